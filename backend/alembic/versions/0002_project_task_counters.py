@@ -0,0 +1,46 @@
+"""Per-project task counters
+
+Revision ID: 0002_project_task_counters
+Revises: 0001_initial_schema
+Create Date: 2026-10-19 09:01:00.000000
+
+The counters start out counted from the tasks already there; the periodic
+reconcile keeps overdue_count current from then on.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0002_project_task_counters'
+down_revision: Union[str, None] = '0001_initial_schema'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('task_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('completed_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('overdue_count', sa.Integer(), server_default='0', nullable=False))
+
+    projects = sa.table('projects', sa.column('id'), sa.column('task_count'), sa.column('completed_count'),
+                        sa.column('overdue_count'))
+    tasks = sa.table('tasks', sa.column('project_id'), sa.column('status'), sa.column('due_date'))
+
+    def count(*conditions):
+        return sa.select(sa.func.count()).where(tasks.c.project_id == projects.c.id, *conditions).scalar_subquery()
+
+    op.execute(projects.update().values(
+        task_count=count(),
+        completed_count=count(tasks.c.status == 'DONE'),
+        overdue_count=count(tasks.c.status != 'DONE', tasks.c.due_date < sa.func.current_timestamp()),
+    ))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.drop_column('overdue_count')
+        batch_op.drop_column('completed_count')
+        batch_op.drop_column('task_count')
@@ -0,0 +1,69 @@
+"""Soft deletion of projects and users, with delete rules on their foreign keys
+
+Revision ID: 0003_soft_delete
+Revises: 0002_project_task_counters
+Create Date: 2026-10-19 09:02:00.000000
+
+The foreign keys were created unnamed. PostgreSQL names them
+<table>_<column>_fkey; on SQLite the batch copy gives the reflected keys
+the same names, so both are dropped and recreated by name.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0003_soft_delete'
+down_revision: Union[str, None] = '0002_project_task_counters'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_FK_NAMES = {'fk': '%(table_name)s_%(column_0_name)s_fkey'}
+# Table -> (column, referred table, ON DELETE) of the keys that get a delete rule.
+_KEYS = {
+    'project_members': [('project_id', 'projects', 'CASCADE'), ('user_id', 'users', 'CASCADE')],
+    'tasks': [('project_id', 'projects', 'CASCADE'), ('assignee_id', 'users', 'SET NULL')],
+    'task_comments': [('task_id', 'tasks', 'CASCADE'), ('author_id', 'users', 'SET NULL')],
+    'user_stories': [('project_id', 'projects', 'CASCADE')],
+}
+
+
+def _replace_keys(table: str, batch_op, with_rules: bool) -> None:
+    for column, referred, ondelete in _KEYS[table]:
+        name = f'{table}_{column}_fkey'
+        batch_op.drop_constraint(name, type_='foreignkey')
+        batch_op.create_foreign_key(name, referred, [column], ['id'], ondelete=ondelete if with_rules else None)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.create_index(batch_op.f('ix_projects_deleted_at'), ['deleted_at'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.create_index(batch_op.f('ix_users_deleted_at'), ['deleted_at'], unique=False)
+
+    for table in _KEYS:
+        with op.batch_alter_table(table, schema=None, naming_convention=_FK_NAMES) as batch_op:
+            if table == 'task_comments':
+                # Comments outlive their author's account.
+                batch_op.alter_column('author_id', existing_type=sa.Integer(), nullable=True)
+            _replace_keys(table, batch_op, with_rules=True)
+
+
+def downgrade() -> None:
+    for table in reversed(list(_KEYS)):
+        with op.batch_alter_table(table, schema=None, naming_convention=_FK_NAMES) as batch_op:
+            _replace_keys(table, batch_op, with_rules=False)
+            if table == 'task_comments':
+                batch_op.alter_column('author_id', existing_type=sa.Integer(), nullable=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_deleted_at'))
+        batch_op.drop_column('deleted_at')
+
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_projects_deleted_at'))
+        batch_op.drop_column('deleted_at')
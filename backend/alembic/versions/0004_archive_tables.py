@@ -0,0 +1,104 @@
+"""Archive tables for finished projects
+
+Revision ID: 0004_archive_tables
+Revises: 0003_soft_delete
+Create Date: 2026-10-19 09:03:00.000000
+
+On SQLite the hot tables are rebuilt with AUTOINCREMENT, so an id moved to
+the archive is never handed to a new row; PostgreSQL sequences never reuse
+ids anyway.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = '0004_archive_tables'
+down_revision: Union[str, None] = '0003_soft_delete'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_HOT_TABLES = ('tasks', 'task_comments', 'user_stories')
+
+
+def _existing_enum(name: str, *values: str) -> sa.Enum:
+    # The type was created with the hot table.
+    return sa.Enum(*values, name=name).with_variant(
+        postgresql.ENUM(*values, name=name, create_type=False), 'postgresql'
+    )
+
+
+def _autoincrement(enabled: bool) -> None:
+    if op.get_context().dialect.name != 'sqlite':
+        return
+    for table in _HOT_TABLES:
+        with op.batch_alter_table(table, recreate='always', table_kwargs={'sqlite_autoincrement': enabled}):
+            pass
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('archived_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.create_index(batch_op.f('ix_projects_archived_at'), ['archived_at'], unique=False)
+
+    op.create_table('archived_tasks',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('title', sa.String(length=200), autoincrement=False, nullable=False),
+    sa.Column('description', sa.Text(), autoincrement=False, nullable=True),
+    sa.Column('status', _existing_enum('taskstatus', 'TODO', 'IN_PROGRESS', 'DONE'), autoincrement=False, nullable=False),
+    sa.Column('priority', _existing_enum('taskpriority', 'LOW', 'MEDIUM', 'HIGH', 'CRITICAL'), autoincrement=False, nullable=False),
+    sa.Column('project_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('assignee_id', sa.Integer(), autoincrement=False, nullable=True),
+    sa.Column('due_date', sa.DateTime(timezone=True), autoincrement=False, nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), autoincrement=False, nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), autoincrement=False, nullable=True),
+    sa.ForeignKeyConstraint(['assignee_id'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_archived_tasks_assignee_id', 'archived_tasks', ['assignee_id'], unique=False)
+    op.create_index('ix_archived_tasks_project_id', 'archived_tasks', ['project_id'], unique=False)
+
+    op.create_table('archived_user_stories',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('title', sa.String(length=200), autoincrement=False, nullable=False),
+    sa.Column('description', sa.Text(), autoincrement=False, nullable=False),
+    sa.Column('acceptance_criteria', sa.Text(), autoincrement=False, nullable=True),
+    sa.Column('project_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), autoincrement=False, nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), autoincrement=False, nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_archived_user_stories_project_id', 'archived_user_stories', ['project_id'], unique=False)
+
+    op.create_table('archived_task_comments',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('content', sa.Text(), autoincrement=False, nullable=False),
+    sa.Column('task_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('author_id', sa.Integer(), autoincrement=False, nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), autoincrement=False, nullable=True),
+    sa.ForeignKeyConstraint(['author_id'], ['users.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['task_id'], ['archived_tasks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_archived_task_comments_task_id', 'archived_task_comments', ['task_id'], unique=False)
+
+    _autoincrement(True)
+
+
+def downgrade() -> None:
+    _autoincrement(False)
+    op.drop_index('ix_archived_task_comments_task_id', table_name='archived_task_comments')
+    op.drop_table('archived_task_comments')
+    op.drop_index('ix_archived_user_stories_project_id', table_name='archived_user_stories')
+    op.drop_table('archived_user_stories')
+    op.drop_index('ix_archived_tasks_project_id', table_name='archived_tasks')
+    op.drop_index('ix_archived_tasks_assignee_id', table_name='archived_tasks')
+    op.drop_table('archived_tasks')
+
+    with op.batch_alter_table('projects', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_projects_archived_at'))
+        batch_op.drop_column('archived_at')
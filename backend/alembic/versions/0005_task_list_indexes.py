@@ -0,0 +1,31 @@
+"""Indexes behind the task list's SQL filters and sorts
+
+Revision ID: 0005_task_list_indexes
+Revises: 0004_archive_tables
+Create Date: 2026-10-19 09:04:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0005_task_list_indexes'
+down_revision: Union[str, None] = '0004_archive_tables'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = ('assignee_id', 'created_at', 'due_date', 'priority', 'status', 'updated_at')
+
+
+def upgrade() -> None:
+    for column in _COLUMNS:
+        op.create_index(op.f(f'ix_tasks_{column}'), 'tasks', [column], unique=False)
+    op.create_index('ix_tasks_project_id_status', 'tasks', ['project_id', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_project_id_status', table_name='tasks')
+    for column in reversed(_COLUMNS):
+        op.drop_index(op.f(f'ix_tasks_{column}'), table_name='tasks')
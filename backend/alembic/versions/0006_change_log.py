@@ -0,0 +1,41 @@
+"""Change log behind incremental sync
+
+Revision ID: 0006_change_log
+Revises: 0005_task_list_indexes
+Create Date: 2026-10-19 09:05:00.000000
+
+The log starts empty: clients take their first token after the upgrade and
+load everything through the list endpoints, as with any new client.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0006_change_log'
+down_revision: Union[str, None] = '0005_task_list_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('change_log',
+    sa.Column('seq', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=True),
+    sa.Column('assignee_id', sa.Integer(), nullable=True),
+    sa.Column('deleted', sa.Boolean(), nullable=False),
+    sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('seq'),
+    sqlite_autoincrement=True
+    )
+    op.create_index(op.f('ix_change_log_changed_at'), 'change_log', ['changed_at'], unique=False)
+    op.create_index('ix_change_log_project_id_seq', 'change_log', ['project_id', 'seq'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_change_log_project_id_seq', table_name='change_log')
+    op.drop_index(op.f('ix_change_log_changed_at'), table_name='change_log')
+    op.drop_table('change_log')
@@ -0,0 +1,69 @@
+"""Task and comment attachments
+
+Revision ID: 0008_attachments
+Revises: 0007_webhooks
+Create Date: 2026-10-19 09:07:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0008_attachments'
+down_revision: Union[str, None] = '0007_webhooks'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('attachments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('comment_id', sa.Integer(), nullable=True),
+    sa.Column('uploader_id', sa.Integer(), nullable=True),
+    sa.Column('filename', sa.String(length=255), nullable=False),
+    sa.Column('content_type', sa.String(length=255), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('digest', sa.String(length=64), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['comment_id'], ['task_comments.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['uploader_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sqlite_autoincrement=True
+    )
+    op.create_index(op.f('ix_attachments_comment_id'), 'attachments', ['comment_id'], unique=False)
+    op.create_index(op.f('ix_attachments_digest'), 'attachments', ['digest'], unique=False)
+    op.create_index(op.f('ix_attachments_id'), 'attachments', ['id'], unique=False)
+    op.create_index(op.f('ix_attachments_task_id'), 'attachments', ['task_id'], unique=False)
+
+    op.create_table('archived_attachments',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('task_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('comment_id', sa.Integer(), autoincrement=False, nullable=True),
+    sa.Column('uploader_id', sa.Integer(), autoincrement=False, nullable=True),
+    sa.Column('filename', sa.String(length=255), autoincrement=False, nullable=False),
+    sa.Column('content_type', sa.String(length=255), autoincrement=False, nullable=False),
+    sa.Column('size', sa.BigInteger(), autoincrement=False, nullable=False),
+    sa.Column('digest', sa.String(length=64), autoincrement=False, nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), autoincrement=False, nullable=True),
+    sa.ForeignKeyConstraint(['comment_id'], ['archived_task_comments.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['archived_tasks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['uploader_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_archived_attachments_digest', 'archived_attachments', ['digest'], unique=False)
+    op.create_index('ix_archived_attachments_task_id', 'archived_attachments', ['task_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_archived_attachments_task_id', table_name='archived_attachments')
+    op.drop_index('ix_archived_attachments_digest', table_name='archived_attachments')
+    op.drop_table('archived_attachments')
+    op.drop_index(op.f('ix_attachments_task_id'), table_name='attachments')
+    op.drop_index(op.f('ix_attachments_id'), table_name='attachments')
+    op.drop_index(op.f('ix_attachments_digest'), table_name='attachments')
+    op.drop_index(op.f('ix_attachments_comment_id'), table_name='attachments')
+    op.drop_table('attachments')
@@ -0,0 +1,56 @@
+"""Blocking dependencies between tasks
+
+Revision ID: 0009_task_dependencies
+Revises: 0008_attachments
+Create Date: 2026-10-19 09:08:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0009_task_dependencies'
+down_revision: Union[str, None] = '0008_attachments'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('task_dependencies',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('blocked_id', sa.Integer(), nullable=False),
+    sa.Column('blocker_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['blocked_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['blocker_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('blocked_id', 'blocker_id', name='uq_task_dependencies_edge'),
+    sqlite_autoincrement=True
+    )
+    op.create_index('ix_task_dependencies_blocker_id', 'task_dependencies', ['blocker_id'], unique=False)
+    op.create_index(op.f('ix_task_dependencies_id'), 'task_dependencies', ['id'], unique=False)
+    op.create_index(op.f('ix_task_dependencies_project_id'), 'task_dependencies', ['project_id'], unique=False)
+
+    op.create_table('archived_task_dependencies',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('project_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('blocked_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('blocker_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), autoincrement=False, nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_archived_task_dependencies_project_id', 'archived_task_dependencies', ['project_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_archived_task_dependencies_project_id', table_name='archived_task_dependencies')
+    op.drop_table('archived_task_dependencies')
+    op.drop_index(op.f('ix_task_dependencies_project_id'), table_name='task_dependencies')
+    op.drop_index(op.f('ix_task_dependencies_id'), table_name='task_dependencies')
+    op.drop_index('ix_task_dependencies_blocker_id', table_name='task_dependencies')
+    op.drop_table('task_dependencies')
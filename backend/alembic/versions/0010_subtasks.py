@@ -0,0 +1,85 @@
+"""Subtasks: parent links, the closure table and subtree counters
+
+Revision ID: 0010_subtasks
+Revises: 0009_task_dependencies
+Create Date: 2026-10-19 09:09:00.000000
+
+Existing tasks have no parent, so the closure table starts empty and every
+counter starts at zero.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0010_subtasks'
+down_revision: Union[str, None] = '0009_task_dependencies'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('parent_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('subtask_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('completed_subtask_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index(batch_op.f('ix_tasks_parent_id'), ['parent_id'], unique=False)
+
+    # The defaults fill the rows already archived; afterwards the archive
+    # copies the counters from tasks and keeps no default of its own.
+    with op.batch_alter_table('archived_tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('parent_id', sa.Integer(), autoincrement=False, nullable=True))
+        batch_op.add_column(sa.Column('subtask_count', sa.Integer(), server_default='0', autoincrement=False, nullable=False))
+        batch_op.add_column(sa.Column('completed_subtask_count', sa.Integer(), server_default='0', autoincrement=False, nullable=False))
+    with op.batch_alter_table('archived_tasks', schema=None) as batch_op:
+        batch_op.alter_column('subtask_count', existing_type=sa.Integer(), server_default=None)
+        batch_op.alter_column('completed_subtask_count', existing_type=sa.Integer(), server_default=None)
+
+    op.create_table('task_closure',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('ancestor_id', sa.Integer(), nullable=False),
+    sa.Column('descendant_id', sa.Integer(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendant_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('ancestor_id', 'descendant_id', name='uq_task_closure_pair'),
+    sqlite_autoincrement=True
+    )
+    op.create_index('ix_task_closure_descendant_id', 'task_closure', ['descendant_id'], unique=False)
+    op.create_index(op.f('ix_task_closure_id'), 'task_closure', ['id'], unique=False)
+    op.create_index(op.f('ix_task_closure_project_id'), 'task_closure', ['project_id'], unique=False)
+
+    op.create_table('archived_task_closure',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('project_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('ancestor_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('descendant_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('depth', sa.Integer(), autoincrement=False, nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_archived_task_closure_project_id', 'archived_task_closure', ['project_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_archived_task_closure_project_id', table_name='archived_task_closure')
+    op.drop_table('archived_task_closure')
+    op.drop_index(op.f('ix_task_closure_project_id'), table_name='task_closure')
+    op.drop_index(op.f('ix_task_closure_id'), table_name='task_closure')
+    op.drop_index('ix_task_closure_descendant_id', table_name='task_closure')
+    op.drop_table('task_closure')
+
+    with op.batch_alter_table('archived_tasks', schema=None) as batch_op:
+        batch_op.drop_column('completed_subtask_count')
+        batch_op.drop_column('subtask_count')
+        batch_op.drop_column('parent_id')
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_tasks_parent_id'))
+        batch_op.drop_column('completed_subtask_count')
+        batch_op.drop_column('subtask_count')
+        batch_op.drop_column('parent_id')
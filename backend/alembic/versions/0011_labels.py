@@ -0,0 +1,65 @@
+"""Project labels and their links to tasks
+
+Revision ID: 0011_labels
+Revises: 0010_subtasks
+Create Date: 2026-10-19 09:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0011_labels'
+down_revision: Union[str, None] = '0010_subtasks'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('labels',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('color', sa.String(length=7), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('project_id', 'name', name='uq_labels_project_name'),
+    sqlite_autoincrement=True
+    )
+    op.create_index(op.f('ix_labels_id'), 'labels', ['id'], unique=False)
+
+    op.create_table('task_labels',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('label_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['label_id'], ['labels.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('task_id', 'label_id', name='uq_task_labels_link'),
+    sqlite_autoincrement=True
+    )
+    op.create_index('ix_task_labels_label_id', 'task_labels', ['label_id'], unique=False)
+
+    op.create_table('archived_task_labels',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('task_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('label_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.ForeignKeyConstraint(['label_id'], ['labels.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['archived_tasks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_archived_task_labels_label_id', 'archived_task_labels', ['label_id'], unique=False)
+    op.create_index('ix_archived_task_labels_task_id', 'archived_task_labels', ['task_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_archived_task_labels_task_id', table_name='archived_task_labels')
+    op.drop_index('ix_archived_task_labels_label_id', table_name='archived_task_labels')
+    op.drop_table('archived_task_labels')
+    op.drop_index('ix_task_labels_label_id', table_name='task_labels')
+    op.drop_table('task_labels')
+    op.drop_index(op.f('ix_labels_id'), table_name='labels')
+    op.drop_table('labels')
@@ -0,0 +1,118 @@
+"""Time entries and their task and weekly project rollups
+
+Revision ID: 0012_time_tracking
+Revises: 0011_labels
+Create Date: 2026-10-19 09:11:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '0012_time_tracking'
+down_revision: Union[str, None] = '0011_labels'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('time_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('task_id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('minutes', sa.Integer(), nullable=False),
+    sa.Column('spent_on', sa.Date(), nullable=False),
+    sa.Column('week_start', sa.Date(), nullable=False),
+    sa.Column('note', sa.String(length=500), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sqlite_autoincrement=True
+    )
+    op.create_index(op.f('ix_time_entries_id'), 'time_entries', ['id'], unique=False)
+    op.create_index('ix_time_entries_project_id_week_start', 'time_entries', ['project_id', 'week_start'], unique=False)
+    op.create_index('ix_time_entries_task_id_spent_on', 'time_entries', ['task_id', 'spent_on'], unique=False)
+    op.create_index(op.f('ix_time_entries_user_id'), 'time_entries', ['user_id'], unique=False)
+
+    op.create_table('task_time_rollups',
+    sa.Column('task_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('minutes', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('entry_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('task_id')
+    )
+    op.create_index(op.f('ix_task_time_rollups_project_id'), 'task_time_rollups', ['project_id'], unique=False)
+
+    op.create_table('project_time_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('week_start', sa.Date(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('minutes', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('entry_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('project_id', 'week_start', 'user_id', name='uq_project_time_rollups_key'),
+    sqlite_autoincrement=True
+    )
+    op.create_index(op.f('ix_project_time_rollups_id'), 'project_time_rollups', ['id'], unique=False)
+    op.create_index('ix_project_time_rollups_user_id_week_start', 'project_time_rollups', ['user_id', 'week_start'], unique=False)
+
+    op.create_table('archived_time_entries',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('task_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('project_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=True),
+    sa.Column('minutes', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('spent_on', sa.Date(), autoincrement=False, nullable=False),
+    sa.Column('week_start', sa.Date(), autoincrement=False, nullable=False),
+    sa.Column('note', sa.String(length=500), autoincrement=False, nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), autoincrement=False, nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), autoincrement=False, nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['archived_tasks.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_archived_time_entries_project_id', 'archived_time_entries', ['project_id'], unique=False)
+    op.create_index('ix_archived_time_entries_task_id', 'archived_time_entries', ['task_id'], unique=False)
+
+    op.create_table('archived_task_time_rollups',
+    sa.Column('task_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('project_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('minutes', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('entry_count', sa.Integer(), autoincrement=False, nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['archived_tasks.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('task_id')
+    )
+    op.create_index('ix_archived_task_time_rollups_project_id', 'archived_task_time_rollups', ['project_id'], unique=False)
+    op.create_index('ix_archived_task_time_rollups_task_id', 'archived_task_time_rollups', ['task_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_archived_task_time_rollups_task_id', table_name='archived_task_time_rollups')
+    op.drop_index('ix_archived_task_time_rollups_project_id', table_name='archived_task_time_rollups')
+    op.drop_table('archived_task_time_rollups')
+    op.drop_index('ix_archived_time_entries_task_id', table_name='archived_time_entries')
+    op.drop_index('ix_archived_time_entries_project_id', table_name='archived_time_entries')
+    op.drop_table('archived_time_entries')
+    op.drop_index('ix_project_time_rollups_user_id_week_start', table_name='project_time_rollups')
+    op.drop_index(op.f('ix_project_time_rollups_id'), table_name='project_time_rollups')
+    op.drop_table('project_time_rollups')
+    op.drop_index(op.f('ix_task_time_rollups_project_id'), table_name='task_time_rollups')
+    op.drop_table('task_time_rollups')
+    op.drop_index(op.f('ix_time_entries_user_id'), table_name='time_entries')
+    op.drop_index('ix_time_entries_task_id_spent_on', table_name='time_entries')
+    op.drop_index('ix_time_entries_project_id_week_start', table_name='time_entries')
+    op.drop_index(op.f('ix_time_entries_id'), table_name='time_entries')
+    op.drop_table('time_entries')
@@ -0,0 +1,55 @@
+"""Multi-get: many entities by id in one request.
+
+``ids`` is a comma-separated list (``?ids=3,1,2``) of at most
+``settings.batch_max_ids`` ids. Endpoints load the accessible ones in a
+single ``IN`` query with the caller's scope applied, and ``collect``
+returns them in the order requested, each once. Ids that came back empty
+are checked with one more id-only query to tell ``forbidden`` ones (they
+exist outside the caller's scope) from ``not_found`` ones.
+"""
+from typing import Any, Callable, Iterable, List
+
+from fastapi import HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..schemas.batch import Batch
+
+
+def parse_ids(ids: str = Query(..., description="Comma-separated ids, e.g. 3,1,2")) -> List[int]:
+    """Dependency: the requested ids, deduplicated in request order."""
+    try:
+        requested = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+    requested = list(dict.fromkeys(requested))
+    if not requested:
+        raise HTTPException(status_code=400, detail="No ids given")
+    if len(requested) > settings.batch_max_ids:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.batch_max_ids} ids per request, got {len(requested)}"
+        )
+    return requested
+
+
+def collect(
+    db: Session,
+    id_column,
+    ids: List[int],
+    rows: Iterable[Any],
+    serialize: Callable[[Any], Any],
+    scoped: bool = True
+) -> Batch:
+    """Order ``rows`` (loaded with ``id_column IN ids``) like ``ids`` and account for the rest."""
+    by_id = {row.id: row for row in rows}
+    missing = [id_ for id_ in ids if id_ not in by_id]
+    existing = set()
+    if scoped and missing:
+        existing = set(db.scalars(select(id_column).where(id_column.in_(missing))))
+    return Batch(
+        items=[serialize(by_id[id_]) for id_ in ids if id_ in by_id],
+        not_found=[id_ for id_ in missing if id_ not in existing],
+        forbidden=[id_ for id_ in missing if id_ in existing],
+    )
\ No newline at end of file
@@ -0,0 +1,122 @@
+"""File downloads with validators and byte ranges.
+
+``file_response`` answers a GET for a stored file: ``304 Not Modified``
+when ``If-None-Match`` holds the file's ETag, ``206 Partial Content`` for a
+single ``Range`` (``bytes=0-99``, ``bytes=100-``, ``bytes=-100``), ``416``
+when the range lies past the end, and the whole file otherwise. A range
+whose ``If-Range`` does not match the current ETag, or that asks for
+several ranges at once, gets the whole file as well.
+
+The body is sent with the ASGI ``http.response.zerocopy`` extension
+(``sendfile``) when the server offers it, and read in chunks off the event
+loop when it does not.
+"""
+import re
+from pathlib import Path
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from fastapi import Request, Response
+
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """``(start, end)``, inclusive, of a single-range header; ``None`` for the whole file."""
+    match = _RANGE.fullmatch((header or "").strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        # Suffix range: the last N bytes.
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable
+        return max(size - length, 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Weak comparison of ``etag`` against an ``If-None-Match`` list."""
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in tags}
+
+
+def content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+class RangeFileResponse(Response):
+    chunk_size = 64 * 1024
+
+    def __init__(self, path: Path, offset: int, length: int, status_code: int, headers: dict, media_type: str):
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers({**headers, "content-length": str(length)})
+
+    async def __call__(self, scope, receive, send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"] == "HEAD" or self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        async with await anyio.open_file(self.path, "rb") as file:
+            if "http.response.zerocopy" in scope.get("extensions", {}):
+                await send({
+                    "type": "http.response.zerocopy", "file": file.wrapped,
+                    "offset": self.offset, "count": self.length, "more_body": False,
+                })
+                return
+            await file.seek(self.offset)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                remaining = remaining - len(chunk) if chunk else 0
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+
+
+def file_response(
+    request: Request, path: Path, size: int, etag: str, media_type: str, filename: str
+) -> Response:
+    headers = {
+        "etag": etag,
+        "accept-ranges": "bytes",
+        # Access can be revoked, so shared caches keep out and clients revalidate.
+        "cache-control": "private, no-cache",
+        "content-disposition": content_disposition(filename),
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range.strip() == etag:
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except RangeNotSatisfiable:
+            return Response(status_code=416, headers={**headers, "content-range": f"bytes */{size}"})
+    if byte_range is None:
+        return RangeFileResponse(path, 0, size, 200, headers, media_type)
+    start, end = byte_range
+    headers["content-range"] = f"bytes {start}-{end}/{size}"
+    return RangeFileResponse(path, start, end - start + 1, 206, headers, media_type)
\ No newline at end of file
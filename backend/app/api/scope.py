@@ -0,0 +1,137 @@
+"""Which projects and tasks a user may see.
+
+A user can access the projects they manage or are a member of; admins can
+access everything. Tasks are accessible when their project is, or when they
+are assigned to the user. ``get_access_scope`` resolves the project id set
+once per request, served from a short-lived per-worker cache that is
+cleared whenever a commit changes a project (its manager or members) or a
+user. The scope gives both an SQL predicate for filtering queries and O(1)
+checks for single objects.
+"""
+import threading
+import time
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from fastapi import Depends, HTTPException
+from sqlalchemy import event, false, or_, select, true, union
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.database import get_db
+from ..core.metrics import record_cache_lookup
+from ..models.project import Project, project_members
+from ..models.task import Task
+from ..models.user import User, UserRole
+from .dependencies import get_current_active_user
+
+# Above this many ids the SQL predicate uses a subquery instead of an IN list.
+_MAX_INLINE_IDS = 500
+
+
+def accessible_project_ids_query(user_id: int):
+    return union(
+        select(Project.id).where(Project.manager_id == user_id),
+        select(project_members.c.project_id).where(project_members.c.user_id == user_id),
+    )
+
+
+class AccessScope:
+    def __init__(self, user_id: int, project_ids: Optional[FrozenSet[int]]):
+        self.user_id = user_id
+        # None means unrestricted (admins).
+        self.project_ids = project_ids
+
+    @property
+    def is_unrestricted(self) -> bool:
+        return self.project_ids is None
+
+    def can_access_project(self, project_id: int) -> bool:
+        return self.project_ids is None or project_id in self.project_ids
+
+    def can_access_task(self, task: Task) -> bool:
+        return self.can_access_project(task.project_id) or task.assignee_id == self.user_id
+
+    def project_filter(self, column=Project.id):
+        """SQL predicate restricting ``column`` (a project id) to accessible projects."""
+        if self.project_ids is None:
+            return true()
+        if not self.project_ids:
+            return false()
+        if len(self.project_ids) > _MAX_INLINE_IDS:
+            return column.in_(accessible_project_ids_query(self.user_id))
+        return column.in_(sorted(self.project_ids))
+
+    def task_filter(self, project_column=Task.project_id, assignee_column=Task.assignee_id):
+        """SQL predicate for accessible tasks; the columns may be those of the archive table."""
+        if self.project_ids is None:
+            return true()
+        return or_(self.project_filter(project_column), assignee_column == self.user_id)
+
+    def require_project(self, project_id: int) -> None:
+        if not self.can_access_project(project_id):
+            raise HTTPException(status_code=403, detail="Access denied")
+
+    def require_task(self, task: Task) -> None:
+        if not self.can_access_task(task):
+            raise HTTPException(status_code=403, detail="Access denied")
+
+
+class ScopeCache:
+    def __init__(self):
+        self._entries: Dict[int, Tuple[float, FrozenSet[int]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[FrozenSet[int]]:
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def put(self, user_id: int, project_ids: FrozenSet[int]) -> None:
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + settings.scope_cache_ttl_seconds, project_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+cache = ScopeCache()
+
+
+def load_access_scope(db: Session, user: User) -> AccessScope:
+    if user.role == UserRole.ADMIN:
+        return AccessScope(user.id, None)
+    project_ids = cache.get(user.id)
+    record_cache_lookup("project_scope", project_ids is not None)
+    if project_ids is None:
+        project_ids = frozenset(db.execute(accessible_project_ids_query(user.id)).scalars())
+        cache.put(user.id, project_ids)
+    return AccessScope(user.id, project_ids)
+
+
+def get_access_scope(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> AccessScope:
+    return load_access_scope(db, current_user)
+
+
+@event.listens_for(Session, "after_flush")
+def _note_scope_changes(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (Project, User)):
+            session.info["scope_changed"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_scopes(session):
+    # Cleared after commit so no request re-caches the old membership in between.
+    if session.info.pop("scope_changed", False):
+        cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_scope_changes(session):
+    session.info.pop("scope_changed", None)
@@ -0,0 +1,158 @@
+"""Filtering and sorting parameters for the task list.
+
+Only whitelisted fields can be filtered or sorted on, and each maps to an
+indexed column of ``tasks`` (see ``models.task``), so every combination
+runs in the database and the client receives just the page it shows.
+The same predicates apply to ``archived_tasks``, which mirrors the columns.
+
+``labels`` takes a label expression such as ``bug and not wontfix`` (see
+``services.label_index``); within one project, ``read_tasks`` resolves it
+to task ids from the project's label index and passes them in.
+
+``sort`` takes comma-separated keys, ``-`` for descending:
+``sort=-priority,due_date``. Missing due dates sort last either way, and
+the id breaks ties so paging is stable.
+"""
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Query
+from sqlalchemy import case, not_
+
+from ..models.archive import archived_task_labels, archived_tasks
+from ..models.label import task_labels
+from ..models.task import Task, TaskPriority, TaskStatus, overdue_clause
+from ..services.label_index import LabelExpressionError, label_condition, parse_label_expression
+
+# Enums are stored by name, so they sort by their position in the workflow instead.
+_RANKS = {
+    "status": {TaskStatus.TODO: 0, TaskStatus.IN_PROGRESS: 1, TaskStatus.DONE: 2},
+    "priority": {TaskPriority.LOW: 0, TaskPriority.MEDIUM: 1, TaskPriority.HIGH: 2, TaskPriority.CRITICAL: 3},
+}
+
+# Sort key -> column name.
+SORT_FIELDS = {
+    "id": "id",
+    "title": "title",
+    "status": "status",
+    "priority": "priority",
+    "due_date": "due_date",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+}
+
+# Task table -> its task-label links.
+_LABEL_LINKS = {Task.__table__: task_labels, archived_tasks: archived_task_labels}
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Stored datetimes are UTC; naive bounds are taken to be UTC as well.
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc)
+
+
+def parse_sort(sort: Optional[str]) -> List[Tuple[str, bool]]:
+    """``"-priority,due_date"`` -> ``[("priority", True), ("due_date", False)]``."""
+    keys = []
+    for part in (sort or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        descending = part.startswith("-")
+        field = part.lstrip("-")
+        if field not in SORT_FIELDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot sort by '{field}'; use one of: {', '.join(SORT_FIELDS)}"
+            )
+        keys.append((field, descending))
+    if not any(field == "id" for field, _ in keys):
+        keys.append(("id", False))
+    return keys
+
+
+class TaskFilters:
+    """Task list query parameters, used as ``filters: TaskFilters = Depends()``."""
+
+    def __init__(
+        self,
+        status: Optional[List[TaskStatus]] = Query(None),
+        priority: Optional[List[TaskPriority]] = Query(None),
+        overdue: Optional[bool] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        updated_after: Optional[datetime] = None,
+        updated_before: Optional[datetime] = None,
+        labels: Optional[str] = Query(None, max_length=500, description="Label expression, e.g. 'bug and not wontfix'"),
+        sort: Optional[str] = Query(None, description="Comma-separated keys, '-' for descending")
+    ):
+        self.status = status
+        self.priority = priority
+        self.overdue = overdue
+        # (column, lower bound, upper bound); both bounds are inclusive.
+        self.ranges = [
+            ("due_date", _as_utc(due_after), _as_utc(due_before)),
+            ("created_at", _as_utc(created_after), _as_utc(created_before)),
+            ("updated_at", _as_utc(updated_after), _as_utc(updated_before)),
+        ]
+        self.labels = None
+        if labels:
+            try:
+                self.labels = parse_label_expression(labels)
+            except LabelExpressionError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid label expression: {e}")
+        self.sort = parse_sort(sort)
+
+    def conditions(self, table=Task.__table__, task_ids: Optional[List[int]] = None) -> list:
+        """WHERE clauses for ``table`` (``tasks`` or ``archived_tasks``).
+
+        ``task_ids``, when given, are the tasks matching the label expression.
+        """
+        conditions = []
+        if task_ids is not None:
+            conditions.append(table.c.id.in_(task_ids))
+        elif self.labels is not None:
+            conditions.append(label_condition(self.labels, table, _LABEL_LINKS[table]))
+        if self.status:
+            conditions.append(table.c.status.in_(self.status))
+        if self.priority:
+            conditions.append(table.c.priority.in_(self.priority))
+        if self.overdue is not None:
+            overdue = overdue_clause(table)
+            conditions.append(overdue if self.overdue else not_(overdue))
+        for name, lower, upper in self.ranges:
+            if lower is not None:
+                conditions.append(table.c[name] >= lower)
+            if upper is not None:
+                conditions.append(table.c[name] <= upper)
+        return conditions
+
+    def order_by(self, table=Task.__table__) -> list:
+        clauses = []
+        for field, descending in self.sort:
+            column = table.c[SORT_FIELDS[field]]
+            if field in _RANKS:
+                column = case(*[(column == value, rank) for value, rank in _RANKS[field].items()])
+            clause = column.desc() if descending else column.asc()
+            clauses.append(clause.nulls_last() if field in ("due_date", "updated_at") else clause)
+        return clauses
+
+    def sort_rows(self, rows: Sequence[Any]) -> List[Any]:
+        """Sort already-loaded rows the way ``order_by`` sorts them in SQL."""
+        rows = list(rows)
+        for field, descending in reversed(self.sort):
+            rows.sort(key=self._row_key(field, descending), reverse=descending)
+        return rows
+
+    @staticmethod
+    def _row_key(field: str, descending: bool) -> Callable[[Any], tuple]:
+        def key(row):
+            value = getattr(row, SORT_FIELDS[field])
+            if field in _RANKS:
+                value = _RANKS[field][value]
+            # Keeps missing values last whichever way the list is sorted.
+            return (value is not None, value) if descending else (value is None, value)
+        return key
@@ -2,16 +2,44 @@ from fastapi import APIRouter
 from .auth import router as auth_router
 from .users import router as users_router
 from .projects import router as projects_router
+from .board import router as board_router
+from .overview import router as overview_router
 from .tasks import router as tasks_router
 from .ai import router as ai_router
 from .dashboard import router as dashboard_router
 from .user_stories import router as user_stories_router
+from .admin import router as admin_router
+from .sync import router as sync_router
+from .webhooks import router as webhooks_router
+from .dependencies import router as dependencies_router, task_router as task_dependencies_router
+from .attachments import router as attachments_router, task_router as task_attachments_router
+from .labels import (
+    router as labels_router, project_router as project_labels_router, task_router as task_labels_router
+)
+from .time_entries import (
+    router as time_entries_router, task_router as task_time_entries_router, report_router as time_reports_router
+)
 
 api_router = APIRouter()
 api_router.include_router(auth_router, prefix="/auth", tags=["authentication"])
 api_router.include_router(users_router, prefix="/users", tags=["users"])
 api_router.include_router(projects_router, prefix="/projects", tags=["projects"])
+api_router.include_router(board_router, prefix="/projects", tags=["board"])
+api_router.include_router(overview_router, prefix="/projects", tags=["overview"])
 api_router.include_router(tasks_router, prefix="/tasks", tags=["tasks"])
+api_router.include_router(task_attachments_router, prefix="/tasks", tags=["attachments"])
+api_router.include_router(task_dependencies_router, prefix="/tasks", tags=["dependencies"])
+api_router.include_router(dependencies_router, prefix="/projects", tags=["dependencies"])
+api_router.include_router(task_labels_router, prefix="/tasks", tags=["labels"])
+api_router.include_router(task_time_entries_router, prefix="/tasks", tags=["time-tracking"])
+api_router.include_router(project_labels_router, prefix="/projects", tags=["labels"])
 api_router.include_router(ai_router, prefix="/ai", tags=["ai"])
 api_router.include_router(dashboard_router, prefix="/dashboard", tags=["dashboard"])
-api_router.include_router(user_stories_router, prefix="/user-stories", tags=["user-stories"])
\ No newline at end of file
+api_router.include_router(user_stories_router, prefix="/user-stories", tags=["user-stories"])
+api_router.include_router(admin_router, prefix="/admin", tags=["admin"])
+api_router.include_router(sync_router, prefix="/sync", tags=["sync"])
+api_router.include_router(webhooks_router, prefix="/webhooks", tags=["webhooks"])
+api_router.include_router(attachments_router, prefix="/attachments", tags=["attachments"])
+api_router.include_router(labels_router, prefix="/labels", tags=["labels"])
+api_router.include_router(time_entries_router, prefix="/time-entries", tags=["time-tracking"])
+api_router.include_router(time_reports_router, prefix="/time-reports", tags=["time-tracking"])
\ No newline at end of file
@@ -0,0 +1,80 @@
+from dataclasses import asdict
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from ...core import profiling, slow_query
+from ...core.database import get_db
+from ...models.user import User
+from ...services.project_counters import reconcile_project_counters
+from ...services.time_rollups import rebuild_time_rollups
+from ...api.dependencies import require_admin
+
+router = APIRouter()
+
+
+@router.get("/slow-queries")
+async def read_slow_queries(
+    route: Optional[str] = None,
+    fingerprint: Optional[str] = None,
+    limit: int = 50,
+    current_user: User = Depends(require_admin())
+):
+    entries = slow_query.store.query(route=route, fingerprint=fingerprint, limit=limit)
+    return {"slow_queries": [asdict(entry) for entry in entries]}
+
+
+@router.get("/slow-queries/summary")
+async def read_slow_query_summary(current_user: User = Depends(require_admin())):
+    return {"statements": slow_query.store.summary()}
+
+
+@router.get("/profiles")
+async def read_profiles(current_user: User = Depends(require_admin())):
+    return {"profiles": [profile.summary() for profile in profiling.store.profiles()]}
+
+
+@router.get("/profiles/routes")
+async def read_route_profiles(current_user: User = Depends(require_admin())):
+    return {"routes": [aggregate.summary() for aggregate in profiling.store.routes()]}
+
+
+@router.get("/profiles/routes/collapsed", response_class=PlainTextResponse)
+async def read_route_profile(route: str, current_user: User = Depends(require_admin())):
+    aggregate = profiling.store.route(route)
+    if aggregate is None:
+        raise HTTPException(status_code=404, detail="No samples for this route")
+    return profiling.format_collapsed(aggregate.samples)
+
+
+@router.delete("/profiles")
+async def clear_profiles(current_user: User = Depends(require_admin())):
+    profiling.store.clear()
+    return {"message": "Profiles cleared"}
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def read_profile(profile_id: str, current_user: User = Depends(require_admin())):
+    profile = profiling.store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profiling.format_collapsed(profile.samples)
+
+
+@router.post("/reconcile/project-counters")
+async def reconcile_counters(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin())
+):
+    repaired = reconcile_project_counters(db)
+    return {"repaired_project_ids": repaired}
+
+
+@router.post("/rebuild/time-rollups")
+async def rebuild_rollups(
+    project_id: Optional[List[int]] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_admin())
+):
+    rebuilt = rebuild_time_rollups(db, project_id)
+    return {"rebuilt_project_ids": rebuilt}
\ No newline at end of file
@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
-import groq
+import time
 from ...core.database import get_db
 from ...core.config import settings
+from ...core.metrics import AI_REQUEST_DURATION
 from ...models.user import User
 from ...models.user_story import UserStory
 from ...schemas.user_story import GenerateUserStoriesRequest, GenerateUserStoriesResponse
 from ...api.dependencies import get_current_active_user, require_manager_or_admin
+from ...api.scope import AccessScope, get_access_scope
 
 router = APIRouter()
 
@@ -19,6 +21,8 @@ async def generate_user_stories_with_groq(project_description: str) -> List[str]
             detail="GROQ API key not configured"
         )
     
+    # groq (and httpx with it) is only imported once the AI endpoint is used.
+    import groq
     client = groq.Groq(api_key=settings.groq_api_key)
     
     prompt = f"""
@@ -31,6 +35,8 @@ async def generate_user_stories_with_groq(project_description: str) -> List[str]
     Return only the user stories, one per line, without numbering or additional formatting.
     """
     
+    start = time.perf_counter()
+    outcome = "error"
     try:
         completion = client.chat.completions.create(
             messages=[
@@ -44,6 +50,7 @@ async def generate_user_stories_with_groq(project_description: str) -> List[str]
             max_tokens=1000,
         )
         
+        outcome = "success"
         response_text = completion.choices[0].message.content.strip()
         user_stories = [story.strip() for story in response_text.split('\n') if story.strip()]
         
@@ -54,14 +61,18 @@ async def generate_user_stories_with_groq(project_description: str) -> List[str]
             status_code=500,
             detail=f"Error generating user stories: {str(e)}"
         )
+    finally:
+        AI_REQUEST_DURATION.observe(time.perf_counter() - start, "groq", outcome)
 
 
 @router.post("/generate-user-stories", response_model=GenerateUserStoriesResponse)
 async def generate_user_stories(
     request: GenerateUserStoriesRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_manager_or_admin())
+    current_user: User = Depends(require_manager_or_admin()),
+    scope: AccessScope = Depends(get_access_scope)
 ):
+    scope.require_project(request.project_id)
     user_stories = await generate_user_stories_with_groq(request.project_description)
     
     generated_stories = []
@@ -82,10 +93,12 @@ async def generate_user_stories(
             db.add(db_story)
             generated_stories.append(db_story)
     
+    db.flush()
+    story_ids = [story.id for story in generated_stories]
     db.commit()
     
-    for story in generated_stories:
-        db.refresh(story)
+    # Reload the committed stories in one query instead of refreshing each one.
+    generated_stories = db.query(UserStory).filter(UserStory.id.in_(story_ids)).order_by(UserStory.id).all()
     
     return GenerateUserStoriesResponse(
         user_stories=user_stories,
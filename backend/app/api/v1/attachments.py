@@ -0,0 +1,139 @@
+"""Files attached to tasks and comments.
+
+Uploads send the file as the raw request body (``Content-Type`` is kept as
+the file's type) with its name in the query string, and are streamed into
+the blob store (``services.attachments``) without ever being held in
+memory. Downloads support ``Range`` and ``If-None-Match`` against the
+content digest (``api.file_response``).
+"""
+import logging
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+
+from ...core.config import settings
+from ...core.database import get_db, get_read_db
+from ...models.attachment import Attachment
+from ...models.project import Project
+from ...models.task import Task, TaskComment
+from ...models.user import User, UserRole
+from ...schemas.attachment import Attachment as AttachmentSchema
+from ...api.dependencies import get_current_active_user
+from ...api.file_response import file_response
+from ...api.scope import AccessScope, get_access_scope
+from ...services.attachments import AttachmentTooLarge, store
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+task_router = APIRouter()
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(status_code=413, detail=f"Attachments are limited to {settings.attachment_max_bytes} bytes")
+
+
+def _attachment(db: Session, attachment_id: int, scope: AccessScope):
+    row = db.query(Attachment, Task.project_id, Task.assignee_id).join(
+        Task, Task.id == Attachment.task_id
+    ).filter(Attachment.id == attachment_id).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    scope.require_task(row)
+    return row.Attachment
+
+
+@task_router.post("/{task_id}/attachments", response_model=AttachmentSchema)
+async def upload_attachment(
+    task_id: int,
+    request: Request,
+    filename: str = Query(..., min_length=1, max_length=255),
+    comment_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    row = db.query(Task.project_id, Task.assignee_id, Project.archived_at).join(
+        Project, Project.id == Task.project_id
+    ).filter(Task.id == task_id).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    scope.require_task(row)
+    if row.archived_at is not None:
+        raise HTTPException(status_code=409, detail="Project is archived; restore it first")
+    if comment_id is not None and not db.query(
+        db.query(TaskComment).filter(TaskComment.id == comment_id, TaskComment.task_id == task_id).exists()
+    ).scalar():
+        raise HTTPException(status_code=404, detail="Comment not found")
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > settings.attachment_max_bytes:
+        raise _too_large()
+
+    # The connection goes back to the pool while the body streams in. Closing
+    # (not rolling back) leaves the current user loaded, just detached.
+    db.close()
+    try:
+        blob = await store.save(request.stream(), settings.attachment_max_bytes)
+    except AttachmentTooLarge:
+        raise _too_large()
+
+    attachment = Attachment(
+        task_id=task_id,
+        comment_id=comment_id,
+        uploader_id=current_user.id,
+        filename=filename,
+        content_type=(request.headers.get("content-type") or "application/octet-stream")[:255],
+        size=blob.size,
+        digest=blob.digest
+    )
+    db.add(attachment)
+    db.commit()
+    db.refresh(attachment)
+    return attachment
+
+
+@task_router.get("/{task_id}/attachments", response_model=List[AttachmentSchema])
+async def read_task_attachments(
+    task_id: int,
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    row = db.query(Task.project_id, Task.assignee_id).filter(Task.id == task_id).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    scope.require_task(row)
+    return db.query(Attachment).filter(Attachment.task_id == task_id).order_by(Attachment.id).all()
+
+
+@router.get("/{attachment_id}")
+async def download_attachment(
+    attachment_id: int,
+    request: Request,
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    attachment = _attachment(db, attachment_id, scope)
+    path = store.path(attachment.digest)
+    if not path.is_file():
+        logger.error("File %s of attachment %s is missing", attachment.digest, attachment.id)
+        raise HTTPException(status_code=404, detail="Attachment content not found")
+    return file_response(
+        request, path, attachment.size, f'"{attachment.digest}"', attachment.content_type, attachment.filename
+    )
+
+
+@router.delete("/{attachment_id}")
+async def delete_attachment(
+    attachment_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    attachment = _attachment(db, attachment_id, scope)
+    if current_user.role == UserRole.DEVELOPER and attachment.uploader_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    # The file stays until the sweep finds it unreferenced.
+    db.delete(attachment)
+    db.commit()
+    return {"message": "Attachment deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""Kanban board of a project.
+
+The board returns every column's task count from one grouped aggregate and
+the first ``per_column`` tasks of each column from one windowed query
+(``ROW_NUMBER() OVER (PARTITION BY status)``), so a project renders in a
+fixed number of queries however much DONE history it has. Columns list the
+newest tasks first and page independently with a keyset cursor: the id of
+the last task shown.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from typing import Dict, Optional
+from ...core.database import get_read_db
+from ...models.project import Project
+from ...models.task import Task, TaskStatus
+from ...schemas.board import Board, BoardColumn
+from ...schemas.loaders import TASK_LIST
+from ...api.scope import AccessScope, get_access_scope
+from .tasks import task_list_item
+
+router = APIRouter()
+
+
+def require_project(db: Session, scope: AccessScope, project_id: int) -> None:
+    if db.query(Project.id).filter(Project.id == project_id).first() is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    scope.require_project(project_id)
+
+
+def _column_counts(db: Session, project_id: int) -> Dict[TaskStatus, int]:
+    rows = db.query(Task.status, func.count(Task.id)).filter(
+        Task.project_id == project_id
+    ).group_by(Task.status).all()
+    return dict(rows)
+
+
+def load_board(db: Session, project_id: int, per_column: int) -> Board:
+    """Column counts and the first ``per_column`` tasks of each column, in two queries."""
+    counts = _column_counts(db, project_id)
+    
+    ranked = select(
+        Task.id,
+        func.row_number().over(partition_by=Task.status, order_by=Task.id.desc()).label("position")
+    ).where(Task.project_id == project_id).subquery()
+    tasks = db.query(Task).options(*TASK_LIST).join(ranked, ranked.c.id == Task.id).filter(
+        ranked.c.position <= per_column
+    ).order_by(Task.id.desc()).all()
+    
+    columns = {status: BoardColumn(status=status, count=counts.get(status, 0)) for status in TaskStatus}
+    for task in tasks:
+        columns[task.status].tasks.append(task_list_item(task))
+    for column in columns.values():
+        if column.count > len(column.tasks):
+            column.next_cursor = column.tasks[-1].id
+    return Board(project_id=project_id, columns=list(columns.values()))
+
+
+@router.get("/{project_id}/board", response_model=Board)
+async def read_board(
+    project_id: int,
+    per_column: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    require_project(db, scope, project_id)
+    return load_board(db, project_id, per_column)
+
+
+@router.get("/{project_id}/board/{status}", response_model=BoardColumn)
+async def read_board_column(
+    project_id: int,
+    status: TaskStatus,
+    cursor: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    require_project(db, scope, project_id)
+    
+    in_column = (Task.project_id == project_id, Task.status == status)
+    count = db.query(func.count(Task.id)).filter(*in_column).scalar()
+    query = db.query(Task).options(*TASK_LIST).filter(*in_column)
+    if cursor is not None:
+        query = query.filter(Task.id < cursor)
+    # One extra row tells whether another page follows.
+    tasks = query.order_by(Task.id.desc()).limit(limit + 1).all()
+    
+    column = BoardColumn(status=status, count=count, tasks=[task_list_item(task) for task in tasks[:limit]])
+    if len(tasks) > limit:
+        column.next_cursor = tasks[limit - 1].id
+    return column
@@ -1,42 +1,26 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, func
-from datetime import datetime
-from ...core.database import get_db
+from ...core.database import get_read_db
 from ...models.user import User, UserRole
 from ...models.project import Project, ProjectStatus
 from ...models.task import Task, TaskStatus
 from ...api.dependencies import get_current_active_user
+from ...api.scope import AccessScope, get_access_scope
+from ...schemas.loaders import TASK_ACTIVITY
 
 router = APIRouter()
 
 
 @router.get("/stats")
 async def get_dashboard_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user),
+    scope: AccessScope = Depends(get_access_scope)
 ):
-    base_project_query = db.query(Project)
-    base_task_query = db.query(Task)
-    
-    if current_user.role == UserRole.DEVELOPER:
-        user_projects = base_project_query.join(Project.members).filter(
-            User.id == current_user.id
-        ).subquery()
-        
-        project_ids = db.query(user_projects.c.id).all()
-        project_ids = [pid[0] for pid in project_ids]
-        
-        base_task_query = base_task_query.filter(Task.project_id.in_(project_ids))
-    elif current_user.role == UserRole.PROJECT_MANAGER:
-        managed_projects = base_project_query.filter(
-            Project.manager_id == current_user.id
-        ).subquery()
-        
-        project_ids = db.query(managed_projects.c.id).all()
-        project_ids = [pid[0] for pid in project_ids]
-        
-        base_task_query = base_task_query.filter(Task.project_id.in_(project_ids))
+    # Only the hot tier: archived projects and their tasks are left out.
+    base_project_query = db.query(Project).filter(scope.project_filter(), Project.archived_at.is_(None))
+    base_task_query = db.query(Task).filter(scope.task_filter())
     
     total_projects = base_project_query.count()
     active_projects = base_project_query.filter(
@@ -48,12 +32,7 @@ async def get_dashboard_stats(
     in_progress_tasks = base_task_query.filter(Task.status == TaskStatus.IN_PROGRESS).count()
     completed_tasks = base_task_query.filter(Task.status == TaskStatus.DONE).count()
     
-    overdue_tasks = base_task_query.filter(
-        and_(
-            Task.due_date < datetime.now(),
-            Task.status != TaskStatus.DONE
-        )
-    ).count()
+    overdue_tasks = base_task_query.filter(Task.is_overdue).count()
     
     if current_user.role == UserRole.DEVELOPER:
         my_tasks = base_task_query.filter(Task.assignee_id == current_user.id).count()
@@ -71,19 +50,13 @@ async def get_dashboard_stats(
     projects = base_project_query.limit(5).all()
     
     for project in projects:
-        project_tasks = db.query(Task).filter(Task.project_id == project.id).count()
-        project_completed = db.query(Task).filter(
-            and_(Task.project_id == project.id, Task.status == TaskStatus.DONE)
-        ).count()
-        
-        progress = (project_completed / project_tasks * 100) if project_tasks > 0 else 0
-        
         project_progress.append({
             "id": project.id,
             "name": project.name,
-            "progress": round(progress, 2),
-            "total_tasks": project_tasks,
-            "completed_tasks": project_completed
+            "progress": round(project.progress_percentage, 2),
+            "total_tasks": project.task_count,
+            "completed_tasks": project.completed_count,
+            "overdue_tasks": project.overdue_count
         })
     
     return {
@@ -107,21 +80,13 @@ async def get_dashboard_stats(
 @router.get("/recent-activity")
 async def get_recent_activity(
     limit: int = 10,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user),
+    scope: AccessScope = Depends(get_access_scope)
 ):
-    base_task_query = db.query(Task)
-    
-    if current_user.role == UserRole.DEVELOPER:
-        base_task_query = base_task_query.filter(
-            Task.assignee_id == current_user.id
-        )
-    elif current_user.role == UserRole.PROJECT_MANAGER:
-        base_task_query = base_task_query.join(Project).filter(
-            Project.manager_id == current_user.id
-        )
+    base_task_query = db.query(Task).filter(scope.task_filter())
     
-    recent_tasks = base_task_query.order_by(
+    recent_tasks = base_task_query.options(*TASK_ACTIVITY).order_by(
         Task.updated_at.desc()
     ).limit(limit).all()
     
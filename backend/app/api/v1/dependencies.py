@@ -0,0 +1,159 @@
+"""Task dependencies ("blocked by") and the views of a project's dependency graph.
+
+Edges are checked for cycles as they are added (``services.task_graph``).
+The frontier and critical path are computed from the project's cached
+graph in the threadpool, so a first load of a large project does not hold
+up other requests.
+"""
+from typing import Callable, List, TypeVar
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from ...core.database import get_db, get_read_db
+from ...models.project import Project
+from ...models.task import Task
+from ...models.task_dependency import TaskDependency
+from ...models.user import User, UserRole
+from ...schemas.task_dependency import (
+    BlockedTask, CriticalPath, CriticalPathTask, Frontier,
+    TaskDependency as TaskDependencySchema, TaskDependencies, TaskDependencyCreate
+)
+from ...api.dependencies import get_current_active_user
+from ...api.scope import AccessScope, get_access_scope
+from ...services.task_graph import ProjectGraph, creates_cycle, graph_cache
+from .board import require_project
+
+router = APIRouter()
+task_router = APIRouter()
+
+T = TypeVar("T")
+
+
+def _task(db: Session, task_id: int, scope: AccessScope, detail: str = "Task not found") -> Task:
+    task = db.query(Task).filter(Task.id == task_id).first()
+    if task is None:
+        raise HTTPException(status_code=404, detail=detail)
+    scope.require_task(task)
+    return task
+
+
+def _require_editable(task: Task, current_user: User) -> None:
+    # As with task updates, developers only change the tasks assigned to them.
+    if current_user.role == UserRole.DEVELOPER and task.assignee_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+
+async def _graph_view(db: Session, project_id: int, view: Callable[[ProjectGraph], T]) -> T:
+    return await run_in_threadpool(graph_cache.read, db, project_id, view)
+
+
+@task_router.get("/{task_id}/dependencies", response_model=TaskDependencies)
+async def read_task_dependencies(
+    task_id: int,
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    _task(db, task_id, scope)
+    blocked_by = db.query(Task).join(TaskDependency, TaskDependency.blocker_id == Task.id).filter(
+        TaskDependency.blocked_id == task_id
+    ).order_by(Task.id).all()
+    blocking = db.query(Task).join(TaskDependency, TaskDependency.blocked_id == Task.id).filter(
+        TaskDependency.blocker_id == task_id
+    ).order_by(Task.id).all()
+    return TaskDependencies(blocked_by=blocked_by, blocking=blocking)
+
+
+@task_router.post("/{task_id}/dependencies", response_model=TaskDependencySchema)
+async def create_task_dependency(
+    task_id: int,
+    dependency_data: TaskDependencyCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    blocked = _task(db, task_id, scope)
+    blocker = _task(db, dependency_data.blocker_id, scope, detail="Blocking task not found")
+    _require_editable(blocked, current_user)
+    if blocker.id == blocked.id:
+        raise HTTPException(status_code=400, detail="A task cannot block itself")
+    if blocker.project_id != blocked.project_id:
+        raise HTTPException(status_code=400, detail="Dependencies must stay within one project")
+
+    # Serializes edge inserts per project, so two concurrent ones cannot close a cycle between them.
+    db.query(Project.id).filter(Project.id == blocked.project_id).with_for_update().first()
+    if db.query(TaskDependency.id).filter(
+        TaskDependency.blocked_id == blocked.id, TaskDependency.blocker_id == blocker.id
+    ).first() is not None:
+        raise HTTPException(status_code=409, detail="Dependency already exists")
+    if creates_cycle(db, blocked.id, blocker.id):
+        raise HTTPException(
+            status_code=409, detail=f"Task {blocked.id} already blocks task {blocker.id}; this would create a cycle"
+        )
+
+    dependency = TaskDependency(project_id=blocked.project_id, blocked_id=blocked.id, blocker_id=blocker.id)
+    db.add(dependency)
+    db.commit()
+    db.refresh(dependency)
+    return dependency
+
+
+@task_router.delete("/{task_id}/dependencies/{blocker_id}")
+async def delete_task_dependency(
+    task_id: int,
+    blocker_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    blocked = _task(db, task_id, scope)
+    _require_editable(blocked, current_user)
+    dependency = db.query(TaskDependency).filter(
+        TaskDependency.blocked_id == task_id, TaskDependency.blocker_id == blocker_id
+    ).first()
+    if dependency is None:
+        raise HTTPException(status_code=404, detail="Dependency not found")
+    db.delete(dependency)
+    db.commit()
+    return {"message": "Dependency deleted successfully"}
+
+
+@router.get("/{project_id}/frontier", response_model=Frontier)
+async def read_frontier(
+    project_id: int,
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    require_project(db, scope, project_id)
+    ready, blocked = await _graph_view(db, project_id, lambda graph: graph.frontier)
+    return Frontier(
+        project_id=project_id,
+        ready=ready,
+        blocked=[BlockedTask(task_id=task_id, blocked_by=blockers) for task_id, blockers in blocked.items()]
+    )
+
+
+@router.get("/{project_id}/critical-path", response_model=CriticalPath)
+async def read_critical_path(
+    project_id: int,
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    require_project(db, scope, project_id)
+    path = await _graph_view(db, project_id, lambda graph: graph.critical_path)
+    tasks = {task.id: task for task in db.query(Task).filter(Task.id.in_([step.task_id for step in path]))}
+    steps: List[CriticalPathTask] = []
+    for step in path:
+        task = tasks.get(step.task_id)
+        if task is None:
+            # Deleted since the graph was cached.
+            continue
+        steps.append(CriticalPathTask.model_validate(task).model_copy(update={
+            "earliest_finish": step.earliest_finish, "is_late": step.is_late,
+        }))
+    return CriticalPath(
+        project_id=project_id,
+        projected_finish=path[-1].earliest_finish if path else None,
+        tasks=steps
+    )
\ No newline at end of file
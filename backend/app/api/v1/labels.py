@@ -0,0 +1,189 @@
+"""Project labels and the labels on tasks.
+
+Task lists filter on label expressions (``GET /tasks/?labels=...``, see
+``services.label_index``). Label counts come from the project's cached
+label index, read in the threadpool like the dependency graph views.
+"""
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, selectinload
+
+from ...core.database import get_db, get_read_db
+from ...models.label import Label
+from ...models.project import Project
+from ...models.task import Task
+from ...models.user import User, UserRole
+from ...schemas.label import (
+    Label as LabelSchema, LabelCreate, LabelUpdate, LabelWithCount, TaskLabels
+)
+from ...api.dependencies import get_current_active_user
+from ...api.scope import AccessScope, get_access_scope
+from ...services.label_index import read_label_index
+from .board import require_project
+
+router = APIRouter()
+project_router = APIRouter()
+task_router = APIRouter()
+
+
+def _require_manager(current_user: User) -> None:
+    if current_user.role == UserRole.DEVELOPER:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+
+def _label(db: Session, label_id: int, scope: AccessScope) -> Label:
+    label = db.query(Label).filter(Label.id == label_id).first()
+    if label is None:
+        raise HTTPException(status_code=404, detail="Label not found")
+    scope.require_project(label.project_id)
+    return label
+
+
+def _require_unique_name(db: Session, project_id: int, name: str) -> None:
+    if db.query(Label.id).filter(Label.project_id == project_id, Label.name == name).first() is not None:
+        raise HTTPException(status_code=409, detail=f"Label '{name}' already exists in this project")
+
+
+def _editable_task(db: Session, task_id: int, current_user: User, scope: AccessScope) -> Task:
+    task = db.query(Task).options(selectinload(Task.labels)).filter(Task.id == task_id).first()
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    scope.require_task(task)
+    # As with task updates, developers only change the tasks assigned to them.
+    if current_user.role == UserRole.DEVELOPER and task.assignee_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    return task
+
+
+def _project_labels(db: Session, project_id: int, label_ids: List[int]) -> List[Label]:
+    labels = db.query(Label).filter(Label.id.in_(label_ids)).all() if label_ids else []
+    if len(labels) != len(set(label_ids)):
+        raise HTTPException(status_code=404, detail="Label not found")
+    if any(label.project_id != project_id for label in labels):
+        raise HTTPException(status_code=400, detail="Labels must belong to the task's project")
+    return labels
+
+
+def _commit_labels(db: Session, task: Task) -> List[LabelSchema]:
+    # Serialized before the commit expires them.
+    labels = [LabelSchema.model_validate(label) for label in sorted(task.labels, key=lambda label: label.name)]
+    db.commit()
+    return labels
+
+
+@project_router.get("/{project_id}/labels", response_model=List[LabelWithCount])
+async def read_labels(
+    project_id: int,
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    require_project(db, scope, project_id)
+    labels = db.query(Label).filter(Label.project_id == project_id).order_by(Label.name).all()
+    counts = await run_in_threadpool(read_label_index, project_id, lambda index: index.counts())
+    return [
+        LabelWithCount(**LabelSchema.model_validate(label).model_dump(), task_count=counts.get(label.id, 0))
+        for label in labels
+    ]
+
+
+@project_router.post("/{project_id}/labels", response_model=LabelSchema)
+async def create_label(
+    project_id: int,
+    label_data: LabelCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    _require_manager(current_user)
+    require_project(db, scope, project_id)
+    # Serializes label changes per project, so two concurrent creates cannot both pass the name check.
+    db.query(Project.id).filter(Project.id == project_id).with_for_update().first()
+    _require_unique_name(db, project_id, label_data.name)
+    label = Label(project_id=project_id, **label_data.model_dump())
+    db.add(label)
+    db.commit()
+    db.refresh(label)
+    return label
+
+
+@router.put("/{label_id}", response_model=LabelSchema)
+async def update_label(
+    label_id: int,
+    label_data: LabelUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    _require_manager(current_user)
+    label = _label(db, label_id, scope)
+    update_data = label_data.model_dump(exclude_unset=True)
+    if update_data.get("name") is None:
+        update_data.pop("name", None)
+    elif update_data["name"] != label.name:
+        db.query(Project.id).filter(Project.id == label.project_id).with_for_update().first()
+        _require_unique_name(db, label.project_id, update_data["name"])
+    for field, value in update_data.items():
+        setattr(label, field, value)
+    db.commit()
+    db.refresh(label)
+    return label
+
+
+@router.delete("/{label_id}")
+async def delete_label(
+    label_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    _require_manager(current_user)
+    label = _label(db, label_id, scope)
+    db.delete(label)
+    db.commit()
+    return {"message": "Label deleted successfully"}
+
+
+@task_router.put("/{task_id}/labels", response_model=List[LabelSchema])
+async def replace_task_labels(
+    task_id: int,
+    labels_data: TaskLabels,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    task = _editable_task(db, task_id, current_user, scope)
+    task.labels = _project_labels(db, task.project_id, labels_data.label_ids)
+    return _commit_labels(db, task)
+
+
+@task_router.post("/{task_id}/labels/{label_id}", response_model=List[LabelSchema])
+async def add_task_label(
+    task_id: int,
+    label_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    task = _editable_task(db, task_id, current_user, scope)
+    label, = _project_labels(db, task.project_id, [label_id])
+    if label not in task.labels:
+        task.labels.append(label)
+    return _commit_labels(db, task)
+
+
+@task_router.delete("/{task_id}/labels/{label_id}", response_model=List[LabelSchema])
+async def remove_task_label(
+    task_id: int,
+    label_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    task = _editable_task(db, task_id, current_user, scope)
+    label = next((label for label in task.labels if label.id == label_id), None)
+    if label is None:
+        raise HTTPException(status_code=404, detail="Label is not on this task")
+    task.labels.remove(label)
+    return _commit_labels(db, task)
\ No newline at end of file
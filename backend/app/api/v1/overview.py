@@ -0,0 +1,140 @@
+"""Everything the project page shows, in one response.
+
+The overview bundles the project with its manager and members, the Kanban
+board (per-status counts and the first tasks of each column) and the first
+page of user stories. Its three sections are independent, so each runs on
+its own pooled connection at the same time; with a single shared connection
+(in-memory SQLite) they take turns on the request's session instead.
+
+Before any of that, one query reads a version of everything the overview
+depends on: the project row and counters, and the count, highest id and
+latest change of its tasks, stories and people. Its hash is a weak ETag, and
+a client sending it back in ``If-None-Match`` gets ``304 Not Modified``
+after that single query. The sections are read after the version, so at
+worst the ETag is older than the body and the next request refetches.
+"""
+import asyncio
+import hashlib
+from typing import Callable, List, Optional, TypeVar
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.orm import Session
+
+from ...core.database import get_read_db, sibling_read_session
+from ...models.project import Project, project_members
+from ...models.task import Task, overdue_clause
+from ...models.user import User
+from ...models.user_story import UserStory
+from ...schemas.loaders import PROJECT_DETAILS
+from ...schemas.overview import ProjectOverview
+from ...schemas.project import ProjectWithDetails
+from ...api.scope import AccessScope, get_access_scope
+from .board import load_board
+from .projects import project_details
+from .user_stories import load_project_stories
+
+router = APIRouter()
+
+T = TypeVar("T")
+
+
+def _version_query(project_id: int):
+    tasks = Task.__table__
+    stories = UserStory.__table__
+    users = User.__table__
+
+    def scalar(*columns, where):
+        return [select(column).where(where).scalar_subquery() for column in columns]
+
+    in_project = tasks.c.project_id == Project.id
+    member_ids = select(project_members.c.user_id).where(project_members.c.project_id == Project.id)
+    return select(
+        Project.updated_at, Project.archived_at,
+        Project.task_count, Project.completed_count, Project.overdue_count,
+        *scalar(
+            func.count(), func.max(tasks.c.id), func.max(func.coalesce(tasks.c.updated_at, tasks.c.created_at)),
+            # Tasks turn overdue without being written to.
+            func.sum(case((overdue_clause(tasks), 1), else_=0)),
+            where=in_project
+        ),
+        *scalar(
+            func.count(), func.max(stories.c.id), func.max(func.coalesce(stories.c.updated_at, stories.c.created_at)),
+            where=stories.c.project_id == Project.id
+        ),
+        *scalar(
+            func.count(), func.sum(project_members.c.user_id),
+            where=project_members.c.project_id == Project.id
+        ),
+        *scalar(
+            func.max(func.coalesce(users.c.updated_at, users.c.created_at)),
+            where=or_(users.c.id == Project.manager_id, users.c.id.in_(member_ids))
+        ),
+    ).where(Project.id == project_id)
+
+
+def _etag(version, *params) -> str:
+    digest = hashlib.sha1(repr((tuple(version), params)).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # Weak comparison: the W/ prefix is ignored on both sides.
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+async def _run_sections(db: Session, sections: List[Callable[[Session], T]]) -> List[T]:
+    """Run each section on its own session concurrently, or one after another on ``db``."""
+    siblings = [sibling_read_session(db) for _ in sections[1:]]
+    try:
+        if None in siblings:
+            return [section(db) for section in sections]
+        sessions = [db, *siblings]
+        return list(await asyncio.gather(*[
+            run_in_threadpool(section, session) for section, session in zip(sections, sessions)
+        ]))
+    finally:
+        for session in siblings:
+            if session is not None:
+                session.close()
+
+
+def _load_project(db: Session, project_id: int) -> Optional[ProjectWithDetails]:
+    project = db.query(Project).options(*PROJECT_DETAILS).filter(Project.id == project_id).first()
+    return project_details(project) if project is not None else None
+
+
+@router.get("/{project_id}/overview", response_model=ProjectOverview)
+async def read_project_overview(
+    project_id: int,
+    request: Request,
+    response: Response,
+    per_column: int = Query(20, ge=1, le=100),
+    stories_limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    version = db.execute(_version_query(project_id)).first()
+    if version is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    scope.require_project(project_id)
+    
+    headers = {"ETag": _etag(version, per_column, stories_limit), "Cache-Control": "private, no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    
+    project, board, stories = await _run_sections(db, [
+        lambda session: _load_project(session, project_id),
+        lambda session: load_board(session, project_id, per_column),
+        lambda session: load_project_stories(session, project_id, 0, stories_limit),
+    ])
+    if project is None:
+        # Deleted since the version was read.
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    response.headers.update(headers)
+    return ProjectOverview(project=project, board=board, stories=stories)
\ No newline at end of file
@@ -1,68 +1,61 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, selectinload
 from typing import List
-from ...core.database import get_db
+from datetime import datetime, timezone
+from ...core.database import get_db, get_read_db
 from ...models.user import User, UserRole
 from ...models.project import Project
-from ...models.task import Task, TaskStatus
 from ...schemas.project import Project as ProjectSchema, ProjectCreate, ProjectUpdate, ProjectWithDetails
-from ...api.dependencies import get_current_active_user, require_manager_or_admin
+from ...schemas.batch import Batch
+from ...schemas.loaders import PROJECT_DETAILS
+from ...api.dependencies import require_manager_or_admin
+from ...api.batch import collect, parse_ids
+from ...api.scope import AccessScope, get_access_scope
+from ...services.archive import ARCHIVABLE_STATUSES, archive_project, restore_project
+from ...services.webhooks import enqueue_events
 
 router = APIRouter()
 
 
+def project_details(project: Project) -> ProjectWithDetails:
+    """Detail representation of a project loaded with ``PROJECT_DETAILS``."""
+    return ProjectWithDetails(
+        id=project.id,
+        name=project.name,
+        description=project.description,
+        status=project.status,
+        start_date=project.start_date,
+        end_date=project.end_date,
+        manager_id=project.manager_id,
+        archived_at=project.archived_at,
+        created_at=project.created_at,
+        updated_at=project.updated_at,
+        task_count=project.task_count,
+        completed_tasks=project.completed_count,
+        overdue_tasks=project.overdue_count,
+        progress_percentage=project.progress_percentage,
+        manager=project.manager,
+        members=project.members
+    )
+
+
 @router.get("/", response_model=List[ProjectWithDetails])
 async def read_projects(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    include_archived: bool = False,
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
 ):
     try:
-        query = db.query(Project)
-        
-        # For admin users, return all projects
-        if current_user.role == UserRole.ADMIN:
-            pass  # No filtering needed
-        elif current_user.role == UserRole.DEVELOPER:
-            query = query.join(Project.members).filter(User.id == current_user.id)
-        elif current_user.role == UserRole.PROJECT_MANAGER:
-            query = query.filter(
-                (Project.manager_id == current_user.id) |
-                (Project.members.any(User.id == current_user.id))
-            )
+        query = db.query(Project).filter(scope.project_filter())
+        if not include_archived:
+            query = query.filter(Project.archived_at.is_(None))
         
-        projects = query.offset(skip).limit(limit).all()
+        projects = query.options(*PROJECT_DETAILS).order_by(Project.id).offset(skip).limit(limit).all()
         
-        result = []
-        for project in projects:
-            task_count = db.query(Task).filter(Task.project_id == project.id).count()
-            completed_tasks = db.query(Task).filter(
-                and_(Task.project_id == project.id, Task.status == TaskStatus.DONE)
-            ).count()
-            
-            progress_percentage = (completed_tasks / task_count * 100) if task_count > 0 else 0
-            
-            project_data = ProjectWithDetails(
-                id=project.id,
-                name=project.name,
-                description=project.description,
-                status=project.status,
-                start_date=project.start_date,
-                end_date=project.end_date,
-                manager_id=project.manager_id,
-                created_at=project.created_at,
-                updated_at=project.updated_at,
-                task_count=task_count,
-                completed_tasks=completed_tasks,
-                progress_percentage=progress_percentage,
-                manager=project.manager,
-                members=project.members
-            )
-            result.append(project_data)
-        
-        return result
+        return [project_details(project) for project in projects]
     except Exception as e:
         print(f"Error in read_projects: {e}")
         import traceback
@@ -70,6 +63,18 @@ async def read_projects(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/batch", response_model=Batch[ProjectWithDetails])
+async def read_projects_batch(
+    ids: List[int] = Depends(parse_ids),
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    projects = db.query(Project).options(*PROJECT_DETAILS).filter(
+        Project.id.in_(ids), scope.project_filter()
+    ).all()
+    return collect(db, Project.id, ids, projects, project_details, scoped=not scope.is_unrestricted)
+
+
 @router.post("/", response_model=ProjectSchema)
 async def create_project(
     project_data: ProjectCreate,
@@ -77,56 +82,28 @@ async def create_project(
     current_user: User = Depends(require_manager_or_admin())
 ):
     db_project = Project(**project_data.model_dump(exclude={"member_ids"}))
+    if project_data.member_ids:
+        db_project.members = db.query(User).filter(User.id.in_(project_data.member_ids)).all()
     
     db.add(db_project)
     db.commit()
     db.refresh(db_project)
-    
-    if project_data.member_ids:
-        members = db.query(User).filter(User.id.in_(project_data.member_ids)).all()
-        db_project.members.extend(members)
-        db.commit()
-    
     return db_project
 
 
 @router.get("/{project_id}", response_model=ProjectWithDetails)
 async def read_project(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
 ):
-    db_project = db.query(Project).filter(Project.id == project_id).first()
+    db_project = db.query(Project).options(*PROJECT_DETAILS).filter(Project.id == project_id).first()
     if db_project is None:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    if (current_user.role == UserRole.DEVELOPER and 
-        current_user not in db_project.members):
-        raise HTTPException(status_code=403, detail="Access denied")
-    
-    task_count = db.query(Task).filter(Task.project_id == project_id).count()
-    completed_tasks = db.query(Task).filter(
-        and_(Task.project_id == project_id, Task.status == TaskStatus.DONE)
-    ).count()
-    
-    progress_percentage = (completed_tasks / task_count * 100) if task_count > 0 else 0
+    scope.require_project(project_id)
     
-    return ProjectWithDetails(
-        id=db_project.id,
-        name=db_project.name,
-        description=db_project.description,
-        status=db_project.status,
-        start_date=db_project.start_date,
-        end_date=db_project.end_date,
-        manager_id=db_project.manager_id,
-        created_at=db_project.created_at,
-        updated_at=db_project.updated_at,
-        task_count=task_count,
-        completed_tasks=completed_tasks,
-        progress_percentage=progress_percentage,
-        manager=db_project.manager,
-        members=db_project.members
-    )
+    return project_details(db_project)
 
 
 @router.put("/{project_id}", response_model=ProjectSchema)
@@ -136,7 +113,7 @@ async def update_project(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_manager_or_admin())
 ):
-    db_project = db.query(Project).filter(Project.id == project_id).first()
+    db_project = db.query(Project).options(selectinload(Project.members)).filter(Project.id == project_id).first()
     if db_project is None:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -152,9 +129,13 @@ async def update_project(
         members = db.query(User).filter(User.id.in_(project_data.member_ids)).all()
         db_project.members = members
     
+    db.flush()
+    enqueue_events(db, project_id, [
+        ("project.updated", ProjectSchema.model_validate(db_project).model_dump(mode="json"))
+    ])
     db.commit()
-    db.refresh(db_project)
-    return db_project
+    # A plain reload; refresh() would also repeat the members load option.
+    return db.query(Project).filter(Project.id == project_id).one()
 
 
 @router.delete("/{project_id}")
@@ -171,6 +152,49 @@ async def delete_project(
         db_project.manager_id != current_user.id):
         raise HTTPException(status_code=403, detail="Access denied")
     
-    db.delete(db_project)
+    # Hidden from now on; tasks, comments and stories are purged in the background.
+    db_project.deleted_at = datetime.now(timezone.utc)
+    enqueue_events(db, project_id, [("project.deleted", {"id": project_id, "name": db_project.name})])
     db.commit()
-    return {"message": "Project deleted successfully"}
\ No newline at end of file
+    return {"message": "Project deleted successfully"}
+
+
+def managed_project(db: Session, project_id: int, current_user: User) -> Project:
+    db_project = db.query(Project).filter(Project.id == project_id).first()
+    if db_project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    if (current_user.role == UserRole.PROJECT_MANAGER and 
+        db_project.manager_id != current_user.id):
+        raise HTTPException(status_code=403, detail="Access denied")
+    return db_project
+
+
+@router.post("/{project_id}/archive", response_model=ProjectSchema)
+async def archive(
+    project_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_manager_or_admin())
+):
+    db_project = managed_project(db, project_id, current_user)
+    if db_project.archived_at is not None:
+        raise HTTPException(status_code=409, detail="Project is already archived")
+    if db_project.status not in ARCHIVABLE_STATUSES:
+        raise HTTPException(status_code=409, detail="Only completed or cancelled projects can be archived")
+    
+    # One commit per batch: a large project takes a while, so keep it off the event loop.
+    await run_in_threadpool(archive_project, db, project_id)
+    return db.query(Project).filter(Project.id == project_id).one()
+
+
+@router.post("/{project_id}/restore", response_model=ProjectSchema)
+async def restore(
+    project_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_manager_or_admin())
+):
+    db_project = managed_project(db, project_id, current_user)
+    if db_project.archived_at is None:
+        raise HTTPException(status_code=409, detail="Project is not archived")
+    
+    await run_in_threadpool(restore_project, db, project_id)
+    return db.query(Project).filter(Project.id == project_id).one()
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""Incremental sync for clients that keep a local replica.
+
+A client starts with ``GET /sync/`` (no ``since``) to get a token, loads
+what it needs through the list endpoints, and from then on asks for
+``GET /sync/?since=<token>``: the projects, memberships, tasks, user stories
+and comments created or updated since, tombstones for the ones deleted (or
+moved out of the caller's reach), and the next token. Work is proportional
+to the changes, read off the ``change_log`` sequence.
+
+Changes are collapsed to the latest state of each row and upserts are
+loaded with the caller's scope; tombstones carry only ids and are sent to
+everyone, since a client cannot know which of its rows were taken away.
+``has_more`` means another page is ready. The token never moves past a
+change younger than ``sync_settle_seconds``, so a transaction that took its
+sequence number earlier but committed later is not skipped; such changes may
+be delivered twice. Tokens from before the oldest kept entry get ``410``.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, or_, select, true
+from sqlalchemy.orm import Session
+
+from ...core.config import settings
+from ...core.database import get_read_db
+from ...models.change_log import change_log
+from ...models.project import Project
+from ...models.task import Task, TaskComment
+from ...models.user_story import UserStory
+from ...schemas.loaders import COMMENT_DETAILS
+from ...schemas.project import Project as ProjectSchema
+from ...schemas.sync import Membership, SyncChanges
+from ...schemas.task import Task as TaskSchema, TaskComment as TaskCommentSchema
+from ...schemas.user_story import UserStory as UserStorySchema
+from ...api.scope import AccessScope, get_access_scope
+
+router = APIRouter()
+
+log = change_log.c
+
+
+def _load_projects(db: Session, scope: AccessScope, ids: List[int]):
+    return db.query(Project).filter(Project.id.in_(ids), scope.project_filter()).all()
+
+
+def _load_tasks(db: Session, scope: AccessScope, ids: List[int]):
+    return db.query(Task).filter(Task.id.in_(ids), scope.task_filter()).all()
+
+
+def _load_user_stories(db: Session, scope: AccessScope, ids: List[int]):
+    return db.query(UserStory).filter(
+        UserStory.id.in_(ids), scope.project_filter(UserStory.project_id)
+    ).all()
+
+
+def _load_comments(db: Session, scope: AccessScope, ids: List[int]):
+    return db.query(TaskComment).options(*COMMENT_DETAILS).join(Task, TaskComment.task_id == Task.id).filter(
+        TaskComment.id.in_(ids), scope.task_filter()
+    ).all()
+
+
+# Entity -> (loader of the accessible rows among ids, response schema).
+_UPSERTS = {
+    "projects": (_load_projects, ProjectSchema),
+    "tasks": (_load_tasks, TaskSchema),
+    "user_stories": (_load_user_stories, UserStorySchema),
+    "comments": (_load_comments, TaskCommentSchema),
+}
+
+
+def _latest(entries) -> list:
+    """The last entry of every row, in sequence order."""
+    latest: Dict[tuple, object] = {}
+    for entry in entries:
+        if entry.entity == "memberships":
+            key = (entry.entity, entry.project_id, entry.entity_id)
+        else:
+            key = (entry.entity, entry.entity_id)
+        latest.pop(key, None)
+        latest[key] = entry
+    return list(latest.values())
+
+
+@router.get("/", response_model=SyncChanges)
+async def read_changes(
+    since: Optional[int] = Query(None, ge=0, description="Token from the previous sync; omit to start"),
+    limit: int = Query(500, ge=1, le=2000),
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.sync_settle_seconds)
+    unsettled = select(func.min(log.seq)).where(log.changed_at > cutoff).scalar_subquery()
+    oldest, head, first_unsettled = db.execute(select(func.min(log.seq), func.max(log.seq), unsettled)).one()
+    head = head or 0
+    settled = head if first_unsettled is None else first_unsettled - 1
+    if since is None:
+        return SyncChanges(token=settled)
+    if since > head or (oldest is not None and since < oldest - 1):
+        raise HTTPException(status_code=410, detail="Sync token expired; reload and sync from a new token")
+    
+    # Matches ``scope.task_filter``: tasks and their comments also reach their assignee.
+    visible = true() if scope.is_unrestricted else or_(
+        log.deleted, scope.project_filter(log.project_id), log.assignee_id == scope.user_id
+    )
+    entries = db.execute(
+        select(change_log).where(log.seq > since, log.seq <= head, visible).order_by(log.seq).limit(limit + 1)
+    ).all()
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    token = entries[-1].seq if has_more else head
+    if token > settled:
+        token, has_more = max(since, settled), False
+    
+    changes = SyncChanges(token=token, has_more=has_more)
+    upserts = defaultdict(list)
+    for entry in _latest(entries):
+        if entry.entity == "memberships":
+            membership = Membership(project_id=entry.project_id, user_id=entry.entity_id)
+            (changes.deleted.memberships if entry.deleted else changes.memberships).append(membership)
+        elif entry.deleted:
+            getattr(changes.deleted, entry.entity).append(entry.entity_id)
+        else:
+            upserts[entry.entity].append(entry.entity_id)
+    
+    for entity, ids in upserts.items():
+        load, schema = _UPSERTS[entity]
+        rows = {row.id: row for row in load(db, scope, ids)}
+        for id_ in ids:
+            if id_ in rows:
+                getattr(changes, entity).append(schema.model_validate(rows[id_]))
+            else:
+                # Gone or out of reach by now.
+                getattr(changes.deleted, entity).append(id_)
+    return changes
\ No newline at end of file
@@ -1,32 +1,123 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, raiseload, selectinload
+from sqlalchemy import and_, or_, select
 from typing import List, Optional
-from datetime import datetime, timezone
-from ...core.database import get_db
+from ...core.config import settings
+from ...core.database import get_db, get_read_db
 from ...models.user import User, UserRole
 from ...models.project import Project
-from ...models.task import Task, TaskComment
+from ...models.task import Task, TaskComment, overdue_clause
+from ...models.task_closure import TaskClosure
+from ...models.archive import archived_task_labels, archived_tasks
+from ...models.label import Label
 from ...schemas.task import (
-    Task as TaskSchema, TaskCreate, TaskUpdate, TaskWithDetails,
+    Subtask, Subtree, Task as TaskSchema, TaskCreate, TaskUpdate, TaskWithDetails,
     TaskComment as TaskCommentSchema, TaskCommentCreate
 )
+from ...schemas.batch import Batch
+from ...schemas.loaders import COMMENT_DETAILS, TASK_DETAILS, TASK_LIST
 from ...api.dependencies import get_current_active_user
+from ...api.batch import collect, parse_ids
+from ...api.scope import AccessScope, get_access_scope
+from ...api.task_filters import TaskFilters
+from ...services.label_index import read_label_index
+from ...services.task_tree import in_subtree
+from ...services.webhooks import enqueue_events
 
 router = APIRouter()
 
 
+def _event_data(task: Task) -> dict:
+    return TaskSchema.model_validate(task).model_dump(mode="json")
+
+
+def task_list_item(task: Task) -> TaskWithDetails:
+    """List representation of a task loaded with ``TASK_LIST``; comments are left out."""
+    return TaskWithDetails(
+        id=task.id,
+        title=task.title,
+        description=task.description,
+        status=task.status,
+        priority=task.priority,
+        project_id=task.project_id,
+        parent_id=task.parent_id,
+        subtask_count=task.subtask_count,
+        completed_subtask_count=task.completed_subtask_count,
+        assignee_id=task.assignee_id,
+        due_date=task.due_date,
+        created_at=task.created_at,
+        updated_at=task.updated_at,
+        is_overdue=task.is_overdue,
+        assignee=task.assignee,
+        labels=task.labels,
+        comments=[]
+    )
+
+
+def _require_parent(db: Session, scope: AccessScope, project_id: int, parent_id: int) -> Task:
+    parent = db.query(Task).filter(Task.id == parent_id).first()
+    if parent is None:
+        raise HTTPException(status_code=404, detail="Parent task not found")
+    scope.require_task(parent)
+    if parent.project_id != project_id:
+        raise HTTPException(status_code=400, detail="Subtasks must stay within one project")
+    return parent
+
+
+def read_archived_tasks(
+    db: Session,
+    scope: AccessScope,
+    filters: TaskFilters,
+    project_id: Optional[int],
+    assignee_id: Optional[int],
+    limit: int
+) -> List[TaskWithDetails]:
+    """The first ``limit`` accessible archived tasks in ``filters`` order."""
+    query = select(archived_tasks, overdue_clause(archived_tasks).label("is_overdue")).where(
+        scope.task_filter(archived_tasks.c.project_id, archived_tasks.c.assignee_id),
+        *filters.conditions(archived_tasks)
+    )
+    if project_id:
+        query = query.where(archived_tasks.c.project_id == project_id)
+    if assignee_id:
+        query = query.where(archived_tasks.c.assignee_id == assignee_id)
+    rows = db.execute(query.order_by(*filters.order_by(archived_tasks)).limit(limit)).all()
+    
+    assignee_ids = {row.assignee_id for row in rows if row.assignee_id}
+    assignees = {user.id: user for user in db.query(User).filter(User.id.in_(assignee_ids))} if assignee_ids else {}
+    labels = {row.id: [] for row in rows}
+    if rows:
+        for task_id, label in db.query(archived_task_labels.c.task_id, Label).join(
+            Label, Label.id == archived_task_labels.c.label_id
+        ).filter(archived_task_labels.c.task_id.in_(labels)).order_by(Label.name):
+            labels[task_id].append(label)
+    return [
+        TaskWithDetails(**row._mapping, assignee=assignees.get(row.assignee_id), labels=labels[row.id], comments=[])
+        for row in rows
+    ]
+
+
 @router.get("/", response_model=List[TaskWithDetails])
 async def read_tasks(
     skip: int = 0,
     limit: int = 100,
     project_id: Optional[int] = None,
     assignee_id: Optional[int] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    include_archived: bool = False,
+    filters: TaskFilters = Depends(),
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
 ):
+    task_ids = None
+    if project_id and filters.labels is not None:
+        # Ids from the project's label index, unless so many tasks match that the SQL form is cheaper.
+        task_ids = await run_in_threadpool(
+            read_label_index, project_id,
+            lambda index: index.matching(filters.labels, settings.label_filter_max_ids)
+        )
     try:
-        query = db.query(Task)
+        query = db.query(Task).filter(scope.task_filter(), *filters.conditions(task_ids=task_ids))
         
         if project_id:
             query = query.filter(Task.project_id == project_id)
@@ -34,46 +125,18 @@ async def read_tasks(
         if assignee_id:
             query = query.filter(Task.assignee_id == assignee_id)
         
-        # For admin users, show all tasks
-        if current_user.role == UserRole.ADMIN:
-            pass  # No filtering needed
-        elif current_user.role == UserRole.DEVELOPER:
-            query = query.filter(
-                or_(
-                    Task.assignee_id == current_user.id,
-                    Task.project.has(Project.members.any(User.id == current_user.id))
-                )
-            )
-        elif current_user.role == UserRole.PROJECT_MANAGER:
-            query = query.join(Project).filter(
-                Project.manager_id == current_user.id
-            )
+        query = query.options(*TASK_LIST).order_by(*filters.order_by())
+        if include_archived:
+            # Both tiers are merged in sort order before paging.
+            tasks = query.limit(skip + limit).all()
+        else:
+            tasks = query.offset(skip).limit(limit).all()
         
-        tasks = query.offset(skip).limit(limit).all()
+        result = [task_list_item(task) for task in tasks]
         
-        result = []
-        from app.models.task import TaskStatus
-        for task in tasks:
-            is_overdue = bool(task.due_date and 
-                             task.due_date < datetime.now(timezone.utc) and 
-                             task.status != TaskStatus.DONE)
-            
-            task_data = TaskWithDetails(
-                id=task.id,
-                title=task.title,
-                description=task.description,
-                status=task.status,
-                priority=task.priority,
-                project_id=task.project_id,
-                assignee_id=task.assignee_id,
-                due_date=task.due_date,
-                created_at=task.created_at,
-                updated_at=task.updated_at,
-                is_overdue=is_overdue,
-                assignee=task.assignee,
-                comments=[]
-            )
-            result.append(task_data)
+        if include_archived:
+            archived = read_archived_tasks(db, scope, filters, project_id, assignee_id, skip + limit)
+            result = filters.sort_rows(result + archived)[skip:skip + limit]
         
         return result
     except Exception as e:
@@ -83,23 +146,38 @@ async def read_tasks(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/batch", response_model=Batch[TaskWithDetails])
+async def read_tasks_batch(
+    ids: List[int] = Depends(parse_ids),
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    tasks = db.query(Task).options(*TASK_LIST).filter(Task.id.in_(ids), scope.task_filter()).all()
+    return collect(db, Task.id, ids, tasks, task_list_item, scoped=not scope.is_unrestricted)
+
+
 @router.post("/", response_model=TaskSchema)
 async def create_task(
     task_data: TaskCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    scope: AccessScope = Depends(get_access_scope)
 ):
     project = db.query(Project).filter(Project.id == task_data.project_id).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    if (current_user.role == UserRole.DEVELOPER and 
-        current_user not in project.members):
-        raise HTTPException(status_code=403, detail="Access denied")
+    scope.require_project(project.id)
+    if project.archived_at is not None:
+        raise HTTPException(status_code=409, detail="Project is archived; restore it first")
+    
+    if task_data.parent_id is not None:
+        _require_parent(db, scope, project.id, task_data.parent_id)
     
     db_task = Task(**task_data.model_dump())
     
     db.add(db_task)
+    db.flush()
+    enqueue_events(db, db_task.project_id, [("task.created", _event_data(db_task))])
     db.commit()
     db.refresh(db_task)
     return db_task
@@ -108,25 +186,45 @@ async def create_task(
 @router.get("/{task_id}", response_model=TaskWithDetails)
 async def read_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
 ):
-    db_task = db.query(Task).filter(Task.id == task_id).first()
+    db_task = db.query(Task).options(*TASK_DETAILS).filter(Task.id == task_id).first()
     if db_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    if (current_user.role == UserRole.DEVELOPER and 
-        db_task.assignee_id != current_user.id and
-        current_user not in db_task.project.members):
-        raise HTTPException(status_code=403, detail="Access denied")
+    scope.require_task(db_task)
     
-    is_overdue = (db_task.due_date and 
-                 db_task.due_date < datetime.now(timezone.utc) and 
-                 db_task.status.value != "done")
+    return TaskWithDetails.model_validate(db_task)
+
+
+@router.get("/{task_id}/subtasks", response_model=Subtree)
+async def read_subtasks(
+    task_id: int,
+    max_depth: Optional[int] = Query(None, ge=1),
+    skip: int = 0,
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    db_task = db.query(Task).filter(Task.id == task_id).first()
+    if db_task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
     
-    return TaskWithDetails(
-        **db_task.__dict__,
-        is_overdue=is_overdue
+    scope.require_task(db_task)
+    
+    # One lookup at any depth: the closure table holds every ancestor and descendant pair.
+    query = db.query(Task, TaskClosure.depth).join(TaskClosure, TaskClosure.descendant_id == Task.id).filter(
+        TaskClosure.ancestor_id == task_id
+    )
+    if max_depth is not None:
+        query = query.filter(TaskClosure.depth <= max_depth)
+    rows = query.options(raiseload("*")).order_by(TaskClosure.depth, Task.id).offset(skip).limit(limit).all()
+    return Subtree(
+        task_id=task_id,
+        subtask_count=db_task.subtask_count,
+        completed_subtask_count=db_task.completed_subtask_count,
+        tasks=[Subtask(**TaskSchema.model_validate(task).model_dump(), depth=depth) for task, depth in rows]
     )
 
 
@@ -135,20 +233,42 @@ async def update_task(
     task_id: int,
     task_data: TaskUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_active_user),
+    scope: AccessScope = Depends(get_access_scope)
 ):
     db_task = db.query(Task).filter(Task.id == task_id).first()
     if db_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
+    scope.require_task(db_task)
     if (current_user.role == UserRole.DEVELOPER and 
         db_task.assignee_id != current_user.id):
         raise HTTPException(status_code=403, detail="Access denied")
     
     update_data = task_data.model_dump(exclude_unset=True)
+    parent_id = update_data.get("parent_id", db_task.parent_id)
+    if parent_id != db_task.parent_id and parent_id is not None:
+        _require_parent(db, scope, db_task.project_id, parent_id)
+        # Serializes moves per project, so two concurrent ones cannot close a
+        # cycle between them; the task is reloaded under the lock.
+        db.query(Project.id).filter(Project.id == db_task.project_id).with_for_update().first()
+        db.refresh(db_task)
+        if in_subtree(db, db_task.id, parent_id):
+            raise HTTPException(
+                status_code=409, detail=f"Task {parent_id} is task {db_task.id} or one of its subtasks"
+            )
+    previous_status, previous_assignee_id = db_task.status, db_task.assignee_id
     for field, value in update_data.items():
         setattr(db_task, field, value)
     
+    db.flush()
+    data = _event_data(db_task)
+    events = [("task.updated", data)]
+    if db_task.assignee_id != previous_assignee_id:
+        events.append(("task.assigned", {**data, "previous_assignee_id": previous_assignee_id}))
+    if db_task.status != previous_status:
+        events.append(("task.status_changed", {**data, "previous_status": previous_status.value}))
+    enqueue_events(db, db_task.project_id, events)
     db.commit()
     db.refresh(db_task)
     return db_task
@@ -158,15 +278,22 @@ async def update_task(
 async def delete_task(
     task_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_active_user),
+    scope: AccessScope = Depends(get_access_scope)
 ):
-    db_task = db.query(Task).filter(Task.id == task_id).first()
+    db_task = db.query(Task).options(
+        selectinload(Task.comments), selectinload(Task.attachments), selectinload(Task.labels)
+    ).filter(Task.id == task_id).first()
     if db_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
     if (current_user.role == UserRole.DEVELOPER):
         raise HTTPException(status_code=403, detail="Access denied")
+    scope.require_task(db_task)
     
+    enqueue_events(db, db_task.project_id, [
+        ("task.deleted", {"id": db_task.id, "project_id": db_task.project_id, "title": db_task.title})
+    ])
     db.delete(db_task)
     db.commit()
     return {"message": "Task deleted successfully"}
@@ -177,16 +304,14 @@ async def create_task_comment(
     task_id: int,
     comment_data: TaskCommentCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_active_user),
+    scope: AccessScope = Depends(get_access_scope)
 ):
     db_task = db.query(Task).filter(Task.id == task_id).first()
     if db_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    if (current_user.role == UserRole.DEVELOPER and 
-        db_task.assignee_id != current_user.id and
-        current_user not in db_task.project.members):
-        raise HTTPException(status_code=403, detail="Access denied")
+    scope.require_task(db_task)
     
     db_comment = TaskComment(
         content=comment_data.content,
@@ -195,6 +320,10 @@ async def create_task_comment(
     )
     
     db.add(db_comment)
+    db.flush()
+    enqueue_events(db, db_task.project_id, [("task.commented", {
+        "task_id": task_id,
+        "comment": {"id": db_comment.id, "content": db_comment.content, "author_id": db_comment.author_id},
+    })])
     db.commit()
-    db.refresh(db_comment)
-    return db_comment
\ No newline at end of file
+    return db.query(TaskComment).options(*COMMENT_DETAILS).filter(TaskComment.id == db_comment.id).one()
\ No newline at end of file
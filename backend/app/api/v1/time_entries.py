@@ -0,0 +1,208 @@
+"""Time entries on tasks, and time reports.
+
+Reports read the rollup tables only (``services.time_rollups``): per task
+for one project, and per project, user and week for any combination of
+those, so they cost the same at ten thousand entries or ten million.
+"""
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ...core.database import get_db, get_read_db
+from ...models.project import Project
+from ...models.task import Task
+from ...models.time_entry import ProjectTimeRollup, TaskTimeRollup, TimeEntry, week_start
+from ...models.archive import archived_task_time_rollups
+from ...models.user import User, UserRole
+from ...schemas.time_entry import (
+    TaskTime, TaskTimeReport, TimeEntry as TimeEntrySchema, TimeEntryCreate, TimeEntryUpdate, TimeReport,
+    TimeReportRow
+)
+from ...api.dependencies import get_current_active_user
+from ...api.scope import AccessScope, get_access_scope
+
+router = APIRouter()
+task_router = APIRouter()
+report_router = APIRouter()
+
+# group_by value -> rollup column.
+REPORT_GROUPS = {
+    "project": ProjectTimeRollup.project_id,
+    "user": ProjectTimeRollup.user_id,
+    "week": ProjectTimeRollup.week_start,
+}
+
+
+def _hours(minutes: int) -> float:
+    return round(minutes / 60, 2)
+
+
+def _task(db: Session, task_id: int, scope: AccessScope) -> Task:
+    task = db.query(Task).filter(Task.id == task_id).first()
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    scope.require_task(task)
+    return task
+
+
+def _entry(db: Session, entry_id: int, current_user: User, scope: AccessScope) -> TimeEntry:
+    entry = db.query(TimeEntry).filter(TimeEntry.id == entry_id).first()
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Time entry not found")
+    # Developers change only their own entries; managers any in their projects.
+    if entry.user_id != current_user.id:
+        if current_user.role == UserRole.DEVELOPER:
+            raise HTTPException(status_code=403, detail="Access denied")
+        scope.require_project(entry.project_id)
+    return entry
+
+
+@task_router.post("/{task_id}/time-entries", response_model=TimeEntrySchema)
+async def create_time_entry(
+    task_id: int,
+    entry_data: TimeEntryCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    task = _task(db, task_id, scope)
+    if db.query(Project.archived_at).filter(Project.id == task.project_id).scalar() is not None:
+        raise HTTPException(status_code=409, detail="Project is archived; restore it first")
+    
+    entry = TimeEntry(
+        task_id=task.id,
+        project_id=task.project_id,
+        user_id=current_user.id,
+        minutes=entry_data.minutes,
+        spent_on=entry_data.spent_on or datetime.now(timezone.utc).date(),
+        note=entry_data.note
+    )
+    db.add(entry)
+    db.commit()
+    db.refresh(entry)
+    return entry
+
+
+@task_router.get("/{task_id}/time-entries", response_model=List[TimeEntrySchema])
+async def read_time_entries(
+    task_id: int,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    _task(db, task_id, scope)
+    return db.query(TimeEntry).filter(TimeEntry.task_id == task_id).order_by(
+        TimeEntry.spent_on.desc(), TimeEntry.id.desc()
+    ).offset(skip).limit(limit).all()
+
+
+@router.put("/{entry_id}", response_model=TimeEntrySchema)
+async def update_time_entry(
+    entry_id: int,
+    entry_data: TimeEntryUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    entry = _entry(db, entry_id, current_user, scope)
+    for field, value in entry_data.model_dump(exclude_unset=True).items():
+        if value is not None or field == "note":
+            setattr(entry, field, value)
+    db.commit()
+    db.refresh(entry)
+    return entry
+
+
+@router.delete("/{entry_id}")
+async def delete_time_entry(
+    entry_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    entry = _entry(db, entry_id, current_user, scope)
+    db.delete(entry)
+    db.commit()
+    return {"message": "Time entry deleted successfully"}
+
+
+@report_router.get("/", response_model=TimeReport)
+async def read_time_report(
+    group_by: List[str] = Query(["week"], description="Any of: project, user, week"),
+    project_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+    week_from: Optional[date] = None,
+    week_to: Optional[date] = None,
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    """Minutes per project, user and week, in any combination, over accessible projects."""
+    unknown = [group for group in group_by if group not in REPORT_GROUPS]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Cannot group by '{unknown[0]}'; use any of: {', '.join(REPORT_GROUPS)}"
+        )
+    group_by = list(dict.fromkeys(group_by))
+    columns = [REPORT_GROUPS[group] for group in group_by]
+    
+    minutes, entries = func.sum(ProjectTimeRollup.minutes), func.sum(ProjectTimeRollup.entry_count)
+    query = select(*columns, minutes, entries).where(scope.project_filter(ProjectTimeRollup.project_id))
+    if project_id is not None:
+        scope.require_project(project_id)
+        query = query.where(ProjectTimeRollup.project_id == project_id)
+    if user_id is not None:
+        query = query.where(ProjectTimeRollup.user_id == user_id)
+    if week_from is not None:
+        query = query.where(ProjectTimeRollup.week_start >= week_start(week_from))
+    if week_to is not None:
+        query = query.where(ProjectTimeRollup.week_start <= week_to)
+    query = query.group_by(*columns).having(entries > 0).order_by(*columns)
+    
+    rows = []
+    for row in db.execute(query):
+        *keys, row_minutes, row_entries = row
+        rows.append(TimeReportRow(
+            **{column.key: key for column, key in zip(columns, keys)},
+            minutes=row_minutes, entry_count=row_entries, hours=_hours(row_minutes)
+        ))
+    return TimeReport(
+        group_by=group_by,
+        total_minutes=sum(row.minutes for row in rows),
+        total_entries=sum(row.entry_count for row in rows),
+        rows=rows
+    )
+
+
+@report_router.get("/tasks", response_model=TaskTimeReport)
+async def read_task_time_report(
+    project_id: int,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
+):
+    """A project's tasks with time logged on them, most minutes first."""
+    project = db.query(Project.id, Project.archived_at).filter(Project.id == project_id).first()
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    scope.require_project(project_id)
+    # An archived project's task rollups moved to the archive with its tasks.
+    rollups = archived_task_time_rollups if project.archived_at is not None else TaskTimeRollup.__table__
+    logged = (rollups.c.project_id == project_id, rollups.c.entry_count > 0)
+    tasks = db.execute(
+        select(rollups.c.task_id, rollups.c.minutes, rollups.c.entry_count).where(*logged)
+        .order_by(rollups.c.minutes.desc(), rollups.c.task_id).offset(skip).limit(limit)
+    ).all()
+    total = db.execute(select(func.coalesce(func.sum(rollups.c.minutes), 0)).where(*logged)).scalar()
+    return TaskTimeReport(
+        project_id=project_id,
+        total_minutes=total,
+        tasks=[
+            TaskTime(task_id=task_id, minutes=minutes, entry_count=count, hours=_hours(minutes))
+            for task_id, minutes, count in tasks
+        ]
+    )
\ No newline at end of file
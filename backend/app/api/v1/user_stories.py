@@ -1,35 +1,42 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
-from ...core.database import get_db
+from ...core.database import get_read_db
 from ...models.user_story import UserStory
 from ...schemas.user_story import UserStoriesResponse, UserStory as UserStorySchema
-from ...api.dependencies import get_current_active_user
+from ...api.scope import AccessScope, get_access_scope
 
 router = APIRouter()
 
 
+def load_project_stories(db: Session, project_id: int, skip: int, limit: int) -> UserStoriesResponse:
+    user_stories = db.query(UserStory).filter(UserStory.project_id == project_id).order_by(
+        UserStory.id
+    ).offset(skip).limit(limit).all()
+    total = db.query(UserStory).filter(UserStory.project_id == project_id).count()
+    return UserStoriesResponse(user_stories=user_stories, total=total)
+
+
 @router.get("/project/{project_id}", response_model=UserStoriesResponse)
 def get_user_stories_by_project(
     project_id: int,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
 ):
-    user_stories = db.query(UserStory).filter(UserStory.project_id == project_id).offset(skip).limit(limit).all()
-    total = db.query(UserStory).filter(UserStory.project_id == project_id).count()
-    
-    return UserStoriesResponse(user_stories=user_stories, total=total)
+    scope.require_project(project_id)
+    return load_project_stories(db, project_id, skip, limit)
 
 
 @router.get("/{user_story_id}", response_model=UserStorySchema)
 def get_user_story(
     user_story_id: int,
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    scope: AccessScope = Depends(get_access_scope)
 ):
     user_story = db.query(UserStory).filter(UserStory.id == user_story_id).first()
     if user_story is None:
         raise HTTPException(status_code=404, detail="User story not found")
+    scope.require_project(user_story.project_id)
     return user_story
\ No newline at end of file
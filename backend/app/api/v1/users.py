@@ -1,10 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
-from ...core.database import get_db
+from datetime import datetime, timezone
+from ...core.database import get_db, get_read_db
 from ...core.security import get_password_hash
 from ...models.user import User
+from ...models.project import Project
 from ...schemas.user import User as UserSchema, UserCreate, UserUpdate, UserWithProjects
+from ...schemas.batch import Batch
+from ...schemas.loaders import USER_WITH_PROJECTS
+from ...api.batch import collect, parse_ids
 from ...api.dependencies import get_current_active_user, require_admin
 
 router = APIRouter()
@@ -19,20 +24,32 @@ async def read_current_user(current_user: User = Depends(get_current_active_user
 async def read_users(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_admin())
 ):
-    users = db.query(User).offset(skip).limit(limit).all()
+    users = db.query(User).order_by(User.id).offset(skip).limit(limit).all()
     return users
 
 
+@router.get("/batch", response_model=Batch[UserSchema])
+async def read_users_batch(
+    ids: List[int] = Depends(parse_ids),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    # Like a single user, any active user may look users up by id.
+    users = db.query(User).filter(User.id.in_(ids)).all()
+    return collect(db, User.id, ids, users, UserSchema.model_validate, scoped=False)
+
+
 @router.post("/", response_model=UserSchema)
 async def create_user(
     user_data: UserCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin())
 ):
-    db_user = db.query(User).filter(
+    # Deleted users keep their username and email until they are purged.
+    db_user = db.query(User).execution_options(include_deleted=True).filter(
         (User.username == user_data.username) | (User.email == user_data.email)
     ).first()
     
@@ -61,10 +78,10 @@ async def create_user(
 @router.get("/{user_id}", response_model=UserWithProjects)
 async def read_user(
     user_id: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    db_user = db.query(User).filter(User.id == user_id).first()
+    db_user = db.query(User).options(*USER_WITH_PROJECTS).filter(User.id == user_id).first()
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return db_user
@@ -100,6 +117,14 @@ async def delete_user(
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     
-    db.delete(db_user)
+    if db.query(Project.id).filter(Project.manager_id == user_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User still manages projects; reassign or delete them first"
+        )
+    
+    # Hidden and locked out from now on; references are cleared in the background.
+    db_user.deleted_at = datetime.now(timezone.utc)
+    db_user.is_active = False
     db.commit()
     return {"message": "User deleted successfully"}
\ No newline at end of file
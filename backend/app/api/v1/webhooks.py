@@ -0,0 +1,94 @@
+import secrets
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from typing import List
+from ...core.database import get_db, get_read_db
+from ...models.user import User
+from ...models.webhook import WebhookDelivery, WebhookSubscription
+from ...schemas.webhook import DeadLetter, Webhook, WebhookCreate, WebhookWithSecret
+from ...api.dependencies import require_manager_or_admin
+from ...services.webhooks import UnsafeWebhookTarget, check_target, requeue_dead_letters
+from .projects import managed_project
+
+router = APIRouter()
+
+
+def _subscription(db: Session, webhook_id: int, current_user: User) -> WebhookSubscription:
+    subscription = db.query(WebhookSubscription).filter(WebhookSubscription.id == webhook_id).first()
+    if subscription is None:
+        raise HTTPException(status_code=404, detail="Webhook not found")
+    managed_project(db, subscription.project_id, current_user)
+    return subscription
+
+
+@router.get("/", response_model=List[Webhook])
+async def read_webhooks(
+    project_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_manager_or_admin())
+):
+    managed_project(db, project_id, current_user)
+    return db.query(WebhookSubscription).filter(
+        WebhookSubscription.project_id == project_id
+    ).order_by(WebhookSubscription.id).all()
+
+
+@router.post("/", response_model=WebhookWithSecret)
+async def create_webhook(
+    webhook_data: WebhookCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_manager_or_admin())
+):
+    managed_project(db, webhook_data.project_id, current_user)
+    try:
+        await run_in_threadpool(check_target, webhook_data.url)
+    except UnsafeWebhookTarget as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    subscription = WebhookSubscription(
+        project_id=webhook_data.project_id,
+        url=webhook_data.url,
+        secret=webhook_data.secret or secrets.token_hex(32),
+        event_types=",".join(webhook_data.event_types),
+        created_by=current_user.id
+    )
+    db.add(subscription)
+    db.commit()
+    db.refresh(subscription)
+    return subscription
+
+
+@router.delete("/{webhook_id}")
+async def delete_webhook(
+    webhook_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_manager_or_admin())
+):
+    subscription = _subscription(db, webhook_id, current_user)
+    # Undelivered events go with it (ON DELETE CASCADE).
+    db.delete(subscription)
+    db.commit()
+    return {"message": "Webhook deleted successfully"}
+
+
+@router.get("/{webhook_id}/dead-letters", response_model=List[DeadLetter])
+async def read_dead_letters(
+    webhook_id: int,
+    limit: int = 100,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_manager_or_admin())
+):
+    _subscription(db, webhook_id, current_user)
+    return db.query(WebhookDelivery).filter(
+        WebhookDelivery.subscription_id == webhook_id, WebhookDelivery.dead_at.is_not(None)
+    ).order_by(WebhookDelivery.id.desc()).limit(limit).all()
+
+
+@router.post("/{webhook_id}/dead-letters/retry")
+async def retry_dead_letters(
+    webhook_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_manager_or_admin())
+):
+    _subscription(db, webhook_id, current_user)
+    return {"requeued": requeue_dead_letters(db, webhook_id)}
\ No newline at end of file
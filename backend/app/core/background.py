@@ -0,0 +1,75 @@
+"""Periodic maintenance jobs run in daemon threads for the app's lifetime."""
+import logging
+import threading
+from typing import Callable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..services.archive import archive_due_projects
+from ..services.attachments import sweep_attachments
+from ..services.change_log import prune_change_log
+from ..services.project_counters import reconcile_project_counters
+from ..services.purge import purge_deleted
+from ..services.webhooks import WebhookDispatcher
+from .config import settings
+from .database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """Run ``func`` every ``interval`` seconds until stopped; failures are logged and retried."""
+
+    def __init__(self, name: str, func: Callable[[], object], interval: float):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None or self.interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.func()
+            except Exception:
+                logger.exception("Background job %s failed", self.name)
+
+
+def _with_session(func: Callable[[Session], object]) -> Callable[[], None]:
+    def run() -> None:
+        db = SessionLocal()
+        try:
+            func(db)
+        finally:
+            db.close()
+    return run
+
+
+def default_jobs() -> List[PeriodicJob]:
+    return [
+        PeriodicJob(
+            "reconcile-project-counters",
+            _with_session(reconcile_project_counters),
+            settings.project_counter_reconcile_interval_seconds,
+        ),
+        PeriodicJob("purge-deleted", _with_session(purge_deleted), settings.purge_interval_seconds),
+        PeriodicJob("archive-projects", _with_session(archive_due_projects), settings.archive_interval_seconds),
+        PeriodicJob("prune-change-log", _with_session(prune_change_log), settings.sync_log_prune_interval_seconds),
+        PeriodicJob(
+            "sweep-attachments", _with_session(sweep_attachments), settings.attachment_sweep_interval_seconds
+        ),
+        PeriodicJob("deliver-webhooks", WebhookDispatcher().run_once, settings.webhook_poll_interval_seconds),
+    ]
@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from typing import Optional, List
+from typing import Optional, List, Dict
 import json
 
 
@@ -17,6 +17,112 @@ class Settings(BaseSettings):
     
     groq_api_key: Optional[str] = None
     
+    # Connection pool (statement timeout of 0 disables it)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 30_000
+    db_pool_warmup_connections: int = 5
+    ready_max_pool_utilization: float = 0.9
+    startup_warmup: bool = True
+    
+    # SQLite profile (file databases only): WAL, one writer, pooled readers
+    sqlite_tuning: bool = True
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 65536
+    sqlite_mmap_size_bytes: int = 268_435_456
+    sqlite_read_pool_size: int = 8
+    sqlite_write_timeout_seconds: float = 30.0
+    
+    # Read replicas (GET handlers using get_read_db are routed to these)
+    database_replica_urls: List[str] = []
+    replica_selection: str = "round_robin"
+    replica_health_check_interval_seconds: float = 10.0
+    read_your_writes_window_seconds: float = 5.0
+    
+    # Per-user accessible project sets are cached this long in each worker
+    scope_cache_ttl_seconds: float = 30.0
+    
+    # Denormalized project task counters are recounted this often (0 disables)
+    project_counter_reconcile_interval_seconds: float = 300.0
+    
+    # Soft-deleted projects and users are purged this often (0 disables), in batches
+    purge_interval_seconds: float = 60.0
+    purge_batch_size: int = 1000
+    
+    # Completed/cancelled projects untouched this long move to the archive tables
+    archive_after_days: int = 90
+    archive_interval_seconds: float = 3600.0
+    archive_batch_size: int = 1000
+    
+    # Incremental sync: the change log is pruned past the retention window; entries
+    # younger than the settle window are returned but not yet covered by the token
+    sync_log_retention_days: int = 30
+    sync_log_prune_interval_seconds: float = 3600.0
+    sync_settle_seconds: float = 2.0
+    
+    # Outbound webhooks: the outbox is polled this often (0 disables delivery); each
+    # endpoint gets batches of events, retried with exponential backoff, then dead-lettered
+    webhook_poll_interval_seconds: float = 1.0
+    webhook_workers: int = 8
+    webhook_batch_size: int = 100
+    webhook_claim_size: int = 1000
+    webhook_timeout_seconds: float = 10.0
+    webhook_max_attempts: int = 8
+    webhook_backoff_base_seconds: float = 2.0
+    webhook_backoff_max_seconds: float = 3600.0
+    # Targets must resolve to public addresses; this also lets them reach loopback
+    webhook_allow_localhost: bool = False
+    
+    # Task dependency graphs are cached per project in each worker, this long and this many
+    task_graph_cache_ttl_seconds: float = 300.0
+    task_graph_cache_size: int = 32
+    
+    # Label bitmap indexes are cached per project in each worker, this long and this many;
+    # label filters matching more tasks than label_filter_max_ids are left to the database
+    label_index_cache_ttl_seconds: float = 300.0
+    label_index_cache_size: int = 32
+    label_filter_max_ids: int = 1000
+    
+    # Attachments: stored once per content digest under attachments_dir, written in
+    # fixed-size chunks; unreferenced files older than the grace period are swept
+    attachments_dir: str = "./attachments"
+    attachment_chunk_bytes: int = 1_048_576
+    attachment_max_bytes: int = 5_368_709_120
+    attachment_sweep_interval_seconds: float = 3600.0
+    attachment_sweep_grace_seconds: float = 3600.0
+    
+    # Multi-get endpoints (GET .../batch?ids=1,2,3) accept at most this many ids
+    batch_max_ids: int = 100
+    
+    # Query instrumentation
+    sql_debug_headers: bool = False
+    n_plus_one_threshold: int = 5
+    
+    # Metrics
+    metrics_multiproc_dir: Optional[str] = None
+    metrics_flush_interval_seconds: float = 5.0
+    
+    # Slow query log
+    slow_query_log_enabled: bool = True
+    slow_query_threshold_ms: float = 200.0
+    slow_query_explain_sample_rate: float = 1.0
+    slow_query_explain_per_minute: int = 6
+    slow_query_store_size: int = 500
+    slow_query_log_file: Optional[str] = None
+    slow_query_log_max_bytes: int = 10_000_000
+    slow_query_log_backups: int = 3
+    
+    # Request profiling (the middleware is not installed unless enabled)
+    profiling_enabled: bool = False
+    profiling_interval_ms: float = 5.0
+    profiling_sample_rate: float = 0.0
+    profiling_route_sample_rates: Dict[str, float] = {}
+    profiling_max_concurrent: int = 4
+    profiling_store_size: int = 50
+    
     cors_origins: List[str] = ["http://localhost:3000", "http://localhost:8000"]
     
     def __init__(self, **kwargs):
@@ -1,16 +1,216 @@
-from sqlalchemy import create_engine
+import logging
+import time
+from typing import Dict, List, Optional
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool, SingletonThreadPool, StaticPool
 from .config import settings
+from .metrics import DB_POOL_WAIT, register_engine_pool
+from .query_counter import instrument_engine
+from .replicas import ReplicaRouter
+from .security import verify_token
+from . import slow_query, sqlite
 
-engine = create_engine(settings.database_url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+logger = logging.getLogger(__name__)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - start)
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (url in ("sqlite://", "sqlite:///") or ":memory:" in url)
+
+
+def _pool_options(url: str) -> dict:
+    options = {
+        "poolclass": TimedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if url.startswith("postgresql") and settings.db_statement_timeout_ms:
+        options["connect_args"] = {"options": f"-c statement_timeout={settings.db_statement_timeout_ms}"}
+    return options
+
+
+def _sqlite_statement_timeout(engine: Engine) -> None:
+    """Interrupt SQLite statements running longer than ``db_statement_timeout_ms``."""
+    timeout = settings.db_statement_timeout_ms / 1000
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        info = connection_record.info
+
+        def check_deadline():
+            deadline = info.get("statement_deadline")
+            return 1 if deadline is not None and time.monotonic() > deadline else 0
+
+        dbapi_connection.set_progress_handler(check_deadline, 10_000)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_deadline(conn, cursor, statement, parameters, context, executemany):
+        conn.info["statement_deadline"] = time.monotonic() + timeout
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def clear_deadline(conn, cursor, statement, parameters, context, executemany):
+        conn.info.pop("statement_deadline", None)
+
+
+_engines: Dict[str, Engine] = {}
+
+
+def _create_engine(url: str, name: str, **kwargs):
+    if not _is_memory_sqlite(url):
+        for option, value in _pool_options(url).items():
+            kwargs.setdefault(option, value)
+    engine = create_engine(url, **kwargs)
+    if url.startswith("sqlite") and settings.db_statement_timeout_ms:
+        _sqlite_statement_timeout(engine)
+    instrument_engine(engine)
+    slow_query.instrument_engine(engine)
+    register_engine_pool(engine, name)
+    _engines[name] = engine
+    return engine
+
+
+if settings.sqlite_tuning and sqlite.is_file_sqlite(settings.database_url):
+    # `engine` is the single writer; reads use a separate pool of connections.
+    engine = _create_engine(settings.database_url, "primary", **sqlite.writer_options())
+    sqlite.configure_engine(engine, writer=True)
+    read_engine = _create_engine(settings.database_url, "primary_read", **sqlite.reader_options())
+    sqlite.configure_engine(read_engine, writer=False)
+    SessionLocal = sessionmaker(
+        class_=sqlite.SQLiteSession, writer=engine, reader=read_engine, autocommit=False, autoflush=False
+    )
+else:
+    engine = read_engine = _create_engine(settings.database_url, "primary")
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+replica_router = ReplicaRouter(
+    read_engine,
+    [_create_engine(url, f"replica{n}") for n, url in enumerate(settings.database_replica_urls)],
+    selection=settings.replica_selection,
+    health_check_interval=settings.replica_health_check_interval_seconds,
+    read_your_writes_window=settings.read_your_writes_window_seconds,
+)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False)
 Base = declarative_base()
 
 
-def get_db():
+class ReadOnlySessionError(RuntimeError):
+    pass
+
+
+@event.listens_for(Session, "before_flush")
+def _reject_read_only_writes(session, flush_context, instances):
+    if session.info.get("read_only") and (session.new or session.dirty or session.deleted):
+        raise ReadOnlySessionError("Attempted to write through a read-only session")
+
+
+@event.listens_for(Session, "after_flush")
+def _note_write(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _stick_writer_to_primary(session):
+    # Reads by this user go to the primary until replicas have caught up.
+    if not session.info.pop("has_writes", False):
+        return
+    request = session.info.get("request")
+    user = getattr(request.state, "user", None) if request is not None else None
+    if user is not None:
+        replica_router.writes.mark(str(user.id))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_write(session):
+    session.info.pop("has_writes", None)
+
+
+def _token_subject(request: Request) -> Optional[str]:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer":
+        return None
+    return verify_token(token)
+
+
+def get_db(request: Request):
     db = SessionLocal()
+    db.info["request"] = request
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request):
+    """Read-only session for GET handlers, served by a replica when one is available."""
+    db = ReadSessionLocal(bind=replica_router.choose(_token_subject(request)))
+    db.info["read_only"] = True
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def sibling_read_session(db: Session) -> Optional[Session]:
+    """Another read-only session on ``db``'s engine, so independent queries can run side by side.
+
+    ``None`` when the engine has a single shared connection (in-memory SQLite)
+    and queries have to take turns on ``db`` instead.
+    """
+    bind = db.get_bind()
+    if isinstance(bind.pool, (StaticPool, SingletonThreadPool)):
+        return None
+    session = ReadSessionLocal(bind=bind)
+    session.info["read_only"] = True
+    return session
+
+
+def pool_status() -> List[dict]:
+    """Checked-out connections against capacity for every engine's pool."""
+    status = []
+    for name, engine in _engines.items():
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            continue
+        overflow = pool._max_overflow
+        capacity = None if overflow < 0 else pool.size() + overflow
+        checked_out = pool.checkedout()
+        status.append({
+            "name": name,
+            "checked_out": checked_out,
+            "capacity": capacity,
+            "utilization": round(checked_out / capacity, 3) if capacity else 0.0,
+        })
+    return status
+
+
+def warm_up_pools() -> None:
+    """Open up to ``db_pool_warmup_connections`` connections per engine ahead of traffic."""
+    for engine in _engines.values():
+        pool = engine.pool
+        count = min(settings.db_pool_warmup_connections, pool.size()) if isinstance(pool, QueuePool) else 1
+        connections = []
+        try:
+            for _ in range(count):
+                connections.append(engine.connect())
+        except Exception as exc:
+            logger.warning("Pool warm-up failed for %s: %s", engine.url.render_as_string(), exc)
+        finally:
+            for connection in connections:
+                connection.close()
\ No newline at end of file
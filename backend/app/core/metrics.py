@@ -0,0 +1,362 @@
+"""Prometheus text-format metrics.
+
+Hot-path updates write to a per-thread shard without taking a lock; shards are
+summed when ``/metrics`` is scraped. With ``metrics_multiproc_dir`` set, every
+worker process also writes periodic snapshots there and a scrape of any worker
+merges the snapshots of all of them.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .config import settings
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            # Taken once per thread, never on the update path.
+            with self._shards_lock:
+                self._shards.append(shard)
+            return shard
+
+    def collect(self) -> Dict[Labels, object]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def collect(self) -> Dict[Labels, float]:
+        totals: Dict[Labels, float] = {}
+        for shard in list(self._shards):
+            for labels, value in shard.copy().items():
+                totals[labels] = totals.get(labels, 0.0) + value
+        return totals
+
+
+class Gauge(Counter):
+    """Up/down gauge, or a callback read at scrape time when ``function`` is given."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 function: Optional[Callable[[], Dict[Labels, float]]] = None):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def collect(self) -> Dict[Labels, float]:
+        if self.function is not None:
+            return self.function()
+        return super().collect()
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shard()
+        series = shard.get(labels)
+        if series is None:
+            # One slot per bucket plus +Inf, then sum and count.
+            series = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def collect(self) -> Dict[Labels, List[float]]:
+        totals: Dict[Labels, List[float]] = {}
+        for shard in list(self._shards):
+            for labels, series in shard.copy().items():
+                total = totals.setdefault(labels, [0] * len(series))
+                for index, value in enumerate(list(series)):
+                    total[index] += value
+        return totals
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: Dict[str, _Metric] = {}
+        self._next_flush = 0.0
+
+    def register(self, metric: _Metric) -> _Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+              function: Optional[Callable[[], Dict[Labels, float]]] = None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, function))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def derived_gauge(self, name: str, documentation: str, labelnames: Sequence[str],
+                      function: Callable[[Dict[str, Dict[Labels, object]]], Dict[Labels, float]]) -> Gauge:
+        """Gauge computed at render time from the merged samples of all workers."""
+        gauge = Gauge(name, documentation, labelnames)
+        gauge.derive = function
+        return self.register(gauge)
+
+    def snapshot(self) -> Dict[str, Dict[Labels, object]]:
+        return {
+            name: metric.collect() for name, metric in self.metrics.items()
+            if getattr(metric, "derive", None) is None
+        }
+
+    # Multi-process support
+
+    def flush_if_due(self) -> None:
+        if not settings.metrics_multiproc_dir or time.monotonic() < self._next_flush:
+            return
+        self._next_flush = time.monotonic() + settings.metrics_flush_interval_seconds
+        self.write_snapshot()
+
+    def write_snapshot(self) -> None:
+        directory = settings.metrics_multiproc_dir
+        os.makedirs(directory, exist_ok=True)
+        payload = {
+            name: [[list(labels), value] for labels, value in samples.items()]
+            for name, samples in self.snapshot().items()
+        }
+        path = os.path.join(directory, f"metrics_{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+    def _merged_snapshot(self) -> Dict[str, Dict[Labels, object]]:
+        merged = self.snapshot()
+        directory = settings.metrics_multiproc_dir
+        if not directory or not os.path.isdir(directory):
+            return merged
+        for filename in os.listdir(directory):
+            if not (filename.startswith("metrics_") and filename.endswith(".json")):
+                continue
+            pid = int(filename[len("metrics_"):-len(".json")])
+            if pid == os.getpid():
+                continue
+            try:
+                with open(os.path.join(directory, filename)) as f:
+                    payload = json.load(f)
+            except (OSError, ValueError):
+                continue
+            alive = _pid_alive(pid)
+            for name, samples in payload.items():
+                metric = self.metrics.get(name)
+                # Gauges of exited workers no longer describe anything live.
+                if metric is None or (metric.type == "gauge" and not alive):
+                    continue
+                target = merged.setdefault(name, {})
+                for labels, value in samples:
+                    key = tuple(labels)
+                    if isinstance(value, list):
+                        total = target.setdefault(key, [0] * len(value))
+                        for index, item in enumerate(value):
+                            total[index] += item
+                    else:
+                        target[key] = target.get(key, 0.0) + value
+        return merged
+
+    def render(self) -> str:
+        if settings.metrics_multiproc_dir:
+            self.write_snapshot()
+        snapshot = self._merged_snapshot()
+        for name, metric in self.metrics.items():
+            if getattr(metric, "derive", None) is not None:
+                snapshot[name] = metric.derive(snapshot)
+        lines: List[str] = []
+        for name, metric in self.metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            for labels, value in sorted(snapshot.get(name, {}).items()):
+                pairs = list(zip(metric.labelnames, labels))
+                if isinstance(metric, Histogram):
+                    cumulative = 0
+                    for bound, count in zip(metric.buckets + (float("inf"),), value):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f"{name}_bucket{_format_labels(pairs + [('le', le)])} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(pairs)} {value[-2]}")
+                    lines.append(f"{name}_count{_format_labels(pairs)} {value[-1]}")
+                else:
+                    lines.append(f"{name}{_format_labels(pairs)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in pairs) + "}"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "HTTP requests by route and status code", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route")
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "HTTP requests currently being handled")
+DB_POOL_WAIT = REGISTRY.histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+PASSWORD_HASH_DURATION = REGISTRY.histogram(
+    "password_hash_duration_seconds", "bcrypt hashing and verification time", ("operation",),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 1.0, 2.0)
+)
+AI_REQUEST_DURATION = REGISTRY.histogram(
+    "ai_request_duration_seconds", "Latency of calls to the AI provider", ("provider", "outcome"),
+    buckets=(0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "cache_requests_total", "Cache lookups by cache and result", ("cache", "result")
+)
+
+
+def _cache_hit_ratio(snapshot) -> Dict[Labels, float]:
+    lookups: Dict[str, List[float]] = {}
+    for (cache, result), value in snapshot.get(CACHE_REQUESTS.name, {}).items():
+        hits_and_total = lookups.setdefault(cache, [0.0, 0.0])
+        hits_and_total[1] += value
+        if result == "hit":
+            hits_and_total[0] += value
+    return {(cache,): hits / total for cache, (hits, total) in lookups.items() if total}
+
+
+REGISTRY.derived_gauge("cache_hit_ratio", "Share of cache lookups served from the cache", ("cache",),
+                       _cache_hit_ratio)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache, "hit" if hit else "miss")
+
+
+_pool_engines: Dict[str, object] = {}
+
+
+def _pool_stat(attribute: str) -> Callable[[], Dict[Labels, float]]:
+    def read() -> Dict[Labels, float]:
+        values = {}
+        for name, engine in _pool_engines.items():
+            stat = getattr(engine.pool, attribute, None)
+            if callable(stat):
+                values[(name,)] = float(stat())
+        return values
+    return read
+
+
+for _attribute, _metric_name, _documentation in (
+    ("size", "db_pool_size", "Configured pool size"),
+    ("checkedout", "db_pool_checked_out", "Connections currently checked out"),
+    ("checkedin", "db_pool_checked_in", "Idle connections in the pool"),
+    ("overflow", "db_pool_overflow", "Connections opened beyond the pool size"),
+):
+    REGISTRY.gauge(_metric_name, _documentation, ("engine",), function=_pool_stat(_attribute))
+
+
+def register_engine_pool(engine, name: str = "primary") -> None:
+    """Expose pool occupancy of ``engine`` as gauges read at scrape time."""
+    _pool_engines[name] = engine
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    # Unmatched paths share one label so scanners cannot explode cardinality.
+    return getattr(route, "path", "unmatched")
+
+
+class MetricsMiddleware:
+    """Records latency, status codes and in-flight requests per route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            HTTP_IN_FLIGHT.dec()
+            method, route = scope["method"], _route_label(scope)
+            HTTP_REQUEST_DURATION.observe(duration, method, route)
+            HTTP_REQUESTS.inc(method, route, str(status_code))
+            REGISTRY.flush_if_due()
@@ -0,0 +1,239 @@
+"""Sampling profiler for individual requests.
+
+Profiling is opt-in: the middleware is only installed when ``profiling_enabled``
+is set, so requests pay nothing otherwise. When installed it profiles
+
+* on demand, when an admin sends ``X-Profile: 1`` (or ``?profile=1``); the
+  collapsed-stack profile is stored and its id returned in ``X-Profile-Id``;
+* in the background, a configurable fraction of requests per route, merged
+  into one profile per route.
+
+Samples are taken from the event loop thread that runs the request, so work
+other requests do concurrently on the loop can show up in the same profile.
+Output uses the collapsed format (``frame;frame;frame count``) understood by
+flamegraph.pl and speedscope.
+"""
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.routing import Match
+
+from .config import settings
+from .security import verify_token
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    path = code.co_filename
+    short_path = os.path.join(os.path.basename(os.path.dirname(path)), os.path.basename(path))
+    return f"{code.co_name} ({short_path}:{code.co_firstlineno})"
+
+
+def collapse_stack(frame) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def format_collapsed(samples: Counter) -> str:
+    return "\n".join(f"{stack} {count}" for stack, count in samples.most_common()) + "\n"
+
+
+class StackSampler:
+    """Samples the stack of one thread at a fixed interval from a helper thread."""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[collapse_stack(frame)] += 1
+
+
+@dataclass
+class Profile:
+    id: str
+    route: str
+    duration_ms: float
+    created_at: str
+    samples: Counter = field(default_factory=Counter)
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "route": self.route,
+            "duration_ms": self.duration_ms,
+            "created_at": self.created_at,
+            "samples": sum(self.samples.values()),
+        }
+
+
+@dataclass
+class RouteProfile:
+    route: str
+    requests: int = 0
+    samples: Counter = field(default_factory=Counter)
+
+    def summary(self) -> dict:
+        return {"route": self.route, "requests": self.requests, "samples": sum(self.samples.values())}
+
+
+class ProfileStore:
+    def __init__(self, max_profiles: int):
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, Profile]" = OrderedDict()
+        self._routes: Dict[str, RouteProfile] = {}
+        self._lock = threading.Lock()
+
+    def add_profile(self, profile: Profile) -> None:
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def add_route_samples(self, route: str, samples: Counter) -> None:
+        with self._lock:
+            aggregate = self._routes.setdefault(route, RouteProfile(route))
+            aggregate.requests += 1
+            aggregate.samples.update(samples)
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        return self._profiles.get(profile_id)
+
+    def profiles(self) -> List[Profile]:
+        with self._lock:
+            return list(reversed(self._profiles.values()))
+
+    def routes(self) -> List[RouteProfile]:
+        with self._lock:
+            return sorted(self._routes.values(), key=lambda aggregate: aggregate.route)
+
+    def route(self, route: str) -> Optional[RouteProfile]:
+        return self._routes.get(route)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+            self._routes.clear()
+
+
+store = ProfileStore(settings.profiling_store_size)
+
+
+def _wants_profile(scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"x-profile" and value in (b"1", b"true"):
+            return True
+    return b"profile=1" in scope.get("query_string", b"").split(b"&")
+
+
+def _bearer_subject(scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer":
+                return verify_token(token)
+    return None
+
+
+def _is_admin(scope) -> bool:
+    # get_current_user stores the resolved user on request.state.
+    user = scope.get("state", {}).get("user")
+    return user is not None and user.role.value == "admin"
+
+
+class ProfilingMiddleware:
+    def __init__(self, app, routes=()):
+        self.app = app
+        self.routes = routes
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def _route_path(self, scope) -> Optional[str]:
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return route.path
+        return None
+
+    def _sample_rate(self, route_path: Optional[str]) -> float:
+        if route_path is not None and route_path in settings.profiling_route_sample_rates:
+            return settings.profiling_route_sample_rates[route_path]
+        return settings.profiling_sample_rate
+
+    def _acquire(self) -> bool:
+        with self._lock:
+            if self._active >= settings.profiling_max_concurrent:
+                return False
+            self._active += 1
+            return True
+
+    def _release(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Only requests carrying a valid token may ask for an on-demand profile;
+        # whether that token belongs to an admin is known once the route ran.
+        on_demand = _wants_profile(scope) and _bearer_subject(scope) is not None
+        route_path = self._route_path(scope)
+        background = not on_demand and random.random() < self._sample_rate(route_path)
+        if not (on_demand or background) or not self._acquire():
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:12]
+        route = f"{scope['method']} {route_path or scope['path']}"
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start" and on_demand and _is_admin(scope):
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        sampler = StackSampler(threading.get_ident(), settings.profiling_interval_ms / 1000).start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            samples = sampler.stop()
+            self._release()
+            if background:
+                store.add_route_samples(route, samples)
+            elif _is_admin(scope):
+                store.add_profile(Profile(
+                    id=profile_id,
+                    route=route,
+                    duration_ms=round((time.perf_counter() - start) * 1000, 2),
+                    created_at=datetime.now(timezone.utc).isoformat(),
+                    samples=samples,
+                ))
@@ -0,0 +1,143 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(
+    r"\(\s*(?:\?|%\(\w+\)s|%s|:\w+|\$\d+)(?:\s*,\s*(?:\?|%\(\w+\)s|%s|:\w+|\$\d+))+\s*\)"
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a SQL statement to its shape so repeated executions compare equal."""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _PLACEHOLDER_LIST.sub("(?...)", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """Statements executed while handling a single request."""
+
+    __slots__ = ("count", "duration", "shapes", "scope")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+        self.scope = scope
+
+    @property
+    def route(self) -> Optional[str]:
+        """``METHOD /route/{template}`` of the request being handled, if any."""
+        if self.scope is None:
+            return None
+        route = self.scope.get("route")
+        return f"{self.scope['method']} {getattr(route, 'path', self.scope['path'])}"
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.shapes[normalize_statement(statement)] += 1
+
+    def repeated_statements(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Statement shapes executed at least ``threshold`` times: suspected N+1 queries."""
+        threshold = threshold or settings.n_plus_one_threshold
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect statements executed in the current context, e.g. a script or test."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context rather than the pooled connection, so a
+    # statement that raises leaves nothing behind.
+    if context is not None and _current_stats.get() is not None:
+        context._query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    start = getattr(context, "_query_start", None)
+    if stats is None or start is None:
+        return
+    stats.record(statement, time.perf_counter() - start)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach the statement counter to ``engine``. Safe to call more than once."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryCounterMiddleware:
+    """Counts statements and DB time per request.
+
+    Totals are logged at DEBUG level and, when ``sql_debug_headers`` is enabled,
+    returned in ``X-Query-Count``/``X-Query-Time-Ms`` response headers. Statement
+    shapes repeated ``n_plus_one_threshold`` times are logged as suspected N+1s.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope)
+        token = _current_stats.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and settings.sql_debug_headers:
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Query-Count", str(stats.count))
+                headers.append("X-Query-Time-Ms", f"{stats.duration * 1000:.2f}")
+                headers.append("X-Query-Repeated", str(len(stats.repeated_statements())))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current_stats.reset(token)
+            self._report(stats)
+
+    @staticmethod
+    def _report(stats: QueryStats) -> None:
+        if not stats.count:
+            return
+        route = stats.route
+        logger.debug("%s: %d queries in %.2fms", route, stats.count, stats.duration * 1000)
+        for shape, n in stats.repeated_statements():
+            logger.warning("Suspected N+1 in %s: statement executed %d times: %s", route, n, shape)
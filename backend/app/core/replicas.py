@@ -0,0 +1,122 @@
+"""Primary/replica routing for read-only sessions.
+
+Reads go to a healthy replica chosen round-robin or by fewest checked-out
+connections. A background thread checks every replica; a replica is also
+marked down as soon as a connection to it fails, and reads fall back to the
+primary while no replica is healthy. After a user writes, their reads stay
+on the primary for ``read_your_writes_window_seconds`` so they never see a
+replica that has not caught up yet. That window is tracked per worker process.
+"""
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class _Replica:
+    def __init__(self, name: str, engine: Engine):
+        self.name = name
+        self.engine = engine
+        self.healthy = True
+        self.last_error: Optional[str] = None
+
+
+class WriteTracker:
+    """Remembers which users wrote recently so their reads stick to the primary."""
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        self._recent: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, key: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._recent[key] = now + self.window_seconds
+            if len(self._recent) > 10_000:
+                self._recent = {k: expiry for k, expiry in self._recent.items() if expiry > now}
+
+    def is_recent(self, key: str) -> bool:
+        expiry = self._recent.get(key)
+        return expiry is not None and expiry > time.monotonic()
+
+
+class ReplicaRouter:
+    def __init__(self, primary: Engine, replicas: List[Engine], selection: str = "round_robin",
+                 health_check_interval: float = 10.0, read_your_writes_window: float = 5.0):
+        if selection not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unknown replica selection strategy: {selection}")
+        self.primary = primary
+        self.replicas = [_Replica(f"replica{n}", replica) for n, replica in enumerate(replicas)]
+        self.selection = selection
+        self.health_check_interval = health_check_interval
+        self.writes = WriteTracker(read_your_writes_window)
+        self._counter = itertools.count()
+        self._health_thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        for replica in self.replicas:
+            event.listen(replica.engine, "handle_error", self._on_error(replica))
+
+    def _on_error(self, replica: _Replica):
+        def handle_error(context):
+            if context.is_disconnect or context.connection is None:
+                self._mark_down(replica, context.original_exception)
+        return handle_error
+
+    def _mark_down(self, replica: _Replica, error: Exception) -> None:
+        if replica.healthy:
+            logger.warning("Replica %s marked unhealthy: %s", replica.name, error)
+        replica.healthy = False
+        replica.last_error = str(error)
+
+    def check_health(self) -> None:
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+            except Exception as exc:
+                self._mark_down(replica, exc)
+            else:
+                if not replica.healthy:
+                    logger.info("Replica %s is healthy again", replica.name)
+                replica.healthy = True
+                replica.last_error = None
+
+    def _ensure_health_checks(self) -> None:
+        if self._health_thread is not None or not self.replicas:
+            return
+        with self._lock:
+            if self._health_thread is None:
+                self._health_thread = threading.Thread(
+                    target=self._health_loop, name="replica-health", daemon=True
+                )
+                self._health_thread.start()
+
+    def _health_loop(self) -> None:
+        while True:
+            time.sleep(self.health_check_interval)
+            self.check_health()
+
+    def choose(self, sticky_key: Optional[str] = None) -> Engine:
+        """Engine for a read-only session, falling back to the primary."""
+        if sticky_key is not None and self.writes.is_recent(sticky_key):
+            return self.primary
+        self._ensure_health_checks()
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return self.primary
+        if self.selection == "least_connections":
+            return min(healthy, key=lambda replica: replica.engine.pool.checkedout()).engine
+        return healthy[next(self._counter) % len(healthy)].engine
+
+    def status(self) -> List[dict]:
+        return [
+            {"name": replica.name, "healthy": replica.healthy, "last_error": replica.last_error}
+            for replica in self.replicas
+        ]
@@ -0,0 +1,288 @@
+"""Slow query log with sampled EXPLAIN capture.
+
+Statements slower than ``slow_query_threshold_ms`` are logged with their
+normalized SQL, parameter shapes (never values), originating route and
+duration. A sampled, rate-limited subset also gets a query plan captured on
+a background thread: ``EXPLAIN (ANALYZE, BUFFERS)`` for Postgres reads, plain
+``EXPLAIN`` for Postgres writes and ``EXPLAIN QUERY PLAN`` on SQLite.
+"""
+import hashlib
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .config import settings
+from .query_counter import current_query_stats, normalize_statement
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SlowQuery:
+    captured_at: str
+    route: Optional[str]
+    fingerprint: str
+    statement: str
+    parameters: Any
+    duration_ms: float
+    dialect: str
+    plan: Optional[str] = None
+
+
+def fingerprint_statement(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def describe_parameters(parameters: Any) -> Any:
+    """Types and sizes of bound parameters, without their values."""
+    def shape(value: Any) -> str:
+        if isinstance(value, (str, bytes)):
+            return f"{type(value).__name__}({len(value)})"
+        if isinstance(value, (list, tuple)):
+            return f"{type(value).__name__}[{len(value)}]"
+        return type(value).__name__
+
+    if isinstance(parameters, dict):
+        return {key: shape(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [shape(value) for value in parameters]
+    return shape(parameters)
+
+
+class SlowQueryStore:
+    """Bounded store of recent slow queries.
+
+    Entries are kept in memory for this worker; with ``slow_query_log_file``
+    set they are also appended as JSON lines to a size-rotated file, which is
+    then what queries read so every worker's captures are visible.
+    """
+
+    def __init__(self, max_entries: int):
+        self._entries: Deque[SlowQuery] = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+        self._file_logger: Optional[logging.Logger] = None
+
+    def _file(self) -> Optional[logging.Logger]:
+        if not settings.slow_query_log_file:
+            return None
+        if self._file_logger is None:
+            file_logger = logging.getLogger(f"{__name__}.store")
+            file_logger.propagate = False
+            file_logger.setLevel(logging.INFO)
+            handler = RotatingFileHandler(
+                settings.slow_query_log_file,
+                maxBytes=settings.slow_query_log_max_bytes,
+                backupCount=settings.slow_query_log_backups,
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            file_logger.addHandler(handler)
+            self._file_logger = file_logger
+        return self._file_logger
+
+    def add(self, entry: SlowQuery) -> None:
+        with self._lock:
+            self._entries.append(entry)
+
+    def persist(self, entry: SlowQuery) -> None:
+        file_logger = self._file()
+        if file_logger is not None:
+            file_logger.info(json.dumps(asdict(entry)))
+
+    def _all(self) -> List[SlowQuery]:
+        if not settings.slow_query_log_file:
+            with self._lock:
+                return list(self._entries)
+        entries = []
+        paths = [f"{settings.slow_query_log_file}.{n}" for n in range(settings.slow_query_log_backups, 0, -1)]
+        for path in paths + [settings.slow_query_log_file]:
+            try:
+                with open(path) as f:
+                    entries.extend(SlowQuery(**json.loads(line)) for line in f if line.strip())
+            except (OSError, ValueError, TypeError):
+                continue
+        return entries
+
+    def query(self, route: Optional[str] = None, fingerprint: Optional[str] = None,
+              limit: int = 50) -> List[SlowQuery]:
+        matches = [
+            entry for entry in reversed(self._all())
+            if (route is None or entry.route == route)
+            and (fingerprint is None or entry.fingerprint == fingerprint)
+        ]
+        return matches[:limit]
+
+    def summary(self) -> List[Dict[str, Any]]:
+        groups: Dict[str, Dict[str, Any]] = {}
+        for entry in self._all():
+            group = groups.setdefault(entry.fingerprint, {
+                "fingerprint": entry.fingerprint,
+                "statement": entry.statement,
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "routes": set(),
+            })
+            group["count"] += 1
+            group["total_ms"] += entry.duration_ms
+            group["max_ms"] = max(group["max_ms"], entry.duration_ms)
+            if entry.route:
+                group["routes"].add(entry.route)
+        result = []
+        for group in groups.values():
+            group["mean_ms"] = round(group["total_ms"] / group["count"], 2)
+            group["total_ms"] = round(group["total_ms"], 2)
+            group["routes"] = sorted(group["routes"])
+            result.append(group)
+        return sorted(result, key=lambda group: group["total_ms"], reverse=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class _RateLimiter:
+    """Token bucket allowing ``per_minute`` plan captures."""
+
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self._tokens = float(per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.per_minute, self._tokens + (now - self._updated) * self.per_minute / 60)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class _ExplainWorker:
+    """Captures plans off the request path on a single daemon thread."""
+
+    def __init__(self):
+        self._queue: "queue.Queue" = queue.Queue(maxsize=100)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, engine: Engine, statement: str, parameters: Any, entry: SlowQuery) -> bool:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="slow-query-explain", daemon=True)
+                self._thread.start()
+        try:
+            self._queue.put_nowait((engine, statement, parameters, entry))
+            return True
+        except queue.Full:
+            return False
+
+    def _run(self) -> None:
+        while True:
+            engine, statement, parameters, entry = self._queue.get()
+            try:
+                entry.plan = explain(engine, statement, parameters)
+            except Exception as exc:
+                entry.plan = f"EXPLAIN failed: {exc}"
+            store.persist(entry)
+            self._queue.task_done()
+
+    def join(self) -> None:
+        self._queue.join()
+
+
+def _is_read(statement: str) -> bool:
+    return statement.lstrip().upper().startswith(("SELECT", "WITH"))
+
+
+def explain(engine: Engine, statement: str, parameters: Any) -> str:
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        # ANALYZE executes the statement, so only reads get a measured plan.
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) " if _is_read(statement) else "EXPLAIN "
+        with engine.connect() as conn:
+            rows = conn.exec_driver_sql(prefix + statement, parameters or ()).fetchall()
+            conn.rollback()
+        return "\n".join(row[0] for row in rows)
+    if dialect == "sqlite":
+        with engine.connect() as conn:
+            rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters or ()).fetchall()
+        depth = {0: -1}
+        lines = []
+        for node_id, parent_id, _, detail in rows:
+            depth[node_id] = depth.get(parent_id, -1) + 1
+            lines.append("  " * depth[node_id] + detail)
+        return "\n".join(lines)
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters or ()).fetchall()
+    return "\n".join(" ".join(str(column) for column in row) for row in rows)
+
+
+store = SlowQueryStore(settings.slow_query_store_size)
+_rate_limiter = _RateLimiter(settings.slow_query_explain_per_minute)
+_explain_worker = _ExplainWorker()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context rather than the pooled connection, so a
+    # statement that raises leaves nothing behind.
+    if context is not None:
+        context._slow_query_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_slow_query_start", None)
+    if start is None:
+        return
+    duration_ms = (time.perf_counter() - start) * 1000
+    if duration_ms < settings.slow_query_threshold_ms:
+        return
+
+    normalized = normalize_statement(statement)
+    stats = current_query_stats()
+    entry = SlowQuery(
+        captured_at=datetime.now(timezone.utc).isoformat(),
+        route=stats.route if stats is not None else None,
+        fingerprint=fingerprint_statement(normalized),
+        statement=normalized,
+        parameters=describe_parameters(parameters),
+        duration_ms=round(duration_ms, 2),
+        dialect=conn.dialect.name,
+    )
+    logger.warning(
+        "Slow query %.1fms on %s [%s]: %s params=%s",
+        entry.duration_ms, entry.route or "-", entry.fingerprint, entry.statement, entry.parameters,
+    )
+    store.add(entry)
+
+    capture = (
+        not executemany
+        and random.random() < settings.slow_query_explain_sample_rate
+        and _rate_limiter.allow()
+        and _explain_worker.submit(conn.engine, statement, parameters, entry)
+    )
+    if not capture:
+        store.persist(entry)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach the slow query log to ``engine``. Safe to call more than once."""
+    if not settings.slow_query_log_enabled:
+        return
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,129 @@
+"""Deployment profile for file-backed SQLite databases.
+
+SQLite allows one writer at a time, so the profile keeps a single writer
+connection and a pool of read connections:
+
+* every connection runs in WAL mode with ``synchronous=NORMAL``, a busy
+  timeout, a larger page cache and memory-mapped I/O;
+* the writer pool holds exactly one connection, so its checkout queue
+  serializes writes inside a worker; transactions on it start with
+  ``BEGIN IMMEDIATE`` and wait on the busy timeout for other processes
+  instead of failing when a read lock cannot be upgraded;
+* read connections are ``query_only`` and, thanks to WAL, never block on
+  or block the writer.
+
+``SQLiteSession`` sends reads to the read pool and moves to the writer from
+its first flush until the transaction ends, so a request reads its own
+uncommitted changes. SQLite ignores ``FOR UPDATE``, so a locking select moves
+the session to the writer as well: ``BEGIN IMMEDIATE`` then holds the write
+lock, and the checks that follow it read the latest data, until the commit.
+"""
+import sqlite3
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+from .config import settings
+
+
+def is_file_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and url not in ("sqlite://", "sqlite:///") and ":memory:" not in url
+
+
+@event.listens_for(Engine, "connect")
+def _enforce_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ignores foreign keys, including their ON DELETE actions, unless
+    # every connection opts in.
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+def writer_options() -> Dict[str, Any]:
+    return {
+        "connect_args": {"check_same_thread": False},
+        "pool_size": 1,
+        "max_overflow": 0,
+        "pool_timeout": settings.sqlite_write_timeout_seconds,
+    }
+
+
+def reader_options() -> Dict[str, Any]:
+    return {
+        "connect_args": {"check_same_thread": False},
+        "pool_size": settings.sqlite_read_pool_size,
+        "max_overflow": settings.sqlite_read_pool_size,
+    }
+
+
+def _pragmas(read_only: bool):
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+        f"PRAGMA cache_size=-{settings.sqlite_cache_size_kib}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size_bytes}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def configure_engine(engine: Engine, writer: bool) -> None:
+    """Apply the connection PRAGMAs and, for the writer, immediate transactions."""
+    pragmas = _pragmas(read_only=not writer)
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+        if writer:
+            # Let SQLAlchemy issue BEGIN itself (see the begin listener below).
+            dbapi_connection.isolation_level = None
+
+    if writer:
+        @event.listens_for(engine, "begin")
+        def on_begin(conn):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+class SQLiteSession(Session):
+    """Session that reads from the read pool and writes through the single writer."""
+
+    def __init__(self, writer: Engine, reader: Engine, **kwargs):
+        super().__init__(**kwargs)
+        self.writer = writer
+        self.reader = reader
+        self._writing = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (self._writing or self._flushing or isinstance(clause, UpdateBase)
+                or getattr(clause, "_for_update_arg", None) is not None):
+            self._writing = True
+            return self.writer
+        return self.reader
+
+    def commit(self) -> None:
+        try:
+            super().commit()
+        finally:
+            self._writing = False
+
+    def rollback(self) -> None:
+        try:
+            super().rollback()
+        finally:
+            self._writing = False
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self._writing = False
@@ -0,0 +1,21 @@
+"""Startup work that would otherwise land on the first requests after a deploy."""
+import logging
+import time
+
+from fastapi import FastAPI
+
+from .database import warm_up_pools
+from .security import create_access_token, get_pwd_context, verify_token
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up(app: FastAPI) -> None:
+    started = time.perf_counter()
+    warm_up_pools()
+    # Loads the bcrypt backend; a hash costs as much as a login's verify.
+    get_pwd_context().hash("warm-up")
+    verify_token(create_access_token({"sub": "0"}))
+    # Builds the OpenAPI schema, which FastAPI otherwise generates on first request.
+    app.openapi()
+    logger.info("Warm-up finished in %.0fms", (time.perf_counter() - started) * 1000)
@@ -1,15 +1,37 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from .core.background import default_jobs
 from .core.config import settings
+from .core.database import pool_status
+from .core.metrics import MetricsMiddleware, render_metrics
+from .core.query_counter import QueryCounterMiddleware
 from .api.v1 import api_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.startup_warmup:
+        from .core.warmup import warm_up
+        await run_in_threadpool(warm_up, app)
+    jobs = default_jobs()
+    for job in jobs:
+        job.start()
+    yield
+    for job in jobs:
+        job.stop()
+
+
 app = FastAPI(
     title=settings.project_name,
     version=settings.version,
     description=settings.description,
     openapi_url="/api/v1/openapi.json",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -19,6 +41,11 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(QueryCounterMiddleware)
+app.add_middleware(MetricsMiddleware)
+if settings.profiling_enabled:
+    from .core.profiling import ProfilingMiddleware
+    app.add_middleware(ProfilingMiddleware, routes=app.router.routes)
 
 app.include_router(api_router, prefix="/api/v1")
 
@@ -34,4 +61,24 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/ready")
+async def readiness_check():
+    # Unlike /health this reflects load: saturated workers report 503 so load
+    # balancers send traffic elsewhere until connections free up. A single
+    # connection pool (the SQLite writer) is busy whenever anything writes, so
+    # it queues writes instead of counting towards saturation.
+    pools = pool_status()
+    saturated = [
+        pool["name"] for pool in pools
+        if pool["capacity"] != 1 and pool["utilization"] >= settings.ready_max_pool_utilization
+    ]
+    body = {"status": "saturated" if saturated else "ready", "saturated": saturated, "pools": pools}
+    return JSONResponse(body, status_code=503 if saturated else 200)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
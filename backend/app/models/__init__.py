@@ -2,5 +2,19 @@ from .user import User
 from .project import Project
 from .task import Task
 from .user_story import UserStory
+from .webhook import WebhookSubscription, WebhookDelivery
+from .attachment import Attachment
+from .task_dependency import TaskDependency
+from .task_closure import TaskClosure
+from .label import Label
+from .time_entry import TimeEntry, TaskTimeRollup, ProjectTimeRollup
+from . import archive  # noqa: F401
+from . import change_log  # noqa: F401
 
-__all__ = ["User", "Project", "Task", "UserStory"]
\ No newline at end of file
+# Registers the query hook that hides soft-deleted rows and the flush hooks
+# that keep Project task counters, subtask and time rollups in sync, record
+# changes for clients and update cached dependency graphs and label indexes.
+from . import soft_delete  # noqa: E402,F401
+from ..services import change_log as _change_log, label_index, project_counters, task_graph, task_tree, time_rollups  # noqa: E402,F401
+
+__all__ = ["User", "Project", "Task", "UserStory", "WebhookSubscription", "WebhookDelivery", "Attachment", "TaskDependency", "TaskClosure", "Label", "TimeEntry", "TaskTimeRollup", "ProjectTimeRollup"]
\ No newline at end of file
@@ -0,0 +1,56 @@
+"""Cold storage for the tasks, comments, attachments, labels, dependencies, subtask links, time entries and stories of archived projects.
+
+Each archive table mirrors its hot table column for column, so rows move
+between the tiers with ``INSERT ... SELECT`` and keep their ids. The hot
+tables use AUTOINCREMENT on SQLite so a moved-out id is never handed to a
+new row and a restore cannot collide.
+"""
+from sqlalchemy import Column, ForeignKey, Index, Table
+
+from ..core.database import Base
+from .attachment import Attachment
+from .label import task_labels
+from .task import Task, TaskComment
+from .task_closure import TaskClosure
+from .task_dependency import TaskDependency
+from .time_entry import TaskTimeRollup, TimeEntry
+from .user_story import UserStory
+
+# Foreign keys of the archive tables; the rest of the hot tables' keys are dropped.
+_ARCHIVE_KEYS = {
+    "project_id": lambda: ForeignKey("projects.id", ondelete="CASCADE"),
+    "assignee_id": lambda: ForeignKey("users.id", ondelete="SET NULL"),
+    "author_id": lambda: ForeignKey("users.id", ondelete="SET NULL"),
+    "uploader_id": lambda: ForeignKey("users.id", ondelete="SET NULL"),
+    "user_id": lambda: ForeignKey("users.id", ondelete="SET NULL"),
+    "task_id": lambda: ForeignKey("archived_tasks.id", ondelete="CASCADE"),
+    "comment_id": lambda: ForeignKey("archived_task_comments.id", ondelete="CASCADE"),
+    # Labels stay in the hot table with their project.
+    "label_id": lambda: ForeignKey("labels.id", ondelete="CASCADE"),
+}
+
+
+def _archive_of(source: Table, name: str, *indexed: str) -> Table:
+    columns = []
+    for column in source.columns:
+        key = _ARCHIVE_KEYS.get(column.name)
+        columns.append(Column(
+            column.name, column.type, *([key()] if key else []),
+            primary_key=column.primary_key, nullable=column.nullable, autoincrement=False,
+        ))
+    table = Table(name, Base.metadata, *columns)
+    for column_name in indexed:
+        Index(f"ix_{name}_{column_name}", table.c[column_name])
+    return table
+
+
+archived_tasks = _archive_of(Task.__table__, "archived_tasks", "project_id", "assignee_id")
+archived_task_comments = _archive_of(TaskComment.__table__, "archived_task_comments", "task_id")
+archived_attachments = _archive_of(Attachment.__table__, "archived_attachments", "task_id", "digest")
+archived_task_labels = _archive_of(task_labels, "archived_task_labels", "task_id", "label_id")
+archived_time_entries = _archive_of(TimeEntry.__table__, "archived_time_entries", "task_id", "project_id")
+archived_task_time_rollups = _archive_of(TaskTimeRollup.__table__, "archived_task_time_rollups", "task_id", "project_id")
+# Without keys on the task ids, so edges and subtask links can move before or after their tasks.
+archived_task_dependencies = _archive_of(TaskDependency.__table__, "archived_task_dependencies", "project_id")
+archived_task_closure = _archive_of(TaskClosure.__table__, "archived_task_closure", "project_id")
+archived_user_stories = _archive_of(UserStory.__table__, "archived_user_stories", "project_id")
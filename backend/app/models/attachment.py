@@ -0,0 +1,24 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class Attachment(Base):
+    """A file attached to a task, or to one of its comments.
+
+    The content lives in the blob store (``services.attachments``) under its
+    SHA-256 ``digest``; identical uploads share one file.
+    """
+    __tablename__ = "attachments"
+    # Ids are never reused, so archived attachments can be restored (see models.archive).
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True, index=True)
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False, index=True)
+    comment_id = Column(Integer, ForeignKey("task_comments.id", ondelete="CASCADE"), index=True)
+    uploader_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
+    filename = Column(String(255), nullable=False)
+    content_type = Column(String(255), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    digest = Column(String(64), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
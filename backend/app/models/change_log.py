@@ -0,0 +1,29 @@
+"""Append-only log of changes to the rows clients keep in sync.
+
+Every insert, update and delete of a project, membership, task, user story
+or comment appends an entry (see ``app.services.change_log``); ``seq`` is
+the sync token. Entries keep no foreign keys so they outlive the rows they
+describe until the log is pruned. ``entity_id`` is the user id for
+memberships, whose project is ``project_id``. Task and comment entries also
+carry the task's ``assignee_id``, who can see them outside the project.
+"""
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String, Table
+
+from ..core.database import Base
+
+change_log = Table(
+    "change_log",
+    Base.metadata,
+    Column("seq", Integer, primary_key=True),
+    Column("entity", String(20), nullable=False),
+    Column("entity_id", Integer, nullable=False),
+    Column("project_id", Integer),
+    Column("assignee_id", Integer),
+    Column("deleted", Boolean, nullable=False, default=False),
+    Column("changed_at", DateTime(timezone=True), nullable=False, index=True),
+    Index("ix_change_log_project_id_seq", "project_id", "seq"),
+    # A pruned seq must never come back as a newer change.
+    sqlite_autoincrement=True,
+)
+
+ENTITIES = ("projects", "memberships", "tasks", "user_stories", "comments")
\ No newline at end of file
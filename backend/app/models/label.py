@@ -0,0 +1,31 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Table, UniqueConstraint
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+# Which labels each task carries. The surrogate id lets the archive and the
+# purge move and delete links in batches like the other task children.
+task_labels = Table(
+    "task_labels",
+    Base.metadata,
+    Column("id", Integer, primary_key=True),
+    Column("task_id", Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False),
+    Column("label_id", Integer, ForeignKey("labels.id", ondelete="CASCADE"), nullable=False),
+    UniqueConstraint("task_id", "label_id", name="uq_task_labels_link"),
+    Index("ix_task_labels_label_id", "label_id"),
+    sqlite_autoincrement=True,
+)
+
+
+class Label(Base):
+    """A label of one project ("backend", "bug", "customer-x"); tasks carry any number of them."""
+    __tablename__ = "labels"
+    __table_args__ = (
+        UniqueConstraint("project_id", "name", name="uq_labels_project_name"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    name = Column(String(50), nullable=False)
+    color = Column(String(7))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum, Table
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import backref, relationship
 from sqlalchemy.sql import func
 from enum import Enum
 from ..core.database import Base
@@ -16,8 +16,8 @@ class ProjectStatus(str, Enum):
 project_members = Table(
     'project_members',
     Base.metadata,
-    Column('project_id', Integer, ForeignKey('projects.id'), primary_key=True),
-    Column('user_id', Integer, ForeignKey('users.id'), primary_key=True)
+    Column('project_id', Integer, ForeignKey('projects.id', ondelete='CASCADE'), primary_key=True),
+    Column('user_id', Integer, ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
 )
 
 
@@ -31,10 +31,29 @@ class Project(Base):
     start_date = Column(DateTime(timezone=True))
     end_date = Column(DateTime(timezone=True))
     manager_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Maintained by app.services.project_counters; overdue_count also changes
+    # as time passes and is refreshed by the periodic reconciliation.
+    task_count = Column(Integer, nullable=False, default=0, server_default="0")
+    completed_count = Column(Integer, nullable=False, default=0, server_default="0")
+    overdue_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Set on delete; the row and its children are removed later by app.services.purge.
+    deleted_at = Column(DateTime(timezone=True), index=True)
+    # Set while the project's tasks, comments and stories live in the archive tables.
+    archived_at = Column(DateTime(timezone=True), index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     manager = relationship("User", back_populates="managed_projects")
-    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
-    user_stories = relationship("UserStory", back_populates="project", cascade="all, delete-orphan")
-    members = relationship("User", secondary=project_members, backref="member_projects")
\ No newline at end of file
+    # Child rows are removed by ON DELETE CASCADE, not loaded and deleted one by one.
+    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan", passive_deletes=True)
+    user_stories = relationship(
+        "UserStory", back_populates="project", cascade="all, delete-orphan", passive_deletes=True
+    )
+    members = relationship(
+        "User", secondary=project_members, passive_deletes=True,
+        backref=backref("member_projects", passive_deletes=True)
+    )
+
+    @property
+    def progress_percentage(self) -> float:
+        return (self.completed_count / self.task_count * 100) if self.task_count else 0
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""Soft deletion of projects and users.
+
+Deleting a project or user only sets ``deleted_at``. ORM queries then stop
+returning it, together with the tasks, user stories and time of deleted
+projects, until ``app.services.purge`` removes the rows in the background.
+Queries that need deleted rows pass ``execution_options(include_deleted=True)``.
+"""
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, with_loader_criteria
+
+from .project import Project
+from .task import Task
+from .time_entry import ProjectTimeRollup, TaskTimeRollup, TimeEntry
+from .user import User
+from .user_story import UserStory
+
+# Plain table columns, so the Project criteria below is not applied to it.
+_projects = Project.__table__
+_deleted_project_ids = select(_projects.c.id).where(_projects.c.deleted_at.is_not(None))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _hide_deleted(orm_execute_state):
+    if (
+        not orm_execute_state.is_select
+        or orm_execute_state.is_column_load
+        or orm_execute_state.is_relationship_load
+        or orm_execute_state.execution_options.get("include_deleted", False)
+    ):
+        # Relationship loads inherit the criteria from the query that started them.
+        return
+    orm_execute_state.statement = orm_execute_state.statement.options(
+        with_loader_criteria(Project, Project.deleted_at.is_(None), include_aliases=True),
+        with_loader_criteria(User, User.deleted_at.is_(None), include_aliases=True),
+        with_loader_criteria(Task, Task.project_id.not_in(_deleted_project_ids), include_aliases=True),
+        with_loader_criteria(UserStory, UserStory.project_id.not_in(_deleted_project_ids), include_aliases=True),
+        with_loader_criteria(TimeEntry, TimeEntry.project_id.not_in(_deleted_project_ids), include_aliases=True),
+        with_loader_criteria(
+            TaskTimeRollup, TaskTimeRollup.project_id.not_in(_deleted_project_ids), include_aliases=True
+        ),
+        with_loader_criteria(
+            ProjectTimeRollup, ProjectTimeRollup.project_id.not_in(_deleted_project_ids), include_aliases=True
+        ),
+    )
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum, Index, and_
+from sqlalchemy.orm import column_property, relationship
 from sqlalchemy.sql import func
 from enum import Enum
 from ..core.database import Base
@@ -20,30 +20,59 @@ class TaskPriority(str, Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    # Ids are never reused, so archived tasks can be restored (see models.archive).
+    # The indexes back the task list filters and sort keys (api.task_filters).
+    __table_args__ = (
+        Index("ix_tasks_project_id_status", "project_id", "status"),
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False, index=True)
     description = Column(Text)
-    status = Column(SQLEnum(TaskStatus), nullable=False, default=TaskStatus.TODO)
-    priority = Column(SQLEnum(TaskPriority), nullable=False, default=TaskPriority.MEDIUM)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
-    assignee_id = Column(Integer, ForeignKey("users.id"))
-    due_date = Column(DateTime(timezone=True))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    status = Column(SQLEnum(TaskStatus), nullable=False, default=TaskStatus.TODO, index=True)
+    priority = Column(SQLEnum(TaskPriority), nullable=False, default=TaskPriority.MEDIUM, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    # Subtasks: the hierarchy is also kept in task_closure, with rollups of all
+    # descendants below (app.services.task_tree). No foreign key, as archive
+    # batches move a parent and its children separately.
+    parent_id = Column(Integer, index=True)
+    subtask_count = Column(Integer, nullable=False, default=0, server_default="0")
+    completed_subtask_count = Column(Integer, nullable=False, default=0, server_default="0")
+    assignee_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), index=True)
+    due_date = Column(DateTime(timezone=True), index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), index=True)
 
     project = relationship("Project", back_populates="tasks")
     assignee = relationship("User", back_populates="assigned_tasks")
-    comments = relationship("TaskComment", back_populates="task", cascade="all, delete-orphan")
+    comments = relationship("TaskComment", back_populates="task", cascade="all, delete-orphan", passive_deletes=True)
+    attachments = relationship("Attachment", cascade="all, delete-orphan", passive_deletes=True)
+    labels = relationship("Label", secondary="task_labels", order_by="Label.name")
+
+
+def overdue_clause(table):
+    """SQL predicate for overdue tasks of ``table`` (``tasks`` or its archive)."""
+    return and_(
+        table.c.due_date.is_not(None),
+        table.c.due_date < func.current_timestamp(),
+        table.c.status != TaskStatus.DONE,
+    )
+
+
+# Evaluated by the database with every task load, so lists and filters agree.
+Task.is_overdue = column_property(overdue_clause(Task.__table__))
 
 
 class TaskComment(Base):
     __tablename__ = "task_comments"
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
-    task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
-    author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    # Comments outlive their author's account.
+    author_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     task = relationship("Task", back_populates="comments")
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, UniqueConstraint
+from ..core.database import Base
+
+
+class TaskClosure(Base):
+    """A pair of a task and one of its subtasks, ``depth`` levels below it (1 for a child).
+
+    Holds every such pair, not only parent and child, so a subtree or the
+    chain of ancestors is one indexed lookup. Tasks without parent or
+    children have no rows. Maintained with ``Task.parent_id`` by
+    ``services.task_tree``.
+    """
+    __tablename__ = "task_closure"
+    # Ids are never reused, so archived rows can be restored (see models.archive).
+    __table_args__ = (
+        UniqueConstraint("ancestor_id", "descendant_id", name="uq_task_closure_pair"),
+        Index("ix_task_closure_descendant_id", "descendant_id"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    ancestor_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    descendant_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    depth = Column(Integer, nullable=False)
\ No newline at end of file
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, UniqueConstraint
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class TaskDependency(Base):
+    """An edge of a project's dependency graph: ``blocked_id`` is blocked by ``blocker_id``.
+
+    Both tasks belong to ``project_id``, denormalized here so a project's
+    graph loads from one index. Inserts keep the graph acyclic
+    (``services.task_graph``).
+    """
+    __tablename__ = "task_dependencies"
+    # Ids are never reused, so archived edges can be restored (see models.archive).
+    __table_args__ = (
+        UniqueConstraint("blocked_id", "blocker_id", name="uq_task_dependencies_edge"),
+        Index("ix_task_dependencies_blocker_id", "blocker_id"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    blocked_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    blocker_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
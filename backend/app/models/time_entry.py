@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy.orm import validates
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+def week_start(day: date) -> date:
+    """Monday of the ISO week ``day`` falls in."""
+    return day - timedelta(days=day.weekday())
+
+
+class TimeEntry(Base):
+    """Minutes a user spent on a task on one day.
+
+    Reports never sum these rows: ``services.time_rollups`` keeps the
+    totals per task and per project, week and user up to date with every
+    ORM write. ``project_id`` and ``week_start`` are copied from the task
+    and ``spent_on`` so the rollups and their rebuild need no join.
+    """
+    __tablename__ = "time_entries"
+    # Ids are never reused, so archived entries can be restored (see models.archive).
+    __table_args__ = (
+        Index("ix_time_entries_task_id_spent_on", "task_id", "spent_on"),
+        Index("ix_time_entries_project_id_week_start", "project_id", "week_start"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    # Entries outlive their author's account.
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), index=True)
+    minutes = Column(Integer, nullable=False)
+    spent_on = Column(Date, nullable=False)
+    week_start = Column(Date, nullable=False)
+    note = Column(String(500))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    @validates("spent_on")
+    def _set_week_start(self, key, value: date) -> date:
+        self.week_start = week_start(value)
+        return value
+
+
+class TaskTimeRollup(Base):
+    """Minutes and entries logged on one task; moves to the archive with it."""
+    __tablename__ = "task_time_rollups"
+
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True, autoincrement=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    minutes = Column(Integer, nullable=False, default=0, server_default="0")
+    entry_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class ProjectTimeRollup(Base):
+    """Minutes and entries logged on a project's tasks by one user in one week.
+
+    Stays in this table when the project is archived, so reports cover
+    archived projects too.
+    """
+    __tablename__ = "project_time_rollups"
+    __table_args__ = (
+        UniqueConstraint("project_id", "week_start", "user_id", name="uq_project_time_rollups_key"),
+        Index("ix_project_time_rollups_user_id_week_start", "user_id", "week_start"),
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    week_start = Column(Date, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
+    minutes = Column(Integer, nullable=False, default=0, server_default="0")
+    entry_count = Column(Integer, nullable=False, default=0, server_default="0")
\ No newline at end of file
@@ -21,8 +21,10 @@ class User(Base):
     hashed_password = Column(String(255), nullable=False)
     role = Column(SQLEnum(UserRole), nullable=False, default=UserRole.DEVELOPER)
     is_active = Column(Boolean, default=True)
+    # Set on delete; the row is removed later by app.services.purge.
+    deleted_at = Column(DateTime(timezone=True), index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     managed_projects = relationship("Project", back_populates="manager")
-    assigned_tasks = relationship("Task", back_populates="assignee")
\ No newline at end of file
+    assigned_tasks = relationship("Task", back_populates="assignee", passive_deletes=True)
\ No newline at end of file
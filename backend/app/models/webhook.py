@@ -0,0 +1,50 @@
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class WebhookSubscription(Base):
+    __tablename__ = "webhook_subscriptions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    url = Column(String(500), nullable=False)
+    # Shared with the receiver, which checks the HMAC signature of every batch.
+    secret = Column(String(100), nullable=False)
+    # Comma-separated event types, or "*" for all of them.
+    event_types = Column(String(500), nullable=False, default="*")
+    is_active = Column(Boolean, nullable=False, default=True)
+    created_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    deliveries = relationship("WebhookDelivery", back_populates="subscription", passive_deletes=True)
+
+    def wants(self, event_type: str) -> bool:
+        types = self.event_types.split(",")
+        return "*" in types or event_type in types
+
+
+class WebhookDelivery(Base):
+    """Outbox row: one event for one subscription, deleted once delivered.
+
+    Pending rows have ``next_attempt_at`` set; dead letters have it cleared
+    and ``dead_at`` set after ``webhook_max_attempts`` failures.
+    """
+    __tablename__ = "webhook_deliveries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    subscription_id = Column(
+        Integer, ForeignKey("webhook_subscriptions.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    event_id = Column(String(32), nullable=False)
+    event_type = Column(String(50), nullable=False)
+    # The event as sent, JSON-encoded.
+    payload = Column(Text, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), index=True)
+    last_error = Column(Text)
+    dead_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    subscription = relationship("WebhookSubscription", back_populates="deliveries")
\ No newline at end of file
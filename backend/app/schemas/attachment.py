@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class Attachment(BaseModel):
+    id: int
+    task_id: int
+    comment_id: Optional[int] = None
+    uploader_id: Optional[int] = None
+    filename: str
+    content_type: str
+    size: int
+    digest: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
\ No newline at end of file
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import Generic, List, TypeVar
+
+T = TypeVar("T")
+
+
+class Batch(BaseModel, Generic[T]):
+    # In the order the ids were requested.
+    items: List[T]
+    not_found: List[int] = []
+    # Ids that exist but are outside the caller's access scope.
+    forbidden: List[int] = []
\ No newline at end of file
@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from ..models.task import TaskStatus
+from .task import TaskWithDetails
+
+
+class BoardColumn(BaseModel):
+    status: TaskStatus
+    count: int
+    tasks: List[TaskWithDetails] = []
+    # Pass as ``cursor`` to the column endpoint to load the next page.
+    next_cursor: Optional[int] = None
+
+
+class Board(BaseModel):
+    project_id: int
+    columns: List[BoardColumn]
@@ -0,0 +1,58 @@
+import re
+
+from pydantic import BaseModel, field_validator
+from typing import Optional, List
+from datetime import datetime
+
+_COLOR = re.compile(r"^#[0-9a-fA-F]{6}$")
+
+
+def _label_name(value: Optional[str]) -> Optional[str]:
+    # Names are matched as written in label expressions, which quote with ".
+    if value is None:
+        return value
+    value = value.strip()
+    if not value or len(value) > 50 or '"' in value:
+        raise ValueError('name must be 1 to 50 characters, without "')
+    return value
+
+
+def _label_color(value: Optional[str]) -> Optional[str]:
+    if value is not None and not _COLOR.match(value):
+        raise ValueError("color must look like #1f6feb")
+    return value
+
+
+class LabelCreate(BaseModel):
+    name: str
+    color: Optional[str] = None
+
+    _check_name = field_validator("name")(_label_name)
+    _check_color = field_validator("color")(_label_color)
+
+
+class LabelUpdate(BaseModel):
+    name: Optional[str] = None
+    color: Optional[str] = None
+
+    _check_name = field_validator("name")(_label_name)
+    _check_color = field_validator("color")(_label_color)
+
+
+class Label(BaseModel):
+    id: int
+    project_id: int
+    name: str
+    color: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class LabelWithCount(Label):
+    task_count: int = 0
+
+
+class TaskLabels(BaseModel):
+    label_ids: List[int]
\ No newline at end of file
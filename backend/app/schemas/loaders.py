@@ -0,0 +1,76 @@
+"""Relationship loader profiles for the response schemas.
+
+Each profile eagerly loads exactly the relationships its schema serializes
+and ends in ``raiseload("*")``, so anything else a handler touches raises
+instead of issuing one query per row. Apply them with
+``query.options(*PROFILE)``.
+
+``raise_on_lazy_load`` is a ``do_orm_execute`` hook the test suite installs
+to fail on any lazy load during a request, including queries that use no
+profile.
+"""
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+
+from ..core.query_counter import current_query_stats
+from ..models.project import Project
+from ..models.task import Task, TaskComment
+from ..models.user import User
+
+# ProjectWithDetails: manager and members.
+PROJECT_DETAILS = (
+    joinedload(Project.manager),
+    selectinload(Project.members),
+    raiseload("*"),
+)
+
+# TaskWithDetails in lists: assignee and labels, comments are left empty.
+TASK_LIST = (
+    joinedload(Task.assignee),
+    joinedload(Task.labels),
+    raiseload("*"),
+)
+
+# TaskWithDetails for a single task: assignee, labels and comments with their authors.
+TASK_DETAILS = (
+    joinedload(Task.assignee),
+    joinedload(Task.labels),
+    selectinload(Task.comments).joinedload(TaskComment.author),
+    raiseload("*"),
+)
+
+# Dashboard activity rows: project name and assignee name.
+TASK_ACTIVITY = (
+    joinedload(Task.project).raiseload("*"),
+    joinedload(Task.assignee),
+    raiseload("*"),
+)
+
+# TaskComment: author.
+COMMENT_DETAILS = (
+    joinedload(TaskComment.author),
+    raiseload("*"),
+)
+
+# UserWithProjects: managed and member projects, without their relationships.
+USER_WITH_PROJECTS = (
+    selectinload(User.managed_projects).raiseload("*"),
+    selectinload(User.member_projects).raiseload("*"),
+    raiseload("*"),
+)
+
+
+class LazyLoadError(RuntimeError):
+    pass
+
+
+def raise_on_lazy_load(orm_execute_state) -> None:
+    """Fail on relationship lazy loads issued while a request is being handled."""
+    if not orm_execute_state.is_select or current_query_stats() is None:
+        return
+    if orm_execute_state.lazy_loaded_from is None:
+        return
+    state = orm_execute_state.lazy_loaded_from
+    raise LazyLoadError(
+        f"Unplanned lazy load from {state.class_.__name__} in {current_query_stats().route}; "
+        "add the relationship to the endpoint's loader profile"
+    )
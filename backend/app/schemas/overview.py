@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from .board import Board
+from .project import ProjectWithDetails
+from .user_story import UserStoriesResponse
+
+
+class ProjectOverview(BaseModel):
+    project: ProjectWithDetails
+    board: Board
+    stories: UserStoriesResponse
\ No newline at end of file
@@ -31,6 +31,7 @@ class ProjectUpdate(BaseModel):
 class Project(ProjectBase):
     id: int
     manager_id: int
+    archived_at: Optional[datetime] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -43,6 +44,7 @@ class ProjectWithDetails(Project):
     members: List[User] = []
     task_count: int = 0
     completed_tasks: int = 0
+    overdue_tasks: int = 0
     progress_percentage: float = 0.0
 
     class Config:
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from typing import List
+from .project import Project
+from .task import Task, TaskComment
+from .user_story import UserStory
+
+
+class Membership(BaseModel):
+    project_id: int
+    user_id: int
+
+
+class Tombstones(BaseModel):
+    projects: List[int] = []
+    memberships: List[Membership] = []
+    tasks: List[int] = []
+    user_stories: List[int] = []
+    comments: List[int] = []
+
+
+class SyncChanges(BaseModel):
+    # Pass as ``since`` next time; changes up to it have all been delivered.
+    token: int
+    # Another page of changes is ready now.
+    has_more: bool = False
+    projects: List[Project] = []
+    memberships: List[Membership] = []
+    tasks: List[Task] = []
+    user_stories: List[UserStory] = []
+    comments: List[TaskComment] = []
+    deleted: Tombstones = Field(default_factory=Tombstones)
\ No newline at end of file
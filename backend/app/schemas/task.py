@@ -1,8 +1,9 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
 from ..models.task import TaskStatus, TaskPriority
 from .user import User
+from .label import Label
 
 
 class TaskCommentBase(BaseModel):
@@ -16,14 +17,21 @@ class TaskCommentCreate(TaskCommentBase):
 class TaskComment(TaskCommentBase):
     id: int
     task_id: int
-    author_id: int
-    author: User
+    author_id: Optional[int] = None
+    author: Optional[User] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
 
 
+def _due_date_in_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Stored as UTC so the database can compare due dates directly.
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc)
+    return value
+
+
 class TaskBase(BaseModel):
     title: str
     description: Optional[str] = None
@@ -34,8 +42,11 @@ class TaskBase(BaseModel):
 
 class TaskCreate(TaskBase):
     project_id: int
+    parent_id: Optional[int] = None
     assignee_id: Optional[int] = None
 
+    _normalize_due_date = field_validator("due_date")(_due_date_in_utc)
+
 
 class TaskUpdate(BaseModel):
     title: Optional[str] = None
@@ -44,11 +55,19 @@ class TaskUpdate(BaseModel):
     priority: Optional[TaskPriority] = None
     assignee_id: Optional[int] = None
     due_date: Optional[datetime] = None
+    # Moves the task and its subtasks; null makes it a top-level task.
+    parent_id: Optional[int] = None
+
+    _normalize_due_date = field_validator("due_date")(_due_date_in_utc)
 
 
 class Task(TaskBase):
     id: int
     project_id: int
+    parent_id: Optional[int] = None
+    # Over all descendants, not only direct children.
+    subtask_count: int = 0
+    completed_subtask_count: int = 0
     assignee_id: Optional[int] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -60,7 +79,20 @@ class Task(TaskBase):
 class TaskWithDetails(Task):
     assignee: Optional[User] = None
     comments: List[TaskComment] = []
+    labels: List[Label] = []
     is_overdue: bool = False
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class Subtask(Task):
+    # Levels below the task the subtree was read for; 1 for its children.
+    depth: int
+
+
+class Subtree(BaseModel):
+    task_id: int
+    subtask_count: int
+    completed_subtask_count: int
+    tasks: List[Subtask]
\ No newline at end of file
@@ -0,0 +1,47 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+from .task import Task
+
+
+class TaskDependencyCreate(BaseModel):
+    blocker_id: int
+
+
+class TaskDependency(BaseModel):
+    id: int
+    project_id: int
+    blocked_id: int
+    blocker_id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class TaskDependencies(BaseModel):
+    blocked_by: List[Task]
+    blocking: List[Task]
+
+
+class BlockedTask(BaseModel):
+    task_id: int
+    # Open blockers only; done ones no longer block.
+    blocked_by: List[int]
+
+
+class Frontier(BaseModel):
+    project_id: int
+    ready: List[int]
+    blocked: List[BlockedTask]
+
+
+class CriticalPathTask(Task):
+    earliest_finish: Optional[datetime] = None
+    is_late: bool = False
+
+
+class CriticalPath(BaseModel):
+    project_id: int
+    projected_finish: Optional[datetime] = None
+    tasks: List[CriticalPathTask]
\ No newline at end of file
@@ -0,0 +1,82 @@
+from pydantic import BaseModel, field_validator
+from typing import Optional, List
+from datetime import date, datetime
+
+# One entry covers at most a day.
+MAX_MINUTES = 24 * 60
+
+
+def _minutes_in_range(value: Optional[int]) -> Optional[int]:
+    if value is not None and not 1 <= value <= MAX_MINUTES:
+        raise ValueError(f"minutes must be between 1 and {MAX_MINUTES}")
+    return value
+
+
+def _note_length(value: Optional[str]) -> Optional[str]:
+    if value is not None and len(value) > 500:
+        raise ValueError("note must be at most 500 characters")
+    return value
+
+
+class TimeEntryCreate(BaseModel):
+    minutes: int
+    # Today (UTC) when left out.
+    spent_on: Optional[date] = None
+    note: Optional[str] = None
+
+    _check_minutes = field_validator("minutes")(_minutes_in_range)
+    _check_note = field_validator("note")(_note_length)
+
+
+class TimeEntryUpdate(BaseModel):
+    minutes: Optional[int] = None
+    spent_on: Optional[date] = None
+    note: Optional[str] = None
+
+    _check_minutes = field_validator("minutes")(_minutes_in_range)
+    _check_note = field_validator("note")(_note_length)
+
+
+class TimeEntry(BaseModel):
+    id: int
+    task_id: int
+    project_id: int
+    user_id: Optional[int] = None
+    minutes: int
+    spent_on: date
+    note: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class TaskTime(BaseModel):
+    task_id: int
+    minutes: int
+    entry_count: int
+    hours: float
+
+
+class TaskTimeReport(BaseModel):
+    project_id: int
+    total_minutes: int
+    tasks: List[TaskTime]
+
+
+class TimeReportRow(BaseModel):
+    # Only the dimensions in group_by are set.
+    project_id: Optional[int] = None
+    user_id: Optional[int] = None
+    week_start: Optional[date] = None
+    minutes: int
+    entry_count: int
+    hours: float
+
+
+class TimeReport(BaseModel):
+    group_by: List[str]
+    total_minutes: int
+    total_entries: int
+    rows: List[TimeReportRow]
\ No newline at end of file
@@ -1,7 +1,8 @@
 from pydantic import BaseModel, EmailStr
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 from ..models.user import UserRole
+from ..models.project import ProjectStatus
 
 
 class UserBase(BaseModel):
@@ -33,9 +34,19 @@ class User(UserBase):
         from_attributes = True
 
 
+class ProjectSummary(BaseModel):
+    id: int
+    name: str
+    status: ProjectStatus
+    manager_id: int
+
+    class Config:
+        from_attributes = True
+
+
 class UserWithProjects(User):
-    managed_projects: list = []
-    member_projects: list = []
+    managed_projects: List[ProjectSummary] = []
+    member_projects: List[ProjectSummary] = []
 
     class Config:
         from_attributes = True
\ No newline at end of file
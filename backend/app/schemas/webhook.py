@@ -0,0 +1,61 @@
+from pydantic import BaseModel, field_validator
+from typing import Optional, List
+from datetime import datetime
+from ..services.webhooks import EVENT_TYPES, parse_target
+
+
+class WebhookCreate(BaseModel):
+    project_id: int
+    url: str
+    event_types: List[str] = ["*"]
+    # Generated when left out; returned only by the create call.
+    secret: Optional[str] = None
+
+    @field_validator("url")
+    @classmethod
+    def _http_url(cls, value: str) -> str:
+        # Where the host resolves to is checked by the endpoint, off the event loop.
+        parse_target(value)
+        return value
+
+    @field_validator("event_types")
+    @classmethod
+    def _known_event_types(cls, value: List[str]) -> List[str]:
+        unknown = [event_type for event_type in value if event_type != "*" and event_type not in EVENT_TYPES]
+        if unknown or not value:
+            raise ValueError(f"event_types must be '*' or among: {', '.join(EVENT_TYPES)}")
+        return value
+
+
+class Webhook(BaseModel):
+    id: int
+    project_id: int
+    url: str
+    event_types: List[str]
+    is_active: bool
+    created_at: datetime
+
+    @field_validator("event_types", mode="before")
+    @classmethod
+    def _split(cls, value):
+        return value.split(",") if isinstance(value, str) else value
+
+    class Config:
+        from_attributes = True
+
+
+class WebhookWithSecret(Webhook):
+    secret: str
+
+
+class DeadLetter(BaseModel):
+    id: int
+    event_id: str
+    event_type: str
+    attempts: int
+    last_error: Optional[str] = None
+    created_at: datetime
+    dead_at: datetime
+
+    class Config:
+        from_attributes = True
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""Archival of finished projects.
+
+Completed and cancelled projects that have not changed for
+``archive_after_days`` have their tasks, comments, attachments,
+dependencies, subtask links, label links, time entries and stories moved
+into the archive tables (``app.models.archive``), so the hot tables and their
+indexes only grow with active work. The project row itself stays, with
+``archived_at`` set and its task counters frozen, and so do its weekly time
+rollups. Rows move in batches of
+``archive_batch_size``, each batch copied and deleted in one short
+transaction; ``restore_project`` moves them back the same way.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.archive import (
+    archived_attachments, archived_task_closure, archived_task_comments, archived_task_dependencies,
+    archived_task_labels, archived_task_time_rollups, archived_tasks, archived_time_entries, archived_user_stories
+)
+from ..models.attachment import Attachment
+from ..models.label import task_labels
+from ..models.project import Project, ProjectStatus
+from ..models.task import Task, TaskComment
+from ..models.task_closure import TaskClosure
+from ..models.task_dependency import TaskDependency
+from ..models.time_entry import TaskTimeRollup, TimeEntry
+from ..models.user_story import UserStory
+from .change_log import record_project_rows
+from .label_index import label_index
+from .project_counters import reconcile_project_counters
+from .task_graph import graph_cache
+
+logger = logging.getLogger(__name__)
+
+ARCHIVABLE_STATUSES = (ProjectStatus.COMPLETED, ProjectStatus.CANCELLED)
+
+_projects = Project.__table__
+_tasks = Task.__table__
+_comments = TaskComment.__table__
+_attachments = Attachment.__table__
+_dependencies = TaskDependency.__table__
+_closure = TaskClosure.__table__
+_time_entries = TimeEntry.__table__
+_time_rollups = TaskTimeRollup.__table__
+_stories = UserStory.__table__
+
+
+def _copy(db: Session, source, target, condition) -> None:
+    db.execute(insert(target).from_select(
+        [column.name for column in source.columns], select(*source.columns).where(condition)
+    ))
+
+
+def _move(db: Session, source, target, condition, batch_size: int, children=()) -> int:
+    """Move ``source`` rows matching ``condition`` into ``target``, one batch per commit.
+
+    ``children`` are (source, target) pairs of task child tables whose rows
+    follow their tasks in the same batch, since each tier's children must
+    reference a task in that tier. They are copied in order and deleted in
+    reverse, so a child may reference the ones before it.
+    """
+    total = 0
+    while True:
+        ids = db.execute(
+            select(source.c.id).where(condition).order_by(source.c.id).limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            return total
+        _copy(db, source, target, source.c.id.in_(ids))
+        for child_source, child_target in children:
+            _copy(db, child_source, child_target, child_source.c.task_id.in_(ids))
+        for child_source, _ in reversed(children):
+            db.execute(delete(child_source).where(child_source.c.task_id.in_(ids)))
+        db.execute(delete(source).where(source.c.id.in_(ids)))
+        db.commit()
+        total += len(ids)
+
+
+def _set_archived_at(db: Session, project_id: int, value: Optional[datetime]) -> None:
+    db.execute(update(_projects).where(_projects.c.id == project_id).values(archived_at=value))
+    # Synced clients drop the project's rows on archive and get them back on restore.
+    record_project_rows(db, project_id, deleted=value is not None)
+    db.commit()
+
+
+def archive_project(db: Session, project_id: int, batch_size: Optional[int] = None) -> int:
+    """Move a project's rows to the archive tables and return how many tasks moved."""
+    batch_size = batch_size or settings.archive_batch_size
+    # Flagged first, so task writes to the project are refused while rows move.
+    _set_archived_at(db, project_id, datetime.now(timezone.utc))
+    # Edges and subtask links leave first and come back last, so none points at a task in the other tier.
+    _move(db, _dependencies, archived_task_dependencies, _dependencies.c.project_id == project_id, batch_size)
+    _move(db, _closure, archived_task_closure, _closure.c.project_id == project_id, batch_size)
+    moved = _move(db, _tasks, archived_tasks, _tasks.c.project_id == project_id, batch_size,
+                  children=[(_comments, archived_task_comments), (_attachments, archived_attachments),
+                            (task_labels, archived_task_labels), (_time_entries, archived_time_entries),
+                            (_time_rollups, archived_task_time_rollups)])
+    _move(db, _stories, archived_user_stories, _stories.c.project_id == project_id, batch_size)
+    graph_cache.invalidate([project_id])
+    label_index.invalidate([project_id])
+    return moved
+
+
+def restore_project(db: Session, project_id: int, batch_size: Optional[int] = None) -> int:
+    """Move a project's rows back to the hot tables and return how many tasks moved."""
+    batch_size = batch_size or settings.archive_batch_size
+    moved = _move(db, archived_tasks, _tasks, archived_tasks.c.project_id == project_id, batch_size,
+                  children=[(archived_task_comments, _comments), (archived_attachments, _attachments),
+                            (archived_task_labels, task_labels), (archived_time_entries, _time_entries),
+                            (archived_task_time_rollups, _time_rollups)])
+    _move(db, archived_user_stories, _stories, archived_user_stories.c.project_id == project_id, batch_size)
+    _move(db, archived_task_dependencies, _dependencies,
+          archived_task_dependencies.c.project_id == project_id, batch_size)
+    _move(db, archived_task_closure, _closure, archived_task_closure.c.project_id == project_id, batch_size)
+    _set_archived_at(db, project_id, None)
+    graph_cache.invalidate([project_id])
+    label_index.invalidate([project_id])
+    reconcile_project_counters(db, [project_id])
+    return moved
+
+
+def archivable_project_ids(db: Session, now: Optional[datetime] = None) -> List[int]:
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=settings.archive_after_days)
+    return db.execute(
+        select(Project.id).where(
+            Project.status.in_(ARCHIVABLE_STATUSES),
+            Project.archived_at.is_(None),
+            func.coalesce(Project.updated_at, Project.created_at) < cutoff,
+        ).order_by(Project.id)
+    ).scalars().all()
+
+
+def archive_due_projects(db: Session) -> List[int]:
+    """Archive every project past the retention window; run by the background job."""
+    project_ids = archivable_project_ids(db)
+    for project_id in project_ids:
+        moved = archive_project(db, project_id)
+        logger.info("Archived project %s (%d tasks)", project_id, moved)
+    return project_ids
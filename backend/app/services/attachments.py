@@ -0,0 +1,159 @@
+"""Content-addressed storage for attachment files.
+
+Each file is stored once, at ``<root>/ab/cd/<sha256>``, however many
+attachments reference it. Uploads are streamed: incoming chunks are
+regrouped into blocks of ``attachment_chunk_bytes``, and each block is
+hashed and appended to a temporary file in a worker thread, so memory use
+stays at about one block per upload and the event loop never waits on disk.
+Once the body is complete the temporary file is renamed to its digest, or
+dropped when that digest is already stored.
+
+Deleting an attachment only deletes its row. ``sweep_attachments`` later
+removes files that no attachment in either tier references and that have
+not been written or re-uploaded within ``attachment_sweep_grace_seconds``;
+re-uploading a stored file touches it, so an upload that is about to
+insert its row is never swept from under it.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import AsyncIterable, Dict, NamedTuple, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, union
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.archive import archived_attachments
+from ..models.attachment import Attachment
+
+logger = logging.getLogger(__name__)
+
+# Referenced digests are looked up this many at a time during a sweep.
+_SWEEP_BATCH_SIZE = 500
+
+
+class AttachmentTooLarge(Exception):
+    pass
+
+
+class StoredBlob(NamedTuple):
+    digest: str
+    size: int
+    # False when an identical file was already stored.
+    created: bool
+
+
+def _write_block(file, hasher, block: bytearray) -> None:
+    # hashlib releases the GIL for large updates, so concurrent uploads hash in parallel.
+    hasher.update(block)
+    file.write(block)
+
+
+class BlobStore:
+    def __init__(self, root: str, chunk_bytes: int):
+        self.root = Path(root)
+        self.chunk_bytes = chunk_bytes
+
+    @property
+    def _tmp(self) -> Path:
+        return self.root / "tmp"
+
+    def path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:4] / digest
+
+    async def save(self, chunks: AsyncIterable[bytes], max_bytes: Optional[int] = None) -> StoredBlob:
+        """Store the streamed file and return its digest; raises ``AttachmentTooLarge`` past ``max_bytes``."""
+        file = await run_in_threadpool(self._open_temp)
+        hasher = hashlib.sha256()
+        size = 0
+        buffer = bytearray()
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise AttachmentTooLarge(max_bytes)
+                buffer += chunk
+                while len(buffer) >= self.chunk_bytes:
+                    await run_in_threadpool(_write_block, file, hasher, buffer[:self.chunk_bytes])
+                    del buffer[:self.chunk_bytes]
+            if buffer:
+                await run_in_threadpool(_write_block, file, hasher, buffer)
+            digest = hasher.hexdigest()
+            created = await run_in_threadpool(self._commit, file, digest)
+        except BaseException:
+            await run_in_threadpool(self._discard, file)
+            raise
+        return StoredBlob(digest, size, created)
+
+    def _open_temp(self):
+        self._tmp.mkdir(parents=True, exist_ok=True)
+        return tempfile.NamedTemporaryFile(dir=self._tmp, delete=False, buffering=0)
+
+    def _commit(self, file, digest: str) -> bool:
+        os.fsync(file.fileno())
+        file.close()
+        target = self.path(digest)
+        if target.exists():
+            os.utime(target)
+            os.unlink(file.name)
+            return False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(file.name, target)
+        return True
+
+    @staticmethod
+    def _discard(file) -> None:
+        file.close()
+        try:
+            os.unlink(file.name)
+        except FileNotFoundError:
+            pass
+
+    def stale_files(self, older_than: float) -> Dict[str, Path]:
+        """Stored files, by digest, last written before ``older_than`` (a timestamp)."""
+        stale = {}
+        if not self.root.is_dir():
+            return stale
+        for path in self.root.glob("??/??/*"):
+            if path.stat().st_mtime < older_than:
+                stale[path.name] = path
+        return stale
+
+    def sweep(self, db: Session, grace_seconds: float) -> int:
+        """Remove unreferenced files past the grace period and abandoned uploads; returns files removed."""
+        older_than = time.time() - grace_seconds
+        removed = 0
+        if self._tmp.is_dir():
+            for path in self._tmp.iterdir():
+                if path.stat().st_mtime < older_than:
+                    path.unlink(missing_ok=True)
+        stale = self.stale_files(older_than)
+        digests = list(stale)
+        for start in range(0, len(digests), _SWEEP_BATCH_SIZE):
+            batch = digests[start:start + _SWEEP_BATCH_SIZE]
+            referenced = set(db.execute(union(
+                select(Attachment.digest).where(Attachment.digest.in_(batch)),
+                select(archived_attachments.c.digest).where(archived_attachments.c.digest.in_(batch)),
+            )).scalars())
+            for digest in batch:
+                path = stale[digest]
+                # Checked again right before unlinking: an upload may have just touched it.
+                if digest in referenced or path.stat().st_mtime >= older_than:
+                    continue
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+
+store = BlobStore(settings.attachments_dir, settings.attachment_chunk_bytes)
+
+
+def sweep_attachments(db: Session) -> int:
+    removed = store.sweep(db, settings.attachment_sweep_grace_seconds)
+    if removed:
+        logger.info("Removed %d unreferenced attachment file(s)", removed)
+    return removed
\ No newline at end of file
@@ -0,0 +1,190 @@
+"""Recording changes for incremental sync.
+
+A flush hook appends one ``change_log`` entry per project, membership,
+task, user story and comment the flush inserted, updated or deleted, in
+the same transaction. When a project leaves the hot tables (soft delete or
+archive) its remaining rows get tombstones too, and a restore records them
+again, so a client replica never has to infer what a project change
+implies. A task moved to another project also gets a tombstone under the
+project it left, for clients that can only see that one, and a task
+handed to someone else one for its previous assignee.
+
+Core statements bypass the hook: the archive service records its moves
+and the subtask hooks the ancestors whose rollups they update
+(``record_tasks``); bulk loads are expected to be followed by a full reload.
+``prune_change_log`` drops entries past ``sync_log_retention_days``;
+tokens older than the oldest kept entry must reload from scratch.
+"""
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, event, func, insert, inspect, literal, select
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.change_log import change_log
+from ..models.project import Project, project_members
+from ..models.task import Task, TaskComment
+from ..models.user_story import UserStory
+
+logger = logging.getLogger(__name__)
+
+_ENTITY = {Project: "projects", Task: "tasks", UserStory: "user_stories", TaskComment: "comments"}
+_tasks = Task.__table__
+_comments = TaskComment.__table__
+_stories = UserStory.__table__
+
+
+def _columns_changed(obj) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[attr.key].history.has_changes() for attr in state.mapper.column_attrs)
+
+
+def _membership_changes(project: Project):
+    # History never loads the collection, so untouched members cost nothing.
+    history = inspect(project).attrs.members.history
+    return [(user.id, False) for user in history.added] + [(user.id, True) for user in history.deleted]
+
+
+def _comment_tasks(session: Session, comments) -> Dict[int, tuple]:
+    """Project and assignee ids of each comment's task, from the session where possible."""
+    task_ids = {comment.task_id for comment, _ in comments}
+    known = {}
+    for obj in (*session.identity_map.values(), *session.deleted):
+        if isinstance(obj, Task) and obj.id in task_ids:
+            loaded = inspect(obj).dict
+            if "project_id" in loaded and "assignee_id" in loaded:
+                known[obj.id] = (loaded["project_id"], loaded["assignee_id"])
+    missing = [task_id for task_id in task_ids if task_id not in known or known[task_id][0] is None]
+    if missing:
+        known.update((row.id, (row.project_id, row.assignee_id)) for row in session.connection().execute(
+            select(_tasks.c.id, _tasks.c.project_id, _tasks.c.assignee_id).where(_tasks.c.id.in_(missing))
+        ))
+    return known
+
+
+@event.listens_for(Session, "after_flush")
+def _record_changes(session, flush_context):
+    now = datetime.now(timezone.utc)
+    entries: List[dict] = []
+    comments = []
+    vacated = []
+
+    def add(entity: str, entity_id: int, project_id: Optional[int], deleted: bool = False,
+            assignee_id: Optional[int] = None) -> None:
+        entries.append({
+            "entity": entity, "entity_id": entity_id, "project_id": project_id,
+            "assignee_id": assignee_id, "deleted": deleted, "changed_at": now,
+        })
+
+    def record(obj, deleted: bool) -> None:
+        if isinstance(obj, TaskComment):
+            comments.append((obj, deleted))
+        elif isinstance(obj, Project):
+            add("projects", obj.id, obj.id, deleted)
+            if not deleted:
+                for user_id, removed in _membership_changes(obj):
+                    add("memberships", user_id, obj.id, removed)
+        elif isinstance(obj, Task):
+            add("tasks", obj.id, obj.project_id, deleted, obj.assignee_id)
+        else:
+            add(_ENTITY[type(obj)], obj.id, obj.project_id, deleted)
+
+    for obj in session.new:
+        if type(obj) in _ENTITY:
+            record(obj, deleted=False)
+    for obj in session.dirty:
+        if type(obj) not in _ENTITY:
+            continue
+        if isinstance(obj, Project):
+            history = inspect(obj).attrs.deleted_at.history
+            if history.added and history.added[0] is not None and not any(history.deleted):
+                add("projects", obj.id, obj.id, deleted=True)
+                vacated.append(obj.id)
+                continue
+            if not _columns_changed(obj):
+                for user_id, removed in _membership_changes(obj):
+                    add("memberships", user_id, obj.id, removed)
+                continue
+        elif not _columns_changed(obj):
+            continue
+        if isinstance(obj, Task):
+            previous = inspect(obj).attrs.project_id.history.deleted
+            if previous and previous[0] not in (None, obj.project_id):
+                add("tasks", obj.id, previous[0], deleted=True)
+            previous = inspect(obj).attrs.assignee_id.history.deleted
+            if previous and previous[0] not in (None, obj.assignee_id):
+                add("tasks", obj.id, obj.project_id, deleted=True, assignee_id=previous[0])
+        record(obj, deleted=False)
+    for obj in session.deleted:
+        if type(obj) in _ENTITY:
+            record(obj, deleted=True)
+
+    if comments:
+        tasks = _comment_tasks(session, comments)
+        for comment, deleted in comments:
+            project_id, assignee_id = tasks.get(comment.task_id, (None, None))
+            add("comments", comment.id, project_id, deleted, assignee_id)
+
+    connection = session.connection()
+    if entries:
+        connection.execute(insert(change_log), entries)
+    for project_id in vacated:
+        _record_project_rows(connection, project_id, deleted=True, now=now, memberships=True)
+
+
+def _record_project_rows(connection, project_id: int, deleted: bool, now: datetime, memberships: bool = False) -> None:
+    columns = ["entity", "entity_id", "project_id", "assignee_id", "deleted", "changed_at"]
+    flags = (literal(deleted), literal(now, change_log.c.changed_at.type))
+    nobody = literal(None, change_log.c.assignee_id.type)
+    sources = [
+        select(literal("tasks"), _tasks.c.id, _tasks.c.project_id, _tasks.c.assignee_id, *flags).where(
+            _tasks.c.project_id == project_id
+        ),
+        select(literal("user_stories"), _stories.c.id, _stories.c.project_id, nobody, *flags).where(
+            _stories.c.project_id == project_id
+        ),
+        select(literal("comments"), _comments.c.id, _tasks.c.project_id, _tasks.c.assignee_id, *flags).join_from(
+            _comments, _tasks, _comments.c.task_id == _tasks.c.id
+        ).where(_tasks.c.project_id == project_id),
+    ]
+    if memberships:
+        sources.append(
+            select(
+                literal("memberships"), project_members.c.user_id, project_members.c.project_id, nobody, *flags
+            ).where(project_members.c.project_id == project_id)
+        )
+    for source in sources:
+        connection.execute(insert(change_log).from_select(columns, source))
+
+
+def record_project_rows(db: Session, project_id: int, deleted: bool) -> None:
+    """Record the project and every task, story and comment it has in the hot tables."""
+    now = datetime.now(timezone.utc)
+    connection = db.connection()
+    connection.execute(insert(change_log).values(
+        entity="projects", entity_id=project_id, project_id=project_id, deleted=False, changed_at=now
+    ))
+    _record_project_rows(connection, project_id, deleted, now)
+
+
+def record_tasks(connection, condition) -> None:
+    """Record the hot-table tasks matching ``condition`` as changed."""
+    flags = (literal(False), literal(datetime.now(timezone.utc), change_log.c.changed_at.type))
+    connection.execute(insert(change_log).from_select(
+        ["entity", "entity_id", "project_id", "assignee_id", "deleted", "changed_at"],
+        select(literal("tasks"), _tasks.c.id, _tasks.c.project_id, _tasks.c.assignee_id, *flags).where(condition),
+    ))
+
+
+def prune_change_log(db: Session, now: Optional[datetime] = None) -> int:
+    """Delete entries past the retention window and return how many went."""
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=settings.sync_log_retention_days)
+    # The newest entry always stays, so the oldest kept seq shows which tokens are still valid.
+    newest = select(func.max(change_log.c.seq)).scalar_subquery()
+    result = db.execute(delete(change_log).where(change_log.c.changed_at < cutoff, change_log.c.seq < newest))
+    db.commit()
+    if result.rowcount:
+        logger.info("Pruned %d change log entries", result.rowcount)
+    return result.rowcount
\ No newline at end of file
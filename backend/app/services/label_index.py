@@ -0,0 +1,401 @@
+"""Label filters: boolean label expressions and a per-project bitmap index.
+
+Task lists take a label expression such as
+``backend and (bug or regression) and not "customer x"``: label names,
+bare or double-quoted, combined with ``and``, ``or``, ``not`` and
+parentheses (``not`` binds tightest, then ``and``). A name no label has
+matches no task.
+
+An expression always compiles to SQL (``label_condition``), which works
+for any task query and for the archive tier. For a single project the
+``LabelIndex`` evaluates it in memory first: every label is a bitset over
+the project's tasks, numbered densely from 0 in id order, so a project of
+50,000 tasks needs about 6 KB per label however ids of other projects
+interleave, and ``and``/``or``/``not`` are single big-integer operations
+taking microseconds. When the match is small enough the task query gets
+its ids; when it matches too many, the SQL form is used, as a broad filter
+finds a page of rows quickly anyway.
+
+Indexes are cached per project in each worker (``label_index``) and kept
+up to date from the flush hooks below: tasks added or deleted, labels
+added, renamed or deleted, and labels put on or taken off tasks. A task
+whose labels change, or one of whose labels is renamed or deleted, also
+gets a new ``updated_at`` and a change log entry, as its representation
+changed. That entry is how an index hears of writes made by other workers:
+it remembers the project's last change log ``seq`` it has seen, and a read
+that finds a newer one reloads the labels and the tasks logged since.
+Indexes are shared by every user of a worker, so ``read_label_index``
+loads and checks them on the primary, never on a replica that may lag.
+"""
+import re
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, TypeVar, Union
+
+from sqlalchemy import and_, delete, event, func, inspect, not_, or_, select, update
+from sqlalchemy.orm import Session
+
+from ..core.database import SessionLocal
+from ..models.archive import archived_task_labels
+from ..models.change_log import change_log
+from ..models.label import Label, task_labels
+from ..models.task import Task
+from .change_log import record_tasks
+from .project_cache import ProjectCache
+
+_tasks = Task.__table__
+_labels = Label.__table__
+T = TypeVar("T")
+
+_TOKEN = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|([^\s()"]+))')
+_OPERATORS = ("and", "or", "not")
+
+
+class LabelExpressionError(ValueError):
+    pass
+
+
+class LabelTerm(NamedTuple):
+    name: str
+
+
+class LabelNot(NamedTuple):
+    operand: "LabelExpression"
+
+
+class LabelAnd(NamedTuple):
+    operands: Tuple["LabelExpression", ...]
+
+
+class LabelOr(NamedTuple):
+    operands: Tuple["LabelExpression", ...]
+
+
+LabelExpression = Union[LabelTerm, LabelNot, LabelAnd, LabelOr]
+
+
+def _tokenize(text: str) -> List[Tuple[str, Optional[str]]]:
+    tokens, position, text = [], 0, text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None:
+            raise LabelExpressionError(f"Unexpected character at position {position}")
+        position = match.end()
+        opening, closing, quoted, word = match.groups()
+        if opening or closing:
+            tokens.append((opening or closing, None))
+        elif quoted is not None:
+            tokens.append(("name", quoted))
+        elif word.lower() in _OPERATORS:
+            tokens.append((word.lower(), None))
+        else:
+            tokens.append(("name", word))
+    return tokens
+
+
+def parse_label_expression(text: str) -> LabelExpression:
+    """Parse a label expression; raises ``LabelExpressionError`` if it is malformed."""
+    tokens = _tokenize(text)
+    position = 0
+
+    def peek() -> Optional[str]:
+        return tokens[position][0] if position < len(tokens) else None
+
+    def take(kind: str) -> Optional[str]:
+        nonlocal position
+        if peek() != kind:
+            found = f"'{tokens[position][1] or tokens[position][0]}'" if position < len(tokens) else "end of expression"
+            raise LabelExpressionError(f"Expected {kind} but found {found}")
+        position += 1
+        return tokens[position - 1][1]
+
+    def either() -> LabelExpression:
+        operands = [both()]
+        while peek() == "or":
+            take("or")
+            operands.append(both())
+        return operands[0] if len(operands) == 1 else LabelOr(tuple(operands))
+
+    def both() -> LabelExpression:
+        operands = [operand()]
+        while peek() == "and":
+            take("and")
+            operands.append(operand())
+        return operands[0] if len(operands) == 1 else LabelAnd(tuple(operands))
+
+    def operand() -> LabelExpression:
+        if peek() == "not":
+            take("not")
+            return LabelNot(operand())
+        if peek() == "(":
+            take("(")
+            inner = either()
+            take(")")
+            return inner
+        return LabelTerm(take("name"))
+
+    expression = either()
+    if position < len(tokens):
+        take("end of expression")
+    return expression
+
+
+def label_condition(expression: LabelExpression, tasks=_tasks, links=task_labels):
+    """WHERE clause for ``tasks`` (hot or archive tier), whose task-label links are in ``links``."""
+    if isinstance(expression, LabelTerm):
+        return tasks.c.id.in_(
+            select(links.c.task_id).join(_labels, _labels.c.id == links.c.label_id).where(
+                _labels.c.name == expression.name
+            )
+        )
+    if isinstance(expression, LabelNot):
+        return not_(label_condition(expression.operand, tasks, links))
+    operands = [label_condition(operand, tasks, links) for operand in expression.operands]
+    return and_(*operands) if isinstance(expression, LabelAnd) else or_(*operands)
+
+
+class LabelChange(NamedTuple):
+    """A task added or deleted, a label added, renamed or deleted, or a label put on or taken off a task."""
+    kind: str
+    task_id: Optional[int] = None
+    label_id: Optional[int] = None
+    name: Optional[str] = None
+
+
+def _bitset(ordinals: Iterable[int], size: int) -> int:
+    # One pass over a byte buffer; setting bits one at a time on an int
+    # copies the whole number for every bit.
+    buffer = bytearray((size + 7) // 8)
+    for ordinal in ordinals:
+        buffer[ordinal >> 3] |= 1 << (ordinal & 7)
+    return int.from_bytes(buffer, "little")
+
+
+class LabelIndex:
+    """One bitset per label over a project's tasks, numbered densely from 0."""
+
+    def __init__(
+        self, task_ids: Iterable[int], labels: Iterable[Tuple[int, str]], links: Iterable[Tuple[int, int]],
+        seq: int = 0,
+    ):
+        # The project's last change log entry reflected in the index.
+        self.seq = seq
+        self._ordinals: Dict[int, int] = {}
+        # Ordinal -> task id; new tasks get the next ordinal, so ids ascend with ordinals.
+        self._task_ids: List[int] = []
+        for task_id in task_ids:
+            self._ordinals[task_id] = len(self._task_ids)
+            self._task_ids.append(task_id)
+        self.tasks = (1 << len(self._task_ids)) - 1
+        self._label_ids: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        self._bits: Dict[int, int] = {}
+        for label_id, name in labels:
+            self._label_ids[name], self._names[label_id], self._bits[label_id] = label_id, name, 0
+        ordinals = defaultdict(list)
+        for task_id, label_id in links:
+            if task_id in self._ordinals and label_id in self._bits:
+                ordinals[label_id].append(self._ordinals[task_id])
+        for label_id, label_ordinals in ordinals.items():
+            self._bits[label_id] = _bitset(label_ordinals, len(self._task_ids))
+
+    def _ordinal(self, task_id: int) -> int:
+        ordinal = self._ordinals.get(task_id)
+        if ordinal is None:
+            ordinal = self._ordinals[task_id] = len(self._task_ids)
+            self._task_ids.append(task_id)
+            self.tasks |= 1 << ordinal
+        return ordinal
+
+    def apply(self, changes: Iterable[LabelChange]) -> None:
+        for change in changes:
+            if change.kind == "task":
+                self._ordinal(change.task_id)
+            elif change.kind == "task_deleted":
+                ordinal = self._ordinals.pop(change.task_id, None)
+                if ordinal is not None:
+                    # The ordinal stays unused until the index is next loaded.
+                    self.tasks &= ~(1 << ordinal)
+                    self._unlink_all(ordinal)
+            elif change.kind == "label":
+                previous = self._names.get(change.label_id)
+                if previous is not None:
+                    self._label_ids.pop(previous, None)
+                self._label_ids[change.name], self._names[change.label_id] = change.label_id, change.name
+                self._bits.setdefault(change.label_id, 0)
+            elif change.kind == "label_deleted":
+                self._label_ids.pop(self._names.pop(change.label_id, None), None)
+                self._bits.pop(change.label_id, None)
+            elif change.label_id in self._bits:
+                bit = 1 << self._ordinal(change.task_id)
+                if change.kind == "link":
+                    self._bits[change.label_id] |= bit
+                else:
+                    self._bits[change.label_id] &= ~bit
+
+    def _unlink_all(self, ordinal: int) -> None:
+        keep = ~(1 << ordinal)
+        for label_id in self._bits:
+            self._bits[label_id] &= keep
+
+    def reload(
+        self, labels: Iterable[Tuple[int, str]], task_ids: Iterable[int], present: Iterable[int],
+        links: Iterable[Tuple[int, int]],
+    ) -> None:
+        """Replace the labels, and the links of ``task_ids``, of which the ones not ``present`` are gone."""
+        names = dict(labels)
+        self._bits = {label_id: self._bits.get(label_id, 0) for label_id in names}
+        self._names = names
+        self._label_ids = {name: label_id for label_id, name in names.items()}
+        present = set(present)
+        self.apply(LabelChange("task_deleted", task_id) for task_id in task_ids if task_id not in present)
+        for task_id in sorted(present):
+            self._unlink_all(self._ordinal(task_id))
+        self.apply(LabelChange("link", task_id, label_id) for task_id, label_id in links if task_id in present)
+
+    def evaluate(self, expression: LabelExpression) -> int:
+        """Bitset of the tasks matching ``expression``."""
+        if isinstance(expression, LabelTerm):
+            return self._bits.get(self._label_ids.get(expression.name), 0)
+        if isinstance(expression, LabelNot):
+            return self.tasks & ~self.evaluate(expression.operand)
+        bits = self.tasks if isinstance(expression, LabelAnd) else 0
+        for operand in expression.operands:
+            if isinstance(expression, LabelAnd):
+                bits &= self.evaluate(operand)
+            else:
+                bits |= self.evaluate(operand)
+        return bits
+
+    def task_ids(self, bits: int) -> List[int]:
+        """Ids of the tasks in ``bits``, ascending."""
+        if not bits:
+            return []
+        # The binary digits, lowest first; finditer walks them in C.
+        digits = format(bits, "b")[::-1]
+        return [self._task_ids[match.start()] for match in re.finditer("1", digits)]
+
+    def matching(self, expression: LabelExpression, limit: int) -> Optional[List[int]]:
+        """Ids of the tasks matching ``expression``, or None if there are more than ``limit``."""
+        bits = self.evaluate(expression)
+        return self.task_ids(bits) if bits.bit_count() <= limit else None
+
+    def counts(self) -> Dict[int, int]:
+        """Number of tasks carrying each label."""
+        return {label_id: bits.bit_count() for label_id, bits in self._bits.items()}
+
+
+def _last_seq(connection, project_id: int) -> int:
+    return connection.execute(
+        select(func.max(change_log.c.seq)).where(change_log.c.project_id == project_id)
+    ).scalar() or 0
+
+
+def load_label_index(db: Session, project_id: int) -> LabelIndex:
+    # Read first: a write landing while the rows load is then caught up
+    # again on the next read, which is harmless.
+    seq = _last_seq(db.connection(), project_id)
+    task_ids = db.execute(
+        select(_tasks.c.id).where(_tasks.c.project_id == project_id).order_by(_tasks.c.id)
+    ).scalars().all()
+    labels = db.execute(select(_labels.c.id, _labels.c.name).where(_labels.c.project_id == project_id)).all()
+    links = db.execute(
+        select(task_labels.c.task_id, task_labels.c.label_id)
+        .join(_labels, _labels.c.id == task_labels.c.label_id)
+        .where(_labels.c.project_id == project_id)
+    ).all()
+    return LabelIndex(task_ids, labels, links, seq)
+
+
+def catch_up_label_index(db: Session, project_id: int, index: LabelIndex) -> bool:
+    """Reload what the project's change log has recorded since the index last looked."""
+    # Core statements: this runs before every read, and needs none of the ORM's query hooks.
+    connection = db.connection()
+    seq = _last_seq(connection, project_id)
+    if seq <= index.seq:
+        return False
+    changed = select(change_log.c.entity_id).where(
+        change_log.c.project_id == project_id, change_log.c.entity == "tasks",
+        change_log.c.seq > index.seq, change_log.c.seq <= seq,
+    ).distinct()
+    task_ids = connection.execute(changed).scalars().all()
+    labels = connection.execute(select(_labels.c.id, _labels.c.name).where(_labels.c.project_id == project_id)).all()
+    # By primary key: a project_id condition would have SQLite scan the whole project.
+    present = [
+        task_id for task_id, task_project_id in connection.execute(
+            select(_tasks.c.id, _tasks.c.project_id).where(_tasks.c.id.in_(changed))
+        ) if task_project_id == project_id
+    ]
+    links = connection.execute(
+        select(task_labels.c.task_id, task_labels.c.label_id)
+        .join(_labels, _labels.c.id == task_labels.c.label_id)
+        .where(_labels.c.project_id == project_id, task_labels.c.task_id.in_(changed))
+    ).all()
+    index.reload(labels, task_ids, present, links)
+    index.seq = seq
+    return True
+
+
+label_index: ProjectCache[LabelIndex] = ProjectCache(
+    "label_index", load_label_index, "label_index_cache_ttl_seconds", "label_index_cache_size",
+    refresh=catch_up_label_index,
+)
+
+
+def read_label_index(project_id: int, view: Callable[[LabelIndex], T]) -> T:
+    """``view`` of the project's label index, loaded and caught up on the primary."""
+    with SessionLocal() as db:
+        db.info["read_only"] = True
+        return label_index.read(db, project_id, view)
+
+
+def _touch(connection, condition) -> None:
+    """Mark the tasks matching ``condition`` changed, for ETags and synced clients."""
+    connection.execute(update(_tasks).where(condition).values(updated_at=func.now()))
+    record_tasks(connection, condition)
+
+
+def _carrying(label_ids: List[int]):
+    return _tasks.c.id.in_(select(task_labels.c.task_id).where(task_labels.c.label_id.in_(label_ids)))
+
+
+@event.listens_for(Session, "before_flush")
+def _unlink_deleted_labels(session, flush_context, instances):
+    # Before the DELETE, whose cascade would take the links along on databases that enforce it.
+    label_ids = [obj.id for obj in session.deleted if isinstance(obj, Label)]
+    if label_ids:
+        connection = session.connection()
+        _touch(connection, _carrying(label_ids))
+        for links in (task_labels, archived_task_labels):
+            connection.execute(delete(links).where(links.c.label_id.in_(label_ids)))
+
+
+@event.listens_for(Session, "after_flush")
+def _record_label_changes(session, flush_context):
+    relabelled, renamed = [], []
+    for obj in session.new:
+        if isinstance(obj, Task):
+            label_index.stage(session, obj.project_id, LabelChange("task", obj.id))
+        elif isinstance(obj, Label):
+            label_index.stage(session, obj.project_id, LabelChange("label", label_id=obj.id, name=obj.name))
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, Task):
+            history = inspect(obj).attrs.labels.history
+            for label in history.added:
+                label_index.stage(session, obj.project_id, LabelChange("link", obj.id, label.id))
+            for label in history.deleted:
+                label_index.stage(session, obj.project_id, LabelChange("unlink", obj.id, label.id))
+            if obj not in session.new and (history.added or history.deleted):
+                relabelled.append(obj.id)
+        elif isinstance(obj, Label) and obj not in session.new and inspect(obj).attrs.name.history.has_changes():
+            renamed.append(obj.id)
+            label_index.stage(session, obj.project_id, LabelChange("label", label_id=obj.id, name=obj.name))
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            label_index.stage(session, obj.project_id, LabelChange("task_deleted", obj.id))
+        elif isinstance(obj, Label):
+            label_index.stage(session, obj.project_id, LabelChange("label_deleted", label_id=obj.id))
+
+    if relabelled:
+        _touch(session.connection(), _tasks.c.id.in_(relabelled))
+    if renamed:
+        _touch(session.connection(), _carrying(renamed))
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""Per-worker caches of in-memory structures built from one project's rows.
+
+A ``ProjectCache`` keeps the most recently used projects' structures (the
+dependency graph of ``services.task_graph``, the label index of
+``services.label_index``) for a limited time. Loading one is the expensive
+part, so committed changes are applied to the cached copy instead of
+reloading it: flush hooks ``stage`` what a transaction changed, and after
+the commit the changes are queued on the projects' cached structures, which
+apply them on the next read. A rollback drops them.
+
+Writes made through other workers, or through Core statements that bypass
+the hooks, are seen once the cached copy expires, unless the writer calls
+``invalidate`` or the cache has a ``refresh`` that brings the copy up to
+date on every read (the label index follows the change log).
+"""
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Callable, Dict, Generic, Iterable, List, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+
+S = TypeVar("S")
+T = TypeVar("T")
+
+
+class _Entry(Generic[S]):
+    def __init__(self, state: S, ttl_seconds: float):
+        self.state = state
+        self.expires = time.monotonic() + ttl_seconds
+        self.pending: List = []
+        # Held while the state is updated or read.
+        self.lock = threading.Lock()
+
+
+class ProjectCache(Generic[S]):
+    """Most recently used per-project states, each kept for ``settings.<ttl_setting>`` seconds.
+
+    ``load(db, project_id)`` builds a state, and ``state.apply(changes)``
+    updates one with a list of staged changes. ``refresh(db, project_id,
+    state)``, if given, runs before every read and returns True when it
+    caught the state up with the database, which makes the staged changes
+    redundant.
+    """
+
+    def __init__(
+        self, name: str, load: Callable[[Session, int], S], ttl_setting: str, size_setting: str,
+        refresh: Optional[Callable[[Session, int, S], bool]] = None,
+    ):
+        self._load = load
+        self._refresh = refresh
+        self._ttl_setting = ttl_setting
+        self._size_setting = size_setting
+        self._info_key = f"{name}_changes"
+        self._entries: "OrderedDict[int, _Entry[S]]" = OrderedDict()
+        # Bumped on every change, so a state loaded from older rows is not cached.
+        self._generations: Dict[int, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        event.listen(Session, "after_commit", self._queue_staged)
+        event.listen(Session, "after_rollback", self._forget_staged)
+
+    def read(self, db: Session, project_id: int, view: Callable[[S], T]) -> T:
+        """``view`` of the project's current state, loading it first if it is not cached."""
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is not None and entry.expires >= time.monotonic():
+                self._entries.move_to_end(project_id)
+            else:
+                entry = None
+            generation = self._generations[project_id]
+        if entry is None:
+            entry = _Entry(self._load(db, project_id), getattr(settings, self._ttl_setting))
+            with self._lock:
+                if self._generations[project_id] == generation:
+                    self._entries[project_id] = entry
+                    while len(self._entries) > getattr(settings, self._size_setting):
+                        self._entries.popitem(last=False)
+        with entry.lock:
+            with self._lock:
+                pending, entry.pending = entry.pending, []
+            if self._refresh is not None and self._refresh(db, project_id, entry.state):
+                # Committed before it was taken, so the database already has it.
+                pending = []
+            if pending:
+                entry.state.apply(pending)
+            return view(entry.state)
+
+    def stage(self, session: Session, project_id: int, change) -> None:
+        """Hold a change flushed in ``session`` until its transaction commits."""
+        session.info.setdefault(self._info_key, defaultdict(list))[project_id].append(change)
+
+    def record(self, changes: Dict[int, List]) -> None:
+        """Queue committed changes on the cached states of their projects."""
+        with self._lock:
+            for project_id, project_changes in changes.items():
+                self._generations[project_id] += 1
+                entry = self._entries.get(project_id)
+                if entry is not None:
+                    entry.pending.extend(project_changes)
+
+    def invalidate(self, project_ids: Iterable[int]) -> None:
+        with self._lock:
+            for project_id in project_ids:
+                self._generations[project_id] += 1
+                self._entries.pop(project_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _queue_staged(self, session: Session) -> None:
+        changes = session.info.pop(self._info_key, None)
+        if changes:
+            self.record(changes)
+
+    def _forget_staged(self, session: Session) -> None:
+        session.info.pop(self._info_key, None)
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""Denormalized task counters on ``projects``.
+
+``task_count``, ``completed_count`` and ``overdue_count`` are adjusted in
+the same transaction as every ORM insert, update or delete of a task, with
+``SET count = count + delta`` so concurrent writers never lose updates.
+Tasks written through Core statements (bulk loads, the purge) bypass this,
+and a task becomes overdue simply by time passing, so
+``reconcile_project_counters`` recounts from ``tasks`` and repairs any
+drift; it runs periodically and on demand. Archived projects are skipped:
+their counters describe the tasks in the archive tables.
+"""
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, case, event, func, inspect, select, update
+from sqlalchemy.orm import Session
+
+from ..models.project import Project
+from ..models.task import Task, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+_COUNTERS = ("task_count", "completed_count", "overdue_count")
+_TRACKED = ("project_id", "status", "due_date")
+_UNKNOWN = object()
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns naive datetimes for timezone-aware columns.
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _contribution(status, due_date, now: datetime) -> Dict[str, int]:
+    done = status == TaskStatus.DONE
+    return {
+        "task_count": 1,
+        "completed_count": int(done),
+        "overdue_count": int(not done and due_date is not None and _as_utc(due_date) < now),
+    }
+
+
+def _previous(task: Task, key: str):
+    """Value ``key`` had when the task was loaded, or ``_UNKNOWN``."""
+    history = inspect(task).attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return _UNKNOWN if history.added else None
+
+
+def _apply(deltas: Dict[int, Dict[str, int]], project_id: Optional[int], contribution, sign: int) -> None:
+    if project_id is None:
+        return
+    for counter, value in contribution.items():
+        deltas[project_id][counter] += sign * value
+
+
+def _task_deltas(session: Session):
+    now = datetime.now(timezone.utc)
+    deltas: Dict[int, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+    recount = set()
+    for obj in session.new:
+        if isinstance(obj, Task):
+            _apply(deltas, obj.project_id, _contribution(obj.status, obj.due_date, now), 1)
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            _apply(deltas, obj.project_id, _contribution(obj.status, obj.due_date, now), -1)
+    for obj in session.dirty:
+        if not isinstance(obj, Task) or not session.is_modified(obj):
+            continue
+        state = inspect(obj)
+        if not any(state.attrs[key].history.has_changes() for key in _TRACKED):
+            continue
+        previous = [_previous(obj, key) for key in _TRACKED]
+        if _UNKNOWN in previous:
+            # The old values were never loaded; recount the affected projects instead.
+            recount.update(project_id for project_id in (previous[0], obj.project_id)
+                           if project_id not in (None, _UNKNOWN))
+            continue
+        old_project, old_status, old_due = previous
+        _apply(deltas, old_project, _contribution(old_status, old_due, now), -1)
+        _apply(deltas, obj.project_id, _contribution(obj.status, obj.due_date, now), 1)
+    return deltas, recount
+
+
+@event.listens_for(Session, "after_flush")
+def _update_counters(session, flush_context):
+    deltas, recount = _task_deltas(session)
+    # Tasks deleted along with their project need no counter updates.
+    deleted = {obj.id for obj in session.deleted if isinstance(obj, Project)}
+    connection = session.connection()
+    for project_id, delta in sorted(deltas.items()):
+        values = {
+            counter: getattr(Project, counter) + value for counter, value in delta.items() if value
+        }
+        if values and project_id not in recount and project_id not in deleted:
+            connection.execute(update(Project).where(Project.id == project_id).values(**values))
+    if recount:
+        connection.execute(_recount_statement(recount - deleted))
+
+
+def _overdue(now: datetime):
+    return and_(Task.due_date.is_not(None), Task.due_date < now, Task.status != TaskStatus.DONE)
+
+
+def _recount_statement(project_ids: Iterable[int], now: Optional[datetime] = None):
+    overdue = _overdue(now or datetime.now(timezone.utc))
+
+    def count(condition=None):
+        query = select(func.count(Task.id)).where(Task.project_id == Project.id)
+        if condition is not None:
+            query = query.where(condition)
+        return query.scalar_subquery()
+
+    return (
+        update(Project)
+        .where(Project.id.in_(list(project_ids)))
+        .values(
+            task_count=count(),
+            completed_count=count(Task.status == TaskStatus.DONE),
+            overdue_count=count(overdue),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def reconcile_project_counters(db: Session, project_ids: Optional[Iterable[int]] = None) -> List[int]:
+    """Recount task counters from ``tasks`` and return the ids of projects that had drifted."""
+    now = datetime.now(timezone.utc)
+    overdue = _overdue(now)
+    actual = (
+        select(
+            Task.project_id,
+            func.count(Task.id).label("task_count"),
+            func.sum(case((Task.status == TaskStatus.DONE, 1), else_=0)).label("completed_count"),
+            func.sum(case((overdue, 1), else_=0)).label("overdue_count"),
+        )
+        .group_by(Task.project_id)
+        .subquery()
+    )
+    query = select(
+        Project.id,
+        Project.task_count, Project.completed_count, Project.overdue_count,
+        func.coalesce(actual.c.task_count, 0),
+        func.coalesce(actual.c.completed_count, 0),
+        func.coalesce(actual.c.overdue_count, 0),
+    ).outerjoin(actual, actual.c.project_id == Project.id).where(
+        # Archived projects keep the counters they had when their tasks moved out.
+        Project.archived_at.is_(None)
+    )
+    if project_ids is not None:
+        query = query.where(Project.id.in_(list(project_ids)))
+
+    drifted = [row[0] for row in db.execute(query) if tuple(row[1:4]) != tuple(row[4:7])]
+    if drifted:
+        logger.warning("Repairing task counters of %d project(s): %s", len(drifted), drifted[:20])
+        db.execute(_recount_statement(drifted, now))
+    db.commit()
+    return drifted
@@ -0,0 +1,133 @@
+"""Background removal of soft-deleted projects and users.
+
+Children are removed in batches of ``purge_batch_size`` rows, each batch in
+its own short transaction, so purging a project with tens of thousands of
+tasks never holds long locks or runs into request timeouts. The final
+``DELETE`` of the project or user row only has the ``ON DELETE`` actions on
+small tables left to do.
+"""
+import logging
+from typing import Dict, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.archive import (
+    archived_attachments, archived_task_closure, archived_task_comments, archived_task_dependencies,
+    archived_task_labels, archived_task_time_rollups, archived_tasks, archived_time_entries, archived_user_stories
+)
+from ..models.attachment import Attachment
+from ..models.label import Label, task_labels
+from ..models.project import Project, project_members
+from ..models.task import Task, TaskComment
+from ..models.task_closure import TaskClosure
+from ..models.task_dependency import TaskDependency
+from ..models.time_entry import ProjectTimeRollup, TaskTimeRollup, TimeEntry
+from ..models.user import User
+from ..models.user_story import UserStory
+
+logger = logging.getLogger(__name__)
+
+# Core tables: the purge works below the ORM and sees soft-deleted rows.
+_projects = Project.__table__
+_tasks = Task.__table__
+_comments = TaskComment.__table__
+_attachments = Attachment.__table__
+_dependencies = TaskDependency.__table__
+_closure = TaskClosure.__table__
+_stories = UserStory.__table__
+_labels = Label.__table__
+_time_entries = TimeEntry.__table__
+_time_rollups = TaskTimeRollup.__table__
+_project_time_rollups = ProjectTimeRollup.__table__
+_users = User.__table__
+# (tasks, comments, attachments, dependencies, subtask links, label links, time entries, task time rollups,
+# stories) of the hot and the archive tier.
+_TIERS = (
+    (_tasks, _comments, _attachments, _dependencies, _closure, task_labels, _time_entries, _time_rollups, _stories),
+    (archived_tasks, archived_task_comments, archived_attachments, archived_task_dependencies, archived_task_closure,
+     archived_task_labels, archived_time_entries, archived_task_time_rollups, archived_user_stories),
+)
+
+
+def _in_batches(db: Session, table, condition, apply, batch_size: int, key: str = "id") -> int:
+    """Apply ``apply(ids)`` to the ``key`` values of ``table`` rows matching ``condition``, one batch per commit."""
+    total = 0
+    while True:
+        ids = db.execute(select(table.c[key]).where(condition).limit(batch_size)).scalars().all()
+        if not ids:
+            return total
+        db.execute(apply(ids))
+        db.commit()
+        total += len(ids)
+
+
+def purge_project(db: Session, project_id: int, batch_size: int) -> None:
+    for tasks, comments, attachments, dependencies, closure, links, entries, time_rollups, stories in _TIERS:
+        project_tasks = select(tasks.c.id).where(tasks.c.project_id == project_id)
+        _in_batches(db, dependencies, dependencies.c.project_id == project_id,
+                    lambda ids: delete(dependencies).where(dependencies.c.id.in_(ids)), batch_size)
+        _in_batches(db, closure, closure.c.project_id == project_id,
+                    lambda ids: delete(closure).where(closure.c.id.in_(ids)), batch_size)
+        _in_batches(db, links, links.c.task_id.in_(project_tasks),
+                    lambda ids: delete(links).where(links.c.id.in_(ids)), batch_size)
+        # Attachment files are left to the blob store's sweep.
+        _in_batches(db, attachments, attachments.c.task_id.in_(project_tasks),
+                    lambda ids: delete(attachments).where(attachments.c.id.in_(ids)), batch_size)
+        _in_batches(db, comments, comments.c.task_id.in_(project_tasks),
+                    lambda ids: delete(comments).where(comments.c.id.in_(ids)), batch_size)
+        _in_batches(db, entries, entries.c.project_id == project_id,
+                    lambda ids: delete(entries).where(entries.c.id.in_(ids)), batch_size)
+        _in_batches(db, time_rollups, time_rollups.c.project_id == project_id,
+                    lambda ids: delete(time_rollups).where(time_rollups.c.task_id.in_(ids)), batch_size, key="task_id")
+        _in_batches(db, tasks, tasks.c.project_id == project_id,
+                    lambda ids: delete(tasks).where(tasks.c.id.in_(ids)), batch_size)
+        _in_batches(db, stories, stories.c.project_id == project_id,
+                    lambda ids: delete(stories).where(stories.c.id.in_(ids)), batch_size)
+    _in_batches(db, _project_time_rollups, _project_time_rollups.c.project_id == project_id,
+                lambda ids: delete(_project_time_rollups).where(_project_time_rollups.c.id.in_(ids)), batch_size)
+    db.execute(delete(_labels).where(_labels.c.project_id == project_id))
+    db.execute(delete(_projects).where(_projects.c.id == project_id))
+    db.commit()
+
+
+def purge_user(db: Session, user_id: int, batch_size: int) -> bool:
+    # Deleting a user is refused while they manage a project; one that was
+    # soft-deleted since is purged first by purge_deleted.
+    if db.execute(select(_projects.c.id).where(_projects.c.manager_id == user_id).limit(1)).first():
+        logger.warning("Not purging user %s: still manages a project", user_id)
+        return False
+    for tasks, comments, attachments, *_, entries, _, _ in _TIERS:
+        _in_batches(db, tasks, tasks.c.assignee_id == user_id,
+                    lambda ids: update(tasks).where(tasks.c.id.in_(ids)).values(assignee_id=None), batch_size)
+        _in_batches(db, comments, comments.c.author_id == user_id,
+                    lambda ids: update(comments).where(comments.c.id.in_(ids)).values(author_id=None), batch_size)
+        _in_batches(db, attachments, attachments.c.uploader_id == user_id,
+                    lambda ids: update(attachments).where(attachments.c.id.in_(ids)).values(uploader_id=None),
+                    batch_size)
+        _in_batches(db, entries, entries.c.user_id == user_id,
+                    lambda ids: update(entries).where(entries.c.id.in_(ids)).values(user_id=None), batch_size)
+    _in_batches(db, _project_time_rollups, _project_time_rollups.c.user_id == user_id,
+                lambda ids: update(_project_time_rollups).where(_project_time_rollups.c.id.in_(ids))
+                .values(user_id=None), batch_size)
+    db.execute(delete(project_members).where(project_members.c.user_id == user_id))
+    db.execute(delete(_users).where(_users.c.id == user_id))
+    db.commit()
+    return True
+
+
+def purge_deleted(db: Session, batch_size: Optional[int] = None) -> Dict[str, int]:
+    """Remove every soft-deleted project, then every soft-deleted user."""
+    batch_size = batch_size or settings.purge_batch_size
+    purged = {"projects": 0, "users": 0}
+    project_ids = db.execute(select(_projects.c.id).where(_projects.c.deleted_at.is_not(None))).scalars().all()
+    for project_id in project_ids:
+        purge_project(db, project_id, batch_size)
+        purged["projects"] += 1
+    user_ids = db.execute(select(_users.c.id).where(_users.c.deleted_at.is_not(None))).scalars().all()
+    for user_id in user_ids:
+        purged["users"] += purge_user(db, user_id, batch_size)
+    if project_ids or user_ids:
+        logger.info("Purged %(projects)d project(s) and %(users)d user(s)", purged)
+    return purged
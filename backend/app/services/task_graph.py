@@ -0,0 +1,305 @@
+"""Task dependency graphs: cycle checks, the ready/blocked frontier and the critical path.
+
+Edges are only added when they keep the graph acyclic. The check is a
+recursive query that walks forward from the would-be blocked task and
+stops once it reaches the new blocker, so it only visits what that task
+already blocks and never rebuilds the graph.
+
+Frontier and critical path come from an in-memory ``ProjectGraph``, loaded
+with two queries and kept per project in each worker's ``graph_cache``.
+Loading is the expensive part on large projects, so the graph is not
+reloaded when it changes: the flush hooks below record which tasks and
+edges a transaction added, removed or changed (status and due date), and
+after the commit those changes are queued on the cached graph. The next
+read applies them; the critical path is then recomputed only downstream of
+the changed tasks, and only as far as their finish dates actually move. Core statements bypass the hooks, so the
+archive service invalidates the graph instead, and other workers see a
+change once their copy is older than ``task_graph_cache_ttl_seconds``.
+
+Only open tasks (not done) take part; a done blocker blocks nothing. Tasks
+have no durations, so due dates are the schedule: a task finishes at its
+due date, or when its last blocker does if that is later. The critical
+path is the chain of blockers that determines the latest finish in the
+project, following the latest-finishing blocker at each step; without due
+dates it is the longest chain.
+"""
+import heapq
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, TypeVar
+
+from sqlalchemy import delete, event, inspect, or_, select
+from sqlalchemy.orm import Session
+
+from ..models.task import Task, TaskStatus
+from ..models.task_dependency import TaskDependency
+from .project_cache import ProjectCache
+
+_tasks = Task.__table__
+_dependencies = TaskDependency.__table__
+_TRACKED = ("status", "due_date")
+_EARLIEST = datetime.min
+
+T = TypeVar("T")
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Stored datetimes are UTC, and SQLite returns them naive; the graph
+    # compares them naive so loaded and newly written dates mix.
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class PathStep(NamedTuple):
+    task_id: int
+    # When the task can be done at the earliest: its due date or its last blocker's finish.
+    earliest_finish: Optional[datetime]
+    # Its blockers finish after its due date.
+    is_late: bool
+
+
+class GraphChange(NamedTuple):
+    """A task written (``is_open`` and ``due_date`` set), a task deleted, or an edge added or removed."""
+    kind: str
+    task_id: int
+    blocker_id: Optional[int] = None
+    is_open: bool = True
+    due_date: Optional[datetime] = None
+
+
+class ProjectGraph:
+    def __init__(self, tasks: Iterable[Tuple[int, bool, Optional[datetime]]], edges: Iterable[Tuple[int, int]]):
+        self.due: Dict[int, Optional[datetime]] = {}
+        self.open: Set[int] = set()
+        for task_id, is_open, due_date in tasks:
+            self.due[task_id] = _naive_utc(due_date)
+            if is_open:
+                self.open.add(task_id)
+        # Every edge, done tasks included, so reopening a task needs no reload.
+        self.blockers: Dict[int, Set[int]] = defaultdict(set)
+        self.blocking: Dict[int, Set[int]] = defaultdict(set)
+        for blocked_id, blocker_id in edges:
+            self.blockers[blocked_id].add(blocker_id)
+            self.blocking[blocker_id].add(blocked_id)
+        # A topological order of all tasks is one of every subset too, so it
+        # survives status changes and is only rebuilt when an edge breaks it.
+        self._order: Optional[List[int]] = None
+        self._position: Dict[int, int] = {}
+        # Per open task: earliest finish, rank and the blocker it waits for
+        # longest. Changes mark tasks dirty; see _critical_path.
+        self._finish: Dict[int, Optional[datetime]] = {}
+        self._rank: Dict[int, tuple] = {}
+        self._via: Dict[int, int] = {}
+        self._dirty: Set[int] = set()
+        self._views: Dict[str, object] = {}
+
+    def apply(self, changes: Iterable[GraphChange]) -> None:
+        for change in changes:
+            task_id = change.task_id
+            if change.kind == "task":
+                if task_id not in self.due and self._order is not None:
+                    self._position[task_id] = len(self._order)
+                    self._order.append(task_id)
+                self.due[task_id] = _naive_utc(change.due_date)
+                if change.is_open:
+                    self.open.add(task_id)
+                else:
+                    self.open.discard(task_id)
+                self._dirty.add(task_id)
+            elif change.kind == "task_deleted":
+                self.due.pop(task_id, None)
+                self.open.discard(task_id)
+                for blocker_id in self.blockers.pop(task_id, ()):
+                    self.blocking[blocker_id].discard(task_id)
+                dependents = self.blocking.pop(task_id, set())
+                for blocked_id in dependents:
+                    self.blockers[blocked_id].discard(task_id)
+                self._dirty.add(task_id)
+                self._dirty.update(dependents)
+            elif change.kind == "edge":
+                self.blockers[task_id].add(change.blocker_id)
+                self.blocking[change.blocker_id].add(task_id)
+                position = self._position
+                if self._order is not None and position.get(change.blocker_id, -1) > position.get(task_id, -1):
+                    self._order = None
+                self._dirty.add(task_id)
+            elif change.kind == "edge_deleted":
+                self.blockers[task_id].discard(change.blocker_id)
+                self.blocking[change.blocker_id].discard(task_id)
+                self._dirty.add(task_id)
+        self._views.clear()
+
+    def _view(self, name: str, compute: Callable[[], T]) -> T:
+        if name not in self._views:
+            self._views[name] = compute()
+        return self._views[name]
+
+    def _topological_order(self) -> List[int]:
+        if self._order is None:
+            due = self.due
+            remaining = {
+                task_id: sum(1 for blocker_id in self.blockers.get(task_id, ()) if blocker_id in due)
+                for task_id in due
+            }
+            queue = deque(sorted(task_id for task_id, count in remaining.items() if count == 0))
+            order = []
+            while queue:
+                task_id = queue.popleft()
+                order.append(task_id)
+                for blocked_id in self.blocking.get(task_id, ()):
+                    if blocked_id in remaining:
+                        remaining[blocked_id] -= 1
+                        if remaining[blocked_id] == 0:
+                            queue.append(blocked_id)
+            # Tasks on a cycle (only possible through writes that skip the check) are left out.
+            self._order = order
+            self._position = {task_id: position for position, task_id in enumerate(order)}
+            # Positions changed, so everything is recomputed.
+            self._finish.clear()
+            self._rank.clear()
+            self._via.clear()
+            self._dirty = set(self.open)
+        return self._order
+
+    @property
+    def frontier(self) -> Tuple[List[int], Dict[int, List[int]]]:
+        """Open tasks ready to work on, and the open ones still blocked with their open blockers."""
+        def compute():
+            ready, blocked = [], {}
+            is_open = self.open.__contains__
+            for task_id in sorted(self.open):
+                blockers = self.blockers.get(task_id)
+                blockers = sorted(filter(is_open, blockers)) if blockers else None
+                if blockers:
+                    blocked[task_id] = blockers
+                else:
+                    ready.append(task_id)
+            return ready, blocked
+        return self._view("frontier", compute)
+
+    @property
+    def critical_path(self) -> List[PathStep]:
+        return self._view("critical_path", self._critical_path)
+
+    def _settle(self, task_id: int) -> bool:
+        """Recompute one task from its blockers' values; whether anything changed."""
+        finish, rank, via = self._finish, self._rank, self._via
+        previous = rank.get(task_id), via.get(task_id)
+        if task_id not in self.open:
+            finish.pop(task_id, None)
+            rank.pop(task_id, None)
+            via.pop(task_id, None)
+            return previous[0] is not None
+        due_date = self.due[task_id]
+        blockers = self.blockers.get(task_id)
+        blockers = [blocker_id for blocker_id in blockers if blocker_id in rank] if blockers else None
+        if blockers:
+            latest = max(blockers, key=rank.__getitem__)
+            via[task_id] = latest
+            depth = rank[latest][2] + 1
+            value = finish[latest]
+            if due_date is not None and (value is None or due_date > value):
+                value = due_date
+        else:
+            via.pop(task_id, None)
+            depth, value = 1, due_date
+        finish[task_id] = value
+        # Latest finish first, then the longest chain, then the lowest id.
+        rank[task_id] = (value is not None, value or _EARLIEST, depth, -task_id)
+        return (rank[task_id], via.get(task_id)) != previous
+
+    def _critical_path(self) -> List[PathStep]:
+        order = self._topological_order()
+        position = self._position
+        dirty, self._dirty = self._dirty, set()
+        if len(dirty) * 4 > len(order):
+            for task_id in order:
+                self._settle(task_id)
+        else:
+            # Only what lies downstream of a change, in topological order, and
+            # only as far as values actually change.
+            queue = [(position[task_id], task_id) for task_id in dirty if task_id in position]
+            heapq.heapify(queue)
+            settled = set()
+            while queue:
+                _, task_id = heapq.heappop(queue)
+                if task_id in settled:
+                    continue
+                settled.add(task_id)
+                if self._settle(task_id):
+                    for blocked_id in self.blocking.get(task_id, ()):
+                        if blocked_id in position:
+                            heapq.heappush(queue, (position[blocked_id], blocked_id))
+
+        rank = self._rank
+        end = max(rank, key=rank.__getitem__) if rank else None
+        path = []
+        while end is not None:
+            value, due_date = self._finish[end], self.due[end]
+            path.append(PathStep(
+                end,
+                value.replace(tzinfo=timezone.utc) if value else None,
+                due_date is not None and value > due_date,
+            ))
+            end = self._via.get(end)
+        return path[::-1]
+
+
+def load_project_graph(db: Session, project_id: int) -> ProjectGraph:
+    tasks = db.execute(
+        select(_tasks.c.id, (_tasks.c.status != TaskStatus.DONE).label("is_open"), _tasks.c.due_date)
+        .where(_tasks.c.project_id == project_id)
+    ).all()
+    edges = db.execute(
+        select(_dependencies.c.blocked_id, _dependencies.c.blocker_id).where(_dependencies.c.project_id == project_id)
+    ).all()
+    return ProjectGraph(tasks, edges)
+
+
+graph_cache: ProjectCache[ProjectGraph] = ProjectCache(
+    "task_graph", load_project_graph, "task_graph_cache_ttl_seconds", "task_graph_cache_size"
+)
+
+
+def creates_cycle(db: Session, blocked_id: int, blocker_id: int) -> bool:
+    """Whether ``blocked_id`` already blocks ``blocker_id``, directly or through other tasks."""
+    reach = select(_dependencies.c.blocked_id.label("task_id")).where(
+        _dependencies.c.blocker_id == blocked_id
+    ).cte("reach", recursive=True)
+    reach = reach.union(
+        select(_dependencies.c.blocked_id).join(reach, _dependencies.c.blocker_id == reach.c.task_id)
+    )
+    return db.execute(select(reach.c.task_id).where(reach.c.task_id == blocker_id).limit(1)).first() is not None
+
+
+def _task_change(task: Task) -> GraphChange:
+    return GraphChange("task", task.id, is_open=task.status != TaskStatus.DONE, due_date=task.due_date)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_graph_changes(session, flush_context):
+    changes: List[Tuple[int, GraphChange]] = []
+    deleted_tasks = []
+    for obj in session.new:
+        if isinstance(obj, Task):
+            changes.append((obj.project_id, _task_change(obj)))
+        elif isinstance(obj, TaskDependency):
+            changes.append((obj.project_id, GraphChange("edge", obj.blocked_id, obj.blocker_id)))
+    for obj in session.dirty:
+        if isinstance(obj, Task):
+            state = inspect(obj)
+            if any(state.attrs[key].history.has_changes() for key in _TRACKED):
+                changes.append((obj.project_id, _task_change(obj)))
+    for obj in session.deleted:
+        if isinstance(obj, Task):
+            deleted_tasks.append(obj.id)
+            changes.append((obj.project_id, GraphChange("task_deleted", obj.id)))
+        elif isinstance(obj, TaskDependency):
+            changes.append((obj.project_id, GraphChange("edge_deleted", obj.blocked_id, obj.blocker_id)))
+    if deleted_tasks:
+        session.connection().execute(delete(_dependencies).where(or_(
+            _dependencies.c.blocked_id.in_(deleted_tasks), _dependencies.c.blocker_id.in_(deleted_tasks)
+        )))
+    for project_id, change in changes:
+        graph_cache.stage(session, project_id, change)
\ No newline at end of file
@@ -0,0 +1,201 @@
+"""Subtasks: the closure table and the rollups of every task's subtree.
+
+``Task.parent_id`` is the hierarchy as written. ``task_closure`` mirrors it
+with one row per ancestor and descendant pair, so a whole subtree, or the
+chain above a task, is one indexed lookup at any depth. Each task also
+carries ``subtask_count`` and ``completed_subtask_count`` over all of its
+descendants, so the progress of an epic is read from its own row.
+
+The flush hooks below keep both in step with ORM writes, in the same
+transaction and touching only the rows of the ancestors involved:
+
+* a new subtask is linked to its parent's ancestors and counted by them;
+* a status change moves ``completed_subtask_count`` of the ancestors;
+* a new ``parent_id`` moves the whole subtree: its links to the old
+  ancestors are replaced by links to the new ones in one ``INSERT ...
+  SELECT``, and its counts move along;
+* a deleted task's children move up to its parent.
+
+Counters change with ``SET count = count + delta`` (which also moves
+``updated_at``, so ETags over tasks see new counts), and the ancestors are
+recorded in the change log. Callers make sure a new parent is in the same
+project and not inside the task's own subtree (``in_subtree``). Core
+statements bypass the hooks; the archive and the purge move and delete
+closure rows along with their tasks.
+"""
+from typing import Iterable, List
+
+from sqlalchemy import and_, delete, event, func, insert, inspect, literal, or_, select, true, union_all, update
+from sqlalchemy.orm import Session
+
+from ..models.task import Task, TaskStatus
+from ..models.task_closure import TaskClosure
+from .change_log import record_tasks
+
+_tasks = Task.__table__
+_closure = TaskClosure.__table__
+_UNKNOWN = object()
+
+
+def _previous_status(task: Task):
+    """Status the task had when it was loaded, or ``_UNKNOWN``."""
+    history = inspect(task).attrs.status.history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return _UNKNOWN if history.added else task.status
+
+
+def _ancestor_ids(connection, task_id: int) -> List[int]:
+    return connection.execute(
+        select(_closure.c.ancestor_id).where(_closure.c.descendant_id == task_id)
+    ).scalars().all()
+
+
+def _subtree(task_id: int):
+    """The task and its descendants, as ``descendant_id`` and ``depth`` below the task."""
+    return union_all(
+        select(_closure.c.descendant_id, _closure.c.depth).where(_closure.c.ancestor_id == task_id),
+        select(literal(task_id), literal(0)),
+    ).subquery()
+
+
+def _count(connection, task_ids: List[int], subtasks: int, completed: int) -> None:
+    if not task_ids or not (subtasks or completed):
+        return
+    connection.execute(update(_tasks).where(_tasks.c.id.in_(task_ids)).values(
+        subtask_count=_tasks.c.subtask_count + subtasks,
+        completed_subtask_count=_tasks.c.completed_subtask_count + completed,
+    ))
+    record_tasks(connection, _tasks.c.id.in_(task_ids))
+
+
+def _recount(connection, task_ids: Iterable[int]) -> None:
+    task_ids = list(task_ids)
+    if not task_ids:
+        return
+    below = _tasks.alias("below")
+
+    def count(condition=None):
+        query = select(func.count()).select_from(_closure.join(below, below.c.id == _closure.c.descendant_id))
+        query = query.where(_closure.c.ancestor_id == _tasks.c.id)
+        if condition is not None:
+            query = query.where(condition)
+        return query.scalar_subquery()
+
+    connection.execute(update(_tasks).where(_tasks.c.id.in_(task_ids)).values(
+        subtask_count=count(), completed_subtask_count=count(below.c.status == TaskStatus.DONE),
+    ))
+    record_tasks(connection, _tasks.c.id.in_(task_ids))
+
+
+def _link(connection, project_id: int, parent_id: int, task_id: int) -> List[int]:
+    """Link the task's subtree below ``parent_id`` and its ancestors; returns the task's new ancestors."""
+    chain = union_all(
+        select(_closure.c.ancestor_id, _closure.c.depth).where(_closure.c.descendant_id == parent_id),
+        select(literal(parent_id), literal(0)),
+    ).subquery()
+    subtree = _subtree(task_id)
+    connection.execute(insert(_closure).from_select(
+        ["project_id", "ancestor_id", "descendant_id", "depth"],
+        select(
+            literal(project_id), chain.c.ancestor_id, subtree.c.descendant_id, chain.c.depth + subtree.c.depth + 1
+        ).select_from(chain.join(subtree, true())),
+    ))
+    return _ancestor_ids(connection, task_id)
+
+
+def _unlink(connection, task_id: int, ancestor_ids: List[int]) -> None:
+    """Cut the task's subtree off ``ancestor_ids``, its ancestors so far."""
+    if ancestor_ids:
+        subtree = select(_closure.c.descendant_id).where(_closure.c.ancestor_id == task_id)
+        connection.execute(delete(_closure).where(
+            _closure.c.ancestor_id.in_(ancestor_ids),
+            or_(_closure.c.descendant_id == task_id, _closure.c.descendant_id.in_(subtree)),
+        ))
+
+
+def _move(connection, task: Task, was_done: bool, is_done: bool) -> List[int]:
+    """Move the task's subtree to its new parent; returns the old and new ancestors."""
+    below = connection.execute(
+        select(_tasks.c.subtask_count, _tasks.c.completed_subtask_count).where(_tasks.c.id == task.id)
+    ).one()
+    old = _ancestor_ids(connection, task.id)
+    _count(connection, old, -below.subtask_count - 1, -below.completed_subtask_count - was_done)
+    _unlink(connection, task.id, old)
+    new = []
+    if task.parent_id is not None:
+        new = _link(connection, task.project_id, task.parent_id, task.id)
+        _count(connection, new, below.subtask_count + 1, below.completed_subtask_count + is_done)
+    return old + new
+
+
+@event.listens_for(Session, "before_flush")
+def _detach_deleted(session, flush_context, instances):
+    # Runs before the DELETE, while the task's links are still there to follow.
+    deleted = sorted((obj for obj in session.deleted if isinstance(obj, Task)), key=lambda task: task.id)
+    if not deleted:
+        return
+    connection = session.connection()
+    for task in deleted:
+        row = connection.execute(select(_tasks.c.parent_id, _tasks.c.status).where(_tasks.c.id == task.id)).first()
+        if row is None:
+            continue
+        ancestors = _ancestor_ids(connection, task.id)
+        _count(connection, ancestors, -1, -int(row.status == TaskStatus.DONE))
+        if ancestors:
+            # The task's descendants are now one level closer to everything above it.
+            connection.execute(update(_closure).where(
+                _closure.c.ancestor_id.in_(ancestors),
+                _closure.c.descendant_id.in_(select(_closure.c.descendant_id).where(_closure.c.ancestor_id == task.id)),
+            ).values(depth=_closure.c.depth - 1))
+        connection.execute(delete(_closure).where(
+            or_(_closure.c.ancestor_id == task.id, _closure.c.descendant_id == task.id)
+        ))
+        children = _tasks.c.parent_id == task.id
+        record_tasks(connection, children)
+        connection.execute(update(_tasks).where(children).values(parent_id=row.parent_id))
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_tree(session, flush_context):
+    connection = None
+    recount = set()
+    # Ids ascend with insertion order, so a parent new in this flush is linked before its children.
+    for task in sorted((obj for obj in session.new if isinstance(obj, Task)), key=lambda task: task.id):
+        if task.parent_id is not None:
+            connection = connection or session.connection()
+            ancestors = _link(connection, task.project_id, task.parent_id, task.id)
+            _count(connection, ancestors, 1, int(task.status == TaskStatus.DONE))
+    for task in session.dirty:
+        if not isinstance(task, Task) or not session.is_modified(task):
+            continue
+        state = inspect(task)
+        moved = state.attrs.parent_id.history.has_changes()
+        # A top-level task has no ancestors to update.
+        if not moved and (task.parent_id is None or not state.attrs.status.history.has_changes()):
+            continue
+        connection = connection or session.connection()
+        previous, is_done = _previous_status(task), task.status == TaskStatus.DONE
+        # With the old status never loaded, the counts are moved as if it was
+        # unchanged and the ancestors recounted afterwards.
+        was_done = is_done if previous is _UNKNOWN else previous == TaskStatus.DONE
+        if moved:
+            touched = _move(connection, task, was_done, is_done)
+        else:
+            touched = _ancestor_ids(connection, task.id)
+            _count(connection, touched, 0, is_done - was_done)
+        if previous is _UNKNOWN:
+            recount.update(touched)
+    if recount:
+        _recount(connection, recount)
+
+
+def in_subtree(db: Session, root_id: int, task_id: int) -> bool:
+    """Whether ``task_id`` is ``root_id`` or one of its descendants."""
+    if root_id == task_id:
+        return True
+    return db.execute(
+        select(_closure.c.id).where(and_(_closure.c.ancestor_id == root_id, _closure.c.descendant_id == task_id))
+    ).first() is not None
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""Time tracking rollups: totals per task and per project, week and user.
+
+Reports read ``task_time_rollups`` and ``project_time_rollups`` only, so
+their cost follows the number of tasks and of project-week-user cells,
+not the number of time entries. The flush hooks below keep both in step
+with ORM writes of ``TimeEntry`` rows, in the same transaction: each
+flush adds its net change per rollup row with one ``INSERT ... ON
+CONFLICT DO UPDATE SET minutes = minutes + delta`` per table, so
+concurrent writers never lose updates and a row is created on first use.
+Deleting a task through the ORM takes its entries and their minutes
+along.
+
+Core statements bypass the hooks: bulk loads, and entries of a user whose
+account was purged (their rollup rows have no user to conflict on, so
+later edits add rows of their own; sums stay right). ``rebuild_time_rollups``
+recomputes the rollups of some or all projects from the entries of both
+tiers, one project per transaction; ``scripts/rebuild_time_rollups.py``
+runs it from the command line. Entries written while a project is rebuilt
+may be counted twice or not at all, so run it while the project is quiet.
+"""
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, event, func, insert, inspect, select, union, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..models.archive import archived_task_time_rollups, archived_time_entries
+from ..models.task import Task
+from ..models.time_entry import ProjectTimeRollup, TaskTimeRollup, TimeEntry
+
+logger = logging.getLogger(__name__)
+
+_entries = TimeEntry.__table__
+_task_rollups = TaskTimeRollup.__table__
+_project_rollups = ProjectTimeRollup.__table__
+# (entries, task rollups) of the hot and the archive tier; project rollups stay hot.
+_TIERS = ((_entries, _task_rollups), (archived_time_entries, archived_task_time_rollups))
+_TRACKED = ("task_id", "project_id", "user_id", "minutes", "week_start")
+_UNKNOWN = object()
+
+
+class _Deltas:
+    """Net minutes and entry counts per task and per (project, week, user)."""
+
+    def __init__(self):
+        self.tasks: Dict[Tuple[int, int], List[int]] = defaultdict(lambda: [0, 0])
+        self.weeks: Dict[Tuple, List[int]] = defaultdict(lambda: [0, 0])
+
+    def add(self, values: tuple, sign: int, entries: int = 1) -> None:
+        task_id, project_id, user_id, minutes, week = values
+        for delta in (self.tasks[task_id, project_id], self.weeks[project_id, week, user_id]):
+            delta[0] += sign * minutes
+            delta[1] += sign * entries
+
+    def apply(self, connection) -> None:
+        _add(connection, _task_rollups, ["task_id"], [
+            {"task_id": task_id, "project_id": project_id, "minutes": minutes, "entry_count": count}
+            for (task_id, project_id), (minutes, count) in sorted(self.tasks.items()) if minutes or count
+        ])
+        _add(connection, _project_rollups, ["project_id", "week_start", "user_id"], [
+            {"project_id": project_id, "week_start": week, "user_id": user_id, "minutes": minutes, "entry_count": count}
+            for (project_id, week, user_id), (minutes, count) in self.weeks.items() if minutes or count
+        ])
+
+
+def _add(connection, table, keys: List[str], rows: List[dict]) -> None:
+    """Add the ``minutes`` and ``entry_count`` of ``rows`` to the rollups with the same ``keys``."""
+    if not rows:
+        return
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(table)
+    connection.execute(statement.on_conflict_do_update(index_elements=keys, set_={
+        "minutes": table.c.minutes + statement.excluded.minutes,
+        "entry_count": table.c.entry_count + statement.excluded.entry_count,
+    }), rows)
+
+
+def _values(entry: TimeEntry) -> tuple:
+    return tuple(getattr(entry, key) for key in _TRACKED)
+
+
+def _previous_values(entry: TimeEntry):
+    """Values the entry had when it was loaded, or ``_UNKNOWN``."""
+    values = []
+    for key in _TRACKED:
+        history = inspect(entry).attrs[key].history
+        if history.deleted:
+            values.append(history.deleted[0])
+        elif history.unchanged or not history.added:
+            values.append(getattr(entry, key))
+        else:
+            return _UNKNOWN
+    return tuple(values)
+
+
+@event.listens_for(Session, "before_flush")
+def _drop_entries_of_deleted_tasks(session, flush_context, instances):
+    # Before the DELETE, while the task's entries are still there to subtract.
+    task_ids = [obj.id for obj in session.deleted if isinstance(obj, Task)]
+    if not task_ids:
+        return
+    connection = session.connection()
+    deltas = _Deltas()
+    for row in connection.execute(
+        select(_entries.c.task_id, _entries.c.project_id, _entries.c.user_id,
+               func.sum(_entries.c.minutes), _entries.c.week_start, func.count())
+        .where(_entries.c.task_id.in_(task_ids))
+        .group_by(_entries.c.task_id, _entries.c.project_id, _entries.c.user_id, _entries.c.week_start)
+    ):
+        deltas.add(tuple(row[:5]), -1, row[5])
+    deltas.tasks.clear()
+    deltas.apply(connection)
+    connection.execute(delete(_entries).where(_entries.c.task_id.in_(task_ids)))
+    connection.execute(delete(_task_rollups).where(_task_rollups.c.task_id.in_(task_ids)))
+
+
+@event.listens_for(Session, "after_flush")
+def _roll_up_time(session, flush_context):
+    deltas, rebuild = _Deltas(), set()
+    for obj in session.new:
+        if isinstance(obj, TimeEntry):
+            deltas.add(_values(obj), 1)
+    for obj in session.deleted:
+        if isinstance(obj, TimeEntry):
+            deltas.add(_previous_values(obj), -1)
+    for obj in session.dirty:
+        if not isinstance(obj, TimeEntry) or not session.is_modified(obj):
+            continue
+        state = inspect(obj)
+        if not any(state.attrs[key].history.has_changes() for key in _TRACKED):
+            continue
+        previous = _previous_values(obj)
+        if previous is _UNKNOWN:
+            # The old values were never loaded; rebuild the project's rollups instead.
+            rebuild.add(obj.project_id)
+            continue
+        deltas.add(previous, -1)
+        deltas.add(_values(obj), 1)
+    if deltas.tasks or deltas.weeks:
+        deltas.apply(session.connection())
+    if rebuild:
+        _rebuild(session.connection(), sorted(rebuild))
+
+
+def _rebuild(connection, project_ids: List[int]) -> None:
+    for entries, task_rollups in _TIERS:
+        connection.execute(delete(task_rollups).where(task_rollups.c.project_id.in_(project_ids)))
+        connection.execute(insert(task_rollups).from_select(
+            ["task_id", "project_id", "minutes", "entry_count"],
+            select(entries.c.task_id, entries.c.project_id, func.sum(entries.c.minutes), func.count())
+            .where(entries.c.project_id.in_(project_ids))
+            .group_by(entries.c.task_id, entries.c.project_id),
+        ))
+    both = union_all(*(
+        select(entries.c.project_id, entries.c.week_start, entries.c.user_id, entries.c.minutes)
+        .where(entries.c.project_id.in_(project_ids))
+        for entries, _ in _TIERS
+    )).subquery()
+    connection.execute(delete(_project_rollups).where(_project_rollups.c.project_id.in_(project_ids)))
+    connection.execute(insert(_project_rollups).from_select(
+        ["project_id", "week_start", "user_id", "minutes", "entry_count"],
+        select(both.c.project_id, both.c.week_start, both.c.user_id, func.sum(both.c.minutes), func.count())
+        .group_by(both.c.project_id, both.c.week_start, both.c.user_id),
+    ))
+
+
+def rebuild_time_rollups(db: Session, project_ids: Optional[Iterable[int]] = None) -> List[int]:
+    """Recompute the rollups of ``project_ids`` (default: every project with entries or rollups) from the entries."""
+    if project_ids is None:
+        project_ids = db.execute(union(
+            *(select(entries.c.project_id) for entries, _ in _TIERS),
+            select(_project_rollups.c.project_id),
+        )).scalars().all()
+    project_ids = sorted(project_ids)
+    for project_id in project_ids:
+        _rebuild(db.connection(), [project_id])
+        db.commit()
+    logger.info("Rebuilt time rollups of %d project(s)", len(project_ids))
+    return project_ids
\ No newline at end of file
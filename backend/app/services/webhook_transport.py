@@ -0,0 +1,73 @@
+"""HTTP transport for webhook deliveries that only connects to checked addresses.
+
+Imported on the dispatcher's first delivery, which keeps httpx and httpcore
+out of start-up.
+"""
+import httpcore
+import httpx
+
+from .webhooks import UnsafeWebhookTarget, resolve_address
+
+
+class _CheckedBackend(httpcore.NetworkBackend):
+    """Connects to the address it checked, not whatever the host resolves to later."""
+
+    def __init__(self):
+        self._backend = httpcore.SyncBackend()
+
+    def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        return self._backend.connect_tcp(resolve_address(host, port), port, timeout, local_address, socket_options)
+
+    def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        raise UnsafeWebhookTarget("unix sockets are not webhook targets")
+
+    def sleep(self, seconds: float) -> None:
+        self._backend.sleep(seconds)
+
+
+class _ResponseStream(httpx.SyncByteStream):
+    def __init__(self, stream):
+        self._stream = stream
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self) -> None:
+        if hasattr(self._stream, "close"):
+            self._stream.close()
+
+
+class CheckedTransport(httpx.BaseTransport):
+    """Keep-alive connection pool whose connections go through ``_CheckedBackend``."""
+
+    def __init__(self, max_connections: int, keepalive_expiry: float = 5.0):
+        self._pool = httpcore.ConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+            network_backend=_CheckedBackend(),
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self._pool.handle_request(httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        ))
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(response.stream),
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self._pool.close()
@@ -0,0 +1,298 @@
+"""Outbound webhooks: an outbox written with each change, delivered in batches.
+
+``enqueue_events`` runs inside the request's transaction and adds one
+``webhook_deliveries`` row per event and matching subscription, so an event
+goes out if and only if the change that caused it commits. The
+``WebhookDispatcher`` polls the outbox from a background job: it claims due
+rows with a single ``UPDATE`` that leases them, so the app processes that
+all run the job never claim the same row (``SKIP LOCKED`` where supported
+lets them claim side by side), groups them per subscription, and POSTs each
+group as batches of up to ``webhook_batch_size`` events from a pool of
+``webhook_workers`` threads sharing one keep-alive connection pool.
+
+Every batch is signed: ``X-Webhook-Signature: sha256=<hex>`` is the
+HMAC-SHA256, keyed with the subscription secret, of
+``"<X-Webhook-Timestamp>." + body``. A 2xx response deletes the rows; any
+other outcome reschedules them with exponential backoff and jitter, and
+after ``webhook_max_attempts`` they become dead letters that an admin or the
+project's manager can inspect and requeue.
+
+Targets must be public addresses: ``check_target`` rejects URLs whose host
+resolves to a loopback, private, link-local or reserved address when a
+subscription is created, and the dispatcher resolves and checks the host
+again on every new connection, connecting only to the address it checked,
+so a DNS record changed in between cannot redirect it. Loopback targets are
+allowed with ``webhook_allow_localhost`` (for local development).
+"""
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import random
+import socket
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import SplitResult, urlsplit
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.webhook import WebhookDelivery, WebhookSubscription
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPES = (
+    "task.created",
+    "task.updated",
+    "task.assigned",
+    "task.status_changed",
+    "task.deleted",
+    "task.commented",
+    "project.updated",
+    "project.deleted",
+)
+
+_deliveries = WebhookDelivery.__table__
+_subscriptions = WebhookSubscription.__table__
+
+
+def enqueue_events(db: Session, project_id: int, events: Iterable[Tuple[str, dict]]) -> int:
+    """Add ``(event_type, data)`` events to the outbox; the caller commits them with its change."""
+    events = list(events)
+    if not events:
+        return 0
+    subscriptions = db.query(WebhookSubscription).filter(
+        WebhookSubscription.project_id == project_id, WebhookSubscription.is_active.is_(True)
+    ).all()
+    now = datetime.now(timezone.utc)
+    rows = []
+    for event_type, data in events:
+        targets = [subscription for subscription in subscriptions if subscription.wants(event_type)]
+        if not targets:
+            continue
+        event = {
+            "id": uuid.uuid4().hex,
+            "type": event_type,
+            "project_id": project_id,
+            "occurred_at": now.isoformat(),
+            "data": data,
+        }
+        payload = json.dumps(event, default=str)
+        rows.extend(
+            WebhookDelivery(
+                subscription_id=subscription.id, event_id=event["id"], event_type=event_type,
+                payload=payload, next_attempt_at=now,
+            )
+            for subscription in targets
+        )
+    db.add_all(rows)
+    return len(rows)
+
+
+class UnsafeWebhookTarget(ValueError):
+    """The URL is malformed or its host resolves to an address webhooks may not reach."""
+
+
+def parse_target(url: str) -> SplitResult:
+    parts = urlsplit(url)
+    try:
+        parts.port
+    except ValueError:
+        raise UnsafeWebhookTarget("url has an invalid port") from None
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise UnsafeWebhookTarget("url must be an http or https URL with a host")
+    return parts
+
+
+def _allowed(address) -> bool:
+    address = getattr(address, "ipv4_mapped", None) or address
+    if address.is_loopback:
+        return settings.webhook_allow_localhost
+    return address.is_global and not address.is_multicast
+
+
+def resolve_address(host: str, port: int) -> str:
+    """An address ``host`` resolves to, provided none of its addresses is off limits."""
+    try:
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError):
+        raise UnsafeWebhookTarget(f"cannot resolve {host}") from None
+    addresses = [ipaddress.ip_address(info[4][0].split("%")[0]) for info in infos]
+    for address in addresses:
+        if not _allowed(address):
+            raise UnsafeWebhookTarget(f"{host} resolves to a non-public address ({address})")
+    return str(addresses[0])
+
+
+def check_target(url: str) -> None:
+    """Raise ``UnsafeWebhookTarget`` unless ``url`` points at a public address."""
+    parts = parse_target(url)
+    resolve_address(parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+
+
+def sign(secret: str, timestamp: str, body: bytes) -> str:
+    digest = hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Delay before retry number ``attempts``: doubling from the base, capped, with jitter."""
+    delay = min(settings.webhook_backoff_base_seconds * 2 ** (attempts - 1), settings.webhook_backoff_max_seconds)
+    return delay * random.uniform(0.5, 1.0)
+
+
+class WebhookDispatcher:
+    """Delivers due outbox rows; ``run_once`` is the body of the background job."""
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal, client=None):
+        self.session_factory = session_factory
+        self._client = client
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import httpx  # first use only; keeps it out of start-up
+
+            from .webhook_transport import CheckedTransport
+
+            # No proxies from the environment: they would resolve the hosts themselves.
+            self._client = httpx.Client(
+                transport=CheckedTransport(settings.webhook_workers),
+                trust_env=False,
+                timeout=settings.webhook_timeout_seconds,
+                headers={"User-Agent": "ProjectManagement-Webhooks/1.0"},
+            )
+        return self._client
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(settings.webhook_workers, thread_name_prefix="webhook")
+        return self._executor
+
+    def run_once(self) -> Dict[str, int]:
+        """Deliver everything due now; returns delivered and failed event counts."""
+        totals = {"delivered": 0, "failed": 0}
+        while True:
+            with self.session_factory() as db:
+                claimed = self._claim(db)
+            if not claimed:
+                return totals
+            batches = self._batches(claimed)
+            results = list(self.executor.map(self._post, batches))
+            with self.session_factory() as db:
+                for batch, error in zip(batches, results):
+                    self._record(db, batch, error)
+                    totals["failed" if error else "delivered"] += len(batch)
+                db.commit()
+            if len(claimed) < settings.webhook_claim_size:
+                return totals
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def _claim(self, db: Session) -> list:
+        now = datetime.now(timezone.utc)
+        due = (
+            select(_deliveries.c.id)
+            .join(_subscriptions, _subscriptions.c.id == _deliveries.c.subscription_id)
+            .where(_deliveries.c.next_attempt_at <= now, _subscriptions.c.is_active.is_(True))
+            .order_by(_deliveries.c.id)
+            .limit(settings.webhook_claim_size)
+            .with_for_update(skip_locked=True, of=_deliveries)
+        )
+        # Picked and leased in one statement, so no other process can pick the
+        # same rows in between; they are skipped until the attempt has had
+        # time to finish.
+        lease = now + timedelta(seconds=settings.webhook_timeout_seconds * 2)
+        ids = db.execute(
+            update(_deliveries).where(_deliveries.c.id.in_(due)).values(next_attempt_at=lease)
+            .returning(_deliveries.c.id)
+        ).scalars().all()
+        rows = []
+        if ids:
+            rows = db.execute(
+                select(
+                    _deliveries.c.id, _deliveries.c.subscription_id, _deliveries.c.payload, _deliveries.c.attempts,
+                    _subscriptions.c.url, _subscriptions.c.secret,
+                )
+                .join(_subscriptions, _subscriptions.c.id == _deliveries.c.subscription_id)
+                .where(_deliveries.c.id.in_(ids))
+                .order_by(_deliveries.c.id)
+            ).all()
+        db.commit()
+        return rows
+
+    @staticmethod
+    def _batches(rows: list) -> List[list]:
+        by_subscription = defaultdict(list)
+        for row in rows:
+            by_subscription[row.subscription_id].append(row)
+        size = settings.webhook_batch_size
+        return [
+            group[start:start + size]
+            for group in by_subscription.values()
+            for start in range(0, len(group), size)
+        ]
+
+    def _post(self, batch: list) -> Optional[str]:
+        """POST one batch; returns the error, or None once the receiver accepted it."""
+        body = b'{"events":[' + b",".join(row.payload.encode() for row in batch) + b"]}"
+        timestamp = str(int(time.time()))
+        headers = {
+            "Content-Type": "application/json",
+            "X-Webhook-Timestamp": timestamp,
+            "X-Webhook-Signature": sign(batch[0].secret, timestamp, body),
+        }
+        try:
+            response = self.client.post(batch[0].url, content=body, headers=headers)
+        except Exception as exc:
+            return f"{type(exc).__name__}: {exc}"[:500]
+        if 200 <= response.status_code < 300:
+            return None
+        return f"HTTP {response.status_code}: {response.text[:200]}"
+
+    @staticmethod
+    def _record(db: Session, batch: list, error: Optional[str]) -> None:
+        ids = [row.id for row in batch]
+        if error is None:
+            db.execute(_deliveries.delete().where(_deliveries.c.id.in_(ids)))
+            return
+        now = datetime.now(timezone.utc)
+        logger.warning("Webhook delivery of %d event(s) to %s failed: %s", len(batch), batch[0].url, error)
+        by_attempts = defaultdict(list)
+        for row in batch:
+            by_attempts[row.attempts + 1].append(row.id)
+        for attempts, row_ids in by_attempts.items():
+            if attempts >= settings.webhook_max_attempts:
+                values = {"next_attempt_at": None, "dead_at": now}
+            else:
+                values = {"next_attempt_at": now + timedelta(seconds=backoff_seconds(attempts))}
+            db.execute(
+                update(_deliveries).where(_deliveries.c.id.in_(row_ids))
+                .values(attempts=attempts, last_error=error, **values)
+            )
+
+
+def requeue_dead_letters(db: Session, subscription_id: int) -> int:
+    """Give a subscription's dead letters a fresh set of attempts, due now."""
+    result = db.execute(
+        update(_deliveries)
+        .where(_deliveries.c.subscription_id == subscription_id, _deliveries.c.dead_at.is_not(None))
+        .values(dead_at=None, attempts=0, next_attempt_at=datetime.now(timezone.utc))
+    )
+    db.commit()
+    return result.rowcount
\ No newline at end of file
@@ -0,0 +1,270 @@
+"""Synthetic data generator for benchmarks.
+
+Builds a realistic dataset at a configurable scale using bulk inserts:
+users across all roles, projects with managers and members, tasks skewed
+towards a few large projects and busy assignees, comments and user stories.
+
+Usage:
+    python -m benchmarks.datagen --database-url sqlite:///./bench.db --scale medium
+"""
+import argparse
+import os
+import random
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+BENCH_PASSWORD = "bench123"
+
+
+@dataclass
+class Scale:
+    users: int
+    projects: int
+    members_per_project: int
+    tasks: int
+    comments_per_task: float
+    stories_per_project: int
+
+
+SCALES: Dict[str, Scale] = {
+    "tiny": Scale(users=20, projects=5, members_per_project=4, tasks=200,
+                  comments_per_task=0.5, stories_per_project=3),
+    "small": Scale(users=200, projects=40, members_per_project=8, tasks=5_000,
+                   comments_per_task=1.0, stories_per_project=10),
+    "medium": Scale(users=1_000, projects=200, members_per_project=12, tasks=50_000,
+                    comments_per_task=1.5, stories_per_project=20),
+    "large": Scale(users=5_000, projects=1_000, members_per_project=15, tasks=500_000,
+                   comments_per_task=2.0, stories_per_project=25),
+}
+
+
+@dataclass
+class Dataset:
+    """Ids and credentials of the generated data, used to drive the load test."""
+    admin_username: str = ""
+    manager_username: str = ""
+    developer_username: str = ""
+    password: str = BENCH_PASSWORD
+    user_ids: List[int] = field(default_factory=list)
+    project_ids: List[int] = field(default_factory=list)
+    task_ids: List[int] = field(default_factory=list)
+    project_task_ids: Dict[int, List[int]] = field(default_factory=dict)
+    story_ids: List[int] = field(default_factory=list)
+    counts: Dict[str, int] = field(default_factory=dict)
+
+
+def _zipf_weights(n: int, s: float = 1.1) -> List[float]:
+    return [1.0 / (rank ** s) for rank in range(1, n + 1)]
+
+
+def _next_id(db: Session, table: str) -> int:
+    return (db.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM {table}")).scalar() or 0) + 1
+
+
+def _bulk_insert(db: Session, table, rows: List[dict], batch_size: int = 5_000) -> None:
+    for start in range(0, len(rows), batch_size):
+        db.execute(insert(table), rows[start:start + batch_size])
+
+
+def _sync_sequences(db: Session, tables: List[str]) -> None:
+    # Explicit ids bypass Postgres sequences, so move them past the new rows.
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for table in tables:
+        db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+        ))
+
+
+def generate(db: Session, scale: Scale, seed: int = 42) -> Dataset:
+    from app.core.security import get_password_hash
+    from app.models.user import User, UserRole
+    from app.models.project import Project, ProjectStatus, project_members
+    from app.models.task import Task, TaskComment, TaskStatus, TaskPriority
+    from app.models.user_story import UserStory
+    from app.services.project_counters import reconcile_project_counters
+
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    dataset = Dataset()
+    # A single bcrypt hash shared by every user keeps generation fast.
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+
+    first_user_id = _next_id(db, "users")
+    admin_count = max(1, scale.users // 100)
+    manager_count = max(1, scale.users // 10)
+    users, managers, developers = [], [], []
+    for offset in range(scale.users):
+        user_id = first_user_id + offset
+        if offset < admin_count:
+            role = UserRole.ADMIN
+        elif offset < admin_count + manager_count:
+            role = UserRole.PROJECT_MANAGER
+            managers.append(user_id)
+        else:
+            role = UserRole.DEVELOPER
+            developers.append(user_id)
+        users.append({
+            "id": user_id,
+            "username": f"bench_user_{user_id}",
+            "email": f"bench_user_{user_id}@example.com",
+            "full_name": f"Bench User {user_id}",
+            "hashed_password": hashed_password,
+            "role": role,
+            "is_active": True,
+            "created_at": now - timedelta(days=rng.randint(30, 720)),
+        })
+    if not developers:
+        developers = managers
+    _bulk_insert(db, User.__table__, users)
+    dataset.user_ids = [row["id"] for row in users]
+    dataset.admin_username = users[0]["username"]
+
+    first_project_id = _next_id(db, "projects")
+    statuses = list(ProjectStatus)
+    status_weights = [15, 45, 10, 20, 10]
+    projects, memberships = [], []
+    members_by_project: Dict[int, List[int]] = {}
+    manager_weights = _zipf_weights(len(managers))
+    for offset in range(scale.projects):
+        project_id = first_project_id + offset
+        manager_id = rng.choices(managers, weights=manager_weights)[0]
+        start = now - timedelta(days=rng.randint(0, 365))
+        projects.append({
+            "id": project_id,
+            "name": f"Bench Project {project_id}",
+            "description": f"Synthetic project {project_id} generated for benchmarking",
+            "status": rng.choices(statuses, weights=status_weights)[0],
+            "start_date": start,
+            "end_date": start + timedelta(days=rng.randint(30, 240)),
+            "manager_id": manager_id,
+            "created_at": start,
+        })
+        size = min(len(developers), max(1, int(rng.gauss(scale.members_per_project, 3))))
+        members = rng.sample(developers, size)
+        members_by_project[project_id] = members
+        memberships.extend({"project_id": project_id, "user_id": user_id} for user_id in members)
+    _bulk_insert(db, Project.__table__, projects)
+    _bulk_insert(db, project_members, memberships)
+    dataset.project_ids = [row["id"] for row in projects]
+
+    # Pick the busiest manager and a developer with memberships as the
+    # representative users for role-scoped endpoints.
+    manager_id = max(managers, key=lambda uid: sum(1 for p in projects if p["manager_id"] == uid))
+    developer_id = memberships[0]["user_id"]
+    dataset.manager_username = f"bench_user_{manager_id}"
+    dataset.developer_username = f"bench_user_{developer_id}"
+
+    first_task_id = _next_id(db, "tasks")
+    project_weights = _zipf_weights(len(dataset.project_ids))
+    project_choices = rng.choices(dataset.project_ids, weights=project_weights, k=scale.tasks)
+    task_statuses = list(TaskStatus)
+    priorities = list(TaskPriority)
+    tasks = []
+    for offset, project_id in enumerate(project_choices):
+        members = members_by_project[project_id]
+        created = now - timedelta(days=rng.randint(0, 365), minutes=rng.randint(0, 1440))
+        tasks.append({
+            "id": first_task_id + offset,
+            "title": f"Bench task {first_task_id + offset}",
+            "description": "Synthetic task generated for benchmarking",
+            "status": rng.choices(task_statuses, weights=[30, 20, 50])[0],
+            "priority": rng.choices(priorities, weights=[20, 45, 25, 10])[0],
+            "project_id": project_id,
+            # Busy members get most of the work; some tasks stay unassigned.
+            "assignee_id": rng.choices(members, weights=_zipf_weights(len(members)))[0]
+            if rng.random() > 0.1 else None,
+            "due_date": created + timedelta(days=rng.randint(-30, 120)) if rng.random() > 0.2 else None,
+            "created_at": created,
+            "updated_at": created + timedelta(days=rng.randint(0, 30)),
+        })
+    _bulk_insert(db, Task.__table__, tasks)
+    dataset.task_ids = [row["id"] for row in tasks]
+    for row in tasks:
+        dataset.project_task_ids.setdefault(row["project_id"], []).append(row["id"])
+
+    first_comment_id = _next_id(db, "task_comments")
+    comments = []
+    comment_total = int(scale.tasks * scale.comments_per_task)
+    commented_tasks = rng.choices(tasks, weights=_zipf_weights(len(tasks), 0.6), k=comment_total)
+    for offset, task in enumerate(commented_tasks):
+        members = members_by_project[task["project_id"]]
+        comments.append({
+            "id": first_comment_id + offset,
+            "content": f"Synthetic comment {offset}",
+            "task_id": task["id"],
+            "author_id": rng.choice(members),
+            "created_at": task["created_at"] + timedelta(hours=rng.randint(1, 400)),
+        })
+    _bulk_insert(db, TaskComment.__table__, comments)
+
+    first_story_id = _next_id(db, "user_stories")
+    stories = []
+    for project_id in dataset.project_ids:
+        for _ in range(rng.randint(0, scale.stories_per_project * 2)):
+            story_id = first_story_id + len(stories)
+            stories.append({
+                "id": story_id,
+                "title": f"As a user, I want feature {story_id}",
+                "description": f"As a user, I want feature {story_id}, so that work gets done",
+                "acceptance_criteria": "work gets done",
+                "project_id": project_id,
+            })
+    _bulk_insert(db, UserStory.__table__, stories)
+    dataset.story_ids = [row["id"] for row in stories]
+
+    _sync_sequences(db, ["users", "projects", "tasks", "task_comments", "user_stories"])
+    db.commit()
+    # Bulk inserts bypass the ORM flush hook that maintains the task counters.
+    reconcile_project_counters(db, dataset.project_ids)
+
+    dataset.counts = {
+        "users": len(users),
+        "projects": len(projects),
+        "memberships": len(memberships),
+        "tasks": len(tasks),
+        "comments": len(comments),
+        "user_stories": len(stories),
+    }
+    return dataset
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic benchmark data")
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL", "sqlite:///./bench.db"))
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+    from benchmarks.load_test import create_bench_engine
+    from app.core.database import Base
+    from app import models  # noqa: F401  (registers every table on Base.metadata)
+
+    engine = create_bench_engine(args.database_url)
+    if args.reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with Session(engine) as db:
+        dataset = generate(db, SCALES[args.scale], seed=args.seed)
+
+    print(f"Generated {args.scale} dataset: {dataset.counts}")
+    print(f"Admin: {dataset.admin_username} / {BENCH_PASSWORD}")
+    print(f"Manager: {dataset.manager_username} / {BENCH_PASSWORD}")
+    print(f"Developer: {dataset.developer_username} / {BENCH_PASSWORD}")
+
+
+if __name__ == "__main__":
+    main()
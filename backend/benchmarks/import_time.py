@@ -0,0 +1,101 @@
+"""Cold-start budget for ``import app.main``.
+
+Imports the app in fresh interpreters with ``-X importtime``, reports the
+median total and the slowest modules, and exits with status 1 when the
+median exceeds the budget or a module that must load lazily (``groq``,
+``httpx``, ``jose``, ``passlib``) was imported eagerly.
+
+Usage:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --budget-ms 1500 --runs 7 --output import_time.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LAZY_MODULES = ["groq", "httpx", "jose", "passlib"]
+
+_PROBE = (
+    "import sys, json, app.main; "
+    "print(json.dumps(sorted({name.split('.')[0] for name in sys.modules})))"
+)
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Cumulative microseconds per module from ``-X importtime`` output."""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, _, rest = line.partition(":")
+        self_us, total_us, name = (part.strip() for part in rest.split("|"))
+        cumulative[name] = max(cumulative.get(name, 0), int(total_us))
+    return cumulative
+
+
+def measure_once() -> Tuple[Dict[str, int], List[str]]:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    env.setdefault("SECRET_KEY", "import-time-benchmark")
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(completed.stderr), json.loads(completed.stdout)
+
+
+def run(runs: int) -> dict:
+    totals = []
+    modules: Dict[str, List[int]] = {}
+    loaded: List[str] = []
+    for _ in range(runs):
+        cumulative, loaded = measure_once()
+        totals.append(cumulative["app.main"])
+        for name, total in cumulative.items():
+            modules.setdefault(name, []).append(total)
+    slowest = sorted(
+        ((name, statistics.median(values)) for name, values in modules.items() if name != "app.main"),
+        key=lambda item: item[1], reverse=True,
+    )
+    return {
+        "runs": runs,
+        "median_ms": round(statistics.median(totals) / 1000, 1),
+        "min_ms": round(min(totals) / 1000, 1),
+        "slowest_modules": [{"module": name, "ms": round(us / 1000, 1)} for name, us in slowest[:15]],
+        "eager_lazy_modules": [name for name in LAZY_MODULES if name in loaded],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check the cold import time of app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=float(os.environ.get("IMPORT_BUDGET_MS", 2500)))
+    parser.add_argument("--output", help="write results JSON to this file")
+    args = parser.parse_args(argv)
+
+    measure_once()  # compile bytecode so every measured run is a warm-cache cold start
+    result = run(args.runs)
+    result["budget_ms"] = args.budget_ms
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    failed = False
+    if result["median_ms"] > args.budget_ms:
+        print(f"REGRESSION: import app.main took {result['median_ms']}ms, budget is {args.budget_ms}ms")
+        failed = True
+    for name in result["eager_lazy_modules"]:
+        print(f"REGRESSION: {name} is imported at start-up but should load on first use")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
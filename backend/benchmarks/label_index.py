@@ -0,0 +1,150 @@
+"""Multi-label task filters on one large project.
+
+Bulk-loads ``--tasks`` tasks carrying ``--labels`` labels, each task up to
+``--per-task`` of them with the first labels the most common. Reports the
+cold load of the project's label index, then for a narrow and a broad
+label expression the time to evaluate it on the index, to turn a match
+into task ids, and to select the same ids with the SQL form of the
+expression for comparison, plus the commit of relabelling one task and
+the cached read that applies it.
+
+Usage:
+    python -m benchmarks.label_index --tasks 50000 --labels 20
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+
+def _timed(func, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return round((time.perf_counter() - start) / repeat * 1000, 3)
+
+
+def run(args) -> dict:
+    from app.core.database import Base
+    from app import models  # noqa: F401  (registers every table on Base.metadata)
+    from app.models.label import Label, task_labels
+    from app.models.project import Project
+    from app.models.task import Task, TaskStatus
+    from app.models.user import User, UserRole
+    from app.services.label_index import label_condition, label_index, load_label_index, parse_label_expression
+
+    rng = random.Random(args.seed)
+    tasks_table = Task.__table__
+    names = [f"label-{number}" for number in range(args.labels)]
+    # Label i is picked with weight 1 / (i + 1).
+    weights = [1 / (number + 1) for number in range(args.labels)]
+    expressions = {
+        "narrow": f"{names[-1]} and {names[-2]} and not {names[0]}",
+        "broad": f"({names[0]} or {names[1]}) and not {names[2]}",
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(directory, 'labels.db')}", connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine, autoflush=False)
+
+        with factory() as db:
+            manager = User(username="bench_manager", email="bench@example.com", full_name="Bench",
+                           hashed_password="-", role=UserRole.PROJECT_MANAGER)
+            project = Project(name="Label bench", manager=manager)
+            db.add(project)
+            db.flush()
+            labels = [Label(project_id=project.id, name=name) for name in names]
+            db.add_all(labels)
+            db.commit()
+            project_id, label_ids = project.id, [label.id for label in labels]
+
+            db.execute(insert(tasks_table), [
+                {"id": task_id, "title": f"Task {task_id}", "project_id": project_id, "status": TaskStatus.TODO}
+                for task_id in range(1, args.tasks + 1)
+            ])
+            links = []
+            for task_id in range(1, args.tasks + 1):
+                picked = set(rng.choices(label_ids, weights, k=rng.randint(0, args.per_task)))
+                links.extend({"task_id": task_id, "label_id": label_id} for label_id in picked)
+            db.execute(insert(task_labels), links)
+            db.commit()
+
+            load_ms = _timed(lambda: load_label_index(db, project_id))
+            label_index.read(db, project_id, lambda index: None)
+            results = {}
+            for kind, text in expressions.items():
+                expression = parse_label_expression(text)
+                query = select(tasks_table.c.id).where(
+                    tasks_table.c.project_id == project_id, label_condition(expression)
+                ).order_by(tasks_table.c.id)
+                in_sql = db.execute(query).scalars().all()
+                assert label_index.read(db, project_id, lambda index: index.matching(expression, args.tasks)) == in_sql
+                results[kind] = {
+                    "expression": text,
+                    "matches": len(in_sql),
+                    "evaluate_us": round(_timed(
+                        lambda: label_index.read(db, project_id, lambda index: index.evaluate(expression)), repeat=200
+                    ) * 1000, 1),
+                    "ids_ms": _timed(
+                        lambda: label_index.read(db, project_id, lambda index: index.matching(expression, args.tasks)),
+                        repeat=20
+                    ),
+                    "sql_ms": _timed(lambda: db.execute(query).scalars().all(), repeat=5),
+                }
+
+            def relabel():
+                task = db.get(Task, rng.randint(1, args.tasks))
+                task.labels = rng.sample(labels, 2)
+                db.commit()
+
+            relabel_ms = _timed(relabel, repeat=20)
+            relabel()
+            applied_ms = _timed(lambda: label_index.read(db, project_id, lambda index: index.counts()))
+        engine.dispose()
+
+    return {
+        "tasks": args.tasks,
+        "labels": args.labels,
+        "links": len(links),
+        "index_load_ms": load_ms,
+        "relabel_commit_ms": relabel_ms,
+        "read_after_relabel_ms": applied_ms,
+        "expressions": results,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure label expression filters on one project")
+    parser.add_argument("--tasks", type=int, default=50_000)
+    parser.add_argument("--labels", type=int, default=20)
+    parser.add_argument("--per-task", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    result = run(args)
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,485 @@
+"""Latency benchmark for every router in app/api/v1.
+
+Seeds a synthetic dataset (see benchmarks/datagen.py), drives each endpoint
+with concurrent async clients and reports p50/p95/p99 latency, throughput and
+database statements per request as JSON. Results can be compared against a
+stored baseline; the process exits with status 1 when an endpoint regresses.
+
+Usage:
+    python -m benchmarks.load_test --scale small --output bench_results.json
+    python -m benchmarks.load_test --baseline benchmarks/baseline.json
+    python -m benchmarks.load_test --save-baseline benchmarks/baseline.json
+
+Runs in-process against SQLite by default; pass --database-url to use a
+local Postgres instead.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+
+def create_bench_engine(database_url: str):
+    from app.core.config import settings
+
+    connect_args = {"check_same_thread": False} if database_url.startswith("sqlite") else {}
+    # Sized like the app's pools: a request can hold several connections at once
+    # (the overview's sections, a download's read and primary sessions).
+    return create_engine(database_url, connect_args=connect_args,
+                         pool_size=settings.db_pool_size, max_overflow=settings.db_max_overflow)
+
+
+class StatementCounter:
+    """Counts statements executed on an engine."""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    role: str
+    path: Callable[["ScenarioState"], str]
+    body: Optional[Callable[["ScenarioState"], dict]] = None
+    requests: Optional[int] = None
+    # Raw request body, for uploads.
+    content: Optional[Callable[["ScenarioState"], bytes]] = None
+    # Responses are kept under this kind for later scenarios to use.
+    creates: Optional[str] = None
+    # Skipped unless an earlier scenario created objects of this kind.
+    needs: Optional[str] = None
+
+
+@dataclass
+class EndpointResult:
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    max_ms: float
+    throughput_rps: float
+    queries_per_request: Optional[float]
+
+
+class ScenarioState:
+    def __init__(self, dataset, seed: int):
+        self.dataset = dataset
+        self.rng = random.Random(seed)
+        self.created: Dict[str, List[dict]] = defaultdict(list)
+        # Labels and dependencies go to the largest project, where their indexes and graphs do the most work.
+        self.project_id = max(dataset.project_task_ids, key=lambda p: len(dataset.project_task_ids[p]))
+        self.project_task_ids = dataset.project_task_ids[self.project_id]
+        self.label_names = itertools.count(1)
+        self.label_links: Set[Tuple[int, int]] = set()
+        self.edges: Set[Tuple[int, int]] = set()
+        self.edge: Tuple[int, int] = (0, 0)
+
+    def pick(self, ids: List[int]) -> int:
+        return self.rng.choice(ids)
+
+    def pick_created(self, kind: str) -> dict:
+        return self.rng.choice(self.created[kind])
+
+    def pop_created(self, kind: str) -> dict:
+        return self.created[kind].pop()
+
+    def pop_created_task(self) -> int:
+        if self.created["tasks"]:
+            return self.pop_created("tasks")["id"]
+        return self.pick(self.dataset.task_ids)
+
+    def new_label_link(self) -> Tuple[int, int]:
+        """A task and a created label not on it yet, remembered for ``labels.remove``."""
+        while True:
+            link = (self.pick(self.project_task_ids), self.pick_created("labels")["id"])
+            if link not in self.label_links:
+                self.label_links.add(link)
+                self.created["label_links"].append({"task_id": link[0], "label_id": link[1]})
+                return link
+
+    def new_edge(self) -> Tuple[int, int]:
+        """A (blocked, blocker) pair not linked yet, also kept as ``edge`` for the request body.
+
+        Every edge runs from the lower id to the higher one, so none can close a cycle.
+        """
+        while True:
+            first, second = self.rng.sample(self.project_task_ids, 2)
+            edge = (max(first, second), min(first, second))
+            if edge not in self.edges:
+                self.edges.add(edge)
+                self.edge = edge
+                return edge
+
+
+def build_scenarios(login_requests: int) -> List[Scenario]:
+    project = lambda s: s.pick(s.dataset.project_ids)
+    task = lambda s: s.pick(s.dataset.task_ids)
+    sample = lambda s, ids: ",".join(str(i) for i in s.rng.sample(ids, min(20, len(ids))))
+    scenarios = [
+        Scenario("auth.login", "POST", "anonymous", lambda s: "/api/v1/auth/login",
+                 lambda s: {"username": s.dataset.admin_username, "password": s.dataset.password},
+                 requests=login_requests),
+        Scenario("users.me", "GET", "developer", lambda s: "/api/v1/users/me"),
+        Scenario("users.list", "GET", "admin", lambda s: "/api/v1/users/"),
+        Scenario("users.get", "GET", "admin", lambda s: f"/api/v1/users/{s.pick(s.dataset.user_ids)}"),
+        Scenario("ai.generate_user_stories", "POST", "admin", lambda s: "/api/v1/ai/generate-user-stories",
+                 lambda s: {"project_description": "Benchmark project", "project_id": project(s)}),
+        Scenario("user_stories.by_project", "GET", "admin",
+                 lambda s: f"/api/v1/user-stories/project/{project(s)}"),
+        Scenario("user_stories.get", "GET", "admin",
+                 lambda s: f"/api/v1/user-stories/{s.pick(s.dataset.story_ids)}"),
+        Scenario("tasks.create", "POST", "admin", lambda s: "/api/v1/tasks/",
+                 lambda s: {"title": "Benchmark task", "project_id": project(s)}, creates="tasks"),
+        Scenario("tasks.update", "PUT", "admin", lambda s: f"/api/v1/tasks/{task(s)}",
+                 lambda s: {"status": s.rng.choice(["todo", "in_progress", "done"])}),
+        Scenario("tasks.comment", "POST", "admin", lambda s: f"/api/v1/tasks/{task(s)}/comments",
+                 lambda s: {"content": "Benchmark comment", "task_id": 0}),
+        Scenario("tasks.get", "GET", "admin", lambda s: f"/api/v1/tasks/{task(s)}"),
+        Scenario("tasks.subtasks", "GET", "admin", lambda s: f"/api/v1/tasks/{task(s)}/subtasks"),
+        Scenario("tasks.delete", "DELETE", "admin", lambda s: f"/api/v1/tasks/{s.pop_created_task()}"),
+        Scenario("projects.get", "GET", "admin", lambda s: f"/api/v1/projects/{project(s)}"),
+        Scenario("projects.create", "POST", "admin", lambda s: "/api/v1/projects/",
+                 lambda s: {"name": "Benchmark project", "manager_id": s.pick(s.dataset.user_ids)}),
+        Scenario("projects.board", "GET", "admin", lambda s: f"/api/v1/projects/{project(s)}/board"),
+        Scenario("projects.board_column", "GET", "admin",
+                 lambda s: f"/api/v1/projects/{project(s)}/board/{s.rng.choice(['todo', 'in_progress', 'done'])}"),
+        Scenario("projects.overview", "GET", "admin", lambda s: f"/api/v1/projects/{project(s)}/overview"),
+        Scenario("users.batch", "GET", "admin", lambda s: f"/api/v1/users/batch?ids={sample(s, s.dataset.user_ids)}"),
+        Scenario("projects.batch", "GET", "admin",
+                 lambda s: f"/api/v1/projects/batch?ids={sample(s, s.dataset.project_ids)}"),
+        Scenario("tasks.batch", "GET", "admin", lambda s: f"/api/v1/tasks/batch?ids={sample(s, s.dataset.task_ids)}"),
+
+        Scenario("labels.create", "POST", "admin", lambda s: f"/api/v1/projects/{s.project_id}/labels",
+                 lambda s: {"name": f"bench-{next(s.label_names)}"}, creates="labels"),
+        Scenario("labels.list", "GET", "admin", lambda s: f"/api/v1/projects/{s.project_id}/labels"),
+        Scenario("labels.add", "POST", "admin",
+                 lambda s: "/api/v1/tasks/{}/labels/{}".format(*s.new_label_link()), needs="labels"),
+        Scenario("tasks.list_by_label", "GET", "admin",
+                 lambda s: f"/api/v1/tasks/?project_id={s.project_id}&labels={s.pick_created('labels')['name']}",
+                 needs="labels"),
+        Scenario("labels.remove", "DELETE", "admin",
+                 lambda s: "/api/v1/tasks/{task_id}/labels/{label_id}".format(**s.pop_created("label_links")),
+                 needs="label_links"),
+        Scenario("labels.replace", "PUT", "admin", lambda s: f"/api/v1/tasks/{s.pick(s.project_task_ids)}/labels",
+                 lambda s: {"label_ids": [label["id"] for label in s.rng.sample(s.created["labels"], min(3, len(s.created["labels"])))]},
+                 needs="labels"),
+        Scenario("labels.update", "PUT", "admin", lambda s: f"/api/v1/labels/{s.pick_created('labels')['id']}",
+                 lambda s: {"color": s.rng.choice(["#1f6feb", "#d73a4a", "#0e8a16"])}, needs="labels"),
+        Scenario("labels.delete", "DELETE", "admin", lambda s: f"/api/v1/labels/{s.pop_created('labels')['id']}",
+                 needs="labels"),
+
+        # The body reuses the edge the path picked.
+        Scenario("dependencies.create", "POST", "admin",
+                 lambda s: f"/api/v1/tasks/{s.new_edge()[0]}/dependencies",
+                 lambda s: {"blocker_id": s.edge[1]}, creates="dependencies"),
+        Scenario("dependencies.task", "GET", "admin",
+                 lambda s: f"/api/v1/tasks/{s.pick_created('dependencies')['blocked_id']}/dependencies",
+                 needs="dependencies"),
+        Scenario("dependencies.frontier", "GET", "admin", lambda s: f"/api/v1/projects/{s.project_id}/frontier"),
+        Scenario("dependencies.critical_path", "GET", "admin",
+                 lambda s: f"/api/v1/projects/{s.project_id}/critical-path"),
+        Scenario("dependencies.delete", "DELETE", "admin",
+                 lambda s: "/api/v1/tasks/{blocked_id}/dependencies/{blocker_id}".format(**s.pop_created("dependencies")),
+                 needs="dependencies"),
+
+        Scenario("time_entries.create", "POST", "admin", lambda s: f"/api/v1/tasks/{task(s)}/time-entries",
+                 lambda s: {"minutes": s.rng.randint(15, 240), "note": "Benchmark"}, creates="time_entries"),
+        Scenario("time_entries.list", "GET", "admin",
+                 lambda s: f"/api/v1/tasks/{s.pick_created('time_entries')['task_id']}/time-entries",
+                 needs="time_entries"),
+        Scenario("time_entries.update", "PUT", "admin",
+                 lambda s: f"/api/v1/time-entries/{s.pick_created('time_entries')['id']}",
+                 lambda s: {"minutes": s.rng.randint(15, 240)}, needs="time_entries"),
+        Scenario("time_reports.summary", "GET", "admin",
+                 lambda s: "/api/v1/time-reports/?group_by=project&group_by=week"),
+        Scenario("time_reports.tasks", "GET", "admin",
+                 lambda s: f"/api/v1/time-reports/tasks?project_id={s.pick_created('time_entries')['project_id']}",
+                 needs="time_entries"),
+        Scenario("time_entries.delete", "DELETE", "admin",
+                 lambda s: f"/api/v1/time-entries/{s.pop_created('time_entries')['id']}", needs="time_entries"),
+
+        Scenario("attachments.upload", "POST", "admin",
+                 lambda s: f"/api/v1/tasks/{task(s)}/attachments?filename=bench.bin",
+                 content=lambda s: s.rng.randbytes(16_384), creates="attachments"),
+        Scenario("attachments.list", "GET", "admin",
+                 lambda s: f"/api/v1/tasks/{s.pick_created('attachments')['task_id']}/attachments",
+                 needs="attachments"),
+        Scenario("attachments.download", "GET", "admin",
+                 lambda s: f"/api/v1/attachments/{s.pick_created('attachments')['id']}", needs="attachments"),
+        Scenario("attachments.delete", "DELETE", "admin",
+                 lambda s: f"/api/v1/attachments/{s.pop_created('attachments')['id']}", needs="attachments"),
+
+        # An address literal, so creating a webhook needs no DNS lookup.
+        Scenario("webhooks.create", "POST", "admin", lambda s: "/api/v1/webhooks/",
+                 lambda s: {"project_id": project(s), "url": "https://93.184.216.34/bench-hook"},
+                 creates="webhooks"),
+        Scenario("webhooks.list", "GET", "admin",
+                 lambda s: f"/api/v1/webhooks/?project_id={s.pick_created('webhooks')['project_id']}",
+                 needs="webhooks"),
+        Scenario("webhooks.dead_letters", "GET", "admin",
+                 lambda s: f"/api/v1/webhooks/{s.pick_created('webhooks')['id']}/dead-letters", needs="webhooks"),
+        Scenario("webhooks.delete", "DELETE", "admin",
+                 lambda s: f"/api/v1/webhooks/{s.pop_created('webhooks')['id']}", needs="webhooks"),
+
+        Scenario("admin.slow_query_summary", "GET", "admin", lambda s: "/api/v1/admin/slow-queries/summary"),
+    ]
+    for role in ("admin", "manager", "developer"):
+        scenarios.extend([
+            Scenario(f"projects.list[{role}]", "GET", role, lambda s: "/api/v1/projects/"),
+            Scenario(f"tasks.list[{role}]", "GET", role, lambda s: "/api/v1/tasks/"),
+            Scenario(f"dashboard.stats[{role}]", "GET", role, lambda s: "/api/v1/dashboard/stats"),
+            Scenario(f"dashboard.recent_activity[{role}]", "GET", role,
+                     lambda s: "/api/v1/dashboard/recent-activity"),
+        ])
+    scenarios.append(Scenario("tasks.list_by_project", "GET", "admin",
+                              lambda s: f"/api/v1/tasks/?project_id={project(s)}"))
+    # Last, so there are changes from the scenarios above to page through.
+    scenarios.append(Scenario("sync.start", "GET", "developer", lambda s: "/api/v1/sync/"))
+    for role in ("admin", "developer"):
+        scenarios.append(Scenario(f"sync.changes[{role}]", "GET", role, lambda s: "/api/v1/sync/?since=0"))
+    return scenarios
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, state: ScenarioState,
+                       headers: Dict[str, dict], requests: int, concurrency: int,
+                       counter: Optional[StatementCounter]) -> EndpointResult:
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            # The path first: a body may reuse what it picked.
+            path = scenario.path(state)
+            kwargs = {"headers": headers.get(scenario.role, {})}
+            if scenario.body is not None:
+                kwargs["json"] = scenario.body(state)
+            if scenario.content is not None:
+                kwargs["content"] = scenario.content(state)
+            start = time.perf_counter()
+            response = await client.request(scenario.method, path, **kwargs)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+            elif scenario.creates is not None:
+                state.created[scenario.creates].append(response.json())
+
+    queries_before = counter.count if counter else 0
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    return EndpointResult(
+        requests=requests,
+        errors=errors,
+        p50_ms=round(percentile(latencies, 50), 3),
+        p95_ms=round(percentile(latencies, 95), 3),
+        p99_ms=round(percentile(latencies, 99), 3),
+        mean_ms=round(sum(latencies) / len(latencies), 3),
+        max_ms=round(latencies[-1], 3),
+        throughput_rps=round(requests / elapsed, 2),
+        queries_per_request=round((counter.count - queries_before) / requests, 2) if counter else None,
+    )
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> dict:
+    response = await client.post("/api/v1/auth/login", json={"username": username, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run_benchmark(client: httpx.AsyncClient, dataset, args,
+                        counter: Optional[StatementCounter]) -> Dict[str, dict]:
+    headers = {
+        "anonymous": {},
+        "admin": await login(client, dataset.admin_username, dataset.password),
+        "manager": await login(client, dataset.manager_username, dataset.password),
+        "developer": await login(client, dataset.developer_username, dataset.password),
+    }
+    state = ScenarioState(dataset, args.seed)
+    results = {}
+    for scenario in build_scenarios(login_requests=min(args.requests, args.login_requests)):
+        if args.only and not any(name in scenario.name for name in args.only):
+            continue
+        if scenario.needs is not None and not state.created[scenario.needs]:
+            print(f"{scenario.name:40s} skipped: no {scenario.needs} created by an earlier scenario")
+            continue
+        requests = scenario.requests or args.requests
+        # Warm up caches and connections before measuring.
+        await run_scenario(client, scenario, state, headers, min(requests, args.warmup), 1, None)
+        result = await run_scenario(client, scenario, state, headers, requests, args.concurrency, counter)
+        results[scenario.name] = asdict(result)
+        print(f"{scenario.name:40s} p50={result.p50_ms:8.2f}ms p95={result.p95_ms:8.2f}ms "
+              f"p99={result.p99_ms:8.2f}ms rps={result.throughput_rps:8.1f} "
+              f"queries={result.queries_per_request} errors={result.errors}")
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_ms: float) -> List[str]:
+    """Return a description of every endpoint that regressed against the baseline."""
+    regressions = []
+    for name, current in results["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if previous is None:
+            continue
+        limit = previous["p95_ms"] * (1 + tolerance)
+        if current["p95_ms"] > limit and current["p95_ms"] - previous["p95_ms"] > min_delta_ms:
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']:.2f}ms > baseline {previous['p95_ms']:.2f}ms "
+                f"(+{tolerance:.0%} allowed)"
+            )
+        if (current.get("queries_per_request") is not None
+                and previous.get("queries_per_request") is not None
+                and current["queries_per_request"] > previous["queries_per_request"] + 0.01):
+            regressions.append(
+                f"{name}: {current['queries_per_request']} queries/request > "
+                f"baseline {previous['queries_per_request']}"
+            )
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{name}: {current['errors']} errors > baseline {previous['errors']}")
+    return regressions
+
+
+def install_ai_stub() -> None:
+    """Replace the Groq call with a local stub so the AI router can be measured offline."""
+    from app.api.v1 import ai
+
+    async def fake_generate(project_description: str) -> List[str]:
+        return [
+            f"As a user, I want benchmark feature {n}, so that {project_description} is covered"
+            for n in range(5)
+        ]
+
+    ai.generate_user_stories_with_groq = fake_generate
+
+
+def parse_args(argv=None):
+    from benchmarks.datagen import SCALES
+
+    parser = argparse.ArgumentParser(description="Run the API latency benchmark")
+    parser.add_argument("--database-url", default=os.environ.get("BENCH_DATABASE_URL", "sqlite:///./bench.db"))
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    parser.add_argument("--login-requests", type=int, default=20, help="bcrypt makes login slow by design")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="run only endpoints whose name contains one of these")
+    parser.add_argument("--output", help="write results JSON to this file")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--save-baseline", help="write results JSON as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95 increase (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="ignore p95 increases below this")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    # Uploaded blobs go to a scratch directory, removed at the end.
+    attachments_dir = tempfile.TemporaryDirectory(prefix="bench_attachments_")
+    os.environ.setdefault("ATTACHMENTS_DIR", attachments_dir.name)
+
+    from benchmarks.datagen import SCALES, generate
+    from app.main import app
+    from app.core.database import Base, get_db, replica_router
+    from app import models  # noqa: F401  (registers every table on Base.metadata)
+
+    engine = create_bench_engine(args.database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    BenchSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    with BenchSession() as db:
+        started = time.perf_counter()
+        dataset = generate(db, SCALES[args.scale], seed=args.seed)
+        print(f"Generated {args.scale} dataset in {time.perf_counter() - started:.1f}s: {dataset.counts}")
+
+    def override_get_db():
+        db = BenchSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    # Reads without configured replicas use the primary, i.e. the benchmark engine.
+    replica_router.primary = engine
+    install_ai_stub()
+    counter = StatementCounter(engine)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            return await run_benchmark(client, dataset, args, counter)
+
+    endpoints = asyncio.run(run())
+    attachments_dir.cleanup()
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "database": engine.dialect.name,
+            "scale": args.scale,
+            "dataset": dataset.counts,
+            "concurrency": args.concurrency,
+            "requests_per_endpoint": args.requests,
+            "python": platform.python_version(),
+        },
+        "endpoints": endpoints,
+    }
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print("\nRegressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""Concurrent read/write throughput of the SQLite profile versus plain defaults.
+
+Runs the same mixed workload against two fresh database files: one opened
+with ``create_engine(url)`` defaults (rollback journal, no busy timeout) and
+one using the profile from app/core/sqlite.py (WAL, single writer, pooled
+readers). Reader threads list a project's tasks with their assignees; writer
+threads update a task and add a comment per transaction. Reports operations
+per second, p50/p95 latency and how many operations failed, typically with
+``database is locked``.
+
+Usage:
+    python -m benchmarks.sqlite_concurrency --readers 8 --writers 4 --seconds 10
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, joinedload, sessionmaker
+
+
+def build_default(url: str):
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    return sessionmaker(bind=engine, autoflush=False), [engine]
+
+
+def build_tuned(url: str):
+    from app.core import sqlite
+
+    writer = create_engine(url, **sqlite.writer_options())
+    sqlite.configure_engine(writer, writer=True)
+    reader = create_engine(url, **sqlite.reader_options())
+    sqlite.configure_engine(reader, writer=False)
+    factory = sessionmaker(class_=sqlite.SQLiteSession, writer=writer, reader=reader, autoflush=False)
+    return factory, [writer, reader]
+
+
+SETUPS = {"default": build_default, "tuned": build_tuned}
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run_workload(factory, dataset, readers: int, writers: int, seconds: float, seed: int) -> Dict:
+    from app.models.task import Task, TaskComment, TaskStatus
+
+    deadline = time.perf_counter() + seconds
+    latencies: Dict[str, List[float]] = {"read": [], "write": []}
+    errors: Counter = Counter()
+    lock = threading.Lock()
+
+    def read_loop(n: int) -> None:
+        rng = random.Random(seed + n)
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                with factory() as db:
+                    db.query(Task).options(joinedload(Task.assignee)).filter(
+                        Task.project_id == rng.choice(dataset.project_ids)
+                    ).limit(50).all()
+            except Exception as exc:
+                with lock:
+                    errors[f"read: {str(exc).splitlines()[0][:80]}"] += 1
+                continue
+            with lock:
+                latencies["read"].append(time.perf_counter() - start)
+
+    def write_loop(n: int) -> None:
+        rng = random.Random(seed + 1000 + n)
+        statuses = list(TaskStatus)
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                with factory() as db:
+                    task_id = rng.choice(dataset.task_ids)
+                    db.query(Task).filter(Task.id == task_id).update({"status": rng.choice(statuses)})
+                    db.add(TaskComment(content="benchmark", task_id=task_id,
+                                       author_id=rng.choice(dataset.user_ids)))
+                    db.commit()
+            except Exception as exc:
+                with lock:
+                    errors[f"write: {str(exc).splitlines()[0][:80]}"] += 1
+                continue
+            with lock:
+                latencies["write"].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=read_loop, args=(n,)) for n in range(readers)]
+    threads += [threading.Thread(target=write_loop, args=(n,)) for n in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    result = {}
+    for kind, values in latencies.items():
+        result[kind] = {
+            "ops": len(values),
+            "ops_per_second": round(len(values) / seconds, 1),
+            "p50_ms": round(_percentile(values, 50) * 1000, 2),
+            "p95_ms": round(_percentile(values, 95) * 1000, 2),
+        }
+    result["errors"] = dict(errors)
+    return result
+
+
+def parse_args(argv=None):
+    from benchmarks.datagen import SCALES
+
+    parser = argparse.ArgumentParser(description="Compare SQLite concurrency with and without the tuned profile")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--setups", nargs="*", choices=sorted(SETUPS), default=["default", "tuned"])
+    parser.add_argument("--output", help="write results JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+    from benchmarks.datagen import SCALES, generate
+    from app.core.database import Base
+    from app import models  # noqa: F401  (registers every table on Base.metadata)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name in args.setups:
+            url = f"sqlite:///{os.path.join(directory, name + '.db')}"
+            factory, engines = SETUPS[name](url)
+            Base.metadata.create_all(bind=engines[0])
+            with Session(engines[0]) as db:
+                dataset = generate(db, SCALES[args.scale], seed=args.seed)
+            print(f"Running {name} ({args.readers} readers, {args.writers} writers, {args.seconds:.0f}s)")
+            results[name] = run_workload(factory, dataset, args.readers, args.writers, args.seconds, args.seed)
+            print(json.dumps(results[name], indent=2))
+            for engine in engines:
+                engine.dispose()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Dependency graph queries on one large project.
+
+Bulk-loads a project of ``--tasks`` tasks in ``--layers`` layers; every task
+is blocked by up to ``--fan-in`` random tasks of earlier layers, so the
+graph is acyclic and the critical path crosses every layer. Reports the
+time of a cold critical-path query (loading the graph included), a warm
+one served from the cache, one right after a status change (the cached
+graph updated, the path recomputed), the frontier, and the cycle check run
+for each new edge.
+
+Usage:
+    python -m benchmarks.task_graph --tasks 50000 --fan-in 2
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+
+def _timed(func, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return round((time.perf_counter() - start) / repeat * 1000, 2)
+
+
+def run(args) -> dict:
+    from app.core.database import Base
+    from app import models  # noqa: F401  (registers every table on Base.metadata)
+    from app.models.project import Project
+    from app.models.task import Task, TaskStatus
+    from app.models.task_dependency import TaskDependency
+    from app.models.user import User, UserRole
+    from app.services.task_graph import GraphChange, creates_cycle, graph_cache
+
+    rng = random.Random(args.seed)
+    start_date = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    per_layer = max(1, args.tasks // args.layers)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(directory, 'graph.db')}", connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine, autoflush=False)
+
+        with factory() as db:
+            manager = User(username="bench_manager", email="bench@example.com", full_name="Bench",
+                           hashed_password="-", role=UserRole.PROJECT_MANAGER)
+            project = Project(name="Graph bench", manager=manager)
+            db.add(project)
+            db.commit()
+            project_id = project.id
+
+            tasks, edges = [], []
+            for n in range(1, args.tasks + 1):
+                layer = (n - 1) // per_layer
+                tasks.append({
+                    "id": n, "title": f"Task {n}", "project_id": project_id,
+                    "status": TaskStatus.DONE if rng.random() < args.done_ratio else TaskStatus.TODO,
+                    "due_date": start_date + timedelta(days=layer, hours=rng.randrange(24)),
+                })
+                if layer:
+                    for blocker in set(rng.randrange(1, layer * per_layer + 1) for _ in range(args.fan_in)):
+                        edges.append({"project_id": project_id, "blocked_id": n, "blocker_id": blocker})
+            db.execute(insert(Task.__table__), tasks)
+            db.execute(insert(TaskDependency.__table__), edges)
+            db.commit()
+
+            def critical_path():
+                return graph_cache.read(db, project_id, lambda graph: graph.critical_path)
+
+            def cold():
+                graph_cache.clear()
+                return critical_path()
+
+            def after_status_change():
+                task_id = rng.randrange(1, args.tasks + 1)
+                graph_cache.record({project_id: [GraphChange("task", task_id, is_open=rng.random() < 0.5)]})
+                return critical_path()
+
+            cold_ms = _timed(cold, repeat=3)
+            path = cold()
+            warm_ms = _timed(critical_path, repeat=100)
+            changed_ms = _timed(after_status_change, repeat=10)
+            frontier_ms = _timed(lambda: graph_cache.read(db, project_id, lambda graph: graph.frontier))
+            # The worst case for the check: the first task reaches nearly everything.
+            cycle_ms = _timed(lambda: creates_cycle(db, 1, args.tasks), repeat=10)
+        engine.dispose()
+
+    return {
+        "tasks": args.tasks,
+        "edges": len(edges),
+        "critical_path_length": len(path),
+        "critical_path_cold_ms": cold_ms,
+        "critical_path_warm_ms": warm_ms,
+        "critical_path_after_change_ms": changed_ms,
+        "frontier_ms": frontier_ms,
+        "cycle_check_ms": cycle_ms,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure dependency graph queries on a large project")
+    parser.add_argument("--tasks", type=int, default=50_000)
+    parser.add_argument("--layers", type=int, default=200)
+    parser.add_argument("--fan-in", type=int, default=2)
+    parser.add_argument("--done-ratio", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    result = run(args)
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""Subtask reads and writes under one large epic.
+
+Bulk-loads an epic with ``--fan-out`` children per task, ``--depth`` levels
+deep (11,110 subtasks with the defaults), with its closure rows and
+rollups. Reports the time to read the epic's progress from its row, the
+same rollup computed with a recursive query for comparison, the fetch of
+the whole subtree, and the commits of a status change on a leaf and of
+moving a top-level branch to another parent, which update the rollups and
+closure rows in place.
+
+Usage:
+    python -m benchmarks.task_tree --fan-out 10 --depth 4
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+
+def _timed(func, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return round((time.perf_counter() - start) / repeat * 1000, 2)
+
+
+def run(args) -> dict:
+    from app.core.database import Base
+    from app import models  # noqa: F401  (registers every table on Base.metadata)
+    from app.models.project import Project
+    from app.models.task import Task, TaskStatus
+    from app.models.task_closure import TaskClosure
+    from app.models.user import User, UserRole
+
+    rng = random.Random(args.seed)
+    tasks_table = Task.__table__
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(directory, 'tree.db')}", connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine, autoflush=False)
+
+        with factory() as db:
+            manager = User(username="bench_manager", email="bench@example.com", full_name="Bench",
+                           hashed_password="-", role=UserRole.PROJECT_MANAGER)
+            project = Project(name="Tree bench", manager=manager)
+            db.add(project)
+            db.commit()
+            project_id = project.id
+
+            # Breadth first, so every parent precedes its children.
+            rows, ancestors, levels = [], {1: []}, [[1]]
+            rows.append({"id": 1, "title": "Epic", "project_id": project_id, "parent_id": None,
+                         "status": TaskStatus.TODO})
+            for _ in range(args.depth):
+                level = []
+                for parent in levels[-1]:
+                    for _ in range(args.fan_out):
+                        task_id = len(rows) + 1
+                        rows.append({
+                            "id": task_id, "title": f"Task {task_id}", "project_id": project_id,
+                            "parent_id": parent,
+                            "status": TaskStatus.DONE if rng.random() < args.done_ratio else TaskStatus.TODO,
+                        })
+                        ancestors[task_id] = [parent] + ancestors[parent]
+                        level.append(task_id)
+                levels.append(level)
+            counts = {row["id"]: [0, 0] for row in rows}
+            closure = []
+            for row in rows:
+                for depth, ancestor in enumerate(ancestors[row["id"]], 1):
+                    closure.append({"project_id": project_id, "ancestor_id": ancestor,
+                                    "descendant_id": row["id"], "depth": depth})
+                    counts[ancestor][0] += 1
+                    counts[ancestor][1] += row["status"] == TaskStatus.DONE
+            for row in rows:
+                row["subtask_count"], row["completed_subtask_count"] = counts[row["id"]]
+            db.execute(insert(tasks_table), rows)
+            db.execute(insert(TaskClosure.__table__), closure)
+            db.commit()
+
+            def rollup():
+                return db.execute(
+                    select(tasks_table.c.subtask_count, tasks_table.c.completed_subtask_count)
+                    .where(tasks_table.c.id == 1)
+                ).one()
+
+            def recursive_rollup():
+                tree = select(tasks_table.c.id, tasks_table.c.status).where(
+                    tasks_table.c.parent_id == 1
+                ).cte("tree", recursive=True)
+                below = tasks_table.alias("below")
+                tree = tree.union_all(
+                    select(below.c.id, below.c.status).where(below.c.parent_id == tree.c.id)
+                )
+                return db.execute(select(
+                    func.count(), func.sum((tree.c.status == TaskStatus.DONE).cast(tasks_table.c.id.type))
+                )).one()
+
+            def subtree():
+                return db.query(Task, TaskClosure.depth).join(
+                    TaskClosure, TaskClosure.descendant_id == Task.id
+                ).filter(TaskClosure.ancestor_id == 1).order_by(TaskClosure.depth, Task.id).all()
+
+            def status_change():
+                task = db.get(Task, rng.choice(levels[-1]))
+                task.status = TaskStatus.TODO if task.status == TaskStatus.DONE else TaskStatus.DONE
+                db.commit()
+
+            branch, targets = levels[1][0], iter(levels[1][1:] * 2)
+
+            def move_branch():
+                task = db.get(Task, branch)
+                task.parent_id = next(targets)
+                db.commit()
+
+            expected = tuple(rollup())
+            rollup_ms = _timed(rollup, repeat=100)
+            recursive_ms = _timed(recursive_rollup, repeat=5)
+            assert tuple(recursive_rollup()) == expected
+            subtree_ms = _timed(subtree, repeat=3)
+            status_ms = _timed(status_change, repeat=20)
+            move_ms = _timed(move_branch, repeat=5)
+            moved = db.execute(select(func.count()).select_from(TaskClosure.__table__).where(
+                TaskClosure.ancestor_id == branch
+            )).scalar()
+            assert tuple(rollup()) == tuple(recursive_rollup())
+        engine.dispose()
+
+    return {
+        "subtasks": len(rows) - 1,
+        "closure_rows": len(closure),
+        "moved_subtree": moved + 1,
+        "rollup_ms": rollup_ms,
+        "recursive_rollup_ms": recursive_ms,
+        "subtree_ms": subtree_ms,
+        "status_change_commit_ms": status_ms,
+        "move_commit_ms": move_ms,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure subtask rollups and subtree operations on one epic")
+    parser.add_argument("--fan-out", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--done-ratio", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    result = run(args)
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,173 @@
+"""Time reports over a large time-entry table.
+
+Bulk-loads ``--entries`` time entries (10 million by default) spread over
+``--projects`` projects, ``--tasks`` tasks, ``--users`` users and
+``--weeks`` weeks, then builds the rollups with the bulk rebuild. Reports
+the rebuild time, the latency of the reports served from the rollups
+(one project by week, one user by project and week, every project, a
+project's tasks), the same reports summed from the raw entries for
+comparison, and the commit of one new entry, which updates the rollups in
+place.
+
+Usage:
+    python -m benchmarks.time_rollups --entries 10000000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+
+def _timed(func, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return round((time.perf_counter() - start) / repeat * 1000, 2)
+
+
+def run(args) -> dict:
+    from app.core.database import Base
+    from app import models  # noqa: F401  (registers every table on Base.metadata)
+    from app.models.project import Project
+    from app.models.task import Task, TaskStatus
+    from app.models.time_entry import ProjectTimeRollup, TaskTimeRollup, TimeEntry, week_start
+    from app.models.user import User, UserRole
+    from app.services.time_rollups import rebuild_time_rollups
+
+    rng = random.Random(args.seed)
+    entries = TimeEntry.__table__
+    first_week = week_start(date(2024, 1, 1))
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(directory, 'time.db')}", connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine, autoflush=False)
+
+        with factory() as db:
+            users = [User(username=f"bench_{n}", email=f"bench_{n}@example.com", full_name="Bench",
+                          hashed_password="-", role=UserRole.DEVELOPER) for n in range(args.users)]
+            projects = [Project(name=f"Time bench {n}", manager=users[0]) for n in range(args.projects)]
+            db.add_all(users + projects)
+            db.commit()
+            user_ids, project_ids = [user.id for user in users], [project.id for project in projects]
+
+            tasks = [{"id": n, "title": f"Task {n}", "project_id": project_ids[n % len(project_ids)],
+                      "status": TaskStatus.TODO} for n in range(1, args.tasks + 1)]
+            db.execute(insert(Task.__table__), tasks)
+            days = [first_week + timedelta(days=day) for day in range(args.weeks * 7)]
+            load_start = time.perf_counter()
+            for offset in range(0, args.entries, args.chunk):
+                chunk = []
+                for _ in range(min(args.chunk, args.entries - offset)):
+                    task = tasks[rng.randrange(len(tasks))]
+                    spent_on = days[rng.randrange(len(days))]
+                    chunk.append({
+                        "task_id": task["id"], "project_id": task["project_id"],
+                        "user_id": user_ids[rng.randrange(len(user_ids))], "minutes": rng.randint(15, 480),
+                        "spent_on": spent_on, "week_start": week_start(spent_on),
+                    })
+                db.execute(insert(entries), chunk)
+                db.commit()
+            load_s = round(time.perf_counter() - load_start, 1)
+
+            rebuild_start = time.perf_counter()
+            rebuild_time_rollups(db)
+            rebuild_s = round(time.perf_counter() - rebuild_start, 1)
+
+            project_id, user_id = project_ids[0], user_ids[1]
+            weeks, tasks_rollups = ProjectTimeRollup.__table__, TaskTimeRollup.__table__
+            reports = {
+                "project_by_week": (
+                    select(weeks.c.week_start, func.sum(weeks.c.minutes)).where(weeks.c.project_id == project_id)
+                    .group_by(weeks.c.week_start),
+                    select(entries.c.week_start, func.sum(entries.c.minutes)).where(entries.c.project_id == project_id)
+                    .group_by(entries.c.week_start),
+                ),
+                "user_by_project_and_week": (
+                    select(weeks.c.project_id, weeks.c.week_start, func.sum(weeks.c.minutes))
+                    .where(weeks.c.user_id == user_id).group_by(weeks.c.project_id, weeks.c.week_start),
+                    select(entries.c.project_id, entries.c.week_start, func.sum(entries.c.minutes))
+                    .where(entries.c.user_id == user_id).group_by(entries.c.project_id, entries.c.week_start),
+                ),
+                "all_projects": (
+                    select(weeks.c.project_id, func.sum(weeks.c.minutes)).group_by(weeks.c.project_id),
+                    select(entries.c.project_id, func.sum(entries.c.minutes)).group_by(entries.c.project_id),
+                ),
+                "project_tasks": (
+                    select(tasks_rollups.c.task_id, tasks_rollups.c.minutes)
+                    .where(tasks_rollups.c.project_id == project_id)
+                    .order_by(tasks_rollups.c.minutes.desc()).limit(100),
+                    select(entries.c.task_id, func.sum(entries.c.minutes).label("minutes"))
+                    .where(entries.c.project_id == project_id).group_by(entries.c.task_id)
+                    .order_by(func.sum(entries.c.minutes).desc()).limit(100),
+                ),
+            }
+            results = {}
+            for name, (from_rollups, from_entries) in reports.items():
+                expected = sorted(map(tuple, db.execute(from_entries).all()))
+                assert sorted(map(tuple, db.execute(from_rollups).all())) == expected, name
+                results[name] = {
+                    "rows": len(expected),
+                    "rollup_ms": _timed(lambda: db.execute(from_rollups).all(), repeat=20),
+                    "raw_entries_ms": _timed(lambda: db.execute(from_entries).all(), repeat=args.raw_repeat),
+                }
+
+            def log_entry():
+                task = tasks[rng.randrange(len(tasks))]
+                db.add(TimeEntry(task_id=task["id"], project_id=task["project_id"], user_id=user_id,
+                                 minutes=60, spent_on=days[rng.randrange(len(days))]))
+                db.commit()
+
+            write_ms = _timed(log_entry, repeat=50)
+            rollup_rows = db.execute(select(func.count()).select_from(weeks)).scalar()
+        engine.dispose()
+
+    return {
+        "entries": args.entries,
+        "project_week_user_rollups": rollup_rows,
+        "load_s": load_s,
+        "rebuild_s": rebuild_s,
+        "log_entry_commit_ms": write_ms,
+        "reports": results,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure time reports from rollups against raw time entries")
+    parser.add_argument("--entries", type=int, default=10_000_000)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--weeks", type=int, default=104)
+    parser.add_argument("--chunk", type=int, default=100_000, help="entries per bulk insert")
+    parser.add_argument("--raw-repeat", type=int, default=1, help="runs of each report over the raw entries")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    result = run(args)
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
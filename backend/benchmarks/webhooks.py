@@ -0,0 +1,168 @@
+"""Webhook delivery throughput against a local stub receiver.
+
+Creates ``--endpoints`` subscriptions on one project, each pointing at its
+own path of a local HTTP receiver that answers after ``--latency-ms`` (and
+fails ``--fail-rate`` of the batches with 503). ``--events`` task events are
+enqueued through the outbox in transactions of ``--per-transaction``, then
+the dispatcher drains it. Reports enqueue and delivery rates, the number of
+HTTP requests and connections used, and the mean batch size; retries are
+made due immediately so failures only cost extra requests.
+
+Usage:
+    python -m benchmarks.webhooks --events 20000 --endpoints 4 --latency-ms 5
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, func, update
+from sqlalchemy.orm import sessionmaker
+
+
+class StubReceiver:
+    """Counts webhook batches, events and client connections."""
+
+    def __init__(self, latency: float, fail_rate: float, seed: int):
+        self.lock = threading.Lock()
+        self.requests = self.events = self.failures = 0
+        self.connections = set()
+        rng = random.Random(seed)
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                time.sleep(latency)
+                with receiver.lock:
+                    failed = rng.random() < fail_rate
+                    receiver.requests += 1
+                    receiver.failures += failed
+                    receiver.events += 0 if failed else body.count(b'"type"')
+                    receiver.connections.add(self.client_address)
+                self.send_response(503 if failed else 204)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+def run(args) -> dict:
+    from app.core.config import settings
+    from app.core.database import Base
+    from app import models  # noqa: F401  (registers every table on Base.metadata)
+    from app.models.project import Project
+    from app.models.user import User, UserRole
+    from app.models.webhook import WebhookDelivery, WebhookSubscription
+    from app.services.webhooks import WebhookDispatcher, enqueue_events
+
+    settings.webhook_batch_size = args.batch_size
+    settings.webhook_workers = args.workers
+    receiver = StubReceiver(args.latency_ms / 1000, args.fail_rate, args.seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(directory, 'webhooks.db')}", connect_args={"check_same_thread": False}
+        )
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(bind=engine, autoflush=False)
+
+        with factory() as db:
+            manager = User(username="bench_manager", email="bench@example.com", full_name="Bench",
+                           hashed_password="-", role=UserRole.PROJECT_MANAGER)
+            project = Project(name="Webhook bench", manager=manager)
+            db.add(project)
+            db.flush()
+            db.add_all(
+                WebhookSubscription(project_id=project.id, url=f"{receiver.url}/hook/{n}", secret=f"secret-{n}")
+                for n in range(args.endpoints)
+            )
+            db.commit()
+            project_id = project.id
+
+        start = time.perf_counter()
+        for first in range(0, args.events, args.per_transaction):
+            with factory() as db:
+                count = min(args.per_transaction, args.events - first)
+                enqueue_events(db, project_id, [
+                    ("task.status_changed", {"id": first + n, "status": "done", "previous_status": "todo"})
+                    for n in range(count)
+                ])
+                db.commit()
+        enqueue_seconds = time.perf_counter() - start
+
+        dispatcher = WebhookDispatcher(factory)
+        start = time.perf_counter()
+        while True:
+            dispatcher.run_once()
+            with factory() as db:
+                pending = db.query(func.count(WebhookDelivery.id)).scalar()
+                if not pending:
+                    break
+                # Skip the backoff; the benchmark measures throughput, not patience.
+                db.execute(update(WebhookDelivery).values(next_attempt_at=func.current_timestamp()))
+                db.commit()
+        deliver_seconds = time.perf_counter() - start
+        dispatcher.close()
+        engine.dispose()
+    receiver.server.shutdown()
+
+    deliveries = args.events * args.endpoints
+    return {
+        "events": args.events,
+        "endpoints": args.endpoints,
+        "deliveries": deliveries,
+        "enqueue_per_second": round(deliveries / enqueue_seconds, 1),
+        "deliveries_per_second": round(deliveries / deliver_seconds, 1),
+        "deliver_seconds": round(deliver_seconds, 2),
+        "requests": receiver.requests,
+        "failed_requests": receiver.failures,
+        "connections": len(receiver.connections),
+        "mean_batch_size": round(receiver.events / max(1, receiver.requests - receiver.failures), 1),
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measure webhook delivery throughput")
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--endpoints", type=int, default=4)
+    parser.add_argument("--per-transaction", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write results JSON to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+    result = run(args)
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
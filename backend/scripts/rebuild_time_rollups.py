@@ -0,0 +1,29 @@
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from app.core.database import SessionLocal
+from app import models  # noqa: F401  (registers the flush hooks)
+from app.services.time_rollups import rebuild_time_rollups
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Recompute the time tracking rollups from the time entries, one project per transaction"
+    )
+    parser.add_argument("--project-id", type=int, action="append",
+                        help="rebuild only this project (repeatable); default: every project with time entries")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        rebuilt = rebuild_time_rollups(db, args.project_id)
+    finally:
+        db.close()
+    print(f"Rebuilt time rollups of {len(rebuilt)} project(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,179 @@
+import os
+import threading
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import pytest
+from fastapi import Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy.orm import Session, sessionmaker
+from app.main import app
+from app.core.config import settings
+from app.core.database import get_db, replica_router, Base
+from app.api import scope
+from app.services.task_graph import graph_cache
+from app.services.label_index import label_index
+from app.schemas.loaders import raise_on_lazy_load
+from app.core import database, slow_query, sqlite
+from app.core.query_counter import instrument_engine
+from app.models.user import User, UserRole
+from app.core.security import get_password_hash
+
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
+instrument_engine(engine)
+slow_query.instrument_engine(engine)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+settings.sql_debug_headers = True
+# Requests must load relationships through their loader profiles.
+event.listen(Session, "do_orm_execute", raise_on_lazy_load)
+
+_password_hashes = {}
+
+
+def override_get_db(request: Request):
+    try:
+        db = TestingSessionLocal()
+        db.info["request"] = request
+        yield db
+    finally:
+        db.close()
+
+
+app.dependency_overrides[get_db] = override_get_db
+# Read-only sessions fall back to the primary when no replica is configured.
+replica_router.primary = engine
+
+
+@pytest.fixture
+def test_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    scope.cache.clear()
+    graph_cache.clear()
+    label_index.clear()
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def client(test_db):
+    return TestClient(app)
+
+
+@pytest.fixture
+def make_user(test_db):
+    def make(username: str, role: UserRole = UserRole.DEVELOPER, password: str = "testpass") -> User:
+        if password not in _password_hashes:
+            _password_hashes[password] = get_password_hash(password)
+        user = User(
+            username=username,
+            email=f"{username}@example.com",
+            full_name=username.replace("_", " ").title(),
+            hashed_password=_password_hashes[password],
+            role=role,
+            is_active=True
+        )
+        test_db.add(user)
+        test_db.commit()
+        test_db.refresh(user)
+        return user
+    return make
+
+
+@pytest.fixture
+def login(client):
+    def login_as(username: str, password: str = "testpass") -> dict:
+        response = client.post("/api/v1/auth/login", json={
+            "username": username,
+            "password": password
+        })
+        token = response.json()["access_token"]
+        return {"Authorization": f"Bearer {token}"}
+    return login_as
+
+
+@pytest.fixture
+def assert_query_budget():
+    """Fail when a response ran more SQL statements than its budget allows."""
+    def check(response, budget: int):
+        count = int(response.headers["X-Query-Count"])
+        request = response.request
+        assert count <= budget, (
+            f"{request.method} {request.url.path} ran {count} queries, budget is {budget}"
+        )
+        return count
+    return check
+
+
+@pytest.fixture
+def sqlite_profile(test_db):
+    """Serve requests through the SQLite deployment profile on the test database."""
+    writer = create_engine(SQLALCHEMY_DATABASE_URL, **sqlite.writer_options())
+    sqlite.configure_engine(writer, writer=True)
+    reader = create_engine(SQLALCHEMY_DATABASE_URL, **sqlite.reader_options())
+    sqlite.configure_engine(reader, writer=False)
+    ProfileSession = sessionmaker(
+        class_=sqlite.SQLiteSession, writer=writer, reader=reader, autocommit=False, autoflush=False
+    )
+
+    def get_profile_db(request: Request):
+        db = ProfileSession()
+        db.info["request"] = request
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = get_profile_db
+    try:
+        yield ProfileSession
+    finally:
+        app.dependency_overrides[get_db] = override_get_db
+        reader.dispose()
+        writer.dispose()
+        # Other tests expect the default rollback journal, which needs the
+        # database to ourselves.
+        test_db.close()
+        for pooled in (engine, database.engine, database.read_engine):
+            pooled.dispose()
+        with engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA journal_mode=DELETE")
+
+
+@pytest.fixture
+def overlap(monkeypatch):
+    """Send two requests so the second starts while the first sits between its check and its write.
+
+    ``check`` names the function in ``module`` that the endpoint calls before
+    writing; the first call holds on for a moment after it returns.
+    """
+    def run(module, check, first, second):
+        checked = threading.Event()
+        real = getattr(module, check)
+
+        def held(*args, **kwargs):
+            result = real(*args, **kwargs)
+            if not checked.is_set():
+                checked.set()
+                time.sleep(0.3)
+            return result
+
+        monkeypatch.setattr(module, check, held)
+        responses = []
+        thread = threading.Thread(target=lambda: responses.append(first()))
+        thread.start()
+        assert checked.wait(5)
+        responses.append(second())
+        thread.join()
+        return responses
+    return run
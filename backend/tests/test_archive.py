@@ -0,0 +1,99 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select, update
+
+from app.models.archive import archived_task_comments, archived_tasks, archived_user_stories
+from app.models.project import Project, ProjectStatus
+from app.models.task import Task, TaskComment, TaskStatus
+from app.models.user import UserRole
+from app.models.user_story import UserStory
+from app.api.v1 import projects as projects_api
+from app.services.archive import archive_due_projects
+
+
+def rows(db, table):
+    return db.execute(select(func.count()).select_from(table)).scalar()
+
+
+def make_project(db, manager, name, status, tasks=3):
+    project = Project(name=name, manager_id=manager.id, status=status)
+    for n in range(tasks):
+        task = Task(title=f"{name} {n}", status=TaskStatus.DONE)
+        task.comments.append(TaskComment(content="Done", author_id=manager.id))
+        project.tasks.append(task)
+    project.user_stories.append(UserStory(title="Story", description="As a user..."))
+    db.add(project)
+    db.commit()
+    return project.id
+
+
+def test_archive_moves_rows_out_of_hot_tables_and_restore_brings_them_back(client, test_db, make_user, login):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    done = make_project(test_db, manager, "Done", ProjectStatus.COMPLETED)
+    active = make_project(test_db, manager, "Active", ProjectStatus.IN_PROGRESS, tasks=1)
+    headers = login("manager_user")
+
+    assert client.post(f"/api/v1/projects/{active}/archive", headers=headers).status_code == 409
+    response = client.post(f"/api/v1/projects/{done}/archive", headers=headers)
+    assert response.status_code == 200 and response.json()["archived_at"]
+
+    assert (rows(test_db, Task.__table__), rows(test_db, archived_tasks)) == (1, 3)
+    assert (rows(test_db, TaskComment.__table__), rows(test_db, archived_task_comments)) == (1, 3)
+    assert (rows(test_db, UserStory.__table__), rows(test_db, archived_user_stories)) == (1, 1)
+
+    assert [p["id"] for p in client.get("/api/v1/projects/", headers=headers).json()] == [active]
+    archived = client.get("/api/v1/projects/?include_archived=true", headers=headers).json()
+    assert {p["id"]: p["task_count"] for p in archived} == {done: 3, active: 1}
+    assert len(client.get("/api/v1/tasks/", headers=headers).json()) == 1
+    titles = [t["title"] for t in client.get("/api/v1/tasks/?include_archived=true&limit=2&skip=1",
+                                              headers=headers).json()]
+    assert titles == ["Done 1", "Done 2"]
+    task = {"title": "Late", "project_id": done}
+    assert client.post("/api/v1/tasks/", json=task, headers=headers).status_code == 409
+
+    response = client.post(f"/api/v1/projects/{done}/restore", headers=headers)
+    assert response.status_code == 200 and response.json()["archived_at"] is None
+    assert (rows(test_db, Task.__table__), rows(test_db, archived_tasks)) == (4, 0)
+    assert rows(test_db, TaskComment.__table__) == 4 and rows(test_db, archived_task_comments) == 0
+    detail = client.get(f"/api/v1/projects/{done}", headers=headers).json()
+    assert (detail["task_count"], detail["completed_tasks"]) == (3, 3)
+
+
+def test_background_archive_respects_retention_window(test_db, make_user):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    old = make_project(test_db, manager, "Old", ProjectStatus.CANCELLED)
+    recent = make_project(test_db, manager, "Recent", ProjectStatus.COMPLETED)
+    make_project(test_db, manager, "Running", ProjectStatus.IN_PROGRESS)
+    long_ago = datetime.now(timezone.utc) - timedelta(days=365)
+    test_db.execute(update(Project.__table__).where(Project.__table__.c.id.in_([old]))
+                    .values(created_at=long_ago, updated_at=long_ago))
+    test_db.commit()
+
+    assert archive_due_projects(test_db) == [old]
+    assert archive_due_projects(test_db) == []
+    assert test_db.get(Project, recent).archived_at is None
+    assert rows(test_db, archived_tasks) == 3
+
+
+def test_archive_and_restore_run_off_the_event_loop(client, test_db, make_user, login, monkeypatch):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    done = make_project(test_db, manager, "Done", ProjectStatus.COMPLETED)
+    headers = login("manager_user")
+    loops = []
+
+    def off_loop(move):
+        def run(*args):
+            try:
+                loops.append(asyncio.get_running_loop())
+            except RuntimeError:
+                loops.append(None)
+            return move(*args)
+        return run
+
+    monkeypatch.setattr(projects_api, "archive_project", off_loop(projects_api.archive_project))
+    monkeypatch.setattr(projects_api, "restore_project", off_loop(projects_api.restore_project))
+    assert client.post(f"/api/v1/projects/{done}/archive", headers=headers).status_code == 200
+    assert client.post(f"/api/v1/projects/{done}/restore", headers=headers).status_code == 200
+    # Called from a worker thread, where no event loop is running.
+    assert loops == [None, None]
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import time
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.models.archive import archived_attachments
+from app.models.attachment import Attachment
+from app.models.project import Project, ProjectStatus
+from app.models.task import Task, TaskComment, TaskStatus
+from app.models.user import UserRole
+from app.services import attachments
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # Small blocks, so even test files are written in several of them.
+    monkeypatch.setattr(attachments.store, "root", tmp_path)
+    monkeypatch.setattr(attachments.store, "chunk_bytes", 7)
+    return attachments.store
+
+
+def make_task(db, manager, status=ProjectStatus.IN_PROGRESS):
+    project = Project(name="Files", manager_id=manager.id, status=status)
+    task = Task(title="Spec", status=TaskStatus.DONE)
+    task.comments.append(TaskComment(content="See attached", author_id=manager.id))
+    project.tasks.append(task)
+    db.add(project)
+    db.commit()
+    return project.id, task.id, task.comments[0].id
+
+
+def upload(client, headers, task_id, content, filename="spec.txt", **params):
+    return client.post(
+        f"/api/v1/tasks/{task_id}/attachments", params={"filename": filename, **params},
+        content=content, headers={**headers, "Content-Type": "text/plain"}
+    )
+
+
+def age(store, seconds):
+    past = time.time() - seconds
+    for path in store.root.rglob("*"):
+        if path.is_file():
+            os.utime(path, (past, past))
+
+
+def test_upload_streams_to_content_addressed_storage_with_dedup(client, test_db, make_user, login, store):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    _, task_id, comment_id = make_task(test_db, manager)
+    headers = login("manager_user")
+    content = b"The quick brown fox jumps over the lazy dog" * 3
+    digest = hashlib.sha256(content).hexdigest()
+
+    first = upload(client, headers, task_id, content)
+    assert first.status_code == 200
+    assert first.json()["digest"] == digest and first.json()["size"] == len(content)
+    second = upload(client, headers, task_id, content, filename="copy.txt", comment_id=comment_id)
+    assert second.status_code == 200 and second.json()["comment_id"] == comment_id
+
+    assert store.path(digest).read_bytes() == content
+    assert [path.name for path in store.root.glob("??/??/*")] == [digest]
+    assert list((store.root / "tmp").iterdir()) == []
+    listed = client.get(f"/api/v1/tasks/{task_id}/attachments", headers=headers).json()
+    assert [a["filename"] for a in listed] == ["spec.txt", "copy.txt"]
+
+    # The file stays while any attachment references it.
+    assert client.delete(f"/api/v1/attachments/{first.json()['id']}", headers=headers).status_code == 200
+    age(store, 2 * settings.attachment_sweep_grace_seconds)
+    assert attachments.sweep_attachments(test_db) == 0
+    assert client.delete(f"/api/v1/attachments/{second.json()['id']}", headers=headers).status_code == 200
+    assert attachments.sweep_attachments(test_db) == 1
+    assert not store.path(digest).exists()
+
+
+def test_download_supports_ranges_and_etags(client, test_db, make_user, login, store):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    _, task_id, _ = make_task(test_db, manager)
+    headers = login("manager_user")
+    content = bytes(range(256)) * 4
+    attachment = upload(client, headers, task_id, content, filename="data.bin").json()
+    url = f"/api/v1/attachments/{attachment['id']}"
+
+    full = client.get(url, headers=headers)
+    assert full.status_code == 200 and full.content == content
+    etag = full.headers["etag"]
+    assert etag == f'"{attachment["digest"]}"' and full.headers["accept-ranges"] == "bytes"
+    assert full.headers["content-disposition"] == 'attachment; filename="data.bin"'
+
+    assert client.get(url, headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    part = client.get(url, headers={**headers, "Range": "bytes=10-19"})
+    assert part.status_code == 206 and part.content == content[10:20]
+    assert part.headers["content-range"] == f"bytes 10-19/{len(content)}"
+    assert client.get(url, headers={**headers, "Range": "bytes=-5"}).content == content[-5:]
+    assert client.get(url, headers={**headers, "Range": "bytes=1000-"}).content == content[1000:]
+    beyond = client.get(url, headers={**headers, "Range": f"bytes={len(content)}-"})
+    assert beyond.status_code == 416 and beyond.headers["content-range"] == f"bytes */{len(content)}"
+
+    stale = client.get(url, headers={**headers, "Range": "bytes=0-9", "If-Range": '"outdated"'})
+    assert stale.status_code == 200 and stale.content == content
+    fresh = client.get(url, headers={**headers, "Range": "bytes=0-9", "If-Range": etag})
+    assert fresh.status_code == 206 and fresh.content == content[:10]
+
+
+def test_uploads_are_checked_against_task_scope_and_size_limit(
+    client, test_db, make_user, login, store, monkeypatch
+):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    make_user("developer_user")
+    _, task_id, comment_id = make_task(test_db, manager)
+    _, other_task_id, _ = make_task(test_db, manager)
+    headers = login("manager_user")
+
+    attachment = upload(client, headers, task_id, b"secret").json()
+    developer = login("developer_user")
+    assert upload(client, developer, task_id, b"hello").status_code == 403
+    assert client.get(f"/api/v1/attachments/{attachment['id']}", headers=developer).status_code == 403
+    assert upload(client, headers, other_task_id, b"hello", comment_id=comment_id).status_code == 404
+
+    monkeypatch.setattr(settings, "attachment_max_bytes", 10)
+    assert upload(client, headers, task_id, b"x" * 11).status_code == 413
+    assert list((store.root / "tmp").iterdir()) == []
+    assert test_db.execute(select(func.count()).select_from(Attachment.__table__)).scalar() == 1
+
+
+def test_attachments_move_with_archived_tasks(client, test_db, make_user, login, store):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    project_id, task_id, comment_id = make_task(test_db, manager, ProjectStatus.COMPLETED)
+    headers = login("manager_user")
+    upload(client, headers, task_id, b"on the task")
+    upload(client, headers, task_id, b"on the comment", comment_id=comment_id)
+
+    assert client.post(f"/api/v1/projects/{project_id}/archive", headers=headers).status_code == 200
+    counts = lambda table: test_db.execute(select(func.count()).select_from(table)).scalar()  # noqa: E731
+    assert (counts(Attachment.__table__), counts(archived_attachments)) == (0, 2)
+    assert upload(client, headers, task_id, b"late").status_code == 404
+    age(store, 2 * settings.attachment_sweep_grace_seconds)
+    assert attachments.sweep_attachments(test_db) == 0
+
+    assert client.post(f"/api/v1/projects/{project_id}/restore", headers=headers).status_code == 200
+    listed = client.get(f"/api/v1/tasks/{task_id}/attachments", headers=headers).json()
+    assert [a["comment_id"] for a in listed] == [None, comment_id]
+    assert client.get(f"/api/v1/attachments/{listed[1]['id']}", headers=headers).content == b"on the comment"
\ No newline at end of file
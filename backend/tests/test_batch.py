@@ -0,0 +1,54 @@
+import pytest
+
+from app.core.config import settings
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import UserRole
+
+
+@pytest.fixture
+def batch(test_db, make_user, login):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    other = make_user("other_manager", UserRole.PROJECT_MANAGER)
+    mine = Project(name="Mine", manager_id=manager.id, tasks=[Task(title="Mine 1"), Task(title="Mine 2")])
+    theirs = Project(name="Theirs", manager_id=other.id, tasks=[Task(title="Theirs 1")])
+    test_db.add_all([mine, theirs])
+    test_db.commit()
+    return {
+        "mine": mine.id,
+        "theirs": theirs.id,
+        "tasks": {task.title: task.id for task in mine.tasks + theirs.tasks},
+        "users": [manager.id, other.id],
+        "headers": login("manager_user"),
+    }
+
+
+def test_tasks_batch_keeps_order_and_reports_the_rest(client, batch, assert_query_budget):
+    tasks = batch["tasks"]
+    ids = [tasks["Mine 2"], 999, tasks["Theirs 1"], tasks["Mine 1"], tasks["Mine 2"]]
+    response = client.get(f"/api/v1/tasks/batch?ids={','.join(map(str, ids))}", headers=batch["headers"])
+    assert response.status_code == 200
+    # Auth, scope, the IN query and the existence check for the ids it left out.
+    assert_query_budget(response, 4)
+    body = response.json()
+    assert [task["title"] for task in body["items"]] == ["Mine 2", "Mine 1"]
+    assert body["not_found"] == [999]
+    assert body["forbidden"] == [tasks["Theirs 1"]]
+
+
+def test_projects_and_users_batch(client, batch):
+    ids = f"{batch['theirs']},{batch['mine']}"
+    body = client.get(f"/api/v1/projects/batch?ids={ids}", headers=batch["headers"]).json()
+    assert [project["name"] for project in body["items"]] == ["Mine"]
+    assert body["forbidden"] == [batch["theirs"]]
+
+    ids = f"{batch['users'][1]},12345,{batch['users'][0]}"
+    body = client.get(f"/api/v1/users/batch?ids={ids}", headers=batch["headers"]).json()
+    assert [user["username"] for user in body["items"]] == ["other_manager", "manager_user"]
+    assert body["not_found"] == [12345] and body["forbidden"] == []
+
+
+def test_batch_rejects_bad_and_oversized_id_lists(client, batch):
+    assert client.get("/api/v1/tasks/batch?ids=1,x", headers=batch["headers"]).status_code == 400
+    too_many = ",".join(str(n) for n in range(settings.batch_max_ids + 1))
+    assert client.get(f"/api/v1/users/batch?ids={too_many}", headers=batch["headers"]).status_code == 400
\ No newline at end of file
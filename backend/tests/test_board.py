@@ -0,0 +1,45 @@
+import pytest
+
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.models.user import UserRole
+
+
+@pytest.fixture
+def board(test_db, make_user, login):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    make_user("outsider", UserRole.PROJECT_MANAGER)
+    project = Project(name="Board", manager_id=manager.id)
+    statuses = [TaskStatus.DONE] * 7 + [TaskStatus.TODO] * 3 + [TaskStatus.IN_PROGRESS]
+    project.tasks = [Task(title=f"{status.value} {n}", status=status) for n, status in enumerate(statuses)]
+    test_db.add(project)
+    test_db.commit()
+    return {"project_id": project.id, "manager": login("manager_user"), "outsider": login("outsider")}
+
+
+def test_board_returns_counts_and_first_page_per_column(client, board, assert_query_budget):
+    response = client.get(f"/api/v1/projects/{board['project_id']}/board?per_column=2", headers=board["manager"])
+    assert response.status_code == 200
+    # Auth, scope, project check, grouped counts and the windowed task query.
+    assert_query_budget(response, 5)
+
+    columns = {column["status"]: column for column in response.json()["columns"]}
+    assert [columns[status]["count"] for status in ("todo", "in_progress", "done")] == [3, 1, 7]
+    assert [task["title"] for task in columns["done"]["tasks"]] == ["done 6", "done 5"]
+    assert len(columns["todo"]["tasks"]) == 2 and columns["todo"]["next_cursor"] is not None
+    assert columns["in_progress"]["next_cursor"] is None
+
+    path = f"/api/v1/projects/{board['project_id']}/board/done?limit=3"
+    cursor, titles = columns["done"]["next_cursor"], []
+    while cursor is not None:
+        page = client.get(f"{path}&cursor={cursor}", headers=board["manager"]).json()
+        assert page["count"] == 7
+        titles += [task["title"] for task in page["tasks"]]
+        cursor = page["next_cursor"]
+    assert titles == [f"done {n}" for n in range(4, -1, -1)]
+
+
+def test_board_is_scoped(client, board):
+    path = f"/api/v1/projects/{board['project_id']}/board"
+    assert client.get(path, headers=board["outsider"]).status_code == 403
+    assert client.get("/api/v1/projects/999/board", headers=board["manager"]).status_code == 404
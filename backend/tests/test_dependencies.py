@@ -0,0 +1,163 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import func, select
+
+from app.api.v1 import dependencies as dependencies_api
+from app.models.archive import archived_task_dependencies
+from app.models.project import Project, ProjectStatus
+from app.models.task import Task, TaskStatus
+from app.models.task_dependency import TaskDependency
+from app.models.user import UserRole
+from app.services.task_graph import GraphChange, ProjectGraph
+
+
+def make_tasks(db, manager, count, status=ProjectStatus.IN_PROGRESS, due_dates=None):
+    project = Project(name="Graph", manager_id=manager.id, status=status)
+    for n in range(count):
+        due_date = due_dates[n] if due_dates else None
+        project.tasks.append(Task(title=f"Task {n}", due_date=due_date))
+    db.add(project)
+    db.commit()
+    return project.id, [task.id for task in project.tasks]
+
+
+def block(client, headers, blocked, blocker):
+    return client.post(f"/api/v1/tasks/{blocked}/dependencies", json={"blocker_id": blocker}, headers=headers)
+
+
+def test_dependencies_reject_cycles_and_cross_project_edges(client, test_db, make_user, login):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    _, (a, b, c, d) = make_tasks(test_db, manager, 4)
+    _, (other,) = make_tasks(test_db, manager, 1)
+    headers = login("manager_user")
+
+    assert block(client, headers, b, a).status_code == 200
+    assert block(client, headers, c, b).status_code == 200
+    assert block(client, headers, d, b).status_code == 200
+    assert block(client, headers, b, a).status_code == 409
+    cycle = block(client, headers, a, c)
+    assert cycle.status_code == 409 and "cycle" in cycle.json()["detail"]
+    assert block(client, headers, a, a).status_code == 400
+    assert block(client, headers, a, other).status_code == 400
+    assert block(client, headers, d, c).status_code == 200
+
+    edges = client.get(f"/api/v1/tasks/{b}/dependencies", headers=headers).json()
+    assert [t["id"] for t in edges["blocked_by"]] == [a]
+    assert [t["id"] for t in edges["blocking"]] == [c, d]
+
+    assert client.delete(f"/api/v1/tasks/{b}/dependencies/{a}", headers=headers).status_code == 200
+    assert client.delete(f"/api/v1/tasks/{b}/dependencies/{a}", headers=headers).status_code == 404
+    # Without that edge, a may now wait for c.
+    assert block(client, headers, a, c).status_code == 200
+
+
+def test_concurrent_edges_cannot_close_a_cycle(client, test_db, make_user, login, sqlite_profile, overlap):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    _, (a, b) = make_tasks(test_db, manager, 2)
+    headers = login("manager_user")
+
+    responses = overlap(
+        dependencies_api, "creates_cycle", lambda: block(client, headers, b, a), lambda: block(client, headers, a, b)
+    )
+    assert sorted(response.status_code for response in responses) == [200, 409]
+    assert test_db.query(TaskDependency).count() == 1
+
+
+def test_frontier_follows_status_changes_and_deletes(client, test_db, make_user, login):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    project_id, (a, b, c) = make_tasks(test_db, manager, 3)
+    headers = login("manager_user")
+    block(client, headers, b, a)
+    block(client, headers, c, a)
+    block(client, headers, c, b)
+    url = f"/api/v1/projects/{project_id}/frontier"
+
+    frontier = client.get(url, headers=headers).json()
+    assert frontier["ready"] == [a]
+    assert frontier["blocked"] == [{"task_id": b, "blocked_by": [a]}, {"task_id": c, "blocked_by": [a, b]}]
+
+    client.put(f"/api/v1/tasks/{a}", json={"status": TaskStatus.DONE.value}, headers=headers)
+    frontier = client.get(url, headers=headers).json()
+    assert frontier["ready"] == [b] and frontier["blocked"] == [{"task_id": c, "blocked_by": [b]}]
+
+    assert client.delete(f"/api/v1/tasks/{b}", headers=headers).status_code == 200
+    assert client.get(url, headers=headers).json() == {"project_id": project_id, "ready": [c], "blocked": []}
+    remaining = test_db.execute(select(TaskDependency.blocked_id, TaskDependency.blocker_id)).all()
+    assert remaining == [(c, a)]
+
+
+def test_critical_path_uses_due_dates(client, test_db, make_user, login):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    due = [start + timedelta(days=n) for n in (5, 1, 20, 3)]
+    project_id, (design, spike, build, review) = make_tasks(test_db, manager, 4, due_dates=due)
+    headers = login("manager_user")
+    # design -> build, spike -> review -> build; design finishes last among build's blockers.
+    block(client, headers, build, design)
+    block(client, headers, review, spike)
+    block(client, headers, build, review)
+    block(client, headers, review, design)
+
+    path = client.get(f"/api/v1/projects/{project_id}/critical-path", headers=headers).json()
+    assert [t["id"] for t in path["tasks"]] == [design, review, build]
+    assert [t["is_late"] for t in path["tasks"]] == [False, True, False]
+    assert path["tasks"][1]["earliest_finish"].startswith("2030-01-06")
+    assert path["projected_finish"].startswith("2030-01-21")
+
+
+def test_critical_path_without_due_dates_is_the_longest_chain():
+    graph = ProjectGraph(
+        [(n, True, None) for n in range(1, 7)] + [(7, False, None)],
+        [(2, 1), (3, 2), (4, 3), (5, 1), (6, 7)],
+    )
+    assert [step.task_id for step in graph.critical_path] == [1, 2, 3, 4]
+    assert graph.frontier == ([1, 6], {2: [1], 3: [2], 4: [3], 5: [1]})
+
+
+def test_dependencies_move_with_archived_projects(client, test_db, make_user, login):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    project_id, (a, b) = make_tasks(test_db, manager, 2, status=ProjectStatus.COMPLETED)
+    headers = login("manager_user")
+    block(client, headers, b, a)
+
+    count = lambda table: test_db.execute(select(func.count()).select_from(table)).scalar()  # noqa: E731
+    client.post(f"/api/v1/projects/{project_id}/archive", headers=headers)
+    assert (count(TaskDependency.__table__), count(archived_task_dependencies)) == (0, 1)
+    assert client.get(f"/api/v1/projects/{project_id}/frontier", headers=headers).json()["blocked"] == []
+
+    client.post(f"/api/v1/projects/{project_id}/restore", headers=headers)
+    assert (count(TaskDependency.__table__), count(archived_task_dependencies)) == (1, 0)
+    frontier = client.get(f"/api/v1/projects/{project_id}/frontier", headers=headers).json()
+    assert frontier["blocked"] == [{"task_id": b, "blocked_by": [a]}]
+
+def test_incremental_critical_path_matches_a_fresh_graph():
+    rng = random.Random(7)
+    due = lambda: datetime(2030, 1, 1) + timedelta(days=rng.randrange(10)) if rng.random() < 0.6 else None  # noqa: E731
+    tasks = {n: (rng.random() < 0.7, due()) for n in range(1, 30)}
+    edges = {(n, rng.randrange(1, n)) for n in range(2, 30) for _ in range(rng.randrange(3))}
+    graph = ProjectGraph([(n, *state) for n, state in tasks.items()], edges)
+
+    for _ in range(100):
+        graph.critical_path
+        task_id = rng.choice(list(tasks))
+        roll = rng.random()
+        if roll < 0.5:
+            tasks[task_id] = (rng.random() < 0.6, due())
+            change = GraphChange("task", task_id, is_open=tasks[task_id][0], due_date=tasks[task_id][1])
+        elif roll < 0.6 and len(tasks) > 2:
+            del tasks[task_id]
+            edges = {edge for edge in edges if task_id not in edge}
+            change = GraphChange("task_deleted", task_id)
+        elif roll < 0.8 and edges:
+            blocked_id, blocker_id = rng.choice(sorted(edges))
+            edges.discard((blocked_id, blocker_id))
+            change = GraphChange("edge_deleted", blocked_id, blocker_id=blocker_id)
+        else:
+            blocker_id, blocked_id = sorted(rng.sample(list(tasks), 2))
+            edges.add((blocked_id, blocker_id))
+            change = GraphChange("edge", blocked_id, blocker_id=blocker_id)
+        graph.apply([change])
+        fresh = ProjectGraph([(n, *state) for n, state in tasks.items()], edges)
+        assert graph.critical_path == fresh.critical_path
+        assert graph.frontier == fresh.frontier
\ No newline at end of file
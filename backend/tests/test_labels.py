@@ -0,0 +1,219 @@
+import random
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.label import Label
+from app.models.project import Project, ProjectStatus
+from app.models.task import Task
+from app.models.user import UserRole
+from app.services.label_index import label_condition, label_index, parse_label_expression
+from .conftest import TestingSessionLocal
+
+
+def make_project(db, manager, status=ProjectStatus.IN_PROGRESS):
+    project = Project(name="Labelled", manager_id=manager.id, status=status)
+    db.add(project)
+    db.commit()
+    return project.id
+
+
+def make_label(client, headers, project_id, name):
+    response = client.post(f"/api/v1/projects/{project_id}/labels", json={"name": name}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def make_task(client, headers, project_id, title, *label_ids):
+    response = client.post("/api/v1/tasks/", json={"title": title, "project_id": project_id}, headers=headers)
+    task_id = response.json()["id"]
+    response = client.put(f"/api/v1/tasks/{task_id}/labels", json={"label_ids": list(label_ids)}, headers=headers)
+    assert response.status_code == 200, response.text
+    return task_id
+
+
+def titles(client, headers, project_id, expression, **params):
+    if project_id is not None:
+        params["project_id"] = project_id
+    response = client.get("/api/v1/tasks/", params={"labels": expression, **params}, headers=headers)
+    assert response.status_code == 200, response.text
+    return sorted(task["title"] for task in response.json())
+
+
+def labelled_project(client, test_db, make_user, login, status=ProjectStatus.IN_PROGRESS):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    project_id = make_project(test_db, manager, status)
+    headers = login("manager_user")
+    backend, bug, regression, customer = (
+        make_label(client, headers, project_id, name) for name in ("backend", "bug", "regression", "customer x")
+    )
+    make_task(client, headers, project_id, "A", backend, bug)
+    make_task(client, headers, project_id, "B", backend, regression, customer)
+    make_task(client, headers, project_id, "C", bug)
+    make_task(client, headers, project_id, "D", backend)
+    make_task(client, headers, project_id, "E")
+    return project_id, headers
+
+
+EXPECTED = {
+    "backend": ["A", "B", "D"],
+    "backend and (bug or regression)": ["A", "B"],
+    'backend and (bug or regression) and not "customer x"': ["A"],
+    "not backend": ["C", "E"],
+    "bug or nonexistent": ["A", "C"],
+    "nonexistent": [],
+}
+
+
+def test_label_expressions_filter_from_the_index_and_in_sql(client, test_db, make_user, login, monkeypatch):
+    project_id, headers = labelled_project(client, test_db, make_user, login)
+
+    for expression, expected in EXPECTED.items():
+        assert titles(client, headers, project_id, expression) == expected, expression
+    # Without a project, and above the id limit, the expression runs in SQL.
+    assert titles(client, headers, None, "backend and not bug") == ["B", "D"]
+    monkeypatch.setattr(settings, "label_filter_max_ids", 0)
+    for expression, expected in EXPECTED.items():
+        assert titles(client, headers, project_id, expression) == expected, expression
+
+    listed = client.get("/api/v1/tasks/", params={"project_id": project_id, "labels": "regression"},
+                        headers=headers).json()
+    assert [label["name"] for label in listed[0]["labels"]] == ["backend", "customer x", "regression"]
+    for malformed in ("backend and", "(bug", "bug regression"):
+        response = client.get("/api/v1/tasks/", params={"labels": malformed}, headers=headers)
+        assert response.status_code == 400, malformed
+
+
+def test_index_follows_label_changes_made_by_other_workers(client, test_db, make_user, login, monkeypatch):
+    project_id, headers = labelled_project(client, test_db, make_user, login)
+    assert titles(client, headers, project_id, "bug") == ["A", "C"]
+
+    # Another worker's flush hooks never reach this worker's cached index.
+    monkeypatch.setattr(label_index, "stage", lambda session, project_id, change: None)
+    with TestingSessionLocal() as other:
+        tasks = {task.title: task for task in other.query(Task).filter(Task.project_id == project_id)}
+        bug = other.query(Label).filter(Label.project_id == project_id, Label.name == "bug").one()
+        tasks["D"].labels.append(bug)
+        tasks["A"].labels.remove(bug)
+        other.delete(tasks["C"])
+        other.commit()
+
+    assert titles(client, headers, project_id, "bug") == ["D"]
+    assert titles(client, headers, project_id, "backend") == ["A", "B", "D"]
+
+
+def test_label_counts_renames_and_deletes(client, test_db, make_user, login):
+    project_id, headers = labelled_project(client, test_db, make_user, login)
+    counts = lambda: {  # noqa: E731
+        label["name"]: label["task_count"]
+        for label in client.get(f"/api/v1/projects/{project_id}/labels", headers=headers).json()
+    }
+    assert counts() == {"backend": 3, "bug": 2, "customer x": 1, "regression": 1}
+
+    labels = {label["name"]: label["id"] for label in client.get(f"/api/v1/projects/{project_id}/labels",
+                                                                 headers=headers).json()}
+    response = client.put(f"/api/v1/labels/{labels['bug']}", json={"name": "defect"}, headers=headers)
+    assert response.status_code == 200
+    assert titles(client, headers, project_id, "defect") == ["A", "C"]
+    assert titles(client, headers, project_id, "bug") == []
+    assert client.put(f"/api/v1/labels/{labels['backend']}", json={"name": "defect"},
+                      headers=headers).status_code == 409
+
+    assert client.delete(f"/api/v1/labels/{labels['backend']}", headers=headers).status_code == 200
+    assert counts() == {"defect": 2, "customer x": 1, "regression": 1}
+    assert titles(client, headers, project_id, "not defect") == ["B", "D", "E"]
+    task = client.get("/api/v1/tasks/", params={"project_id": project_id, "labels": "regression"},
+                      headers=headers).json()[0]
+    assert [label["name"] for label in task["labels"]] == ["customer x", "regression"]
+
+
+def test_task_labels_stay_within_their_project_and_assignees(client, test_db, make_user, login):
+    project_id, headers = labelled_project(client, test_db, make_user, login)
+    project = test_db.get(Project, project_id)
+    other_project = make_project(test_db, project.manager)
+    stranger = make_label(client, headers, other_project, "backend")
+    task_id = make_task(client, headers, project_id, "F")
+    developer = make_user("dev_user", UserRole.DEVELOPER)
+    project.members.append(developer)
+    test_db.commit()
+    dev_headers = login("dev_user")
+
+    assert client.post(f"/api/v1/tasks/{task_id}/labels/{stranger}", headers=headers).status_code == 400
+    assert client.post(f"/api/v1/tasks/{task_id}/labels/10000", headers=headers).status_code == 404
+    assert client.post(f"/api/v1/projects/{project_id}/labels", json={"name": "backend"},
+                       headers=headers).status_code == 409
+    assert client.post(f"/api/v1/projects/{project_id}/labels", json={"name": "ops"},
+                       headers=dev_headers).status_code == 403
+    label_id = test_db.execute(select(Label.id).where(Label.project_id == project_id, Label.name == "bug")).scalar()
+    assert client.post(f"/api/v1/tasks/{task_id}/labels/{label_id}", headers=dev_headers).status_code == 403
+
+    client.put(f"/api/v1/tasks/{task_id}", json={"assignee_id": developer.id}, headers=headers)
+    response = client.post(f"/api/v1/tasks/{task_id}/labels/{label_id}", headers=dev_headers)
+    assert [label["name"] for label in response.json()] == ["bug"]
+    response = client.delete(f"/api/v1/tasks/{task_id}/labels/{label_id}", headers=dev_headers)
+    assert response.json() == []
+    assert client.delete(f"/api/v1/tasks/{task_id}/labels/{label_id}", headers=dev_headers).status_code == 404
+
+
+def test_cached_index_matches_sql_after_random_edits(test_db, make_user):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    project_id = make_project(test_db, manager)
+    other_project = make_project(test_db, manager)
+    rng = random.Random(5)
+    names = ["a", "b", "c", "d", "e"]
+    labels = [Label(project_id=project_id, name=name) for name in names]
+    test_db.add_all(labels + [Label(project_id=other_project, name="a")])
+    tasks = []
+    test_db.commit()
+    # Loaded now, so the edits below are applied to the cached index.
+    label_index.read(test_db, project_id, lambda index: None)
+
+    for step in range(150):
+        roll = rng.random()
+        if roll < 0.3 or len(tasks) < 3:
+            task = Task(title="T", project_id=rng.choice([project_id, project_id, other_project]))
+            test_db.add(task)
+            tasks.append(task)
+        elif roll < 0.8:
+            task = rng.choice(tasks)
+            if task.project_id == project_id:
+                task.labels = rng.sample([label for label in labels if label in test_db], rng.randint(0, 3))
+        elif roll < 0.9:
+            test_db.delete(tasks.pop(rng.randrange(len(tasks))))
+        elif roll < 0.95:
+            label = rng.choice(labels)
+            label.name = f"{label.name[0]}{step}"
+        else:
+            label = labels.pop(rng.randrange(len(labels)))
+            test_db.delete(label)
+            labels.append(Label(project_id=project_id, name=f"{label.name[0]}{step}"))
+            test_db.add(labels[-1])
+        test_db.commit()
+
+    names = sorted({label.name for label in labels})
+    for _ in range(40):
+        picked = rng.sample(names, 3)
+        expression = parse_label_expression(rng.choice([
+            "{} and not ({} or {})", "{} or {} and {}", "not {} or ({} and {})", "({} or {}) and not {}"
+        ]).format(*picked))
+        in_sql = test_db.execute(select(Task.id).where(
+            Task.project_id == project_id, label_condition(expression)
+        ).order_by(Task.id)).scalars().all()
+        assert label_index.read(test_db, project_id, lambda index: index.matching(expression, 10_000)) == in_sql
+
+
+def test_label_links_move_with_archived_projects(client, test_db, make_user, login):
+    project_id, headers = labelled_project(client, test_db, make_user, login, status=ProjectStatus.COMPLETED)
+
+    client.post(f"/api/v1/projects/{project_id}/archive", headers=headers)
+    assert titles(client, headers, project_id, "backend and bug") == []
+    archived = client.get("/api/v1/tasks/", params={
+        "project_id": project_id, "labels": "backend and not bug", "include_archived": True
+    }, headers=headers).json()
+    assert [(task["title"], [label["name"] for label in task["labels"]]) for task in archived] == [
+        ("B", ["backend", "customer x", "regression"]), ("D", ["backend"])
+    ]
+
+    client.post(f"/api/v1/projects/{project_id}/restore", headers=headers)
+    for expression, expected in EXPECTED.items():
+        assert titles(client, headers, project_id, expression) == expected, expression
\ No newline at end of file
@@ -0,0 +1,33 @@
+import json
+import os
+from app.core.config import settings
+from app.core.metrics import Registry
+
+
+def test_metrics_endpoint_reports_route_latency(client):
+    client.get("/health")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/health",status="200"}' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/health",le="+Inf"}' in body
+    assert "db_pool_checked_out" in body
+
+
+def test_multiprocess_snapshots_are_merged(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "metrics_multiproc_dir", str(tmp_path))
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests", ("route",))
+    in_flight = registry.gauge("in_flight", "In flight")
+    requests.inc("/tasks/", amount=3)
+    in_flight.inc()
+
+    # A live sibling worker (this test's parent process) and one that exited.
+    with open(tmp_path / f"metrics_{os.getppid()}.json", "w") as f:
+        json.dump({"requests_total": [[["/tasks/"], 2.0]], "in_flight": [[[], 4.0]]}, f)
+    with open(tmp_path / "metrics_999999999.json", "w") as f:
+        json.dump({"requests_total": [[["/tasks/"], 5.0]], "in_flight": [[[], 7.0]]}, f)
+
+    body = registry.render()
+    assert 'requests_total{route="/tasks/"} 10.0' in body
+    assert "in_flight 5.0" in body
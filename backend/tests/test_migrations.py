@@ -0,0 +1,73 @@
+from pathlib import Path
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, text
+
+import app.models  # noqa: F401
+from app.core.config import settings
+from app.core.database import Base
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+
+def _alembic(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    monkeypatch.setattr(settings, "database_url", url)
+    # No ini file: env.py would otherwise reconfigure the app's loggers.
+    config = Config()
+    config.set_main_option("script_location", str(BACKEND / "alembic"))
+    return config, create_engine(url)
+
+
+def test_migrations_build_the_models_schema(tmp_path, monkeypatch):
+    config, engine = _alembic(tmp_path, monkeypatch)
+    command.upgrade(config, "head")
+
+    with engine.connect() as connection:
+        context = MigrationContext.configure(connection, opts={"compare_type": True})
+        assert compare_metadata(context, Base.metadata) == []
+
+    command.downgrade(config, "base")
+    with engine.connect() as connection:
+        tables = connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars().all()
+    assert set(tables) <= {"alembic_version", "sqlite_sequence"}
+
+
+def test_migrations_keep_existing_rows(tmp_path, monkeypatch):
+    config, engine = _alembic(tmp_path, monkeypatch)
+    command.upgrade(config, "0001_initial_schema")
+    with engine.begin() as connection:
+        connection.execute(text(
+            "INSERT INTO users (id, username, email, full_name, hashed_password, role, is_active) "
+            "VALUES (1, 'manager', 'manager@example.com', 'Manager', 'x', 'PROJECT_MANAGER', 1)"
+        ))
+        connection.execute(text(
+            "INSERT INTO projects (id, name, description, status, manager_id) "
+            "VALUES (1, 'Apollo', 'Moon', 'IN_PROGRESS', 1)"
+        ))
+        for task_id, status in enumerate(("TODO", "DONE", "DONE"), start=1):
+            connection.execute(text(
+                "INSERT INTO tasks (id, title, status, priority, project_id, assignee_id) "
+                "VALUES (:id, 'Task', :status, 'LOW', 1, 1)"
+            ), {"id": task_id, "status": status})
+        connection.execute(text("INSERT INTO task_comments (content, task_id, author_id) VALUES ('Hi', 1, 1)"))
+        connection.execute(text("INSERT INTO project_members (project_id, user_id) VALUES (1, 1)"))
+
+    # Rebuilding referenced tables must not trip the app's foreign keys.
+    command.upgrade(config, "head")
+
+    with engine.connect() as connection:
+        project = connection.execute(text(
+            "SELECT task_count, completed_count, deleted_at, archived_at FROM projects"
+        )).one()
+        assert tuple(project) == (3, 2, None, None)
+        tasks = connection.execute(text(
+            "SELECT id, parent_id, subtask_count, completed_subtask_count FROM tasks ORDER BY id"
+        )).all()
+        assert [tuple(task) for task in tasks] == [(1, None, 0, 0), (2, None, 0, 0), (3, None, 0, 0)]
+        assert connection.execute(text("SELECT count(*) FROM task_comments")).scalar() == 1
+        assert connection.execute(text("SELECT count(*) FROM project_members")).scalar() == 1
+        assert connection.execute(text("PRAGMA foreign_key_check")).all() == []
@@ -0,0 +1,54 @@
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.models.user import UserRole
+from app.models.user_story import UserStory
+
+
+def _project(test_db, make_user):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    developer = make_user("developer_user")
+    project = Project(name="Overview", manager_id=manager.id, members=[developer])
+    project.tasks = [Task(title=f"Task {n}", status=TaskStatus.TODO, assignee_id=developer.id) for n in range(3)]
+    project.user_stories = [UserStory(title=f"Story {n}", description="As a user") for n in range(2)]
+    test_db.add(project)
+    test_db.commit()
+    return project.id
+
+
+def test_overview_bundles_project_board_and_stories(client, test_db, make_user, login, assert_query_budget):
+    project_id = _project(test_db, make_user)
+    headers = login("manager_user")
+
+    response = client.get(f"/api/v1/projects/{project_id}/overview?per_column=2", headers=headers)
+    assert response.status_code == 200
+    # Auth, scope, version, project with members, board counts and tasks, stories and their total.
+    assert_query_budget(response, 9)
+    body = response.json()
+    assert body["project"]["task_count"] == 3
+    assert [member["username"] for member in body["project"]["members"]] == ["developer_user"]
+    todo = next(column for column in body["board"]["columns"] if column["status"] == "todo")
+    assert todo["count"] == 3 and len(todo["tasks"]) == 2
+    assert todo["tasks"][0]["assignee"]["username"] == "developer_user"
+    assert body["stories"]["total"] == 2
+
+    assert client.get("/api/v1/projects/999/overview", headers=headers).status_code == 404
+
+
+def test_overview_etag_revalidates(client, test_db, make_user, login):
+    project_id = _project(test_db, make_user)
+    headers = login("manager_user")
+    path = f"/api/v1/projects/{project_id}/overview"
+
+    etag = client.get(path, headers=headers).headers["ETag"]
+    cached = client.get(path, headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert int(cached.headers["X-Query-Count"]) <= 3
+
+    task = test_db.query(Task).filter(Task.title == "Task 0").one()
+    task.status = TaskStatus.DONE
+    test_db.commit()
+    changed = client.get(path, headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    # Different page sizes are different representations.
+    assert client.get(f"{path}?per_column=5", headers=headers).headers["ETag"] != changed.headers["ETag"]
\ No newline at end of file
@@ -0,0 +1,49 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core import profiling
+from app.core.config import settings
+from app.models.user import UserRole
+
+
+@pytest.fixture
+def profiled_client(test_db, monkeypatch):
+    monkeypatch.setattr(settings, "profiling_interval_ms", 0.5)
+    profiling.store.clear()
+    return TestClient(profiling.ProfilingMiddleware(app, routes=app.router.routes))
+
+
+def test_admin_can_profile_a_request_on_demand(profiled_client, make_user, login):
+    make_user("admin_user", UserRole.ADMIN)
+    headers = login("admin_user")
+
+    response = profiled_client.get("/api/v1/projects/", headers={**headers, "X-Profile": "1"})
+    assert response.status_code == 200
+    profile_id = response.headers["X-Profile-Id"]
+
+    profile = profiled_client.get(f"/api/v1/admin/profiles/{profile_id}", headers=headers)
+    assert profile.status_code == 200
+    stack, _, count = profile.text.splitlines()[0].rpartition(" ")
+    assert ";" in stack and int(count) > 0
+
+
+def test_profile_header_is_ignored_for_non_admins(profiled_client, make_user, login):
+    make_user("dev_user")
+    response = profiled_client.get("/api/v1/projects/", headers={**login("dev_user"), "X-Profile": "1"})
+    assert response.status_code == 200
+    assert "X-Profile-Id" not in response.headers
+    assert profiling.store.profiles() == []
+
+
+def test_background_sampling_aggregates_per_route(profiled_client, make_user, login, monkeypatch):
+    make_user("admin_user", UserRole.ADMIN)
+    headers = login("admin_user")
+    monkeypatch.setattr(settings, "profiling_route_sample_rates", {"/api/v1/projects/": 1.0})
+
+    for _ in range(3):
+        profiled_client.get("/api/v1/projects/", headers=headers)
+
+    routes = profiled_client.get("/api/v1/admin/profiles/routes", headers=headers).json()["routes"]
+    assert {"route": "GET /api/v1/projects/", "requests": 3} == {
+        key: routes[0][key] for key in ("route", "requests")
+    }
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import update
+
+from app.models.project import Project
+from app.models.task import Task, TaskStatus
+from app.models.user import UserRole
+from app.services.project_counters import reconcile_project_counters
+
+
+@pytest.fixture
+def projects(test_db, make_user):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    first = Project(name="First", manager_id=manager.id)
+    second = Project(name="Second", manager_id=manager.id)
+    test_db.add_all([first, second])
+    test_db.commit()
+    return first.id, second.id
+
+
+def counters(db, project_id):
+    project = db.get(Project, project_id)
+    db.refresh(project)
+    return project.task_count, project.completed_count, project.overdue_count
+
+
+def test_task_writes_keep_counters_exact(test_db, projects):
+    first, second = projects
+    yesterday = datetime.now(timezone.utc) - timedelta(days=1)
+    tasks = [
+        Task(title="Open", project_id=first),
+        Task(title="Late", project_id=first, due_date=yesterday),
+        Task(title="Done", project_id=first, status=TaskStatus.DONE),
+    ]
+    test_db.add_all(tasks)
+    test_db.commit()
+    assert counters(test_db, first) == (3, 1, 1)
+
+    tasks[1].status = TaskStatus.DONE
+    tasks[0].project_id = second
+    test_db.commit()
+    assert counters(test_db, first) == (2, 2, 0)
+    assert counters(test_db, second) == (1, 0, 0)
+
+    # Old values that were never loaded fall back to a recount.
+    test_db.expire(tasks[0], ["status"])
+    tasks[0].status = TaskStatus.DONE
+    test_db.delete(tasks[2])
+    test_db.commit()
+    assert counters(test_db, first) == (1, 1, 0)
+    assert counters(test_db, second) == (1, 1, 0)
+    assert reconcile_project_counters(test_db) == []
+
+
+def test_reconcile_repairs_drift(client, test_db, projects, make_user, login):
+    first, second = projects
+    test_db.add(Task(title="Open", project_id=first))
+    test_db.commit()
+    test_db.execute(update(Project).where(Project.id == second).values(task_count=7, overdue_count=2))
+    test_db.commit()
+
+    make_user("admin_user", UserRole.ADMIN)
+    response = client.post("/api/v1/admin/reconcile/project-counters", headers=login("admin_user"))
+    assert response.status_code == 200
+    assert response.json() == {"repaired_project_ids": [second]}
+    assert counters(test_db, second) == (0, 0, 0)
+    assert counters(test_db, first) == (1, 0, 0)
+
+    project = client.get(f"/api/v1/projects/{first}", headers=login("admin_user")).json()
+    assert (project["task_count"], project["completed_tasks"], project["progress_percentage"]) == (1, 0, 0)
@@ -0,0 +1,81 @@
+from sqlalchemy import delete, func, select
+
+from app.models.project import Project
+from app.models.task import Task, TaskComment
+from app.models.user import User, UserRole
+from app.models.user_story import UserStory
+from app.services.purge import purge_deleted
+
+
+def rows(db, table, *conditions):
+    return db.execute(select(func.count()).select_from(table).where(*conditions)).scalar()
+
+
+def make_project(db, manager, developer, name="Doomed", tasks=5):
+    project = Project(name=name, manager_id=manager.id, members=[developer])
+    for n in range(tasks):
+        task = Task(title=f"Task {n}", assignee_id=developer.id)
+        task.comments.append(TaskComment(content="Note", author_id=developer.id))
+        project.tasks.append(task)
+    project.user_stories.append(UserStory(title="Story", description="As a user..."))
+    db.add(project)
+    db.commit()
+    return project.id
+
+
+def test_deleted_project_is_hidden_then_purged_in_batches(client, test_db, make_user, login):
+    admin = make_user("admin_user", UserRole.ADMIN)
+    developer = make_user("dev_user")
+    project_id = make_project(test_db, admin, developer)
+    kept_id = make_project(test_db, admin, developer, name="Kept", tasks=1)
+    headers = login("admin_user")
+
+    assert client.delete(f"/api/v1/projects/{project_id}", headers=headers).status_code == 200
+    assert client.get(f"/api/v1/projects/{project_id}", headers=headers).status_code == 404
+    assert [p["id"] for p in client.get("/api/v1/projects/", headers=headers).json()] == [kept_id]
+    assert {t["project_id"] for t in client.get("/api/v1/tasks/", headers=headers).json()} == {kept_id}
+    assert client.get(f"/api/v1/user-stories/project/{project_id}", headers=headers).json()["total"] == 0
+
+    assert purge_deleted(test_db, batch_size=2) == {"projects": 1, "users": 0}
+    projects, tasks = Project.__table__, Task.__table__
+    assert rows(test_db, projects, projects.c.id == project_id) == 0
+    assert rows(test_db, tasks, tasks.c.project_id == project_id) == 0
+    assert rows(test_db, TaskComment.__table__) == 1
+    assert rows(test_db, UserStory.__table__) == 1
+
+
+def test_deleted_user_is_locked_out_and_references_cleared(client, test_db, make_user, login):
+    admin = make_user("admin_user", UserRole.ADMIN)
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    developer = make_user("dev_user")
+    make_project(test_db, manager, developer, tasks=2)
+    manager_id, developer_id = manager.id, developer.id
+    headers = login("admin_user")
+    developer_headers = login("dev_user")
+
+    response = client.delete(f"/api/v1/users/{manager_id}", headers=headers)
+    assert response.status_code == 409
+
+    assert client.delete(f"/api/v1/users/{developer_id}", headers=headers).status_code == 200
+    assert client.get(f"/api/v1/users/{developer_id}", headers=headers).status_code == 404
+    assert client.get("/api/v1/users/me", headers=developer_headers).status_code == 401
+    tasks = client.get("/api/v1/tasks/", headers=headers).json()
+    assert len(tasks) == 2 and all(task["assignee"] is None for task in tasks)
+
+    assert purge_deleted(test_db) == {"projects": 0, "users": 1}
+    users, tasks, comments = User.__table__, Task.__table__, TaskComment.__table__
+    assert rows(test_db, users, users.c.id == developer_id) == 0
+    assert rows(test_db, tasks, tasks.c.assignee_id.is_not(None)) == 0
+    assert rows(test_db, comments, comments.c.author_id.is_(None)) == 2
+
+
+def test_database_cascades_project_deletes(test_db, make_user):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    developer = make_user("dev_user")
+    project_id = make_project(test_db, manager, developer, tasks=3)
+
+    test_db.execute(delete(Project.__table__).where(Project.__table__.c.id == project_id))
+    test_db.commit()
+    assert rows(test_db, Task.__table__) == 0
+    assert rows(test_db, TaskComment.__table__) == 0
+    assert rows(test_db, UserStory.__table__) == 0
@@ -0,0 +1,144 @@
+"""Query budgets per endpoint.
+
+Each request runs against a small seeded dataset and must stay within its
+statement budget, so new N+1 patterns fail locally instead of in production.
+"""
+import itertools
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+from app.core import query_counter
+from app.core.query_counter import QueryStats, instrument_engine, normalize_statement, track_queries
+from app.models.user import User, UserRole
+from app.models.project import Project, ProjectStatus
+from app.models.task import Task, TaskComment, TaskStatus
+from app.models.user_story import UserStory
+
+
+@pytest.fixture
+def seeded(test_db, make_user, login):
+    admin = make_user("admin_user", UserRole.ADMIN)
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    developers = [make_user(f"dev_{n}") for n in range(3)]
+
+    projects = []
+    for n in range(3):
+        project = Project(name=f"Project {n}", status=ProjectStatus.IN_PROGRESS, manager_id=manager.id)
+        project.members.extend(developers)
+        test_db.add(project)
+        projects.append(project)
+    test_db.commit()
+
+    for project in projects:
+        for n in range(6):
+            task = Task(
+                title=f"Task {n}",
+                project_id=project.id,
+                assignee_id=developers[n % len(developers)].id,
+                status=TaskStatus.DONE if n % 2 else TaskStatus.TODO,
+            )
+            task.comments.append(TaskComment(content="Looks good", author_id=manager.id))
+            task.comments.append(TaskComment(content="Thanks", author_id=task.assignee_id))
+            test_db.add(task)
+        test_db.add(UserStory(title="Story", description="As a user...", project_id=project.id))
+    test_db.commit()
+
+    return {
+        "admin": login("admin_user"),
+        "manager": login("manager_user"),
+        "developer": login("dev_0"),
+        "project_id": projects[0].id,
+        "task_id": projects[0].tasks[0].id,
+        "user_id": developers[0].id,
+    }
+
+
+# (role, path, budget). Loader profiles (app/schemas/loaders.py) keep these
+# independent of how many rows an endpoint returns. Read endpoints use their
+# own session, so the requesting user is loaded once more, and non-admins pay
+# one query to resolve their accessible projects on a cold scope cache.
+ENDPOINT_BUDGETS = [
+    ("admin", "/api/v1/projects/", 3),
+    ("manager", "/api/v1/projects/", 4),
+    ("developer", "/api/v1/projects/", 4),
+    ("admin", "/api/v1/projects/{project_id}", 3),
+    ("admin", "/api/v1/tasks/", 2),
+    ("developer", "/api/v1/tasks/", 3),
+    ("developer", "/api/v1/tasks/{task_id}", 4),
+    ("admin", "/api/v1/users/", 2),
+    ("admin", "/api/v1/users/{user_id}", 4),
+    ("admin", "/api/v1/dashboard/stats", 9),
+    ("developer", "/api/v1/dashboard/stats", 12),
+    ("admin", "/api/v1/dashboard/recent-activity", 2),
+    ("developer", "/api/v1/dashboard/recent-activity", 3),
+    ("admin", "/api/v1/user-stories/project/{project_id}", 3),
+    ("admin", "/api/v1/time-reports/?group_by=user&group_by=week", 2),
+    ("developer", "/api/v1/time-reports/?group_by=project", 3),
+    ("admin", "/api/v1/time-reports/tasks?project_id={project_id}", 4),
+    ("developer", "/api/v1/tasks/{task_id}/time-entries", 4),
+]
+
+
+@pytest.mark.parametrize("role,path,budget", ENDPOINT_BUDGETS)
+def test_endpoint_query_budget(client, seeded, assert_query_budget, role, path, budget):
+    response = client.get(path.format(**seeded), headers=seeded[role])
+    assert_query_budget(response, budget)
+
+
+@pytest.mark.parametrize("role,path", [
+    ("admin", "/api/v1/projects/"),
+    ("developer", "/api/v1/tasks/"),
+    ("admin", "/api/v1/tasks/{task_id}"),
+    ("admin", "/api/v1/dashboard/recent-activity"),
+])
+def test_query_count_does_not_grow_with_results(client, seeded, test_db, role, path):
+    def count():
+        response = client.get(path.format(**seeded), headers=seeded[role])
+        assert response.status_code == 200
+        return int(response.headers["X-Query-Count"])
+
+    before = count()
+    developers = test_db.query(User).filter(User.role == UserRole.DEVELOPER).all()
+    task = test_db.get(Task, seeded["task_id"])
+    for n in range(4):
+        project = Project(name=f"Extra {n}", manager_id=task.project.manager_id, members=developers)
+        project.tasks = [Task(title=f"Extra {i}", assignee_id=developers[i % 3].id) for i in range(5)]
+        test_db.add(project)
+        task.comments.append(TaskComment(content="More", author_id=developers[n % 3].id))
+    test_db.commit()
+    assert count() == before
+
+
+def test_normalize_statement_collapses_literals_and_in_lists():
+    first = normalize_statement("SELECT * FROM tasks WHERE id IN (?, ?, ?) AND title = 'a'")
+    second = normalize_statement("SELECT *  FROM tasks WHERE id IN (?, ?) AND title = 'b'")
+    assert first == second
+
+
+def test_repeated_statements_flag_n_plus_one():
+    stats = QueryStats()
+    for task_id in range(6):
+        stats.record(f"SELECT * FROM users WHERE users.id = {task_id}", 0.001)
+    stats.record("SELECT * FROM tasks", 0.001)
+    assert stats.count == 7
+    assert stats.repeated_statements(threshold=5) == [("SELECT * FROM users WHERE users.id = ?", 6)]
+
+
+def test_failed_statements_leave_no_timing_state_on_the_connection(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'counted.db'}")
+    instrument_engine(engine)
+    # Every clock reading is a second after the previous one.
+    clock = itertools.count()
+    monkeypatch.setattr(query_counter.time, "perf_counter", lambda: float(next(clock)))
+
+    with engine.connect() as conn, track_queries() as stats:
+        info = dict(conn.info)
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.exec_driver_sql("SELECT * FROM missing")
+        assert dict(conn.info) == info
+        conn.exec_driver_sql("SELECT 1")
+    assert stats.count == 1
+    assert stats.duration == 1.0
@@ -0,0 +1,49 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app.core import database
+from app.core.config import settings
+from app.main import app
+
+
+def test_ready_reports_saturated_pools(client, monkeypatch):
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+    assert {pool["name"] for pool in response.json()["pools"]} >= {"primary"}
+
+    # The SQLite profile's writer pool holds a single connection: a write in
+    # progress must not take the worker out of rotation.
+    with database.engine.connect():
+        response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["saturated"] == []
+
+    monkeypatch.setattr(settings, "ready_max_pool_utilization", 0.05)
+    with database.engine.connect(), database.read_engine.connect():
+        response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["saturated"] == ["primary_read"]
+
+
+def test_lifespan_warms_up_pools_and_openapi(test_db):
+    with TestClient(app) as client:
+        assert app.openapi_schema is not None
+        pools = {pool["name"]: pool for pool in client.get("/ready").json()["pools"]}
+    assert database.engine.pool.checkedin() >= 1
+    assert pools["primary"]["checked_out"] == 0
+
+
+def test_sqlite_statement_timeout(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "db_statement_timeout_ms", 50)
+    engine = create_engine(f"sqlite:///{tmp_path / 'timeout.db'}")
+    database._sqlite_statement_timeout(engine)
+    endless = text(
+        "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT count(*) FROM n"
+    )
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError, match="interrupted"):
+            conn.execute(endless)
+        assert conn.execute(text("SELECT 1")).scalar() == 1
@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import database
+from app.core.database import Base
+from app.core.replicas import ReplicaRouter
+from app.models.project import Project
+from app.models.user import User, UserRole
+
+from .conftest import engine as primary_engine
+
+
+def _sqlite_engine(path):
+    return create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+
+@pytest.fixture
+def replica(tmp_path, make_user):
+    """A second database file standing in for a replica that lags the primary."""
+    admin = make_user("admin_user", UserRole.ADMIN)
+    replica_engine = _sqlite_engine(tmp_path / "replica.db")
+    Base.metadata.create_all(bind=replica_engine)
+    with sessionmaker(bind=replica_engine)() as db:
+        db.add(User(
+            id=admin.id, username=admin.username, email=admin.email, full_name=admin.full_name,
+            hashed_password=admin.hashed_password, role=admin.role, is_active=True
+        ))
+        db.add(Project(name="Replica Project", manager_id=admin.id))
+        db.commit()
+    yield replica_engine
+    replica_engine.dispose()
+
+
+def test_reads_use_replica_until_user_writes(client, login, replica, monkeypatch):
+    router = ReplicaRouter(primary_engine, [replica], read_your_writes_window=60)
+    monkeypatch.setattr(database, "replica_router", router)
+    headers = login("admin_user")
+    admin_id = client.get("/api/v1/users/me", headers=headers).json()["id"]
+
+    names = [p["name"] for p in client.get("/api/v1/projects/", headers=headers).json()]
+    assert names == ["Replica Project"]
+
+    response = client.post(
+        "/api/v1/projects/", json={"name": "Fresh Project", "manager_id": admin_id}, headers=headers
+    )
+    assert response.status_code == 200
+
+    # The write has not reached the replica, so this user now reads from the primary.
+    names = [p["name"] for p in client.get("/api/v1/projects/", headers=headers).json()]
+    assert names == ["Fresh Project"]
+
+
+def test_selection_and_failover(tmp_path):
+    replicas = [_sqlite_engine(tmp_path / f"replica{n}.db") for n in range(2)]
+    router = ReplicaRouter(primary_engine, replicas)
+    assert [router.choose() for _ in range(4)] == replicas * 2
+
+    least_used = ReplicaRouter(primary_engine, replicas, selection="least_connections")
+    with replicas[0].connect():
+        assert least_used.choose() is replicas[1]
+
+    unreachable = _sqlite_engine(tmp_path / "missing" / "replica.db")
+    router = ReplicaRouter(primary_engine, [unreachable])
+    router.check_health()
+    assert router.status()[0]["healthy"] is False
+    assert router.choose() is primary_engine
+
+
+def test_read_session_rejects_writes(client, make_user, login):
+    make_user("admin_user", UserRole.ADMIN)
+    request = type("FakeRequest", (), {"headers": {}})()
+    db = next(database.get_read_db(request))
+    db.add(Project(name="Should Fail"))
+    with pytest.raises(database.ReadOnlySessionError):
+        db.flush()
+    db.close()
@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy.dialects import sqlite
+
+from app.api.scope import AccessScope
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import UserRole
+
+
+@pytest.fixture
+def world(test_db, make_user, login):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    other_manager = make_user("other_manager", UserRole.PROJECT_MANAGER)
+    developer = make_user("dev_user")
+
+    managed = Project(name="Managed", manager_id=manager.id)
+    joined = Project(name="Joined", manager_id=other_manager.id)
+    joined.members.append(developer)
+    hidden = Project(name="Hidden", manager_id=other_manager.id)
+    test_db.add_all([managed, joined, hidden])
+    test_db.commit()
+
+    tasks = {
+        "assigned": Task(title="Assigned", project_id=managed.id, assignee_id=developer.id),
+        "member": Task(title="Member", project_id=joined.id),
+        "hidden": Task(title="Hidden", project_id=hidden.id),
+    }
+    test_db.add_all(tasks.values())
+    test_db.commit()
+    return {
+        "projects": {"managed": managed.id, "joined": joined.id, "hidden": hidden.id},
+        "tasks": {name: task.id for name, task in tasks.items()},
+        "developer_id": developer.id,
+        "manager": login("manager_user"),
+        "other_manager": login("other_manager"),
+        "developer": login("dev_user"),
+    }
+
+
+def test_projects_and_tasks_are_scoped(client, world):
+    projects, tasks = world["projects"], world["tasks"]
+
+    names = {p["name"] for p in client.get("/api/v1/projects/", headers=world["developer"]).json()}
+    assert names == {"Joined"}
+    titles = {t["title"] for t in client.get("/api/v1/tasks/", headers=world["developer"]).json()}
+    assert titles == {"Assigned", "Member"}
+
+    names = {p["name"] for p in client.get("/api/v1/projects/", headers=world["manager"]).json()}
+    assert names == {"Managed"}
+
+    def status(path, who):
+        return client.get(path, headers=world[who]).status_code
+
+    assert status(f"/api/v1/projects/{projects['joined']}", "developer") == 200
+    assert status(f"/api/v1/projects/{projects['managed']}", "developer") == 403
+    assert status(f"/api/v1/projects/{projects['hidden']}", "manager") == 403
+    assert status(f"/api/v1/tasks/{tasks['hidden']}", "developer") == 403
+    assert status(f"/api/v1/user-stories/project/{projects['hidden']}", "developer") == 403
+
+
+def test_membership_changes_invalidate_cached_scope(client, world):
+    hidden = world["projects"]["hidden"]
+    assert client.get(f"/api/v1/projects/{hidden}", headers=world["developer"]).status_code == 403
+
+    response = client.put(
+        f"/api/v1/projects/{hidden}",
+        json={"member_ids": [world["developer_id"]]},
+        headers=world["other_manager"],
+    )
+    assert response.status_code == 200
+    assert client.get(f"/api/v1/projects/{hidden}", headers=world["developer"]).status_code == 200
+
+
+def test_project_filter_switches_to_subquery_for_large_scopes():
+    def compiled(scope):
+        return str(scope.project_filter().compile(dialect=sqlite.dialect()))
+
+    assert "SELECT" not in compiled(AccessScope(1, frozenset({1, 2, 3})))
+    assert "SELECT" in compiled(AccessScope(1, frozenset(range(1000))))
+    assert AccessScope(1, None).can_access_project(42)
+    assert not AccessScope(1, frozenset()).can_access_project(42)
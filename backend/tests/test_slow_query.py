@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+
+from app.core import slow_query
+from app.core.config import settings
+from app.models.user import UserRole
+
+
+def test_slow_queries_are_captured_with_plans(client, make_user, login, monkeypatch):
+    make_user("admin_user", UserRole.ADMIN)
+    headers = login("admin_user")
+    slow_query.store.clear()
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 0.0)
+
+    client.get("/api/v1/projects/", headers=headers)
+    slow_query._explain_worker.join()
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 10_000.0)
+
+    response = client.get(
+        "/api/v1/admin/slow-queries", params={"route": "GET /api/v1/projects/"}, headers=headers
+    )
+    assert response.status_code == 200
+    entries = response.json()["slow_queries"]
+    assert entries and all(entry["route"] == "GET /api/v1/projects/" for entry in entries)
+    assert any(entry["plan"] for entry in entries)
+
+    fingerprint = entries[0]["fingerprint"]
+    response = client.get(
+        "/api/v1/admin/slow-queries", params={"fingerprint": fingerprint}, headers=headers
+    )
+    assert {entry["fingerprint"] for entry in response.json()["slow_queries"]} == {fingerprint}
+
+    summary = client.get("/api/v1/admin/slow-queries/summary", headers=headers).json()["statements"]
+    assert any(group["fingerprint"] == fingerprint for group in summary)
+
+
+def test_slow_query_endpoints_require_admin(client, make_user, login):
+    make_user("dev_user")
+    response = client.get("/api/v1/admin/slow-queries", headers=login("dev_user"))
+    assert response.status_code == 403
+
+
+def test_parameter_shapes_hide_values():
+    assert slow_query.describe_parameters(("secret", 3, [1, 2])) == ["str(6)", "int", "list[2]"]
+
+
+
+def test_failed_statements_leave_no_timing_state_on_the_connection(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'slow.db'}")
+    slow_query.instrument_engine(engine)
+    slow_query.store.clear()
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 0.0)
+    monkeypatch.setattr(settings, "slow_query_explain_sample_rate", 0.0)
+
+    with engine.connect() as conn:
+        info = dict(conn.info)
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.exec_driver_sql("SELECT * FROM missing")
+        assert dict(conn.info) == info
+        conn.exec_driver_sql("SELECT 1")
+    assert [entry.statement for entry in slow_query.store.query()] == ["SELECT ?"]
@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core import sqlite
+from app.core.database import Base
+from app.models.project import Project
+from app.models.user import User, UserRole
+
+
+@pytest.fixture
+def engines(tmp_path):
+    url = f"sqlite:///{tmp_path / 'profile.db'}"
+    writer = create_engine(url, **sqlite.writer_options())
+    sqlite.configure_engine(writer, writer=True)
+    reader = create_engine(url, **sqlite.reader_options())
+    sqlite.configure_engine(reader, writer=False)
+    Base.metadata.create_all(bind=writer)
+    yield writer, reader
+    writer.dispose()
+    reader.dispose()
+
+
+@pytest.fixture
+def Session(engines):
+    writer, reader = engines
+    return sessionmaker(class_=sqlite.SQLiteSession, writer=writer, reader=reader, autoflush=False)
+
+
+def _add_manager(db):
+    manager = User(username="pm", email="pm@example.com", full_name="PM",
+                   hashed_password="x", role=UserRole.PROJECT_MANAGER)
+    db.add(manager)
+    db.commit()
+    return manager.id
+
+
+def test_connections_use_wal_and_read_only_readers(engines):
+    writer, reader = engines
+    with reader.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+        assert conn.exec_driver_sql("PRAGMA query_only").scalar() == 1
+        with pytest.raises(Exception, match="readonly"):
+            conn.execute(text("DELETE FROM users"))
+    with writer.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA query_only").scalar() == 0
+
+
+def test_session_reads_from_pool_and_writes_through_writer(engines, Session):
+    writer, reader = engines
+    with Session() as db:
+        assert db.get_bind() is reader
+        manager_id = _add_manager(db)
+        assert db.get_bind() is reader
+
+        db.add(Project(name="Pending", manager_id=manager_id))
+        db.flush()
+        # After a flush the session stays on the writer to see its own changes.
+        assert db.get_bind() is writer
+        assert db.query(Project).filter(Project.name == "Pending").count() == 1
+        db.rollback()
+        assert db.get_bind() is reader
+        assert db.query(Project).count() == 0
+
+
+def test_concurrent_writes_are_serialized(Session):
+    with Session() as db:
+        manager_id = _add_manager(db)
+    errors = []
+
+    def write(n):
+        try:
+            with Session() as db:
+                for i in range(10):
+                    db.add(Project(name=f"p{n}-{i}", manager_id=manager_id))
+                    db.commit()
+                    db.query(Project).count()
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with Session() as db:
+        assert db.query(Project).count() == 80
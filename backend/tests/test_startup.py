@@ -0,0 +1,16 @@
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_heavy_dependencies_load_lazily():
+    probe = "import sys, json, app.main; print(json.dumps(sorted(sys.modules)))"
+    env = dict(os.environ, DATABASE_URL="sqlite://", SECRET_KEY="startup-test")
+    completed = subprocess.run(
+        [sys.executable, "-c", probe], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    loaded = {name.split(".")[0] for name in json.loads(completed.stdout)}
+    assert not loaded & {"groq", "httpx", "jose", "passlib"}
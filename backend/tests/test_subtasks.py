@@ -0,0 +1,175 @@
+import random
+
+from sqlalchemy import func, select
+
+from app.api.v1 import tasks as tasks_api
+from app.models.archive import archived_task_closure
+from app.models.project import Project, ProjectStatus
+from app.models.task import Task, TaskStatus
+from app.models.task_closure import TaskClosure
+from app.models.user import UserRole
+
+
+def make_project(db, manager, status=ProjectStatus.IN_PROGRESS):
+    project = Project(name="Epics", manager_id=manager.id, status=status)
+    db.add(project)
+    db.commit()
+    return project.id
+
+
+def create(client, headers, project_id, title, parent_id=None):
+    response = client.post("/api/v1/tasks/", json={
+        "title": title, "project_id": project_id, "parent_id": parent_id
+    }, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def rollup(client, headers, task_id):
+    task = client.get(f"/api/v1/tasks/{task_id}", headers=headers).json()
+    return task["subtask_count"], task["completed_subtask_count"]
+
+
+def closure(db):
+    return sorted(db.execute(select(TaskClosure.ancestor_id, TaskClosure.descendant_id, TaskClosure.depth)).all())
+
+
+def test_rollups_follow_new_subtasks_and_status_changes(client, test_db, make_user, login):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    project_id = make_project(test_db, manager)
+    headers = login("manager_user")
+    epic = create(client, headers, project_id, "Epic")
+    story = create(client, headers, project_id, "Story", epic)
+    first = create(client, headers, project_id, "First", story)
+    second = create(client, headers, project_id, "Second", story)
+    other = create(client, headers, project_id, "Other", epic)
+
+    assert rollup(client, headers, epic) == (4, 0)
+    client.put(f"/api/v1/tasks/{first}", json={"status": TaskStatus.DONE.value}, headers=headers)
+    client.put(f"/api/v1/tasks/{other}", json={"status": TaskStatus.DONE.value}, headers=headers)
+    assert rollup(client, headers, epic) == (4, 2)
+    assert rollup(client, headers, story) == (2, 1)
+    client.put(f"/api/v1/tasks/{first}", json={"status": TaskStatus.IN_PROGRESS.value}, headers=headers)
+    assert rollup(client, headers, epic) == (4, 1)
+
+    subtree = client.get(f"/api/v1/tasks/{epic}/subtasks", headers=headers).json()
+    assert [(t["id"], t["depth"]) for t in subtree["tasks"]] == [(story, 1), (other, 1), (first, 2), (second, 2)]
+    assert (subtree["subtask_count"], subtree["completed_subtask_count"]) == (4, 1)
+    children = client.get(f"/api/v1/tasks/{epic}/subtasks?max_depth=1", headers=headers).json()
+    assert [t["parent_id"] for t in children["tasks"]] == [epic, epic]
+
+
+def test_moving_a_subtree_moves_its_rollups_and_rejects_cycles(client, test_db, make_user, login):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    project_id = make_project(test_db, manager)
+    other_project = make_project(test_db, manager)
+    headers = login("manager_user")
+    left, right = create(client, headers, project_id, "Left"), create(client, headers, project_id, "Right")
+    story = create(client, headers, project_id, "Story", left)
+    leaf = create(client, headers, project_id, "Leaf", story)
+    client.put(f"/api/v1/tasks/{leaf}", json={"status": TaskStatus.DONE.value}, headers=headers)
+    stranger = create(client, headers, other_project, "Stranger")
+
+    move = lambda task_id, parent_id: client.put(  # noqa: E731
+        f"/api/v1/tasks/{task_id}", json={"parent_id": parent_id}, headers=headers
+    )
+    assert move(story, right).status_code == 200
+    assert rollup(client, headers, left) == (0, 0)
+    assert rollup(client, headers, right) == (2, 1)
+    assert closure(test_db) == [(right, story, 1), (right, leaf, 2), (story, leaf, 1)]
+
+    assert move(right, leaf).status_code == 409
+    assert move(story, story).status_code == 409
+    assert move(story, stranger).status_code == 400
+    assert move(story, 10_000).status_code == 404
+
+    assert move(story, None).status_code == 200
+    assert rollup(client, headers, right) == (0, 0)
+    assert closure(test_db) == [(story, leaf, 1)]
+
+
+def test_concurrent_moves_cannot_close_a_cycle(client, test_db, make_user, login, sqlite_profile, overlap):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    project_id = make_project(test_db, manager)
+    headers = login("manager_user")
+    left, right = create(client, headers, project_id, "Left"), create(client, headers, project_id, "Right")
+
+    move = lambda task_id, parent_id: lambda: client.put(  # noqa: E731
+        f"/api/v1/tasks/{task_id}", json={"parent_id": parent_id}, headers=headers
+    )
+    responses = overlap(tasks_api, "in_subtree", move(left, right), move(right, left))
+    assert sorted(response.status_code for response in responses) == [200, 409]
+    assert len(closure(test_db)) == 1
+    assert sorted([rollup(client, headers, left), rollup(client, headers, right)]) == [(0, 0), (1, 0)]
+
+
+def test_deleting_a_task_moves_its_children_up(client, test_db, make_user, login):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    project_id = make_project(test_db, manager)
+    headers = login("manager_user")
+    epic = create(client, headers, project_id, "Epic")
+    story = create(client, headers, project_id, "Story", epic)
+    leaf = create(client, headers, project_id, "Leaf", story)
+    client.put(f"/api/v1/tasks/{story}", json={"status": TaskStatus.DONE.value}, headers=headers)
+
+    assert client.delete(f"/api/v1/tasks/{story}", headers=headers).status_code == 200
+    assert rollup(client, headers, epic) == (1, 0)
+    assert client.get(f"/api/v1/tasks/{leaf}", headers=headers).json()["parent_id"] == epic
+    assert closure(test_db) == [(epic, leaf, 1)]
+
+
+def test_closure_and_rollups_match_the_tree_after_random_edits(test_db, make_user):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    project_id = make_project(test_db, manager)
+    rng = random.Random(3)
+    tasks = []
+
+    def descendants(task_id):
+        children = [task.id for task in tasks if task.parent_id == task_id]
+        return children + [below for child in children for below in descendants(child)]
+
+    for _ in range(120):
+        roll = rng.random()
+        if roll < 0.4 or len(tasks) < 3:
+            parent = rng.choice(tasks + [None])
+            task = Task(title="T", project_id=project_id, parent_id=parent.id if parent else None)
+            test_db.add(task)
+            tasks.append(task)
+        elif roll < 0.7:
+            rng.choice(tasks).status = rng.choice(list(TaskStatus))
+        elif roll < 0.9:
+            task, parent = rng.choice(tasks), rng.choice(tasks + [None])
+            if parent is None or parent.id not in [task.id, *descendants(task.id)]:
+                task.parent_id = parent.id if parent else None
+        else:
+            task = tasks.pop(rng.randrange(len(tasks)))
+            test_db.delete(task)
+        test_db.commit()
+
+    expected = []
+    for task in tasks:
+        parent_id, depth = task.parent_id, 1
+        while parent_id is not None:
+            expected.append((parent_id, task.id, depth))
+            parent_id, depth = next(t.parent_id for t in tasks if t.id == parent_id), depth + 1
+    assert closure(test_db) == sorted(expected)
+    for task in tasks:
+        below = [t for t in tasks if t.id in descendants(task.id)]
+        done = sum(t.status == TaskStatus.DONE for t in below)
+        assert (task.subtask_count, task.completed_subtask_count) == (len(below), done)
+
+
+def test_subtask_links_move_with_archived_projects(client, test_db, make_user, login):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    project_id = make_project(test_db, manager, status=ProjectStatus.COMPLETED)
+    headers = login("manager_user")
+    epic = create(client, headers, project_id, "Epic")
+    create(client, headers, project_id, "Story", epic)
+
+    count = lambda table: test_db.execute(select(func.count()).select_from(table)).scalar()  # noqa: E731
+    client.post(f"/api/v1/projects/{project_id}/archive", headers=headers)
+    assert (count(TaskClosure.__table__), count(archived_task_closure)) == (0, 1)
+
+    client.post(f"/api/v1/projects/{project_id}/restore", headers=headers)
+    assert (count(TaskClosure.__table__), count(archived_task_closure)) == (1, 0)
+    assert client.get(f"/api/v1/tasks/{epic}/subtasks", headers=headers).json()["subtask_count"] == 1
\ No newline at end of file
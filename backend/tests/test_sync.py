@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.config import settings
+from app.models.project import Project, ProjectStatus
+from app.models.task import Task
+from app.models.user import UserRole
+from app.services.change_log import prune_change_log
+
+
+@pytest.fixture
+def sync(test_db, make_user, login, monkeypatch):
+    monkeypatch.setattr(settings, "sync_settle_seconds", 0)
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    other = make_user("other_manager", UserRole.PROJECT_MANAGER)
+    mine = Project(name="Mine", manager_id=manager.id, tasks=[Task(title="Keep"), Task(title="Drop")])
+    theirs = Project(name="Theirs", manager_id=other.id)
+    test_db.add_all([mine, theirs])
+    test_db.commit()
+    return {"mine": mine.id, "theirs": theirs.id, "manager": login("manager_user"), "other": login("other_manager")}
+
+
+def _sync(client, headers, since=None, **params):
+    if since is not None:
+        params["since"] = since
+    response = client.get("/api/v1/sync/", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_sync_returns_changes_since_token(client, test_db, sync, assert_query_budget):
+    token = _sync(client, sync["manager"])["token"]
+    keep = test_db.query(Task).filter(Task.title == "Keep").one().id
+    drop = test_db.query(Task).filter(Task.title == "Drop").one().id
+
+    client.put(f"/api/v1/tasks/{keep}", json={"status": "in_progress"}, headers=sync["manager"])
+    client.put(f"/api/v1/tasks/{keep}", json={"title": "Kept"}, headers=sync["manager"])
+    client.post(f"/api/v1/tasks/{keep}/comments", json={"content": "Noted", "task_id": keep}, headers=sync["manager"])
+    client.delete(f"/api/v1/tasks/{drop}", headers=sync["manager"])
+    test_db.add(Task(title="Elsewhere", project_id=sync["theirs"]))
+    test_db.commit()
+
+    response = client.get("/api/v1/sync/", params={"since": token}, headers=sync["manager"])
+    # Auth, scope, log bounds, entries, then one load per changed entity type.
+    assert_query_budget(response, 6)
+    changes = response.json()
+    assert [(task["id"], task["title"], task["status"]) for task in changes["tasks"]] == [(keep, "Kept", "in_progress")]
+    assert [comment["content"] for comment in changes["comments"]] == ["Noted"]
+    assert changes["deleted"]["tasks"] == [drop]
+    assert changes["token"] > token and not changes["has_more"]
+
+    # Nothing new since the returned token; the other project's task was never visible.
+    again = _sync(client, sync["manager"], changes["token"])
+    assert again["tasks"] == [] and again["deleted"]["tasks"] == []
+    assert [task["title"] for task in _sync(client, sync["other"], token)["tasks"]] == ["Elsewhere"]
+
+
+def test_sync_pages_and_tombstones_removed_projects(client, test_db, sync):
+    token = _sync(client, sync["manager"])["token"]
+    project = test_db.get(Project, sync["mine"])
+    project.status = ProjectStatus.COMPLETED
+    test_db.commit()
+    client.delete(f"/api/v1/projects/{sync['mine']}", headers=sync["manager"])
+
+    # Out of scope once deleted, the project's earlier update is skipped; its tombstone is not.
+    first = _sync(client, sync["manager"], token, limit=1)
+    assert first["has_more"] and first["projects"] == [] and first["deleted"]["projects"] == [sync["mine"]]
+    rest = _sync(client, sync["manager"], first["token"])
+    assert len(rest["deleted"]["tasks"]) == 2 and not rest["has_more"]
+
+
+def test_sync_archive_and_restore(client, test_db, sync):
+    test_db.get(Project, sync["mine"]).status = ProjectStatus.COMPLETED
+    test_db.commit()
+    token = _sync(client, sync["manager"])["token"]
+
+    client.post(f"/api/v1/projects/{sync['mine']}/archive", headers=sync["manager"])
+    archived = _sync(client, sync["manager"], token)
+    assert archived["projects"][0]["archived_at"] is not None
+    assert len(archived["deleted"]["tasks"]) == 2
+
+    client.post(f"/api/v1/projects/{sync['mine']}/restore", headers=sync["manager"])
+    restored = _sync(client, sync["manager"], archived["token"])
+    assert sorted(task["title"] for task in restored["tasks"]) == ["Drop", "Keep"]
+
+
+def test_sync_tokens_expire_and_wait_to_settle(client, test_db, sync, monkeypatch):
+    token = _sync(client, sync["manager"])["token"]
+    test_db.add(Task(title="Late", project_id=sync["mine"]))
+    test_db.commit()
+
+    # Changes inside the settle window are delivered, but the token stays put.
+    monkeypatch.setattr(settings, "sync_settle_seconds", 60)
+    pending = _sync(client, sync["manager"], token)
+    assert [task["title"] for task in pending["tasks"]] == ["Late"] and pending["token"] == token
+
+    monkeypatch.setattr(settings, "sync_log_retention_days", 0)
+    prune_change_log(test_db, now=datetime.now(timezone.utc) + timedelta(seconds=1))
+    response = client.get("/api/v1/sync/", params={"since": 0}, headers=sync["manager"])
+    assert response.status_code == 410
+
+
+def test_sync_follows_tasks_assigned_outside_the_callers_projects(client, test_db, sync, make_user, login):
+    developer = make_user("dev_user")
+    headers = login("dev_user")
+    token = _sync(client, headers)["token"]
+    task = Task(title="Help", project_id=sync["theirs"], assignee_id=developer.id)
+    test_db.add(task)
+    test_db.commit()
+    client.post(f"/api/v1/tasks/{task.id}/comments", json={"content": "On it", "task_id": task.id}, headers=headers)
+    assert [t["id"] for t in client.get("/api/v1/tasks/", headers=headers).json()] == [task.id]
+
+    changes = _sync(client, headers, token)
+    assert [t["title"] for t in changes["tasks"]] == ["Help"]
+    assert [comment["content"] for comment in changes["comments"]] == ["On it"]
+
+    client.put(f"/api/v1/tasks/{task.id}", json={"title": "Help wanted"}, headers=sync["other"])
+    updated = _sync(client, headers, changes["token"])
+    assert [t["title"] for t in updated["tasks"]] == ["Help wanted"]
+
+    # Handed to someone else: the former assignee gets a tombstone, the manager the update.
+    client.put(f"/api/v1/tasks/{task.id}", json={"assignee_id": None}, headers=sync["other"])
+    assert _sync(client, headers, updated["token"])["deleted"]["tasks"] == [task.id]
+    assert [t["id"] for t in _sync(client, sync["other"], updated["token"])["tasks"]] == [task.id]
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.api.task_filters import SORT_FIELDS
+from app.models.project import Project
+from app.models.task import Task, TaskPriority, TaskStatus
+from app.models.user import UserRole
+
+NOW = datetime.now(timezone.utc)
+
+
+@pytest.fixture
+def tasks(test_db, make_user, login):
+    admin = make_user("admin_user", UserRole.ADMIN)
+    project = Project(name="Filters", manager_id=admin.id)
+    project.tasks = [
+        Task(title="late", status=TaskStatus.TODO, priority=TaskPriority.HIGH, due_date=NOW - timedelta(days=2)),
+        Task(title="late but done", status=TaskStatus.DONE, priority=TaskPriority.LOW,
+             due_date=NOW - timedelta(days=1)),
+        Task(title="soon", status=TaskStatus.IN_PROGRESS, priority=TaskPriority.CRITICAL,
+             due_date=NOW + timedelta(days=3)),
+        Task(title="someday", status=TaskStatus.TODO, priority=TaskPriority.MEDIUM),
+    ]
+    test_db.add(project)
+    test_db.commit()
+    late = test_db.query(Task).filter(Task.title == "late").one()
+    return {"headers": login("admin_user"), "late_id": late.id}
+
+
+def titles(client, tasks, query):
+    response = client.get(f"/api/v1/tasks/?{query}", headers=tasks["headers"])
+    assert response.status_code == 200, response.json()
+    return [task["title"] for task in response.json()]
+
+
+def test_filters_run_in_sql(client, tasks):
+    assert titles(client, tasks, "status=todo&status=in_progress") == ["late", "soon", "someday"]
+    assert titles(client, tasks, "priority=high&priority=critical") == ["late", "soon"]
+    assert titles(client, tasks, "overdue=true") == ["late"]
+    assert titles(client, tasks, "overdue=false&status=todo") == ["someday"]
+    window = f"due_after={(NOW - timedelta(days=1, hours=1)).isoformat()}&due_before={NOW.isoformat()}"
+    assert titles(client, tasks, window.replace("+", "%2B")) == ["late but done"]
+    assert titles(client, tasks, f"created_before={(NOW - timedelta(days=1)).isoformat()}".replace("+", "%2B")) == []
+
+    task = client.get(f"/api/v1/tasks/{tasks['late_id']}", headers=tasks["headers"]).json()
+    assert task["is_overdue"] is True
+
+
+def test_multi_key_sort(client, tasks):
+    assert titles(client, tasks, "sort=-priority") == ["soon", "late", "someday", "late but done"]
+    assert titles(client, tasks, "sort=due_date") == ["late", "late but done", "soon", "someday"]
+    assert titles(client, tasks, "sort=-due_date") == ["soon", "late but done", "late", "someday"]
+    assert titles(client, tasks, "sort=status,-priority&limit=2") == ["late", "someday"]
+
+    response = client.get("/api/v1/tasks/?sort=description", headers=tasks["headers"])
+    assert response.status_code == 400
+
+
+def test_every_filter_and_sort_column_is_indexed():
+    indexed = {column.name for index in Task.__table__.indexes for column in index.columns[:1]}
+    filtered = {"status", "priority", "due_date", "created_at", "updated_at", "project_id", "assignee_id"}
+    assert filtered <= indexed
+    assert set(SORT_FIELDS.values()) - {"id"} <= indexed
@@ -0,0 +1,182 @@
+import random
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+
+from app.models.archive import archived_task_time_rollups, archived_time_entries
+from app.models.project import Project, ProjectStatus
+from app.models.task import Task
+from app.models.time_entry import ProjectTimeRollup, TaskTimeRollup, TimeEntry
+from app.models.user import UserRole
+from app.services.time_rollups import rebuild_time_rollups
+
+MONDAY = date(2024, 3, 4)
+
+
+def make_project(db, manager, members=(), status=ProjectStatus.IN_PROGRESS):
+    project = Project(name="Tracked", manager_id=manager.id, status=status, members=list(members))
+    db.add(project)
+    db.commit()
+    return project.id
+
+
+def make_task(client, headers, project_id, title="Task"):
+    response = client.post("/api/v1/tasks/", json={"title": title, "project_id": project_id}, headers=headers)
+    return response.json()["id"]
+
+
+def log(client, headers, task_id, minutes, spent_on):
+    response = client.post(f"/api/v1/tasks/{task_id}/time-entries", json={
+        "minutes": minutes, "spent_on": spent_on.isoformat()
+    }, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def report(client, headers, *group_by, **params):
+    response = client.get("/api/v1/time-reports/", params={"group_by": list(group_by), **params}, headers=headers)
+    assert response.status_code == 200, response.text
+    return [
+        (*(row[key] for key in ("project_id", "user_id", "week_start") if row[key] is not None), row["minutes"])
+        for row in response.json()["rows"]
+    ]
+
+
+def rollups(db):
+    tasks = db.execute(select(TaskTimeRollup.task_id, TaskTimeRollup.minutes, TaskTimeRollup.entry_count)
+                       .where(TaskTimeRollup.entry_count != 0).order_by(TaskTimeRollup.task_id)).all()
+    weeks = db.execute(select(ProjectTimeRollup.project_id, ProjectTimeRollup.week_start, ProjectTimeRollup.user_id,
+                              ProjectTimeRollup.minutes, ProjectTimeRollup.entry_count)
+                       .where(ProjectTimeRollup.entry_count != 0)
+                       .order_by(ProjectTimeRollup.project_id, ProjectTimeRollup.week_start, ProjectTimeRollup.user_id)
+                       ).all()
+    return tasks, weeks
+
+
+def test_reports_follow_new_edited_and_deleted_entries(client, test_db, make_user, login):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    developer = make_user("dev_user")
+    project_id = make_project(test_db, manager, [developer])
+    headers, dev_headers = login("manager_user"), login("dev_user")
+    first, second = make_task(client, headers, project_id, "First"), make_task(client, headers, project_id, "Second")
+
+    log(client, headers, first, 60, MONDAY)
+    log(client, dev_headers, first, 90, MONDAY + timedelta(days=6))
+    moved = log(client, dev_headers, second, 30, MONDAY + timedelta(days=7))
+    dropped = log(client, headers, second, 15, MONDAY + timedelta(days=8))
+
+    next_week = (MONDAY + timedelta(days=7)).isoformat()
+    assert report(client, headers, "week") == [(MONDAY.isoformat(), 150), (next_week, 45)]
+    assert report(client, headers, "user", "week", week_from=MONDAY + timedelta(days=9)) == [
+        (manager.id, next_week, 15), (developer.id, next_week, 30)
+    ]
+    assert report(client, headers, "project", user_id=developer.id) == [(project_id, 120)]
+
+    assert client.put(f"/api/v1/time-entries/{moved}", json={"minutes": 45, "spent_on": MONDAY.isoformat()},
+                      headers=dev_headers).status_code == 200
+    assert client.delete(f"/api/v1/time-entries/{dropped}", headers=headers).status_code == 200
+    assert report(client, headers, "week") == [(MONDAY.isoformat(), 195)]
+    by_task = client.get("/api/v1/time-reports/tasks", params={"project_id": project_id}, headers=headers).json()
+    assert by_task["total_minutes"] == 195
+    assert [(task["task_id"], task["minutes"], task["entry_count"]) for task in by_task["tasks"]] == [
+        (first, 150, 2), (second, 45, 1)
+    ]
+    entries = client.get(f"/api/v1/tasks/{first}/time-entries", headers=headers).json()
+    assert [entry["minutes"] for entry in entries] == [90, 60]
+
+    assert client.delete(f"/api/v1/tasks/{first}", headers=headers).status_code == 200
+    assert report(client, headers, "user") == [(developer.id, 45)]
+    assert test_db.execute(select(func.count()).select_from(TimeEntry)).scalar() == 1
+
+
+def test_time_entry_permissions_and_validation(client, test_db, make_user, login):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    developer, other = make_user("dev_user"), make_user("other_dev")
+    project_id = make_project(test_db, manager, [developer, other])
+    headers, dev_headers, other_headers = login("manager_user"), login("dev_user"), login("other_dev")
+    task_id = make_task(client, headers, project_id)
+    entry_id = log(client, dev_headers, task_id, 60, MONDAY)
+
+    assert client.put(f"/api/v1/time-entries/{entry_id}", json={"minutes": 5}, headers=other_headers).status_code == 403
+    assert client.delete(f"/api/v1/time-entries/{entry_id}", headers=other_headers).status_code == 403
+    assert client.put(f"/api/v1/time-entries/{entry_id}", json={"note": "Review"}, headers=headers).status_code == 200
+    for minutes in (0, 24 * 60 + 1):
+        response = client.post(f"/api/v1/tasks/{task_id}/time-entries", json={"minutes": minutes}, headers=headers)
+        assert response.status_code == 422
+    assert client.get("/api/v1/time-reports/", params={"group_by": "task"}, headers=headers).status_code == 400
+
+    make_user("outsider")
+    outsider_headers = login("outsider")
+    assert report(client, outsider_headers, "project") == []
+    assert client.get("/api/v1/time-reports/tasks", params={"project_id": project_id},
+                      headers=outsider_headers).status_code == 403
+
+
+def test_rollups_match_a_rebuild_after_random_edits(test_db, make_user):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    users = [manager, make_user("dev_a"), make_user("dev_b")]
+    project_ids = [make_project(test_db, manager), make_project(test_db, manager)]
+    rng = random.Random(11)
+    tasks = [Task(title="T", project_id=rng.choice(project_ids)) for _ in range(6)]
+    test_db.add_all(tasks)
+    test_db.commit()
+    entries = []
+
+    for _ in range(150):
+        roll = rng.random()
+        if roll < 0.45 or not entries:
+            task = rng.choice(tasks)
+            entry = TimeEntry(task_id=task.id, project_id=task.project_id, user_id=rng.choice(users).id,
+                              minutes=rng.randint(1, 480), spent_on=MONDAY + timedelta(days=rng.randint(0, 30)))
+            test_db.add(entry)
+            entries.append(entry)
+        elif roll < 0.75:
+            entry = rng.choice(entries)
+            test_db.refresh(entry)
+            entry.minutes = rng.randint(1, 480)
+            if rng.random() < 0.5:
+                entry.spent_on = MONDAY + timedelta(days=rng.randint(0, 30))
+        elif roll < 0.85:
+            # Edited without its old values loaded: the project's rollups are rebuilt.
+            entry = rng.choice(entries)
+            test_db.expire(entry)
+            entry.minutes = rng.randint(1, 480)
+        elif roll < 0.97:
+            test_db.delete(entries.pop(rng.randrange(len(entries))))
+        else:
+            task = tasks.pop(rng.randrange(len(tasks)))
+            entries = [entry for entry in entries if entry.task_id != task.id]
+            test_db.delete(task)
+            tasks.append(Task(title="T", project_id=rng.choice(project_ids)))
+            test_db.add(tasks[-1])
+        test_db.commit()
+
+    incremental = rollups(test_db)
+    assert sum(minutes for _, minutes, _ in incremental[0]) == sum(entry.minutes for entry in entries)
+    assert rebuild_time_rollups(test_db) == project_ids
+    assert rollups(test_db) == incremental
+
+
+def test_time_moves_with_archived_projects(client, test_db, make_user, login):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    project_id = make_project(test_db, manager, status=ProjectStatus.COMPLETED)
+    headers = login("manager_user")
+    task_id = make_task(client, headers, project_id)
+    log(client, headers, task_id, 120, MONDAY)
+    count = lambda table: test_db.execute(select(func.count()).select_from(table)).scalar()  # noqa: E731
+    by_task = lambda: client.get("/api/v1/time-reports/tasks", params={  # noqa: E731
+        "project_id": project_id
+    }, headers=headers).json()["tasks"]
+
+    client.post(f"/api/v1/projects/{project_id}/archive", headers=headers)
+    assert (count(TimeEntry.__table__), count(archived_time_entries)) == (0, 1)
+    assert count(archived_task_time_rollups) == 1
+    assert [task["minutes"] for task in by_task()] == [120]
+    assert report(client, headers, "project") == [(project_id, 120)]
+    response = client.post(f"/api/v1/tasks/{task_id}/time-entries", json={"minutes": 5}, headers=headers)
+    assert response.status_code == 404
+
+    client.post(f"/api/v1/projects/{project_id}/restore", headers=headers)
+    assert (count(TimeEntry.__table__), count(archived_time_entries)) == (1, 0)
+    log(client, headers, task_id, 30, MONDAY)
+    assert [task["minutes"] for task in by_task()] == [150]
\ No newline at end of file
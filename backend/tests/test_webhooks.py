@@ -0,0 +1,201 @@
+import json
+import socket
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import UserRole
+from app.models.webhook import WebhookDelivery
+from app.services import webhooks
+from app.services.webhooks import WebhookDispatcher, sign
+from .conftest import TestingSessionLocal, engine
+
+
+class StubReceiver:
+    """Local HTTP endpoint that records webhook batches and answers with ``status``."""
+
+    def __init__(self):
+        self.requests = []
+        self.status = 200
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                receiver.requests.append((dict(self.headers), body, self.client_address[1]))
+                self.send_response(receiver.status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def events(self):
+        return [event for _, body, _ in self.requests for event in json.loads(body)["events"]]
+
+
+@pytest.fixture
+def receiver(monkeypatch):
+    monkeypatch.setattr(settings, "webhook_allow_localhost", True)
+    stub = StubReceiver()
+    yield stub
+    stub.server.shutdown()
+
+
+@pytest.fixture
+def dispatcher():
+    dispatcher = WebhookDispatcher(TestingSessionLocal)
+    yield dispatcher
+    dispatcher.close()
+
+
+@pytest.fixture
+def hooked(client, test_db, make_user, login, receiver):
+    manager = make_user("manager_user", UserRole.PROJECT_MANAGER)
+    developer = make_user("developer_user")
+    project = Project(name="Hooked", manager_id=manager.id, tasks=[Task(title="Ship it")])
+    test_db.add(project)
+    test_db.commit()
+    headers = login("manager_user")
+    response = client.post("/api/v1/webhooks/", json={
+        "project_id": project.id,
+        "url": receiver.url,
+        "event_types": ["task.assigned", "task.status_changed"],
+    }, headers=headers)
+    assert response.status_code == 200
+    return {
+        "webhook": response.json(),
+        "task_id": project.tasks[0].id,
+        "developer_id": developer.id,
+        "headers": headers,
+    }
+
+
+def test_events_are_batched_signed_and_delivered(client, hooked, receiver, dispatcher):
+    task_path = f"/api/v1/tasks/{hooked['task_id']}"
+    client.put(task_path, json={"assignee_id": hooked["developer_id"]}, headers=hooked["headers"])
+    client.put(task_path, json={"status": "in_progress"}, headers=hooked["headers"])
+    client.put(task_path, json={"title": "Not subscribed"}, headers=hooked["headers"])
+    client.put(task_path, json={"status": "done"}, headers=hooked["headers"])
+
+    assert dispatcher.run_once() == {"delivered": 3, "failed": 0}
+    assert len(receiver.requests) == 1
+    headers, body, _ = receiver.requests[0]
+    assert headers["X-Webhook-Signature"] == sign(hooked["webhook"]["secret"], headers["X-Webhook-Timestamp"], body)
+    events = receiver.events()
+    assert [event["type"] for event in events] == ["task.assigned", "task.status_changed", "task.status_changed"]
+    assert events[2]["data"]["previous_status"] == "in_progress" and events[2]["data"]["status"] == "done"
+
+    # Delivered rows leave the outbox; later batches reuse the kept-alive connection.
+    with TestingSessionLocal() as db:
+        assert db.query(WebhookDelivery).count() == 0
+    client.put(task_path, json={"status": "todo"}, headers=hooked["headers"])
+    dispatcher.run_once()
+    assert receiver.requests[1][2] == receiver.requests[0][2]
+
+
+def test_concurrent_claims_never_share_a_delivery(client, hooked):
+    task_path = f"/api/v1/tasks/{hooked['task_id']}"
+    for status in ("in_progress", "done", "todo"):
+        client.put(task_path, json={"status": status}, headers=hooked["headers"])
+
+    # Both claimers finish a first SELECT before either writes, which is
+    # where a select-then-update claim hands both the same rows.
+    barrier = threading.Barrier(2)
+    starting = set()
+
+    def hold_first_select(conn, cursor, statement, parameters, context, executemany):
+        thread = threading.get_ident()
+        if thread in starting:
+            starting.discard(thread)
+            if statement.lstrip().upper().startswith("SELECT"):
+                barrier.wait(5)
+
+    claimed = []
+
+    def claim():
+        starting.add(threading.get_ident())
+        with TestingSessionLocal() as db:
+            claimed.extend(row.id for row in WebhookDispatcher(TestingSessionLocal)._claim(db))
+
+    event.listen(engine, "after_cursor_execute", hold_first_select)
+    try:
+        threads = [threading.Thread(target=claim) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        event.remove(engine, "after_cursor_execute", hold_first_select)
+    assert len(claimed) == 3 and len(set(claimed)) == 3
+
+
+def test_failures_back_off_then_dead_letter(client, hooked, receiver, dispatcher, monkeypatch):
+    monkeypatch.setattr(settings, "webhook_max_attempts", 2)
+    receiver.status = 500
+    client.put(f"/api/v1/tasks/{hooked['task_id']}", json={"status": "done"}, headers=hooked["headers"])
+
+    assert dispatcher.run_once() == {"delivered": 0, "failed": 1}
+    with TestingSessionLocal() as db:
+        delivery = db.query(WebhookDelivery).one()
+        assert delivery.attempts == 1 and "HTTP 500" in delivery.last_error
+        # Not due again until the backoff has passed.
+        assert dispatcher.run_once() == {"delivered": 0, "failed": 0}
+        delivery.next_attempt_at = datetime.now(timezone.utc)
+        db.commit()
+    dispatcher.run_once()
+
+    path = f"/api/v1/webhooks/{hooked['webhook']['id']}/dead-letters"
+    dead = client.get(path, headers=hooked["headers"]).json()
+    assert [(letter["event_type"], letter["attempts"]) for letter in dead] == [("task.status_changed", 2)]
+
+    receiver.status = 200
+    assert client.post(f"{path}/retry", headers=hooked["headers"]).json() == {"requeued": 1}
+    assert dispatcher.run_once() == {"delivered": 1, "failed": 0}
+    assert client.get(path, headers=hooked["headers"]).json() == []
+
+
+def test_webhooks_are_managed_by_the_project_manager(client, hooked, make_user, login):
+    make_user("other_manager", UserRole.PROJECT_MANAGER)
+    other = login("other_manager")
+    webhook_id = hooked["webhook"]["id"]
+    assert client.delete(f"/api/v1/webhooks/{webhook_id}", headers=other).status_code == 403
+    invalid = {"project_id": 1, "url": "ftp://example.com", "event_types": ["task.created"]}
+    assert client.post("/api/v1/webhooks/", json=invalid, headers=hooked["headers"]).status_code == 422
+    listed = client.get("/api/v1/webhooks/?project_id=1", headers=hooked["headers"]).json()
+    assert listed[0]["event_types"] == ["task.assigned", "task.status_changed"] and "secret" not in listed[0]
+
+
+def test_webhooks_only_reach_public_addresses(client, hooked, receiver, dispatcher, monkeypatch):
+    monkeypatch.setattr(settings, "webhook_allow_localhost", False)
+    for url in (receiver.url, "http://localhost/hook", "http://169.254.169.254/latest/meta-data/",
+                "http://10.0.0.7/hook", "https://[::ffff:192.168.0.1]/hook", "http://0.0.0.0/hook"):
+        response = client.post("/api/v1/webhooks/", json={"project_id": 1, "url": url}, headers=hooked["headers"])
+        assert response.status_code == 400, url
+    public = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("93.184.216.34", 443))]
+    monkeypatch.setattr(webhooks.socket, "getaddrinfo", lambda *args, **kwargs: public)
+    response = client.post("/api/v1/webhooks/", json={"project_id": 1, "url": "https://hooks.example.com/in"},
+                           headers=hooked["headers"])
+    assert response.status_code == 200
+    client.delete(f"/api/v1/webhooks/{response.json()['id']}", headers=hooked["headers"])
+    monkeypatch.undo()
+
+    # The existing subscription's host is checked again before every connection.
+    monkeypatch.setattr(settings, "webhook_allow_localhost", False)
+    client.put(f"/api/v1/tasks/{hooked['task_id']}", json={"status": "done"}, headers=hooked["headers"])
+    assert dispatcher.run_once() == {"delivered": 0, "failed": 1}
+    assert receiver.requests == []
+    with TestingSessionLocal() as db:
+        assert "non-public address (127.0.0.1)" in db.query(WebhookDelivery).one().last_error
@@ -10,9 +10,11 @@ import TasksPage from './pages/TasksPage';
 import UsersPage from './pages/UsersPage';
 import ProjectDetailPage from './pages/ProjectDetailPage';
 import LoadingSpinner from './components/LoadingSpinner';
+import { useChangeSync } from './services/sync';
 
 function App() {
   const { user, loading } = useAuth();
+  useChangeSync(!!user);
 
   if (loading) {
     return (
@@ -20,8 +20,8 @@ import {
 } from '@mui/material';
 import { useParams } from 'react-router-dom';
 import { useQuery, useMutation, useQueryClient } from 'react-query';
-import { projectsAPI, tasksAPI, aiAPI, usersAPI } from '../services/api';
-import { userStoriesAPI, UserStory } from '../services/userStoriesAPI';
+import { projectsAPI, aiAPI } from '../services/api';
+import { UserStory } from '../services/userStoriesAPI';
 import { useAuth } from '../contexts/AuthContext';
 import LoadingSpinner from '../components/LoadingSpinner';
 import { AutoAwesome } from '@mui/icons-material';
@@ -36,28 +36,36 @@ const ProjectDetailPage: React.FC = () => {
   const { user } = useAuth();
   const queryClient = useQueryClient();
 
-  const { data: project, isLoading } = useQuery(
+  // Project, members, board and stories in one request.
+  const [moreTasks, setMoreTasks] = useState<Record<string, { tasks: any[]; next_cursor: number | null }>>({});
+  const { data: overview, isLoading } = useQuery(
     ['project', id],
-    () => projectsAPI.getProject(parseInt(id!)),
-    { enabled: !!id }
+    () => projectsAPI.getOverview(parseInt(id!)),
+    { enabled: !!id, onSuccess: () => setMoreTasks({}) }
   );
+  const project = overview?.project;
+  const board = overview?.board;
+  const userStoriesData = overview?.stories;
 
-  const { data: tasks } = useQuery(
-    ['tasks', id],
-    () => tasksAPI.getTasks(parseInt(id!)),
-    { enabled: !!id }
-  );
-
-  const { data: users } = useQuery(
-    ['users'],
-    () => usersAPI.getUsers()
-  );
+  const loadMore = async (status: string) => {
+    const column = boardColumn(status);
+    if (column.next_cursor === null) return;
+    const page = await projectsAPI.getBoardColumn(parseInt(id!), status, column.next_cursor);
+    setMoreTasks({
+      ...moreTasks,
+      [status]: { tasks: [...(moreTasks[status]?.tasks || []), ...page.tasks], next_cursor: page.next_cursor },
+    });
+  };
 
-  const { data: userStoriesData } = useQuery(
-    ['user-stories', id],
-    () => userStoriesAPI.getUserStoriesByProject(parseInt(id!)),
-    { enabled: !!id }
-  );
+  const boardColumn = (status: string) => {
+    const column = board?.columns.find((c: any) => c.status === status);
+    const more = moreTasks[status];
+    return {
+      count: column?.count || 0,
+      tasks: [...(column?.tasks || []), ...(more?.tasks || [])],
+      next_cursor: more ? more.next_cursor : column?.next_cursor ?? null,
+    };
+  };
 
   const aiMutation = useMutation(
     ({ description, projectId }: { description: string; projectId: number }) =>
@@ -65,7 +73,6 @@ const ProjectDetailPage: React.FC = () => {
     {
       onSuccess: () => {
         queryClient.invalidateQueries(['project', id]);
-        queryClient.invalidateQueries(['user-stories', id]);
         setAiDialogOpen(false);
         setProjectDescription('');
         setAiLoading(false);
@@ -101,9 +108,15 @@ const ProjectDetailPage: React.FC = () => {
   const canManage = user?.role === 'admin' || 
     (user?.role === 'project_manager' && project.manager_id === user.id);
 
-  const todoTasks = tasks?.filter((t: any) => t.status === 'todo') || [];
-  const inProgressTasks = tasks?.filter((t: any) => t.status === 'in_progress') || [];
-  const doneTasks = tasks?.filter((t: any) => t.status === 'done') || [];
+  const todoColumn = boardColumn('todo');
+  const inProgressColumn = boardColumn('in_progress');
+  const doneColumn = boardColumn('done');
+  const loadMoreButton = (status: string, column: { next_cursor: number | null }) =>
+    column.next_cursor !== null && (
+      <Button size="small" fullWidth onClick={() => loadMore(status)}>
+        Load more
+      </Button>
+    );
 
   return (
     <Box>
@@ -175,7 +188,7 @@ const ProjectDetailPage: React.FC = () => {
       {userStoriesData?.user_stories && userStoriesData.user_stories.length > 0 && (
         <>
           <Typography variant="h5" gutterBottom sx={{ mt: 4 }}>
-            User Stories ({userStoriesData.user_stories.length})
+            User Stories ({userStoriesData.total})
           </Typography>
           <Grid container spacing={3} sx={{ mb: 4 }}>
             {userStoriesData.user_stories.map((story: UserStory) => (
@@ -208,10 +221,10 @@ const ProjectDetailPage: React.FC = () => {
           <Card>
             <CardContent>
               <Typography variant="h6" gutterBottom color="textSecondary">
-                To Do ({todoTasks.length})
+                To Do ({todoColumn.count})
               </Typography>
               <List dense>
-                {todoTasks.map((task: any) => (
+                {todoColumn.tasks.map((task: any) => (
                   <ListItem key={task.id} sx={{ bgcolor: 'grey.50', mb: 1, borderRadius: 1 }}>
                     <ListItemText
                       primary={task.title}
@@ -224,7 +237,7 @@ const ProjectDetailPage: React.FC = () => {
                           />
                           {task.assignee_id && (
                             <Typography variant="caption" display="block">
-                              Assigned to: {users?.find((u: any) => u.id === task.assignee_id)?.full_name}
+                              Assigned to: {task.assignee?.full_name}
                             </Typography>
                           )}
                         </Box>
@@ -234,6 +247,7 @@ const ProjectDetailPage: React.FC = () => {
                   </ListItem>
                 ))}
               </List>
+              {loadMoreButton('todo', todoColumn)}
             </CardContent>
           </Card>
         </Grid>
@@ -242,10 +256,10 @@ const ProjectDetailPage: React.FC = () => {
           <Card>
             <CardContent>
               <Typography variant="h6" gutterBottom color="primary">
-                In Progress ({inProgressTasks.length})
+                In Progress ({inProgressColumn.count})
               </Typography>
               <List dense>
-                {inProgressTasks.map((task: any) => (
+                {inProgressColumn.tasks.map((task: any) => (
                   <ListItem key={task.id} sx={{ bgcolor: 'primary.light', mb: 1, borderRadius: 1, color: 'white' }}>
                     <ListItemText
                       primary={task.title}
@@ -263,6 +277,7 @@ const ProjectDetailPage: React.FC = () => {
                   </ListItem>
                 ))}
               </List>
+              {loadMoreButton('in_progress', inProgressColumn)}
             </CardContent>
           </Card>
         </Grid>
@@ -271,10 +286,10 @@ const ProjectDetailPage: React.FC = () => {
           <Card>
             <CardContent>
               <Typography variant="h6" gutterBottom color="success.main">
-                Done ({doneTasks.length})
+                Done ({doneColumn.count})
               </Typography>
               <List dense>
-                {doneTasks.map((task: any) => (
+                {doneColumn.tasks.map((task: any) => (
                   <ListItem key={task.id} sx={{ bgcolor: 'success.light', mb: 1, borderRadius: 1, color: 'white' }}>
                     <ListItemText
                       primary={task.title}
@@ -290,6 +305,7 @@ const ProjectDetailPage: React.FC = () => {
                   </ListItem>
                 ))}
               </List>
+              {loadMoreButton('done', doneColumn)}
             </CardContent>
           </Card>
         </Grid>
@@ -21,10 +21,12 @@ import {
   Select,
   MenuItem,
   IconButton,
+  Checkbox,
+  FormControlLabel,
 } from '@mui/material';
 import { Add, Edit, Delete, Comment } from '@mui/icons-material';
 import { useQuery, useMutation, useQueryClient } from 'react-query';
-import { tasksAPI, projectsAPI, usersAPI } from '../services/api';
+import { tasksAPI, projectsAPI, usersAPI, TaskFilters } from '../services/api';
 import { useAuth } from '../contexts/AuthContext';
 import LoadingSpinner from '../components/LoadingSpinner';
 import { DatePicker } from '@mui/x-date-pickers/DatePicker';
@@ -44,10 +46,18 @@ const TasksPage: React.FC = () => {
     due_date: null as Date | null,
   });
 
+  const [filters, setFilters] = useState<TaskFilters>({ status: [], priority: [], overdue: false, sort: '' });
+
   const { user } = useAuth();
   const queryClient = useQueryClient();
 
-  const { data: tasks, isLoading: tasksLoading } = useQuery('tasks', () => tasksAPI.getTasks());
+  // Developers only see their own tasks; the server applies every filter.
+  const assigneeId = user?.role === 'developer' ? user.id : undefined;
+  const { data: tasks, isLoading: tasksLoading } = useQuery(
+    ['tasks', assigneeId, filters],
+    () => tasksAPI.getTasks(undefined, assigneeId, filters),
+    { keepPreviousData: true }
+  );
   const { data: projects } = useQuery('projects', projectsAPI.getProjects);
   const { data: users } = useQuery('users', usersAPI.getUsers);
 
@@ -148,9 +158,6 @@ const TasksPage: React.FC = () => {
   if (tasksLoading) return <LoadingSpinner />;
 
   const canManage = user?.role === 'admin' || user?.role === 'project_manager';
-  const filteredTasks = user?.role === 'developer' 
-    ? tasks?.filter((task: any) => task.assignee_id === user.id)
-    : tasks;
 
   return (
     <LocalizationProvider dateAdapter={AdapterDateFns}>
@@ -168,6 +175,60 @@ const TasksPage: React.FC = () => {
           )}
         </Box>
 
+        <Box display="flex" gap={2} alignItems="center" mb={2} flexWrap="wrap">
+          <FormControl size="small" sx={{ minWidth: 180 }}>
+            <InputLabel>Status</InputLabel>
+            <Select
+              multiple
+              value={filters.status}
+              onChange={(e) => setFilters({ ...filters, status: e.target.value as string[] })}
+              label="Status"
+            >
+              <MenuItem value="todo">To Do</MenuItem>
+              <MenuItem value="in_progress">In Progress</MenuItem>
+              <MenuItem value="done">Done</MenuItem>
+            </Select>
+          </FormControl>
+          <FormControl size="small" sx={{ minWidth: 180 }}>
+            <InputLabel>Priority</InputLabel>
+            <Select
+              multiple
+              value={filters.priority}
+              onChange={(e) => setFilters({ ...filters, priority: e.target.value as string[] })}
+              label="Priority"
+            >
+              <MenuItem value="low">Low</MenuItem>
+              <MenuItem value="medium">Medium</MenuItem>
+              <MenuItem value="high">High</MenuItem>
+              <MenuItem value="critical">Critical</MenuItem>
+            </Select>
+          </FormControl>
+          <FormControl size="small" sx={{ minWidth: 200 }}>
+            <InputLabel>Sort by</InputLabel>
+            <Select
+              value={filters.sort}
+              onChange={(e) => setFilters({ ...filters, sort: e.target.value as string })}
+              label="Sort by"
+            >
+              <MenuItem value="">Default order</MenuItem>
+              <MenuItem value="-created_at">Newest first</MenuItem>
+              <MenuItem value="due_date">Due date</MenuItem>
+              <MenuItem value="-priority,due_date">Priority</MenuItem>
+              <MenuItem value="status,-priority">Status</MenuItem>
+              <MenuItem value="-updated_at">Recently updated</MenuItem>
+            </Select>
+          </FormControl>
+          <FormControlLabel
+            control={
+              <Checkbox
+                checked={!!filters.overdue}
+                onChange={(e) => setFilters({ ...filters, overdue: e.target.checked })}
+              />
+            }
+            label="Overdue only"
+          />
+        </Box>
+
         <TableContainer component={Paper}>
           <Table>
             <TableHead>
@@ -182,7 +243,7 @@ const TasksPage: React.FC = () => {
               </TableRow>
             </TableHead>
             <TableBody>
-              {filteredTasks?.map((task: any) => (
+              {tasks?.map((task: any) => (
                 <TableRow key={task.id}>
                   <TableCell>{task.title}</TableCell>
                   <TableCell>
@@ -190,7 +251,7 @@ const TasksPage: React.FC = () => {
                   </TableCell>
                   <TableCell>
                     {task.assignee_id 
-                      ? users?.find((u: any) => u.id === task.assignee_id)?.full_name
+                      ? task.assignee?.full_name
                       : 'Unassigned'
                     }
                   </TableCell>
@@ -48,6 +48,12 @@ export const usersAPI = {
     const response = await api.get('/users/');
     return response.data;
   },
+
+  // Multi-get: { items, not_found, forbidden }, items in the order of `ids`.
+  getUsersByIds: async (ids: number[]) => {
+    const response = await api.get(`/users/batch?ids=${ids.join(',')}`);
+    return response.data;
+  },
   
   createUser: async (userData: any) => {
     const response = await api.post('/users/', userData);
@@ -71,6 +77,11 @@ export const projectsAPI = {
     return response.data;
   },
   
+  getProjectsByIds: async (ids: number[]) => {
+    const response = await api.get(`/projects/batch?ids=${ids.join(',')}`);
+    return response.data;
+  },
+
   getProject: async (projectId: number) => {
     const response = await api.get(`/projects/${projectId}`);
     return response.data;
@@ -90,18 +101,91 @@ export const projectsAPI = {
     const response = await api.delete(`/projects/${projectId}`);
     return response.data;
   },
+
+  // Project, members, board and stories in one response; revalidated with its ETag.
+  getOverview: async (projectId: number) => {
+    const response = await api.get(`/projects/${projectId}/overview`);
+    return response.data;
+  },
+
+  getBoard: async (projectId: number, perColumn = 20) => {
+    const response = await api.get(`/projects/${projectId}/board?per_column=${perColumn}`);
+    return response.data;
+  },
+
+  getBoardColumn: async (projectId: number, status: string, cursor: number, limit = 20) => {
+    const response = await api.get(`/projects/${projectId}/board/${status}?cursor=${cursor}&limit=${limit}`);
+    return response.data;
+  },
+
+  getFrontier: async (projectId: number) => {
+    const response = await api.get(`/projects/${projectId}/frontier`);
+    return response.data;
+  },
+
+  getCriticalPath: async (projectId: number) => {
+    const response = await api.get(`/projects/${projectId}/critical-path`);
+    return response.data;
+  },
+
+  // With task_count on each label.
+  getLabels: async (projectId: number) => {
+    const response = await api.get(`/projects/${projectId}/labels`);
+    return response.data;
+  },
+
+  createLabel: async (projectId: number, labelData: { name: string; color?: string }) => {
+    const response = await api.post(`/projects/${projectId}/labels`, labelData);
+    return response.data;
+  },
 };
 
+export const labelsAPI = {
+  updateLabel: async (labelId: number, labelData: { name?: string; color?: string }) => {
+    const response = await api.put(`/labels/${labelId}`, labelData);
+    return response.data;
+  },
+
+  deleteLabel: async (labelId: number) => {
+    const response = await api.delete(`/labels/${labelId}`);
+    return response.data;
+  },
+};
+
+export interface TaskFilters {
+  status?: string[];
+  priority?: string[];
+  overdue?: boolean;
+  due_after?: string;
+  due_before?: string;
+  // Label expression, e.g. 'backend and (bug or regression) and not "customer x"'.
+  labels?: string;
+  sort?: string;
+}
+
 export const tasksAPI = {
-  getTasks: async (projectId?: number, assigneeId?: number) => {
+  getTasks: async (projectId?: number, assigneeId?: number, filters: TaskFilters = {}) => {
     const params = new URLSearchParams();
     if (projectId) params.append('project_id', projectId.toString());
     if (assigneeId) params.append('assignee_id', assigneeId.toString());
+    // Filtering and sorting run on the server; see backend/app/api/task_filters.py.
+    filters.status?.forEach((status) => params.append('status', status));
+    filters.priority?.forEach((priority) => params.append('priority', priority));
+    if (filters.overdue) params.append('overdue', 'true');
+    if (filters.due_after) params.append('due_after', filters.due_after);
+    if (filters.due_before) params.append('due_before', filters.due_before);
+    if (filters.labels) params.append('labels', filters.labels);
+    if (filters.sort) params.append('sort', filters.sort);
     
     const response = await api.get(`/tasks/?${params}`);
     return response.data;
   },
   
+  getTasksByIds: async (ids: number[]) => {
+    const response = await api.get(`/tasks/batch?ids=${ids.join(',')}`);
+    return response.data;
+  },
+
   getTask: async (taskId: number) => {
     const response = await api.get(`/tasks/${taskId}`);
     return response.data;
@@ -122,10 +206,127 @@ export const tasksAPI = {
     return response.data;
   },
   
+  // Subtasks at every depth; maxDepth 1 for direct children only.
+  getSubtasks: async (taskId: number, maxDepth?: number) => {
+    const params = maxDepth !== undefined ? { max_depth: maxDepth } : {};
+    const response = await api.get(`/tasks/${taskId}/subtasks`, { params });
+    return response.data;
+  },
+
+  // Moves the task with its subtasks; null makes it a top-level task.
+  moveTask: async (taskId: number, parentId: number | null) => {
+    const response = await api.put(`/tasks/${taskId}`, { parent_id: parentId });
+    return response.data;
+  },
+
   addComment: async (taskId: number, content: string) => {
     const response = await api.post(`/tasks/${taskId}/comments`, { content, task_id: taskId });
     return response.data;
   },
+
+  getAttachments: async (taskId: number) => {
+    const response = await api.get(`/tasks/${taskId}/attachments`);
+    return response.data;
+  },
+
+  // The file is sent as the raw body, so the server can stream it to disk.
+  uploadAttachment: async (taskId: number, file: File, commentId?: number) => {
+    const params: Record<string, string | number> = { filename: file.name };
+    if (commentId !== undefined) params.comment_id = commentId;
+    const response = await api.post(`/tasks/${taskId}/attachments`, file, {
+      params,
+      headers: { 'Content-Type': file.type || 'application/octet-stream' },
+      timeout: 0,
+    });
+    return response.data;
+  },
+
+  downloadAttachment: async (attachmentId: number) => {
+    const response = await api.get(`/attachments/${attachmentId}`, { responseType: 'blob', timeout: 0 });
+    return response.data as Blob;
+  },
+
+  deleteAttachment: async (attachmentId: number) => {
+    const response = await api.delete(`/attachments/${attachmentId}`);
+    return response.data;
+  },
+
+  getDependencies: async (taskId: number) => {
+    const response = await api.get(`/tasks/${taskId}/dependencies`);
+    return response.data;
+  },
+
+  addDependency: async (taskId: number, blockerId: number) => {
+    const response = await api.post(`/tasks/${taskId}/dependencies`, { blocker_id: blockerId });
+    return response.data;
+  },
+
+  removeDependency: async (taskId: number, blockerId: number) => {
+    const response = await api.delete(`/tasks/${taskId}/dependencies/${blockerId}`);
+    return response.data;
+  },
+
+  setLabels: async (taskId: number, labelIds: number[]) => {
+    const response = await api.put(`/tasks/${taskId}/labels`, { label_ids: labelIds });
+    return response.data;
+  },
+
+  addLabel: async (taskId: number, labelId: number) => {
+    const response = await api.post(`/tasks/${taskId}/labels/${labelId}`);
+    return response.data;
+  },
+
+  removeLabel: async (taskId: number, labelId: number) => {
+    const response = await api.delete(`/tasks/${taskId}/labels/${labelId}`);
+    return response.data;
+  },
+
+  getTimeEntries: async (taskId: number, skip = 0, limit = 100) => {
+    const response = await api.get(`/tasks/${taskId}/time-entries`, { params: { skip, limit } });
+    return response.data;
+  },
+
+  // spentOn as YYYY-MM-DD; today when left out.
+  logTime: async (taskId: number, minutes: number, spentOn?: string, note?: string) => {
+    const response = await api.post(`/tasks/${taskId}/time-entries`, { minutes, spent_on: spentOn, note });
+    return response.data;
+  },
+};
+
+export interface TimeReportFilters {
+  projectId?: number;
+  userId?: number;
+  weekFrom?: string;
+  weekTo?: string;
+}
+
+export const timeAPI = {
+  updateEntry: async (entryId: number, entryData: { minutes?: number; spent_on?: string; note?: string }) => {
+    const response = await api.put(`/time-entries/${entryId}`, entryData);
+    return response.data;
+  },
+
+  deleteEntry: async (entryId: number) => {
+    const response = await api.delete(`/time-entries/${entryId}`);
+    return response.data;
+  },
+
+  // Served from pre-aggregated rollups; groupBy is any of 'project', 'user' and 'week'.
+  getReport: async (groupBy: string[] = ['week'], filters: TimeReportFilters = {}) => {
+    const params = new URLSearchParams();
+    groupBy.forEach((group) => params.append('group_by', group));
+    if (filters.projectId) params.append('project_id', filters.projectId.toString());
+    if (filters.userId) params.append('user_id', filters.userId.toString());
+    if (filters.weekFrom) params.append('week_from', filters.weekFrom);
+    if (filters.weekTo) params.append('week_to', filters.weekTo);
+    const response = await api.get(`/time-reports/?${params}`);
+    return response.data;
+  },
+
+  getTaskReport: async (projectId: number, skip = 0, limit = 100) => {
+    const response = await api.get('/time-reports/tasks', { params: { project_id: projectId, skip, limit } });
+    return response.data;
+  },
 };
 
 export const dashboardAPI = {
@@ -152,4 +353,12 @@ export const aiAPI = {
   },
 };
 
+export const syncAPI = {
+  // Without `since`, just a token to sync from; see backend/app/api/v1/sync.py.
+  getChanges: async (since?: number) => {
+    const response = await api.get('/sync/', { params: since === undefined ? {} : { since } });
+    return response.data;
+  },
+};
+
 export default api;
\ No newline at end of file
@@ -0,0 +1,59 @@
+import { useEffect, useRef } from 'react';
+import { useQueryClient } from 'react-query';
+import { syncAPI } from './api';
+
+// Queries to refetch when rows of each synced entity change.
+const AFFECTED_QUERIES: Record<string, string[]> = {
+  projects: ['projects', 'project', 'dashboard-stats'],
+  memberships: ['projects', 'project'],
+  tasks: ['tasks', 'project', 'dashboard-stats', 'recent-activity'],
+  user_stories: ['project'],
+  comments: ['project'],
+};
+
+// On window focus, asks the server what changed since the last check and
+// refetches only the queries those changes affect.
+export const useChangeSync = (enabled: boolean) => {
+  const queryClient = useQueryClient();
+  const token = useRef<number | null>(null);
+
+  useEffect(() => {
+    if (!enabled) return;
+    let active = true;
+
+    const sync = async () => {
+      try {
+        if (token.current === null) {
+          token.current = (await syncAPI.getChanges()).token;
+          return;
+        }
+        const keys: string[] = [];
+        let more = true;
+        while (more && active) {
+          const changes = await syncAPI.getChanges(token.current!);
+          Object.keys(AFFECTED_QUERIES).forEach((entity) => {
+            if (changes[entity].length || changes.deleted[entity].length) {
+              AFFECTED_QUERIES[entity].forEach((key) => keys.indexOf(key) < 0 && keys.push(key));
+            }
+          });
+          token.current = changes.token;
+          more = changes.has_more;
+        }
+        keys.forEach((key) => queryClient.invalidateQueries(key));
+      } catch (error: any) {
+        // The token expired: anything may have changed.
+        if (error.response?.status === 410) {
+          token.current = null;
+          queryClient.invalidateQueries();
+        }
+      }
+    };
+
+    sync();
+    window.addEventListener('focus', sync);
+    return () => {
+      active = false;
+      window.removeEventListener('focus', sync);
+    };
+  }, [enabled, queryClient]);
+};